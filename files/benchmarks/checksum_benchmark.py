@@ -0,0 +1,147 @@
+"""
+File in charge of measuring the cost of the checksum verification
+A local http server (in its own process) serves a file of the requested size,
+the file is downloaded by a DownloadManager that does not hash, by the
+DownloadManager (the sha256 is computed while the file is written) and by a
+DownloadManager followed by a second read of the file to hash it, the way the
+digest would be checked after the download.
+Usage:
+    python benchmarks/checksum_benchmark.py [size_mb] [runs]
+"""
+
+import os
+import sys
+import time
+import socket
+import hashlib
+import tempfile
+import subprocess
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from services.common import DownloadManager  # noqa: E402
+
+
+class _NoDigest:
+    """ A digest that does not hash, the baseline of the measure """
+
+    def update(self, _: bytes) -> None:
+        """ Ignore the bytes """
+
+    def hexdigest(self) -> str:
+        """ Return an empty digest """
+        return ""
+
+
+class _NoHashDownloadManager(DownloadManager):
+    """ A DownloadManager that does not hash the files """
+
+    def _new_digest(self) -> any:
+        """ Return the digest that does not hash """
+        return _NoDigest()
+
+
+def _second_pass(manager: DownloadManager, url: str, filepath: str) -> None:
+    """ Download the file, then read it again to hash it """
+    manager.download(url, filepath)
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+
+
+def _get_free_port() -> int:
+    """ Return a free tcp port on the loopback interface """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(port: int, timeout: float = 10) -> None:
+    """ Wait until the http server accepts connections """
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("The http server did not start")
+
+
+def _measure(download: callable, url: str, filepath: str, runs: int) -> tuple:
+    """ Return the best (wall time, cpu time) of the runs """
+    best_wall = None
+    best_cpu = None
+    for _ in range(runs):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        download(url, filepath)
+        cpu = time.process_time() - cpu
+        wall = time.perf_counter() - wall
+        os.remove(filepath)
+        if best_wall is None or wall < best_wall:
+            best_wall = wall
+            best_cpu = cpu
+    return best_wall, best_cpu
+
+
+def main(size_mb: int = 100, runs: int = 3) -> None:
+    """ Serve a file locally and compare the download with and without hashing """
+    with tempfile.TemporaryDirectory() as folder:
+        served = os.path.join(folder, "served")
+        os.makedirs(served)
+        with open(os.path.join(served, "artifact.bin"), "wb") as file:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                file.write(block)
+        port = _get_free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "http.server", str(port),
+                "--bind", "127.0.0.1", "--directory", served
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_for_server(port)
+            url = f"http://127.0.0.1:{port}/artifact.bin"
+            target = os.path.join(folder, "downloaded.bin")
+            baseline = _NoHashDownloadManager(show_progress=False)
+            manager = DownloadManager(show_progress=False)
+            results = {
+                "no hash": _measure(baseline.download, url, target, runs),
+                "streaming sha256": _measure(manager.download, url, target, runs),
+                "second pass": _measure(
+                    lambda link, path: _second_pass(baseline, link, path),
+                    url,
+                    target,
+                    runs
+                )
+            }
+            baseline.close()
+            manager.close()
+        finally:
+            server.terminate()
+            server.wait()
+    base_wall = results["no hash"][0]
+    print(f"{size_mb} MB from a local http server, best of {runs} runs")
+    for name, (wall, cpu) in results.items():
+        print(
+            f"{name:17}: {wall * 1000:8.1f} ms, {size_mb / wall:8.1f} MB/s, "
+            f"cpu {cpu * 1000:8.1f} ms, overhead {(wall / base_wall - 1) * 100:+6.1f} %"
+        )
+
+
+if __name__ == "__main__":
+    SIZE_MB = 100
+    RUNS = 3
+    if len(sys.argv) > 1:
+        SIZE_MB = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        RUNS = int(sys.argv[2])
+    main(SIZE_MB, RUNS)
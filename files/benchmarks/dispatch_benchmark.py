@@ -0,0 +1,96 @@
+"""
+File in charge of measuring the command lookup latency of the shell
+The full command registry is loaded (with the kube_* -> kubectl_* aliases)
+and the index is compared with the option list scan done by tty_ov.
+Usage:
+    python benchmarks/dispatch_benchmark.py [repeats]
+"""
+
+import os
+import sys
+import timeit
+import contextlib
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from main import Main  # noqa: E402
+
+
+def _linear_lookup(options: list[dict], command: str) -> any:
+    """ The lookup done by tty_ov: a scan of the option list """
+    for item in options:
+        if list(item)[0] == command:
+            return item[command]
+    return None
+
+
+def _linear_complete(names: list[str], prefix: str) -> list[str]:
+    """ The completion done without an index: a filter of every name """
+    return sorted(name for name in names if name.startswith(prefix))
+
+
+def _load_registry() -> Main:
+    """ Load every command of the program and rebind the kube aliases """
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            main = Main(False)
+            main.call_injectors()
+            main.tty.process_complex_input(
+                ["rebind_kube_commands_as_kubectl"]
+            )
+    return main
+
+
+def _per_call(statement: callable, calls: int, repeats: int) -> float:
+    """ Return the best time per call in nano seconds """
+    timer = timeit.Timer(statement)
+    best = min(timer.repeat(repeat=repeats, number=1))
+    return best / calls * 1e9
+
+
+def main(repeats: int = 200) -> None:
+    """ Run the lookup and completion benchmarks """
+    program = _load_registry()
+    index = program.tty.command_index
+    options = program.tty.options
+    names = index.names()
+    all_names = index.complete("")
+    prefixes = ["kube_log", "install_", "is_", "kubectl_d", "h", "x"]
+    print(
+        f"Registry: {len(names)} commands, "
+        f"{len(all_names) - len(names)} aliases"
+    )
+    linear = _per_call(
+        lambda: [_linear_lookup(options, name) for name in names],
+        len(names),
+        repeats
+    )
+    indexed = _per_call(
+        lambda: [index.get_function(name) for name in all_names],
+        len(all_names),
+        repeats
+    )
+    print(f"lookup   option scan: {linear:9.1f} ns/call")
+    print(f"lookup   index      : {indexed:9.1f} ns/call")
+    linear = _per_call(
+        lambda: [_linear_complete(all_names, item) for item in prefixes],
+        len(prefixes),
+        repeats
+    )
+    indexed = _per_call(
+        lambda: [index.complete(item) for item in prefixes],
+        len(prefixes),
+        repeats
+    )
+    print(f"complete name filter: {linear:9.1f} ns/call")
+    print(f"complete trie       : {indexed:9.1f} ns/call")
+
+
+if __name__ == "__main__":
+    REPEATS = 200
+    if len(sys.argv) > 1:
+        REPEATS = int(sys.argv[1])
+    main(REPEATS)
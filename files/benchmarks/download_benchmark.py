@@ -0,0 +1,134 @@
+"""
+File in charge of comparing the old installer download loop with the DownloadManager
+A local http server (in its own process) serves a file of the requested size,
+the file is downloaded with the loop the installers used (a new connection,
+1 KB chunks and a flush after every chunk) and with the shared DownloadManager.
+The wall time, the throughput and the CPU time of the client are reported.
+Usage:
+    python benchmarks/download_benchmark.py [size_mb] [runs]
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import contextlib
+import subprocess
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+import requests  # noqa: E402
+from tqdm import tqdm  # noqa: E402
+from services.common import DownloadManager  # noqa: E402
+
+
+def _legacy_download(url: str, filepath: str) -> None:
+    """ The download loop copied in the installers before the DownloadManager """
+    request = requests.get(
+        url,
+        allow_redirects=True,
+        timeout=10,
+        stream=True
+    )
+    with open(filepath, "wb") as file:
+        total_length = int(request.headers.get('content-length'))
+        chunk_size = 1024
+        for chunk in tqdm(
+            request.iter_content(chunk_size=chunk_size),
+            total=(total_length // chunk_size)+1,
+            unit='KB'
+        ):
+            if chunk:
+                file.write(chunk)
+                file.flush()
+
+
+def _get_free_port() -> int:
+    """ Return a free tcp port on the loopback interface """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(port: int, timeout: float = 10) -> None:
+    """ Wait until the http server accepts connections """
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("The http server did not start")
+
+
+def _measure(download: callable, url: str, filepath: str, runs: int) -> tuple:
+    """ Return the best (wall time, cpu time) of the runs """
+    best_wall = None
+    best_cpu = None
+    for _ in range(runs):
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with contextlib.redirect_stderr(devnull):
+                wall = time.perf_counter()
+                cpu = time.process_time()
+                download(url, filepath)
+                cpu = time.process_time() - cpu
+                wall = time.perf_counter() - wall
+        os.remove(filepath)
+        if best_wall is None or wall < best_wall:
+            best_wall = wall
+            best_cpu = cpu
+    return best_wall, best_cpu
+
+
+def main(size_mb: int = 100, runs: int = 3) -> None:
+    """ Serve a file locally and compare the two download paths """
+    with tempfile.TemporaryDirectory() as folder:
+        served = os.path.join(folder, "served")
+        os.makedirs(served)
+        with open(os.path.join(served, "artifact.bin"), "wb") as file:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                file.write(block)
+        port = _get_free_port()
+        server = subprocess.Popen(
+            [
+                sys.executable, "-m", "http.server", str(port),
+                "--bind", "127.0.0.1", "--directory", served
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_for_server(port)
+            url = f"http://127.0.0.1:{port}/artifact.bin"
+            target = os.path.join(folder, "downloaded.bin")
+            manager = DownloadManager()
+            results = {
+                "legacy loop": _measure(_legacy_download, url, target, runs),
+                "DownloadManager": _measure(manager.download, url, target, runs)
+            }
+            manager.close()
+        finally:
+            server.terminate()
+            server.wait()
+    print(f"{size_mb} MB from a local http server, best of {runs} runs")
+    for name, (wall, cpu) in results.items():
+        print(
+            f"{name:16}: {wall * 1000:8.1f} ms, {size_mb / wall:8.1f} MB/s, "
+            f"cpu {cpu * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    SIZE_MB = 100
+    RUNS = 3
+    if len(sys.argv) > 1:
+        SIZE_MB = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        RUNS = int(sys.argv[2])
+    main(SIZE_MB, RUNS)
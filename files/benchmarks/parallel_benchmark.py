@@ -0,0 +1,84 @@
+"""
+File in charge of comparing serial and concurrent kubectl calls
+A fake kubectl (a python script answering 'get' after a short delay, like a
+round trip to the api server) is written in a temporary folder, then the same
+N 'kubectl get' calls are run one after the other with the ProcessRunner and
+at the same time with the AsyncCommandRunner.
+Usage:
+    python benchmarks/parallel_benchmark.py [calls] [jobs] [delay_ms]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from services.common import ProcessRunner, AsyncCommandRunner, CommandTask  # noqa: E402
+
+# The fake kubectl, it prints a pod table for the requested namespace
+FAKE_KUBECTL = """#!{python}
+import sys
+import time
+time.sleep({delay})
+namespace = sys.argv[sys.argv.index("-n") + 1] if "-n" in sys.argv else "default"
+print("NAME                     READY   STATUS    RESTARTS   AGE")
+print(f"app-{{namespace}}-5d8c7   1/1     Running   0          3d")
+"""
+
+
+def _write_fake_kubectl(folder: str, delay: float) -> str:
+    """ Write the fake kubectl in a folder and return its path """
+    path = os.path.join(folder, "kubectl")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(FAKE_KUBECTL.format(python=sys.executable, delay=delay))
+    os.chmod(path, 0o755)
+    return path
+
+
+def main(calls: int = 16, jobs: int = 8, delay_ms: float = 100) -> None:
+    """ Run the serial and concurrent measures """
+    with tempfile.TemporaryDirectory() as folder:
+        kubectl = _write_fake_kubectl(folder, delay_ms / 1000)
+        argvs = [
+            [kubectl, "get", "pods", "-n", f"namespace-{index}"]
+            for index in range(calls)
+        ]
+        runner = ProcessRunner()
+        start = time.perf_counter()
+        serial = [runner.run(argv) for argv in argvs]
+        serial_time = time.perf_counter() - start
+        parallel_runner = AsyncCommandRunner(max_jobs=jobs, stream=False)
+        start = time.perf_counter()
+        concurrent = parallel_runner.run_all(
+            [
+                CommandTask(f"get {index}", argv)
+                for index, argv in enumerate(argvs)
+            ]
+        )
+        concurrent_time = time.perf_counter() - start
+    failed = [item for item in serial + concurrent if item.ok is False]
+    print(
+        f"{calls} 'kubectl get' calls, {delay_ms:.0f} ms each, "
+        f"{jobs} concurrent jobs, {len(failed)} failed"
+    )
+    print(f"serial    : {serial_time * 1000:8.1f} ms")
+    print(f"concurrent: {concurrent_time * 1000:8.1f} ms")
+    print(f"speedup   : {serial_time / concurrent_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    CALLS = 16
+    JOBS = 8
+    DELAY_MS = 100
+    if len(sys.argv) > 1:
+        CALLS = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        JOBS = int(sys.argv[2])
+    if len(sys.argv) > 3:
+        DELAY_MS = float(sys.argv[3])
+    main(CALLS, JOBS, DELAY_MS)
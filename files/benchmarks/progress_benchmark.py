@@ -0,0 +1,74 @@
+"""
+File in charge of measuring the cost of the progress display of the downloads
+A download of the requested size is simulated chunk by chunk (without any
+network). The progress is reported by tqdm redrawn for every chunk, by tqdm
+throttled to 0.1 s and by the ProgressRenderer (counters per chunk, a line a
+few times per second), to a terminal-like stream and to a pipe.
+Usage:
+    python benchmarks/progress_benchmark.py [size_mb] [chunk_kb]
+"""
+
+import os
+import io
+import sys
+import time
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from services.common import ProgressRenderer  # noqa: E402
+
+
+class _TerminalStream(io.StringIO):
+    """ A stream that says it is a terminal """
+
+    def isatty(self) -> bool:
+        """ Pretend to be a terminal """
+        return True
+
+
+def _run_tqdm(total: int, chunk: int, stream: any, mininterval: float = 0) -> tuple:
+    """ Report every chunk to tqdm, returns (cpu time, characters written) """
+    from tqdm import tqdm
+    cpu = time.process_time()
+    with tqdm(total=total, unit="B", unit_scale=True, unit_divisor=1024, file=stream, mininterval=mininterval) as progress:
+        for _ in range(total // chunk):
+            progress.update(chunk)
+    return time.process_time() - cpu, len(stream.getvalue())
+
+
+def _run_renderer(total: int, chunk: int, stream: any) -> tuple:
+    """ Report every chunk to the renderer, returns (cpu time, characters written) """
+    cpu = time.process_time()
+    with ProgressRenderer(total=total, label="artifact.bin", stream=stream) as progress:
+        for _ in range(total // chunk):
+            progress.update(chunk)
+    return time.process_time() - cpu, len(stream.getvalue())
+
+
+def main(size_mb: int = 200, chunk_kb: int = 1) -> None:
+    """ Compare the cost of the progress displays """
+    total = size_mb * 1024 * 1024
+    chunk = chunk_kb * 1024
+    print(f"{size_mb} MB in {chunk_kb} KB chunks ({total // chunk} updates)")
+    for name, stream_type in (("terminal", _TerminalStream), ("pipe", io.StringIO)):
+        runs = (
+            ("tqdm (every chunk)", _run_tqdm),
+            ("tqdm (0.1 s)", lambda size, step, stream: _run_tqdm(size, step, stream, 0.1)),
+            ("ProgressRenderer", _run_renderer)
+        )
+        for label, run in runs:
+            cpu, written = run(total, chunk, stream_type())
+            print(f"{name:8} {label:18}: cpu {cpu * 1000:8.1f} ms, {written:9} characters written")
+
+
+if __name__ == "__main__":
+    SIZE_MB = 200
+    CHUNK_KB = 1
+    if len(sys.argv) > 1:
+        SIZE_MB = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        CHUNK_KB = int(sys.argv[2])
+    main(SIZE_MB, CHUNK_KB)
@@ -0,0 +1,163 @@
+"""
+File in charge of comparing single stream and segmented downloads
+A local http server (in its own process) serves a file with HEAD and Range
+support and caps the bandwidth of every connection, like a mirror throttling
+each client connection. The file is downloaded over one connection and split
+in segments over several connections with the DownloadManager.
+Usage:
+    python benchmarks/segmented_benchmark.py [size_mb] [cap_mb_per_s] [segments]
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import subprocess
+
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+from services.common import DownloadManager  # noqa: E402
+
+# The server run in the child interpreter: ranges, ETag and a per connection cap
+SERVER = """
+import os
+import sys
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+PATH = sys.argv[1]
+CAP = float(sys.argv[2]) * 1024 * 1024
+SIZE = os.path.getsize(PATH)
+BLOCK = 64 * 1024
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_headers(self):
+        start, end = 0, SIZE - 1
+        requested = self.headers.get("Range", "")
+        if requested != "" and self.headers.get("If-Range", '"bench"') == '"bench"':
+            first, last = requested.split("=")[1].split("-")
+            start, end = int(first), int(last or end)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{SIZE}")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", '"bench"')
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        return start, end
+
+    def do_HEAD(self):
+        self._send_headers()
+
+    def do_GET(self):
+        start, end = self._send_headers()
+        begin = time.perf_counter()
+        sent = 0
+        with open(PATH, "rb") as file:
+            file.seek(start)
+            while sent < end - start + 1:
+                block = file.read(min(BLOCK, end - start + 1 - sent))
+                self.wfile.write(block)
+                sent += len(block)
+                delay = sent / CAP - (time.perf_counter() - begin)
+                if delay > 0:
+                    time.sleep(delay)
+
+
+ThreadingHTTPServer(("127.0.0.1", int(sys.argv[3])), Handler).serve_forever()
+"""
+
+
+def _get_free_port() -> int:
+    """ Return a free tcp port on the loopback interface """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(port: int, timeout: float = 10) -> None:
+    """ Wait until the http server accepts connections """
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("The http server did not start")
+
+
+def _measure(manager: DownloadManager, url: str, filepath: str) -> float:
+    """ Return the wall time of a download """
+    start = time.perf_counter()
+    manager.download(url, filepath)
+    elapsed = time.perf_counter() - start
+    os.remove(filepath)
+    manager.close()
+    return elapsed
+
+
+def main(size_mb: int = 64, cap_mb: float = 16, segments: int = 4) -> None:
+    """ Serve a throttled file locally and compare the two download modes """
+    with tempfile.TemporaryDirectory() as folder:
+        served = os.path.join(folder, "artifact.bin")
+        with open(served, "wb") as file:
+            block = os.urandom(1024 * 1024)
+            for _ in range(size_mb):
+                file.write(block)
+        port = _get_free_port()
+        server = subprocess.Popen(
+            [sys.executable, "-c", SERVER, served, str(cap_mb), str(port)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        try:
+            _wait_for_server(port)
+            url = f"http://127.0.0.1:{port}/artifact.bin"
+            target = os.path.join(folder, "downloaded.bin")
+            results = {
+                "single stream": _measure(
+                    DownloadManager(show_progress=False, segments=1),
+                    url,
+                    target
+                ),
+                f"{segments} segments": _measure(
+                    DownloadManager(
+                        show_progress=False,
+                        segment_threshold=1024 * 1024,
+                        segments=segments
+                    ),
+                    url,
+                    target
+                )
+            }
+        finally:
+            server.terminate()
+            server.wait()
+    print(f"{size_mb} MB from a local http server capped at {cap_mb:.0f} MB/s per connection")
+    for name, elapsed in results.items():
+        print(f"{name:14}: {elapsed * 1000:8.1f} ms, {size_mb / elapsed:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    SIZE_MB = 64
+    CAP_MB = 16
+    SEGMENTS = 4
+    if len(sys.argv) > 1:
+        SIZE_MB = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        CAP_MB = float(sys.argv[2])
+    if len(sys.argv) > 3:
+        SEGMENTS = int(sys.argv[3])
+    main(SIZE_MB, CAP_MB, SEGMENTS)
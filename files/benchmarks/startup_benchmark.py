@@ -0,0 +1,120 @@
+"""
+File in charge of measuring the time and memory needed to reach the first prompt
+Each measure is done in a fresh interpreter so that the import cache is cold.
+The manifest measure is done after a first run that wrote the command manifest
+(in a temporary cache folder).
+Usage:
+    python benchmarks/startup_benchmark.py [runs]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+SRC_FOLDER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "src"
+)
+
+# The code run in the child interpreter, it prints a json line with the results
+PROBE = """
+import sys
+import json
+import time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+from main import Main
+from services.common import preload_children
+main = Main(False, {manifest!r})
+if {eager!r} is True:
+    preload_children(main.docker.docker_children.install_docker.install)
+    preload_children(
+        main.docker_compose.docker_compose_children.install_docker_compose.install
+    )
+    preload_children(main.kubernetes.kube_children.install_kubernetes)
+    preload_children(main.kubernetes.kube_children.uninstall_kubernetes)
+main.call_injectors()
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss //= 1024
+except ImportError:
+    rss = -1
+sys.__stdout__.write("\\n" + json.dumps({{
+    "seconds": elapsed,
+    "rss_kb": rss,
+    "modules": len(sys.modules)
+}}) + "\\n")
+"""
+
+
+def _run_probe(eager: bool, manifest: bool, cache_folder: str) -> dict:
+    """ Run the probe in a fresh interpreter and return the parsed results """
+    code = PROBE.format(src=SRC_FOLDER, eager=eager, manifest=manifest)
+    env = dict(os.environ)
+    env["XDG_CACHE_HOME"] = cache_folder
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+        text=True
+    )
+    last_line = result.stdout.strip().splitlines()[-1]
+    return json.loads(last_line)
+
+
+def _average(measures: list[dict], key: str) -> float:
+    """ Return the average of a key in the list of measures """
+    return sum(item[key] for item in measures) / len(measures)
+
+
+def main(runs: int = 5) -> None:
+    """ Compare the lazy start with a start that builds every installer """
+    results = {}
+    modes = (
+        ("eager", True, False),
+        ("lazy", False, False),
+        ("manifest", False, True)
+    )
+    cache_folder = tempfile.mkdtemp()
+    # ---- Write the command manifest used by the warm starts ----
+    _run_probe(False, True, cache_folder)
+    for label, eager, manifest in modes:
+        measures = [
+            _run_probe(eager, manifest, cache_folder) for _ in range(runs)
+        ]
+        results[label] = {
+            "seconds": _average(measures, "seconds"),
+            "rss_kb": _average(measures, "rss_kb"),
+            "modules": _average(measures, "modules")
+        }
+    print(f"Startup benchmark ({runs} runs each, time to first prompt)")
+    for label, data in results.items():
+        print(
+            f"{label:>8}: {data['seconds'] * 1000:8.1f} ms"
+            f" | {data['rss_kb'] / 1024:7.1f} MiB max rss"
+            f" | {data['modules']:6.0f} modules"
+        )
+    eager = results["eager"]
+    for label in ("lazy", "manifest"):
+        data = results[label]
+        print(
+            f"    gain: {(eager['seconds'] - data['seconds']) * 1000:8.1f} ms"
+            f" | {(eager['rss_kb'] - data['rss_kb']) / 1024:7.1f} MiB"
+            f" ({label})"
+        )
+
+
+if __name__ == "__main__":
+    RUNS = 5
+    if len(sys.argv) > 1:
+        RUNS = int(sys.argv[1])
+    main(RUNS)
@@ -42,7 +42,7 @@ mkdir %DEST_PATH%
 xcopy /s/e ..\%SRC_PATH% %DEST_PATH%
 cd %COMPDIR%
 echo Compiling
-pyinstaller --onefile --icon %ICON% --name %BIN_NAME% --paths %SRC_PATH% --workpath %BUILD% %SRC_FILES%
+pyinstaller --onefile --icon %ICON% --name %BIN_NAME% --paths %SRC_PATH% --collect-submodules services --workpath %BUILD% %SRC_FILES%
 echo Moving
 move dist\* ..
 cd ..
@@ -49,7 +49,7 @@ cp -r "../$SRC_PATH"/* "$DEST_PATH/"
 cd "$COMPDIR" || exit
 
 echo "Compiling"
-pyinstaller --onefile --icon="$ICON" --name="$BIN_NAME" --paths="$SRC_PATH" --workpath="$BUILD" "$SRC_FILES"
+pyinstaller --onefile --icon="$ICON" --name="$BIN_NAME" --paths="$SRC_PATH" --collect-submodules="services" --workpath="$BUILD" "$SRC_FILES"
 
 echo "Moving"
 cp -rf dist/* ..
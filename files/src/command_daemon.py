@@ -0,0 +1,246 @@
+"""
+File in charge of the daemon mode of the program
+The daemon keeps one instance of the program loaded (injectors called, tty
+ready) and runs the commands it receives on a local unix socket. The client
+forwards its arguments and streams the output back, so a command does not
+pay the interpreter and module startup anymore.
+This file only uses the standard library so that the client stays light.
+Usage:
+    python main.py --daemon[=socket_path]
+    python command_daemon.py [--socket=socket_path] <command> [args...]
+    python command_daemon.py [--socket=socket_path] --stop-daemon
+The messages are json lines:
+    client -> daemon: {"action": "run", "argv": [...], "cwd": "..."}
+                      {"action": "stop"}
+    daemon -> client: {"output": "..."} (any number) then {"status": 0}
+"""
+
+import os
+import sys
+import json
+import socket
+import threading
+import contextlib
+import socketserver
+
+SOCKET_ENV_VAR = "CONTOPSSYNC_SOCKET"
+SOCKET_NAME = "contopssync.sock"
+ERR = 84
+
+
+def get_socket_path(socket_path: str = "") -> str:
+    """ Return the path of the daemon socket
+    The order is: the given path, $CONTOPSSYNC_SOCKET, $XDG_RUNTIME_DIR and
+    finally a per user file in the temporary folder.
+    """
+    if socket_path != "":
+        return socket_path
+    socket_path = os.environ.get(SOCKET_ENV_VAR, "")
+    if socket_path != "":
+        return socket_path
+    runtime_folder = os.environ.get("XDG_RUNTIME_DIR", "")
+    if runtime_folder != "" and os.path.isdir(runtime_folder):
+        return os.path.join(runtime_folder, SOCKET_NAME)
+    user_id = os.getuid() if hasattr(os, "getuid") else os.getpid()
+    return os.path.join("/tmp", f"contopssync-{user_id}.sock")
+
+
+def _send_message(connection: socket.socket, message: dict) -> None:
+    """ Send a json line on the socket """
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+class _SocketWriter:
+    """ A text stream forwarding what is written to the client """
+
+    def __init__(self, connection: socket.socket) -> None:
+        self.connection = connection
+        self.closed = False
+
+    def write(self, string: str) -> int:
+        """ Send the text to the client (dropped if the client left) """
+        if string == "" or self.closed is True:
+            return len(string)
+        try:
+            _send_message(self.connection, {"output": string})
+        except OSError:
+            self.closed = True
+        return len(string)
+
+    def flush(self) -> None:
+        """ The text is sent as soon as it is written """
+
+    def isatty(self) -> bool:
+        """ The client is not a terminal from the point of view of the daemon """
+        return False
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """ Read one request from a client and answer it """
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError:
+            _send_message(self.connection, {"status": ERR})
+            return
+        if request.get("action") == "stop":
+            _send_message(self.connection, {"status": self.server.daemon.success})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+        status = self.server.daemon.run_command(
+            request.get("argv", []),
+            request.get("cwd", ""),
+            _SocketWriter(self.connection)
+        )
+        _send_message(self.connection, {"status": status})
+
+
+if hasattr(socketserver, "UnixStreamServer") is True:
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        """ The threaded unix socket server of the daemon """
+
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class CommandDaemon:
+    """ Run the commands received on the socket in a resident tty
+
+    The tty state (current_tty_status, help_function_child_name, the
+    working directory and the standard streams) is shared, so the commands
+    are run one at a time and this state is reset before each of them.
+    """
+
+    def __init__(self, tty: any, socket_path: str = "") -> None:
+        self.tty = tty
+        self.success = tty.success
+        self.err = tty.err
+        self.error = tty.error
+        self.socket_path = get_socket_path(socket_path)
+        self.lock = threading.Lock()
+        self.server = None
+
+    def run_command(self, argv: list[str], cwd: str, output: _SocketWriter) -> int:
+        """ Run a command in the tty and return its status """
+        with self.lock:
+            self.tty.current_tty_status = self.success
+            self.tty.help_function_child_name = "help"
+            self.tty.continue_tty_loop = True
+            try:
+                if cwd != "":
+                    os.chdir(cwd)
+                with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                    stdin = sys.stdin
+                    sys.stdin = open(os.devnull, "r", encoding="utf-8")
+                    try:
+                        self.tty.process_complex_input(argv)
+                    finally:
+                        sys.stdin.close()
+                        sys.stdin = stdin
+            except (Exception, SystemExit) as error:
+                output.write(f"Error while running the command: {error}\n")
+                self.tty.current_tty_status = self.error
+            status = self.tty.current_tty_status
+            self.tty.current_tty_status = self.success
+            self.tty.continue_tty_loop = True
+        return status
+
+    def _remove_stale_socket(self) -> bool:
+        """ Remove a socket left by a daemon that is not running, false if one is running """
+        if os.path.exists(self.socket_path) is False:
+            return True
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+            return True
+        finally:
+            client.close()
+        return False
+
+    def serve_forever(self) -> int:
+        """ Answer the clients until a stop request is received """
+        if _UnixServer is None:
+            sys.stderr.write("The daemon mode requires unix sockets\n")
+            return self.error
+        if self._remove_stale_socket() is False:
+            sys.stderr.write(f"A daemon is already listening on {self.socket_path}\n")
+            return self.error
+        self.server = _UnixServer(self.socket_path, _RequestHandler)
+        self.server.daemon = self
+        os.chmod(self.socket_path, 0o600)
+        sys.stdout.write(f"Daemon listening on {self.socket_path}\n")
+        sys.stdout.flush()
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        return self.success
+
+
+class CommandClient:
+    """ Forward a command to the daemon and stream its output """
+
+    def __init__(self, socket_path: str = "") -> None:
+        self.socket_path = get_socket_path(socket_path)
+
+    def _request(self, message: dict, output: any) -> int:
+        """ Send a request and write the output received until the status """
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.connect(self.socket_path)
+        except OSError as error:
+            client.close()
+            sys.stderr.write(
+                f"Could not reach the daemon on {self.socket_path}: {error}\n"
+            )
+            return ERR
+        with client, client.makefile("rb") as answer:
+            _send_message(client, message)
+            for line in answer:
+                data = json.loads(line.decode("utf-8"))
+                if "output" in data:
+                    output.write(data["output"])
+                    output.flush()
+                    continue
+                return data.get("status", ERR)
+        return ERR
+
+    def run(self, argv: list[str], output: any = None) -> int:
+        """ Run a command in the daemon and return its status """
+        if output is None:
+            output = sys.stdout
+        return self._request(
+            {"action": "run", "argv": argv, "cwd": os.getcwd()},
+            output
+        )
+
+    def stop(self) -> int:
+        """ Ask the daemon to stop """
+        return self._request({"action": "stop"}, sys.stdout)
+
+
+def main(argv: list[str]) -> int:
+    """ The entry point of the client """
+    socket_path = ""
+    if len(argv) > 0 and argv[0].startswith("--socket="):
+        socket_path = argv[0].split("=", 1)[1]
+        argv = argv[1:]
+    client = CommandClient(socket_path)
+    if argv == ["--stop-daemon"]:
+        return client.stop()
+    if len(argv) == 0:
+        sys.stderr.write("Usage: command_daemon.py [--socket=path] <command> [args...]\n")
+        return ERR
+    return client.run(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
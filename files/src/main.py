@@ -1,22 +1,49 @@
+import os
 import sys
-import constants as CONST
-from services import Docker, DockerCompose, Kubernetes
-from tty_ov import TTY, ColouriseOutput, AskQuestion
+from startup_profiler import StartupProfiler
+from command_daemon import CommandDaemon
+
+# ---- Started before the other imports so that they are measured ----
+STARTUP_PROFILER = None
+if __name__ == "__main__":
+    STARTUP_PROFILER = StartupProfiler.from_argv(sys.argv)
+
+import constants as CONST  # noqa: E402
+import services  # noqa: E402
+from services.common import (  # noqa: E402
+    IndexedTTY,
+    CommandManifest,
+    ManifestCommand,
+    BundleError,
+    set_active_bundle,
+    ResumeHook,
+    RESUME_FLAG
+)
+from tty_ov import ColouriseOutput, AskQuestion  # noqa: E402
+
+# The services injected in the shell: name -> (class name, display name)
+SERVICE_CLASSES = {
+    "docker": ("Docker", "Docker"),
+    "docker_compose": ("DockerCompose", "Docker Compose"),
+    "kubernetes": ("Kubernetes", "Kubernetes"),
+    "tools": ("Tools", "Tools")
+}
 
 
 class Main:
     """ The main class of the program """
 
-    def __init__(self, colourise_output: bool = True) -> None:
+    def __init__(self, colourise_output: bool = True, use_manifest: bool = True, startup_profiler: StartupProfiler = None) -> None:
         super().__init__()
         self.err = CONST.ERR
         self.error = CONST.ERROR
         self.success = CONST.SUCCESS
         self.colours = CONST.COLOURS
+        self.startup_profiler = startup_profiler
         # finish the imports
         self.co = ColouriseOutput()
         self.aq = AskQuestion()
-        self.tty = TTY(
+        self.tty = IndexedTTY(
             self.err,
             self.error,
             self.success,
@@ -26,40 +53,123 @@ class Main:
             colourise_output
         )
         self.tty.load_basics()
-        self.docker = Docker(self.success, self.err, self.error, self.tty)
-        self.docker_compose = DockerCompose(
-            self.success,
-            self.err,
-            self.error,
-            self.tty
+        # ---- The services, built on their first use ----
+        self.services = {}
+        self.injected_services = set()
+        # ---- The cached list of the service commands ----
+        self.use_manifest = use_manifest
+        self.manifest = CommandManifest(
+            os.path.dirname(os.path.abspath(__file__)),
+            salt=self._get_build_salt()
         )
-        self.kubernetes = Kubernetes(
+
+    def _get_build_salt(self) -> str:
+        """ Identify the binary of a frozen build (its sources are not on the disk) """
+        if getattr(sys, "frozen", False) is False:
+            return ""
+        try:
+            stat = os.stat(sys.executable)
+        except OSError:
+            return sys.executable
+        return f"{sys.executable}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    @property
+    def docker(self) -> any:
+        """ The Docker service """
+        return self.load_service("docker")
+
+    @property
+    def docker_compose(self) -> any:
+        """ The Docker Compose service """
+        return self.load_service("docker_compose")
+
+    @property
+    def kubernetes(self) -> any:
+        """ The Kubernetes service """
+        return self.load_service("kubernetes")
+
+    @property
+    def tools(self) -> any:
+        """ The Tools service """
+        return self.load_service("tools")
+
+    def load_service(self, name: str) -> any:
+        """ Import and build a service if it was not already done """
+        if name in self.services:
+            return self.services[name]
+        service_class = getattr(services, SERVICE_CLASSES[name][0])
+        self.services[name] = service_class(
             self.success,
             self.err,
             self.error,
             self.tty
         )
+        return self.services[name]
 
-    def call_injectors(self) -> None:
-        """ The function in charge of calling the injectors of the classes """
-        status = self.docker.injector()
+    def inject_service(self, name: str) -> int:
+        """ Inject the commands of a service in the shell """
+        status = self.load_service(name).injector()
         if status != self.success:
             self.tty.print_on_tty(
                 self.tty.error_colour,
-                "Error while injecting tty with the Docker class\n"
+                f"Error while injecting tty with the {SERVICE_CLASSES[name][1]} class\n"
             )
-        status = self.docker_compose.injector()
-        if status != self.success:
-            self.tty.print_on_tty(
-                self.tty.error_colour,
-                "Error while injecting tty with the Docker Compose class\n"
+            return status
+        self.injected_services.add(name)
+        return status
+
+    def replace_manifest_commands(self, name: str) -> int:
+        """ Replace the commands read from the manifest by the ones of the service """
+        if name in self.injected_services:
+            return self.success
+        status = self.tty.current_tty_status
+        self.tty.announce_imports = False
+        try:
+            self.inject_service(name)
+        finally:
+            self.tty.announce_imports = True
+        self.tty.current_tty_status = status
+        return self.success
+
+    def inject_manifest_commands(self, name: str, entries: list[dict]) -> int:
+        """ Fill the shell with the commands of a service read from the manifest """
+        options = []
+        for entry in entries:
+            stub = ManifestCommand(
+                self.tty,
+                entry["name"],
+                entry.get("help"),
+                lambda service=name: self.replace_manifest_commands(service)
             )
-        status = self.kubernetes.injector()
-        if status != self.success:
-            self.tty.print_on_tty(
-                self.tty.error_colour,
-                "Error while injecting tty with the Kubernetes class\n"
+            options.append(
+                {
+                    entry["name"]: stub,
+                    "desc": entry.get("desc", "")
+                }
             )
+        return self.tty.import_functions_into_shell(options)
+
+    def call_injectors(self) -> None:
+        """ The function in charge of calling the injectors of the classes """
+        content = None
+        if self.use_manifest is True:
+            content = self.manifest.load()
+        if content is not None and set(content) == set(SERVICE_CLASSES):
+            for name in SERVICE_CLASSES:
+                self.inject_manifest_commands(name, content[name])
+            return
+        content = {}
+        for name in SERVICE_CLASSES:
+            if self.inject_service(name) != self.success:
+                content = None
+                continue
+            if self.use_manifest is True and content is not None:
+                content[name] = self.manifest.describe_options(
+                    self.tty,
+                    self.services[name].options
+                )
+        if self.use_manifest is True and content is not None:
+            self.manifest.save(content)
 
     def compile_characters(self, char: str = " ", nb: int = 5) -> str:
         """ Compile a string of characters """
@@ -120,19 +230,67 @@ Output:
         self.tty.current_tty_status = self.success
         return self.success
 
+    def serve(self, socket_path: str = "") -> int:
+        """ Keep the program loaded and run the commands received on a unix socket """
+        self.call_injectors()
+        daemon = CommandDaemon(self.tty, socket_path)
+        status = daemon.serve_forever()
+        self.tty.unload_basics()
+        return status
+
+    def resume_install(self) -> int:
+        """ Run again the installation interrupted by a reboot (started at boot by the resume hook) """
+        hook = ResumeHook()
+        state = hook.get_state()
+        if state == {}:
+            print("No installation is waiting to be resumed")
+            return self.success
+        print(f"Resuming the {state['installer']} installation (reboot {state['reboots']})")
+        os.environ.update(state.get("environment", {}))
+        self.call_injectors()
+        self.tty.process_complex_input(state["command"])
+        status = self.tty.current_tty_status
+        # ---- The installer registers the hook again when it needs another reboot ----
+        if hook.get_state().get("registered_at") == state.get("registered_at"):
+            hook.unregister()
+        self.tty.unload_basics()
+        return status
+
     def main(self) -> None:
         """ The main function of the program """
         self.call_injectors()
+        if self.startup_profiler is not None:
+            self.startup_profiler.stop()
+            self.startup_profiler.write_report()
         self.add_spacing()
         status = self.tty.mainloop()
         self.tty.unload_basics()
         print()
         sys.exit(status)
 
+    def start(self, argv: list) -> None:
+        """ Run the mode asked on the command line: the daemon, a resumed installation or the shell """
+        for arg in argv:
+            if arg == "--daemon" or arg.startswith("--daemon="):
+                sys.exit(self.serve(arg.partition("=")[2]))
+            if arg == RESUME_FLAG:
+                sys.exit(self.resume_install())
+        self.main()
+
 
 if __name__ == "__main__":
     COLOURISE_OUTPUT = True
+    USE_MANIFEST = True
     if "-nc" in sys.argv or "--no-colour" in sys.argv:
         COLOURISE_OUTPUT = False
-    main = Main(COLOURISE_OUTPUT)
-    main.main()
+    if "-nm" in sys.argv or "--no-manifest" in sys.argv:
+        USE_MANIFEST = False
+    for ARG in sys.argv:
+        if ARG.startswith("--from-bundle="):
+            try:
+                set_active_bundle(ARG.partition("=")[2])
+            except BundleError as ERR:
+                print(ERR, file=sys.stderr)
+                sys.exit(CONST.ERROR)
+    main = Main(COLOURISE_OUTPUT, USE_MANIFEST, STARTUP_PROFILER)
+    main.start(sys.argv)
@@ -1,16 +1,53 @@
 """
 File in charge of grouping the sub-classes that are in charge of managing the different services
+The services are only imported when they are requested so that a start
+served from the command manifest does not import them.
 """
-from .docker import Docker
-from .docker_compose import DockerCompose
-from .kubernetes import Kubernetes
+
+import importlib
+
+__all__ = ["Docker", "DockerCompose", "Kubernetes", "Tools"]
+
+_SERVICE_MODULES = {
+    "Docker": ".docker",
+    "DockerCompose": ".docker_compose",
+    "Kubernetes": ".kubernetes",
+    "Tools": ".tools"
+}
+
+
+def _import_service(class_name: str) -> type:
+    """ Import the module containing the service class and return the class """
+    module = importlib.import_module(_SERVICE_MODULES[class_name], __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str) -> type:
+    """ Resolve the service classes on their first access """
+    if name in _SERVICE_MODULES:
+        return _import_service(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Services:
     """ The class in charge of managing the services """
 
-    def __init__(self) -> None:
-        super().__init__()
-        self.docker = Docker
-        self.docker_compose = DockerCompose
-        self.kubernetes = Kubernetes
+    @property
+    def docker(self) -> type:
+        """ The Docker service class """
+        return _import_service("Docker")
+
+    @property
+    def docker_compose(self) -> type:
+        """ The Docker Compose service class """
+        return _import_service("DockerCompose")
+
+    @property
+    def kubernetes(self) -> type:
+        """ The Kubernetes service class """
+        return _import_service("Kubernetes")
+
+    @property
+    def tools(self) -> type:
+        """ The Tools service class """
+        return _import_service("Tools")
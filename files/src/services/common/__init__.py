@@ -0,0 +1,110 @@
+"""
+File in charge of grouping the helper classes shared by the different services
+"""
+from .lazy_child import LazyChild, is_child_loaded, preload_children
+from .command_index import CommandIndex, CommandTrie
+from .indexed_tty import IndexedTTY, CommandCompleter
+from .cache_folder import get_cache_folder
+from .command_manifest import CommandManifest, ManifestCommand
+from .host_facts import HostFacts, get_host_facts
+from .tool_cache import ToolCache, get_tool_cache
+from .tool_inventory import ToolInventory, INVENTORY_TOOLS
+from .process_runner import ProcessRunner, ProcessResult
+from .async_runner import AsyncCommandRunner, CommandTask
+from .progress_renderer import ProgressRenderer, format_bytes
+from .transfer_log import TransferLog, get_transfer_log
+from .download_manager import DownloadManager, DownloadError, ChecksumError, RemoteFileChangedError, get_download_manager
+from .artifact_cache import ArtifactCache, get_artifact_cache
+from .offline_bundle import (
+    OfflineBundle,
+    BundleBuilder,
+    BundleError,
+    get_bundle_architecture,
+    set_active_bundle,
+    get_active_bundle
+)
+from .peer_server import ArtifactPeerServer, PeerSource, PEER_PORT, get_peer_server, set_peer_source, get_peer_source
+from .prefetcher import ArtifactPrefetcher, set_active_prefetcher, get_active_prefetcher
+from .release_resolver import ReleaseResolver, ReleaseError, get_release_resolver
+from .step_graph import StepGraph, InstallStep, StepGraphError
+from .step_journal import StepJournal, get_step_journal
+from .resume_hook import ResumeHook, ResumeError, RESUME_FLAG
+from .stack_plan import StackPlan, StackTarget, StackError, get_stack_targets
+from .package_manager import (
+    PackageBackend,
+    PackageManager,
+    PackageTransaction,
+    PackageManagerError,
+    get_package_backend,
+    PIP_PACKAGES
+)
+
+__all__ = [
+    "LazyChild",
+    "is_child_loaded",
+    "preload_children",
+    "CommandIndex",
+    "CommandTrie",
+    "IndexedTTY",
+    "CommandCompleter",
+    "get_cache_folder",
+    "CommandManifest",
+    "ManifestCommand",
+    "HostFacts",
+    "get_host_facts",
+    "ToolCache",
+    "get_tool_cache",
+    "ToolInventory",
+    "INVENTORY_TOOLS",
+    "ProcessRunner",
+    "ProcessResult",
+    "AsyncCommandRunner",
+    "CommandTask",
+    "ProgressRenderer",
+    "format_bytes",
+    "TransferLog",
+    "get_transfer_log",
+    "DownloadManager",
+    "DownloadError",
+    "ChecksumError",
+    "RemoteFileChangedError",
+    "get_download_manager",
+    "ArtifactCache",
+    "get_artifact_cache",
+    "OfflineBundle",
+    "BundleBuilder",
+    "BundleError",
+    "get_bundle_architecture",
+    "set_active_bundle",
+    "get_active_bundle",
+    "ArtifactPeerServer",
+    "PeerSource",
+    "PEER_PORT",
+    "get_peer_server",
+    "set_peer_source",
+    "get_peer_source",
+    "ArtifactPrefetcher",
+    "set_active_prefetcher",
+    "get_active_prefetcher",
+    "ReleaseResolver",
+    "ReleaseError",
+    "get_release_resolver",
+    "StepGraph",
+    "InstallStep",
+    "StepGraphError",
+    "StepJournal",
+    "get_step_journal",
+    "ResumeHook",
+    "ResumeError",
+    "RESUME_FLAG",
+    "StackPlan",
+    "StackTarget",
+    "StackError",
+    "get_stack_targets",
+    "PackageBackend",
+    "PackageManager",
+    "PackageTransaction",
+    "PackageManagerError",
+    "get_package_backend",
+    "PIP_PACKAGES"
+]
@@ -0,0 +1,281 @@
+"""
+File in charge of keeping the downloaded artifacts between the installs
+The artifacts (installer scripts, release files, binaries) are stored under
+~/.cache/contopssync/artifacts by the sha256 of their content, an index maps
+every url to its object with the ETag and Last-Modified sent by the server.
+A cached url is revalidated with If-None-Match / If-Modified-Since so that an
+unchanged artifact is not downloaded again, and the least recently used
+objects are evicted once the cache grows over its size limit.
+"""
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import threading
+from .cache_folder import get_cache_folder
+from .download_manager import DownloadManager, DownloadError, ChecksumError, get_download_manager
+
+ARTIFACT_CACHE_FOLDER = "artifacts"
+ARTIFACT_INDEX_FILE = "index.json"
+ARTIFACT_MAX_SIZE = 2 * 1024 * 1024 * 1024
+ARTIFACT_MAX_SIZE_ENV = "CONTOPSSYNC_ARTIFACT_CACHE_MB"
+
+
+class ArtifactCache:
+    """ A content addressed cache of the downloaded artifacts """
+
+    def __init__(self, cache_folder: str = "", max_size: int = 0) -> None:
+        self.cache_folder = cache_folder
+        if self.cache_folder == "":
+            self.cache_folder = get_cache_folder(ARTIFACT_CACHE_FOLDER, create=False)
+        self.index_file = os.path.join(self.cache_folder, ARTIFACT_INDEX_FILE)
+        self.max_size = max_size
+        if self.max_size <= 0:
+            self.max_size = ARTIFACT_MAX_SIZE
+            value = os.environ.get(ARTIFACT_MAX_SIZE_ENV, "")
+            if value.isdigit() is True:
+                self.max_size = int(value) * 1024 * 1024
+        self.lock = threading.RLock()
+
+    def get_object_path(self, sha256: str) -> str:
+        """ Return the path of the object holding a content """
+        return os.path.join(self.cache_folder, "objects", sha256[:2], sha256)
+
+    def load_index(self) -> dict:
+        """ Return the index: url -> {sha256, size, etag, last_modified, fetched_at, last_used} """
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(content, dict) is False:
+            return {}
+        return content
+
+    def save_index(self, index: dict) -> None:
+        """ Write the index to the disk """
+        tmp_file = f"{self.index_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(index, file, indent=4)
+            os.replace(tmp_file, self.index_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _copy_object(self, sha256: str, filepath: str) -> None:
+        """ Copy a cached object to filepath (the file only appears once complete) """
+        folder = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(folder, exist_ok=True)
+        tmp_file = f"{filepath}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            shutil.copyfile(self.get_object_path(sha256), tmp_file)
+            os.replace(tmp_file, filepath)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def fetch(self, url: str, filepath: str, manager: DownloadManager = None, expected_sha256: str = "", source_url: str = "") -> dict:
+        """ Put the artifact of url in filepath, downloading it only if it changed
+        Returns the index entry of the url with a "source" key: "network" when the
+        content was downloaded, "cache" when the server confirmed the cached copy
+        and "offline" when the server could not be reached. With expected_sha256,
+        a cached copy with another digest is downloaded again and ChecksumError is
+        raised if the content still does not match. source_url downloads the
+        content of url from another place (a peer node): it is always fetched and
+        a failure is raised. An empty filepath only fills the cache.
+        """
+        if manager is None:
+            manager = get_download_manager()
+        expected_sha256 = expected_sha256.strip().lower()
+        entry, previous_sha256 = self._get_cached_entry(url, expected_sha256)
+        if source_url != "":
+            entry = None
+        else:
+            source_url = url
+        download_file = os.path.join(
+            self.cache_folder,
+            "downloads",
+            hashlib.sha256(url.encode("utf-8")).hexdigest()
+        )
+        source = "network"
+        try:
+            result = manager.fetch(
+                source_url,
+                download_file,
+                headers=self._get_validators(entry),
+                expected_sha256=expected_sha256
+            )
+        except ChecksumError:
+            raise
+        except DownloadError:
+            if entry is None:
+                raise
+            result = None
+            source = "offline"
+        if result is not None and result["status"] == 304:
+            source = "cache"
+            entry["etag"] = result["etag"] or entry.get("etag", "")
+            entry["last_modified"] = result["last_modified"] or entry.get("last_modified", "")
+        elif result is not None:
+            entry = self._store_download(download_file, result, source_url == url)
+        entry["last_used"] = time.time()
+        if filepath != "":
+            self._copy_object(entry["sha256"], filepath)
+        self._save_entry(url, entry, previous_sha256)
+        return dict(entry, source=source)
+
+    def _get_cached_entry(self, url: str, expected_sha256: str) -> tuple:
+        """ Return (the usable cached entry of url or None, the digest cached for it before) """
+        with self.lock:
+            entry = self.load_index().get(url)
+        previous_sha256 = entry["sha256"] if entry is not None else ""
+        if entry is not None and os.path.isfile(self.get_object_path(entry["sha256"])) is False:
+            entry = None
+        if entry is not None and expected_sha256 not in ("", entry["sha256"]):
+            entry = None
+        return entry, previous_sha256
+
+    def _get_validators(self, entry: dict) -> dict:
+        """ Return the headers asking the server to only send the content if it changed since entry """
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.get("etag", "") != "":
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified", "") != "":
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _store_download(self, download_file: str, result: dict, from_upstream: bool) -> dict:
+        """ Move a downloaded file to the objects, returns its new index entry """
+        object_path = self.get_object_path(result["sha256"])
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        os.replace(download_file, object_path)
+        entry = {
+            "sha256": result["sha256"],
+            "size": result["size"],
+            "etag": result["etag"],
+            "last_modified": result["last_modified"],
+            "fetched_at": time.time()
+        }
+        if from_upstream is False:
+            # ---- The validators of the peer do not apply to the upstream server ----
+            entry["etag"] = ""
+            entry["last_modified"] = ""
+        return entry
+
+    def _save_entry(self, url: str, entry: dict, previous_sha256: str) -> None:
+        """ Record the entry of url, evict the cache and drop the object it no longer uses """
+        with self.lock:
+            index = self.load_index()
+            index[url] = entry
+            self.evict(index, keep=entry["sha256"])
+            self.save_index(index)
+            still_used = set(item["sha256"] for item in index.values())
+            if previous_sha256 != "" and previous_sha256 not in still_used:
+                self._remove_object(previous_sha256)
+
+    def restore(self, url: str, filepath: str) -> dict:
+        """ Copy the cached artifact of url to filepath without asking the server, returns its entry (None if not cached) """
+        with self.lock:
+            index = self.load_index()
+            entry = index.get(url)
+            if entry is None or os.path.isfile(self.get_object_path(entry["sha256"])) is False:
+                return None
+            entry["last_used"] = time.time()
+            self.save_index(index)
+        self._copy_object(entry["sha256"], filepath)
+        return dict(entry, source="cache")
+
+    def evict(self, index: dict, keep: str = "") -> list[str]:
+        """ Drop the least recently used objects until the cache fits in max_size
+        The index is updated in place, the object keep is never evicted.
+        Returns the urls that were removed.
+        """
+        objects = {}
+        for url, entry in index.items():
+            item = objects.setdefault(
+                entry["sha256"],
+                {"size": entry.get("size", 0), "last_used": 0, "urls": []}
+            )
+            item["last_used"] = max(item["last_used"], entry.get("last_used", 0))
+            item["urls"].append(url)
+        total = sum(item["size"] for item in objects.values())
+        removed = []
+        for sha256, item in sorted(objects.items(), key=lambda pair: pair[1]["last_used"]):
+            if total <= self.max_size:
+                break
+            if sha256 == keep:
+                continue
+            self._remove_object(sha256)
+            for url in item["urls"]:
+                index.pop(url, None)
+                removed.append(url)
+            total -= item["size"]
+        return removed
+
+    def _remove_object(self, sha256: str) -> None:
+        """ Remove an object from the disk """
+        try:
+            os.remove(self.get_object_path(sha256))
+        except OSError:
+            pass
+
+    def list_entries(self) -> list[dict]:
+        """ Return the cached artifacts, the most recently used first """
+        with self.lock:
+            index = self.load_index()
+        entries = [dict(entry, url=url) for url, entry in index.items()]
+        entries.sort(key=lambda entry: entry.get("last_used", 0), reverse=True)
+        return entries
+
+    def get_total_size(self) -> int:
+        """ Return the size of the cached objects (an object shared by several urls counts once) """
+        sizes = {}
+        for entry in self.list_entries():
+            sizes[entry["sha256"]] = entry.get("size", 0)
+        return sum(sizes.values())
+
+    def purge(self, selector: str = "") -> list[str]:
+        """ Remove the artifacts whose url or sha256 starts with selector (all of them if empty)
+        Returns the urls that were removed.
+        """
+        with self.lock:
+            index = self.load_index()
+            removed = [
+                url for url, entry in index.items()
+                if selector == "" or url.startswith(selector) or entry["sha256"].startswith(selector)
+            ]
+            for url in removed:
+                index.pop(url)
+            still_used = set(entry["sha256"] for entry in index.values())
+            objects_folder = os.path.join(self.cache_folder, "objects")
+            if os.path.isdir(objects_folder) is True:
+                for _, _, files in os.walk(objects_folder):
+                    for name in files:
+                        if name not in still_used:
+                            self._remove_object(name)
+            if selector == "":
+                # ---- The interrupted downloads kept to be resumed ----
+                shutil.rmtree(
+                    os.path.join(self.cache_folder, "downloads"),
+                    ignore_errors=True
+                )
+            self.save_index(index)
+        return removed
+
+
+# The artifact cache shared by the installers
+_ARTIFACT_CACHE = None
+
+
+def get_artifact_cache() -> ArtifactCache:
+    """ Return the artifact cache shared by the installers """
+    global _ARTIFACT_CACHE
+    if _ARTIFACT_CACHE is None:
+        _ARTIFACT_CACHE = ArtifactCache()
+    return _ARTIFACT_CACHE
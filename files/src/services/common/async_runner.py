@@ -0,0 +1,151 @@
+"""
+File in charge of running independent commands at the same time
+The commands are argv lists started with asyncio (no shell), at most
+max_jobs of them run at once. Their output is captured and printed line by
+line with the name of the command in front of every line, and the statuses
+are folded into the success / error codes used by the TTY. The sudo
+password is asked once, before the commands start: the admin commands then
+run with sudo -n so that their prompts never interleave on the terminal.
+"""
+
+import sys
+import time
+import asyncio
+import subprocess
+from .process_runner import ProcessRunner, ProcessResult, PROCESS_NOT_FOUND, PROCESS_TIMED_OUT
+
+ASYNC_MAX_JOBS = 4
+
+
+class CommandTask:
+    """ A command to run with the AsyncCommandRunner """
+
+    def __init__(self, name: str, argv: list, as_admin: bool = False, timeout: float = None) -> None:
+        self.name = name
+        self.argv = [str(item) for item in argv]
+        self.as_admin = as_admin
+        self.timeout = timeout
+
+
+class AsyncCommandRunner:
+    """ Run several commands concurrently and multiplex their output """
+
+    def __init__(self, success: int = 0, error: int = 84, max_jobs: int = ASYNC_MAX_JOBS, stream: bool = True) -> None:
+        self.success = success
+        self.error = error
+        self.max_jobs = max(1, max_jobs)
+        self.stream = stream
+        self.admin_prefix = ProcessRunner().get_admin_prefix()
+
+    def _write_line(self, output, name: str, line: str) -> None:
+        """ Print a line of a command with the name of the command in front """
+        if self.stream is False:
+            return
+        if line.endswith("\n") is False:
+            line += "\n"
+        output.write(f"[{name}] {line}")
+        output.flush()
+
+    async def _pump(self, reader: asyncio.StreamReader, buffer: list, output, name: str) -> None:
+        """ Read a stream line by line, store the lines and print them """
+        while True:
+            line = await reader.readline()
+            if line == b"":
+                break
+            text = line.decode("utf-8", errors="replace")
+            buffer.append(text)
+            self._write_line(output, name, text)
+
+    def validate_admin(self) -> bool:
+        """ Ask for the sudo password once (nothing to do as root), returns False when it was refused """
+        if self.admin_prefix == []:
+            return True
+        try:
+            return subprocess.run(self.admin_prefix + ["-v"], check=False).returncode == 0
+        except OSError:
+            return False
+
+    async def run_task(self, task: CommandTask, semaphore: asyncio.Semaphore, admin_ready: bool = True) -> ProcessResult:
+        """ Run a task once a slot of the semaphore is free """
+        argv = task.argv
+        if task.as_admin is True and self.admin_prefix != []:
+            # ---- Never prompt: the credentials were validated before the tasks started ----
+            argv = self.admin_prefix + ["-n"] + argv
+            if admin_ready is False:
+                self._write_line(sys.stderr, task.name, "not run: sudo refused the credentials")
+                return ProcessResult(argv, PROCESS_NOT_FOUND, stderr="sudo refused the credentials\n")
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+            except OSError as error:
+                self._write_line(sys.stderr, task.name, str(error))
+                return ProcessResult(
+                    argv,
+                    PROCESS_NOT_FOUND,
+                    stderr=f"{error}\n",
+                    duration=time.perf_counter() - start
+                )
+            stdout = []
+            stderr = []
+            pumps = asyncio.gather(
+                self._pump(process.stdout, stdout, sys.stdout, task.name),
+                self._pump(process.stderr, stderr, sys.stderr, task.name)
+            )
+            timed_out = False
+            try:
+                returncode = await asyncio.wait_for(process.wait(), task.timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                process.kill()
+                await process.wait()
+                returncode = PROCESS_TIMED_OUT
+            try:
+                await asyncio.wait_for(pumps, 1 if timed_out is True else None)
+            except asyncio.TimeoutError:
+                pass
+            return ProcessResult(
+                argv,
+                returncode,
+                stdout="".join(stdout),
+                stderr="".join(stderr),
+                duration=time.perf_counter() - start,
+                timed_out=timed_out
+            )
+
+    async def run_all_async(self, tasks: list[CommandTask], max_jobs: int = 0, admin_ready: bool = True) -> list[ProcessResult]:
+        """ Run the tasks concurrently, the results keep the order of the tasks """
+        semaphore = asyncio.Semaphore(max_jobs if max_jobs > 0 else self.max_jobs)
+        return list(
+            await asyncio.gather(
+                *[self.run_task(task, semaphore, admin_ready) for task in tasks]
+            )
+        )
+
+    def run_all(self, tasks: list[CommandTask], max_jobs: int = 0) -> list[ProcessResult]:
+        """ Run the tasks concurrently from synchronous code """
+        if len(tasks) == 0:
+            return []
+        admin_ready = True
+        if any(task.as_admin is True for task in tasks):
+            admin_ready = self.validate_admin()
+        return asyncio.run(self.run_all_async(tasks, max_jobs, admin_ready))
+
+    def get_status(self, results: list[ProcessResult]) -> int:
+        """ Return success if every command succeeded, error otherwise """
+        for result in results:
+            if result.ok is False:
+                return self.error
+        return self.success
+
+    def run_on_tty(self, tty, tasks: list[CommandTask], max_jobs: int = 0) -> int:
+        """ Run the tasks and store the aggregated status in the tty """
+        results = self.run_all(tasks, max_jobs)
+        status = self.get_status(results)
+        tty.current_tty_status = status
+        return status
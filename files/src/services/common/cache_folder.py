@@ -0,0 +1,22 @@
+"""
+File in charge of locating the folder in which the program caches its data
+"""
+
+import os
+
+CACHE_FOLDER_NAME = "contopssync"
+
+
+def get_cache_folder(sub_folder: str = "", create: bool = True) -> str:
+    """ Return the cache folder of the program (~/.cache/contopssync by default)
+    The XDG_CACHE_HOME environement variable is honoured when it is set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME", "")
+    if base == "":
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    folder = os.path.join(base, CACHE_FOLDER_NAME)
+    if sub_folder != "":
+        folder = os.path.join(folder, sub_folder)
+    if create is True:
+        os.makedirs(folder, exist_ok=True)
+    return folder
@@ -0,0 +1,176 @@
+"""
+File in charge of indexing the commands available in the shell
+The index offers a constant time lookup by name for the dispatch and a
+prefix tree used for the completion and the filtered help listings.
+"""
+
+
+class TrieNode:
+    """ A node of the command prefix tree """
+
+    __slots__ = ("children", "names")
+
+    def __init__(self) -> None:
+        self.children = {}
+        # ---- Every name stored below this node (completion in O(prefix)) ----
+        self.names = set()
+
+
+class CommandTrie:
+    """ A prefix tree containing the command names """
+
+    def __init__(self) -> None:
+        self.root = TrieNode()
+
+    def insert(self, name: str) -> None:
+        """ Add a name to the tree """
+        node = self.root
+        node.names.add(name)
+        for char in name:
+            if char not in node.children:
+                node.children[char] = TrieNode()
+            node = node.children[char]
+            node.names.add(name)
+
+    def remove(self, name: str) -> bool:
+        """ Remove a name from the tree, returns false if it was not present """
+        if name not in self.root.names:
+            return False
+        node = self.root
+        node.names.discard(name)
+        for char in name:
+            child = node.children[char]
+            child.names.discard(name)
+            if len(child.names) == 0:
+                node.children.pop(char)
+                break
+            node = child
+        return True
+
+    def starting_with(self, prefix: str) -> list[str]:
+        """ Return the sorted names starting with the prefix """
+        node = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return sorted(node.names)
+
+    def clear(self) -> None:
+        """ Remove every name from the tree """
+        self.root = TrieNode()
+
+
+class CommandIndex:
+    """ The index of the shell commands and of their aliases
+
+    The commands are stored in the same format as the tty options:
+        {"command_name": function, "desc": "description"}
+    The names are stored in lower case because the tty lower cases the input.
+    An alias points to the entry of its command, it is never duplicated.
+    """
+
+    def __init__(self, description_token: str = "desc") -> None:
+        self.description_token = description_token
+        self.commands = {}
+        self.aliases = {}
+        self.trie = CommandTrie()
+
+    def get_option_name(self, option: dict) -> str:
+        """ Return the name of the command contained in a tty option """
+        for key in option:
+            if key != self.description_token:
+                return key
+        return ""
+
+    def add(self, option: dict) -> str:
+        """ Index a tty option, returns the name under which it was saved """
+        name = self.get_option_name(option).lower()
+        if name == "":
+            return name
+        if name in self.aliases:
+            self.aliases.pop(name)
+        if name not in self.commands:
+            self.trie.insert(name)
+        self.commands[name] = option
+        return name
+
+    def add_alias(self, alias: str, name: str) -> bool:
+        """ Make alias resolve to the command name, returns false if it is not possible """
+        alias = alias.lower()
+        name = self.aliases.get(name.lower(), name.lower())
+        if name not in self.commands or alias in self.commands:
+            return False
+        if alias not in self.aliases:
+            self.trie.insert(alias)
+        self.aliases[alias] = name
+        return True
+
+    def remove(self, name: str) -> bool:
+        """ Remove a command (and its aliases) or a single alias from the index """
+        name = name.lower()
+        if name in self.aliases:
+            self.aliases.pop(name)
+            self.trie.remove(name)
+            return True
+        if name not in self.commands:
+            return False
+        self.commands.pop(name)
+        self.trie.remove(name)
+        for alias in self.get_aliases(name):
+            self.aliases.pop(alias)
+            self.trie.remove(alias)
+        return True
+
+    def get_aliases(self, name: str) -> list[str]:
+        """ Return the aliases pointing to a command """
+        return [alias for alias, target in self.aliases.items() if target == name]
+
+    def resolve_name(self, name: str) -> str:
+        """ Return the name of the command behind a name or an alias ("" if unknown) """
+        name = name.lower()
+        if name in self.commands:
+            return name
+        return self.aliases.get(name, "")
+
+    def resolve(self, name: str) -> dict:
+        """ Return the tty option behind a name or an alias (None if unknown) """
+        name = name.lower()
+        option = self.commands.get(name)
+        if option is None and name in self.aliases:
+            option = self.commands.get(self.aliases[name])
+        return option
+
+    def get_function(self, name: str) -> any:
+        """ Return the function bound to a name or an alias (None if unknown) """
+        option = self.resolve(name)
+        if option is None:
+            return None
+        return option[self.get_option_name(option)]
+
+    def get_description(self, name: str) -> str:
+        """ Return the description of a command or an alias """
+        option = self.resolve(name)
+        if option is None:
+            return ""
+        return option.get(self.description_token, "")
+
+    def complete(self, prefix: str) -> list[str]:
+        """ Return the commands and aliases starting with the prefix """
+        return self.trie.starting_with(prefix.lower())
+
+    def names(self) -> list[str]:
+        """ Return the command names in their registration order """
+        return list(self.commands)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve_name(name) != ""
+
+    def __len__(self) -> int:
+        return len(self.commands) + len(self.aliases)
+
+    def clear(self) -> None:
+        """ Remove every command and alias from the index """
+        self.commands = {}
+        self.aliases = {}
+        self.trie.clear()
@@ -0,0 +1,176 @@
+"""
+File in charge of the on disk manifest of the shell commands
+The manifest stores the name, description, help text and owning module of
+every service command. It is keyed on the modification time and size of the
+source files so that a warm start can fill the shell without importing the
+services: a service is only imported when one of its commands is dispatched.
+"""
+
+import os
+import json
+import hashlib
+import contextlib
+from .cache_folder import get_cache_folder
+
+
+class ManifestCommand:
+    """ A placeholder for a service command that was read from the manifest """
+
+    def __init__(self, tty, name: str, help_text: str, load_service: callable) -> None:
+        self.tty = tty
+        self.name = name
+        self.help_text = help_text
+        self.load_service = load_service
+
+    def __call__(self, args: list) -> int:
+        """ Answer the help from the manifest, otherwise load the service and run the command """
+        if self.tty.help_function_child_name == self.name.lower() and self.help_text is not None:
+            self.tty.function_help(self.name, self.help_text)
+            self.tty.current_tty_status = self.tty.success
+            return self.tty.success
+        self.load_service()
+        function = self.tty.command_index.get_function(self.name)
+        if function is None or function is self:
+            self.tty.print_on_tty(
+                self.tty.error_colour,
+                f"Invalid option: {self.name}\n"
+            )
+            self.tty.current_tty_status = self.tty.err
+            return self.tty.err
+        return function(args)
+
+
+class CommandManifest:
+    """ Read, write and validate the command manifest """
+
+    def __init__(self, source_folder: str, manifest_file: str = "", salt: str = "") -> None:
+        self.source_folder = os.path.abspath(source_folder)
+        self.manifest_file = manifest_file
+        # ---- Extra key of the fingerprint (ex: the binary of a frozen build) ----
+        self.salt = salt
+        if self.manifest_file == "":
+            self.manifest_file = os.path.join(
+                get_cache_folder(create=False),
+                "command_manifest.json"
+            )
+        self.format_version = 1
+        self.source_extension = ".py"
+        self.ignored_folders = ("__pycache__",)
+        self.help_attribute = "help_function_child_name"
+
+    def compute_fingerprint(self) -> str:
+        """ Return a hash of the path, modification time and size of the source files """
+        entries = []
+        for root, folders, files in os.walk(self.source_folder):
+            folders[:] = [i for i in folders if i not in self.ignored_folders]
+            for file in files:
+                if file.endswith(self.source_extension) is False:
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                relative_path = os.path.relpath(path, self.source_folder)
+                entries.append(
+                    f"{relative_path}:{stat.st_mtime_ns}:{stat.st_size}"
+                )
+        entries.sort()
+        entries.insert(0, f"format:{self.format_version}:{self.salt}")
+        return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+    def load(self) -> dict:
+        """ Return the commands of each service (None if the manifest is missing or outdated) """
+        try:
+            with open(self.manifest_file, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if isinstance(content, dict) is False:
+            return None
+        if content.get("fingerprint") != self.compute_fingerprint():
+            return None
+        services = content.get("services")
+        if isinstance(services, dict) is False:
+            return None
+        return services
+
+    def save(self, services: dict) -> bool:
+        """ Write the manifest atomically, returns false if it could not be written """
+        content = {
+            "version": self.format_version,
+            "fingerprint": self.compute_fingerprint(),
+            "services": services
+        }
+        tmp_file = f"{self.manifest_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.manifest_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(content, file)
+            os.replace(tmp_file, self.manifest_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            return False
+        return True
+
+    def clear(self) -> bool:
+        """ Remove the manifest, returns false if there was nothing to remove """
+        if os.path.isfile(self.manifest_file) is False:
+            return False
+        os.remove(self.manifest_file)
+        return True
+
+    def declares_help(self, function: callable) -> bool:
+        """ Return True when a command has a help branch (it reads help_function_child_name) """
+        code = getattr(getattr(function, "__func__", function), "__code__", None)
+        if code is None:
+            return False
+        return self.help_attribute in code.co_names
+
+    def record_help(self, tty, names: list[str]) -> dict:
+        """ Call the commands declaring a help branch in help mode and return the recorded help texts
+        A command without a help branch would run for real, it is never called.
+        """
+        recorder = {}
+        status = tty.current_tty_status
+        tty.help_recorder = recorder
+        try:
+            with open(os.devnull, "w", encoding="utf-8") as devnull:
+                with contextlib.redirect_stdout(devnull):
+                    for name in names:
+                        function = tty.command_index.get_function(name)
+                        if self.declares_help(function) is False:
+                            continue
+                        tty.help_function_child_name = name.lower()
+                        try:
+                            function([])
+                        except Exception:
+                            continue
+        finally:
+            tty.help_recorder = None
+            tty.help_function_child_name = "help"
+            tty.current_tty_status = status
+        return recorder
+
+    def describe_options(self, tty, options: list[dict]) -> list[dict]:
+        """ Convert the options of a service into manifest entries """
+        index = tty.command_index
+        names = [index.get_option_name(option) for option in options]
+        help_texts = self.record_help(tty, names)
+        entries = []
+        for name, option in zip(names, options):
+            function = option[name]
+            owner = getattr(function, "__self__", function)
+            module = getattr(owner, "__module__", "")
+            if module == "":
+                module = type(owner).__module__
+            entries.append(
+                {
+                    "name": name,
+                    "desc": option.get(index.description_token, ""),
+                    "help": help_texts.get(name.lower()),
+                    "module": module
+                }
+            )
+        return entries
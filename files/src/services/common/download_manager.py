@@ -0,0 +1,778 @@
+"""
+File in charge of downloading the files needed by the installers
+Every installer goes through the same pooled HTTP session, so the connections
+to a host are reused, and the same retry and timeout policy applies to all of
+them. The body is written in chunks sized after the file (without flushing
+every chunk) to a .part file that is renamed once it is complete, an
+interrupted transfer keeps its .part file and is resumed with a Range request.
+Large files are split in segments downloaded over several connections into a
+preallocated file, with one progress line for the whole file (redrawn a few
+times per second, see progress_renderer). The sha256 of the content is
+computed while it is written and can be checked against a published or pinned
+digest. Every completed download is added to the transfer log of the session.
+requests is only imported when the first download starts.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from .progress_renderer import ProgressRenderer
+from .transfer_log import TransferLog, get_transfer_log
+
+DOWNLOAD_CONNECT_TIMEOUT = 10
+DOWNLOAD_READ_TIMEOUT = 60
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_BACKOFF = 0.5
+DOWNLOAD_RETRY_STATUSES = (429, 500, 502, 503, 504)
+DOWNLOAD_POOL_SIZE = 8
+# ---- Files above the threshold are fetched as byte ranges over several connections ----
+SEGMENT_THRESHOLD = 16 * 1024 * 1024
+SEGMENT_COUNT = 4
+# ---- A json file mapping urls to the sha256 they must have ----
+PINNED_DIGESTS_ENV = "CONTOPSSYNC_PINNED_SHA256"
+# ---- Chunk sizes: about 1/256 of the file, kept between the bounds ----
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
+
+
+class DownloadError(Exception):
+    """ Raised when a file could not be downloaded """
+
+
+class ChecksumError(DownloadError):
+    """ Raised when the sha256 of a downloaded file is not the expected one """
+
+
+class RemoteFileChangedError(DownloadError):
+    """ Raised when the remote file changed since the partial download started (If-Range mismatch) """
+
+
+class _OrderedHasher(threading.Thread):
+    """ Hash a segmented file in order while its segments are being downloaded
+    The bytes are hashed as soon as every byte before them arrived, so that the
+    digest is ready when the last segment ends instead of after a second pass.
+    """
+
+    def __init__(self, filepath: str, segments: list, digest: any) -> None:
+        super().__init__(daemon=True)
+        self.filepath = filepath
+        self.segments = segments
+        self.digest = digest
+        self.position = 0
+        self.finished = False
+        self.condition = threading.Condition()
+
+    def get_ready_end(self) -> int:
+        """ Return the end of the bytes that arrived without a gap """
+        end = 0
+        for start, last, position in self.segments:
+            if start != end:
+                break
+            end = position
+            if position <= last:
+                break
+        return end
+
+    def notify(self) -> None:
+        """ Wake the hasher up after a write """
+        with self.condition:
+            self.condition.notify()
+
+    def finish(self) -> None:
+        """ Hash what is left and stop """
+        with self.condition:
+            self.finished = True
+            self.condition.notify()
+        self.join()
+
+    def run(self) -> None:
+        """ Hash the bytes in order until the end of the file """
+        # ---- Unbuffered: a read ahead would keep bytes not written yet ----
+        with open(self.filepath, "rb", buffering=0) as file:
+            while True:
+                with self.condition:
+                    while self.finished is False and self.get_ready_end() <= self.position:
+                        self.condition.wait(0.5)
+                    end = self.get_ready_end()
+                    finished = self.finished
+                file.seek(self.position)
+                while self.position < end:
+                    chunk = file.read(min(MAX_CHUNK_SIZE, end - self.position))
+                    if chunk == b"":
+                        break
+                    self.digest.update(chunk)
+                    self.position += len(chunk)
+                if finished is True:
+                    return
+
+
+class DownloadManager:
+    """ Download files through a shared session with one retry policy """
+
+    def __init__(self, connect_timeout: float = DOWNLOAD_CONNECT_TIMEOUT, read_timeout: float = DOWNLOAD_READ_TIMEOUT, retries: int = DOWNLOAD_RETRIES, backoff: float = DOWNLOAD_BACKOFF, show_progress: bool = True, segment_threshold: int = SEGMENT_THRESHOLD, segments: int = SEGMENT_COUNT, transfer_log: TransferLog = None) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.show_progress = show_progress
+        self.segment_threshold = segment_threshold
+        self.segments = max(1, min(segments, DOWNLOAD_POOL_SIZE))
+        self.transfer_log = transfer_log
+        if self.transfer_log is None:
+            self.transfer_log = get_transfer_log()
+        self.session = None
+        self.lock = threading.Lock()
+        self.path_locks = {}
+
+    def get_session(self) -> any:
+        """ Return the pooled session (created on the first call) """
+        with self.lock:
+            if self.session is not None:
+                return self.session
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            retry = Retry(
+                total=self.retries,
+                connect=self.retries,
+                read=self.retries,
+                status=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=DOWNLOAD_RETRY_STATUSES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=DOWNLOAD_POOL_SIZE,
+                pool_maxsize=DOWNLOAD_POOL_SIZE,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self.session = session
+            return session
+
+    def get_chunk_size(self, total_length: int) -> int:
+        """ Return the chunk size to use for a file of total_length bytes (0 if unknown) """
+        if total_length <= 0:
+            return MIN_CHUNK_SIZE
+        return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, total_length // 256))
+
+    def _get_temporary_path(self, filepath: str) -> str:
+        """ Return the path the file is written to before its rename
+        The path is stable so that an interrupted download can be resumed.
+        """
+        return f"{filepath}.part"
+
+    def _get_path_lock(self, filepath: str) -> threading.Lock:
+        """ Return the lock serialising the downloads to a path """
+        with self.lock:
+            return self.path_locks.setdefault(os.path.abspath(filepath), threading.Lock())
+
+    def _load_partial(self, tmp_file: str, url: str) -> dict:
+        """ Return the description of a resumable partial file ({} if there is none) """
+        try:
+            size = os.path.getsize(tmp_file)
+            with open(f"{tmp_file}.json", "r", encoding="utf-8") as file:
+                meta = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(meta, dict) is False or meta.get("url") != url or size <= 0:
+            return {}
+        validator = meta.get("etag", "") or meta.get("last_modified", "")
+        if validator == "" or meta.get("etag", "").startswith("W/") is True:
+            return {}
+        meta["size"] = size
+        meta["validator"] = validator
+        return meta
+
+    def _save_partial(self, tmp_file: str, meta: dict) -> None:
+        """ Describe a partial file so that a later call can resume it """
+        try:
+            with open(f"{tmp_file}.json", "w", encoding="utf-8", newline="\n") as file:
+                json.dump(meta, file)
+        except OSError:
+            pass
+
+    def _remove_partial(self, tmp_file: str) -> None:
+        """ Remove a partial file and its description """
+        for path in (tmp_file, f"{tmp_file}.json"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _new_digest(self) -> any:
+        """ Return the hash computed while the files are written """
+        return hashlib.sha256()
+
+    def _hash_file(self, filepath: str, digest: any) -> None:
+        """ Feed the content of a file to a hash """
+        with open(filepath, "rb") as file:
+            for chunk in iter(lambda: file.read(MAX_CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+    def _get_range_start(self, response: any) -> tuple:
+        """ Return the first byte and the full size announced by a 206 answer (-1 if unknown) """
+        content_range = response.headers.get("content-range", "")
+        try:
+            unit, value = content_range.split(" ", 1)
+            span, total = value.split("/", 1)
+            start = int(span.split("-", 1)[0])
+            total = int(total) if total != "*" else -1
+        except ValueError:
+            return -1, -1
+        if unit != "bytes":
+            return -1, -1
+        return start, total
+
+    def _get_label(self, url: str) -> str:
+        """ Return the name of the file of url, used to label its progress line """
+        path = urlsplit(url).path.rstrip("/")
+        return path.rsplit("/", 1)[-1] or urlsplit(url).netloc
+
+    def _get_pool_counters(self, session: any, url: str) -> tuple:
+        """ Return the (connections opened, requests sent) by the connection pools of the host of url """
+        host = urlsplit(url).hostname or ""
+        connections = 0
+        sent = 0
+        try:
+            pools = session.get_adapter(url).poolmanager.pools
+            for key in pools.keys():
+                if key.key_host == host:
+                    pool = pools[key]
+                    connections += pool.num_connections
+                    sent += pool.num_requests
+        except (AttributeError, KeyError, ValueError):
+            pass
+        return connections, sent
+
+    def _record_transfer(self, session: any, url: str, result: dict, started: float, counters: tuple) -> None:
+        """ Add a completed download to the transfer log """
+        connections, sent = self._get_pool_counters(session, url)
+        transferred = 0
+        if result["status"] != 304:
+            transferred = result["size"] - result["resumed_from"]
+        self.transfer_log.record(
+            url,
+            result["status"],
+            result["size"],
+            transferred,
+            time.monotonic() - started,
+            connections - counters[0],
+            sent - counters[1],
+            result["resumed_from"],
+            result.get("segments", 1)
+        )
+
+    def _write_body(self, response: any, tmp_file: str, offset: int, total_length: int, digest: any, show_progress: bool) -> int:
+        """ Write the body of a response to a file after offset bytes, return the size of the file """
+        written = offset
+        with open(tmp_file, "ab" if offset > 0 else "wb") as file, ProgressRenderer(
+            total=total_length,
+            initial=offset,
+            label=self._get_label(response.url),
+            enabled=show_progress
+        ) as progress:
+            for chunk in response.iter_content(chunk_size=self.get_chunk_size(total_length)):
+                if chunk:
+                    file.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+                    progress.update(len(chunk))
+        return written
+
+    def _write_at(self, descriptor: int, data: bytes, position: int) -> None:
+        """ Write data at a position of a file (pwrite when the system has it) """
+        view = memoryview(data)
+        while len(view) > 0:
+            if hasattr(os, "pwrite") is True:
+                written = os.pwrite(descriptor, view, position)
+            else:
+                os.lseek(descriptor, position, os.SEEK_SET)
+                written = os.write(descriptor, view)
+            view = view[written:]
+            position += written
+
+    def _describe_response(self, response: any) -> dict:
+        """ Return the size and the range support announced by the first answer of a download """
+        return {
+            "status": response.status_code,
+            "total": int(response.headers.get("content-length", 0) or 0),
+            "ranges": response.headers.get("accept-ranges", "").lower() == "bytes",
+            "encoded": response.headers.get("content-encoding", "identity") != "identity",
+            "etag": response.headers.get("etag", ""),
+            "last_modified": response.headers.get("last-modified", "")
+        }
+
+    def _is_segmentable(self, probe: dict) -> bool:
+        """ Return True when a file is large enough and served in a way that allows byte ranges """
+        if self.segments <= 1 or probe["status"] != 200:
+            return False
+        if probe["total"] < self.segment_threshold or probe["ranges"] is False or probe["encoded"] is True:
+            return False
+        validator = probe["etag"] or probe["last_modified"]
+        return validator != "" and probe["etag"].startswith("W/") is False
+
+    def _download_segment(self, session: any, url: str, tmp_file: str, segment: list, validator: str, progress: ProgressRenderer, hasher: _OrderedHasher) -> None:
+        """ Fetch the missing bytes of a segment [start, end, next] into their place in the file """
+        if segment[2] > segment[1]:
+            return
+        headers = {"Range": f"bytes={segment[2]}-{segment[1]}", "If-Range": validator}
+        with session.get(url, headers=headers, allow_redirects=True, timeout=self.timeout, stream=True) as response:
+            if response.status_code != 206:
+                raise RemoteFileChangedError(f"{url}: the file changed during the download")
+            start, _ = self._get_range_start(response)
+            if start != segment[2]:
+                raise DownloadError(f"{url}: unexpected range in the answer")
+            descriptor = os.open(tmp_file, os.O_WRONLY | getattr(os, "O_BINARY", 0))
+            try:
+                chunk_size = self.get_chunk_size(segment[1] - segment[0] + 1)
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        chunk = chunk[:segment[1] + 1 - segment[2]]
+                        self._write_at(descriptor, chunk, segment[2])
+                        segment[2] += len(chunk)
+                        progress.update(len(chunk))
+                        hasher.notify()
+            finally:
+                os.close(descriptor)
+        if segment[2] != segment[1] + 1:
+            raise DownloadError(f"{url}: a segment of the file is incomplete")
+
+    def _fetch_segmented(self, session: any, url: str, tmp_file: str, headers: dict, show_progress: bool, probe: dict = None) -> dict:
+        """ Fetch a large file as byte ranges over several connections
+        A new download starts from probe, the first answer of the server (see
+        _fetch_once). Returns None when there is neither a probe nor a segmented
+        partial download to resume.
+        """
+        partial = self._load_partial(tmp_file, url)
+        if len(partial) > 0 and "segments" not in partial:
+            return None
+        if len(partial) == 0:
+            if probe is None:
+                return None
+            total = probe["total"]
+            size = -(-total // self.segments)
+            partial = {
+                "url": url,
+                "etag": probe["etag"],
+                "last_modified": probe["last_modified"],
+                "total": total,
+                "segments": [
+                    [start, min(start + size, total) - 1, start]
+                    for start in range(0, total, size)
+                ]
+            }
+            # ---- The file is preallocated, every segment writes at its offset ----
+            with open(tmp_file, "wb") as file:
+                file.truncate(total)
+        segments = partial["segments"]
+        total = partial["total"]
+        validator = partial["etag"] or partial["last_modified"]
+        resumed_from = sum(segment[2] - segment[0] for segment in segments)
+        self._save_partial(tmp_file, partial)
+        digest = self._new_digest()
+        hasher = _OrderedHasher(tmp_file, segments, digest)
+        hasher.start()
+        errors = []
+        with ProgressRenderer(
+            total=total,
+            initial=resumed_from,
+            label=self._get_label(url),
+            enabled=show_progress
+        ) as progress:
+            with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+                futures = [
+                    pool.submit(
+                        self._download_segment,
+                        session, url, tmp_file, segment, validator,
+                        progress, hasher
+                    )
+                    for segment in segments
+                ]
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as error:
+                        errors.append(error)
+        hasher.finish()
+        if len(errors) > 0:
+            # ---- Keep the progress of every segment for the next attempt ----
+            self._save_partial(tmp_file, partial)
+            if isinstance(errors[0], RemoteFileChangedError):
+                self._remove_partial(tmp_file)
+            raise errors[0]
+        return {
+            "status": 200,
+            "size": total,
+            "sha256": digest.hexdigest(),
+            "etag": partial["etag"],
+            "last_modified": partial["last_modified"],
+            "resumed_from": resumed_from,
+            "segments": len(segments)
+        }
+
+    def _fetch_once(self, session: any, url: str, tmp_file: str, headers: dict, show_progress: bool) -> dict:
+        """ Run one request, resuming the partial file when the server allows it """
+        partial = self._load_partial(tmp_file, url)
+        if "segments" in partial:
+            partial = {}
+        request_headers = dict(headers or {})
+        if len(partial) > 0:
+            request_headers["Range"] = f"bytes={partial['size']}-"
+            request_headers["If-Range"] = partial["validator"]
+        with session.get(url, headers=request_headers, allow_redirects=True, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 416 and len(partial) > 0:
+                # ---- The partial file does not match the remote file anymore ----
+                self._remove_partial(tmp_file)
+                raise RemoteFileChangedError(f"{url}: the partial download is no longer valid")
+            response.raise_for_status()
+            probe = self._describe_response(response)
+            if len(partial) > 0 or self._is_segmentable(probe) is False:
+                return self._read_answer(response, url, tmp_file, partial, show_progress)
+        # ---- A large file: its body is left unread and fetched as byte ranges ----
+        return self._fetch_segmented(session, url, tmp_file, headers, show_progress, probe)
+
+    def _read_answer(self, response: any, url: str, tmp_file: str, partial: dict, show_progress: bool) -> dict:
+        """ Write the body of an answer to the temporary file (after the partial download) and describe it """
+        result = {
+            "status": response.status_code,
+            "size": 0,
+            "sha256": "",
+            "etag": response.headers.get("etag", ""),
+            "last_modified": response.headers.get("last-modified", ""),
+            "resumed_from": 0
+        }
+        if response.status_code == 304:
+            return result
+        digest = self._new_digest()
+        offset = 0
+        total_length = int(response.headers.get("content-length", 0) or 0)
+        if response.headers.get("content-encoding", "identity") != "identity":
+            total_length = 0
+        if response.status_code == 206:
+            start, total_length = self._get_range_start(response)
+            if start != partial.get("size", -1):
+                self._remove_partial(tmp_file)
+                raise DownloadError(f"{url}: unexpected range in the answer")
+            offset = start
+            self._hash_file(tmp_file, digest)
+            result["status"] = 200
+            result["resumed_from"] = offset
+        self._save_partial(
+            tmp_file,
+            {
+                "url": url,
+                "etag": result["etag"] or partial.get("etag", ""),
+                "last_modified": result["last_modified"] or partial.get("last_modified", ""),
+                "total": total_length
+            }
+        )
+        result["size"] = self._write_body(
+            response, tmp_file, offset, total_length, digest, show_progress
+        )
+        if total_length > 0 and result["size"] != total_length:
+            raise DownloadError(
+                f"{url}: received {result['size']} bytes out of {total_length}"
+            )
+        result["sha256"] = digest.hexdigest()
+        return result
+
+    def _fetch_attempt(self, session: any, url: str, filepath: str, tmp_file: str, headers: dict, show_progress: bool, expected_sha256: str) -> dict:
+        """ Download url once (in segments when possible), check it and move it to filepath """
+        result = self._fetch_segmented(
+            session, url, tmp_file, headers, show_progress
+        )
+        if result is None:
+            result = self._fetch_once(
+                session, url, tmp_file, headers, show_progress
+            )
+        if result["status"] != 304:
+            self.verify_digest(url, result["sha256"], expected_sha256)
+            os.replace(tmp_file, filepath)
+            self._remove_partial(tmp_file)
+        return result
+
+    def fetch(self, url: str, filepath: str, headers: dict = None, show_progress: bool = None, expected_sha256: str = "") -> dict:
+        """ Download url to filepath and describe the response
+        Returns {status, size, sha256, etag, last_modified, resumed_from}. On a 304
+        answer to conditional headers, filepath is left untouched. The file only
+        appears once it is complete. An interrupted transfer is kept next to the
+        file and resumed with a Range request (by this call or a later one) when
+        the server sent an ETag or a Last-Modified date. Files over the segment
+        threshold are fetched as byte ranges over several connections when the
+        server allows it, the size and the range support are read from the first
+        answer. DownloadError is raised on failure (RemoteFileChangedError when
+        the file kept changing during the attempts), ChecksumError when
+        expected_sha256 is given and the content does not match it (the file is
+        then discarded).
+        """
+        import requests
+        if show_progress is None:
+            show_progress = self.show_progress
+        folder = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(folder, exist_ok=True)
+        tmp_file = self._get_temporary_path(filepath)
+        session = self.get_session()
+        last_error = None
+        started = time.monotonic()
+        counters = self._get_pool_counters(session, url)
+        with self._get_path_lock(filepath):
+            for attempt in range(self.retries + 1):
+                if attempt > 0:
+                    time.sleep(self.backoff * (2 ** (attempt - 1)))
+                try:
+                    result = self._fetch_attempt(
+                        session, url, filepath, tmp_file, headers, show_progress, expected_sha256
+                    )
+                    self._record_transfer(session, url, result, started, counters)
+                    return result
+                except ChecksumError:
+                    self._remove_partial(tmp_file)
+                    raise
+                except requests.HTTPError as error:
+                    # ---- The adapter already retried the statuses worth retrying ----
+                    last_error = error
+                    self._remove_partial(tmp_file)
+                    break
+                except (requests.RequestException, DownloadError, OSError) as error:
+                    last_error = error
+                    if len(self._load_partial(tmp_file, url)) == 0:
+                        self._remove_partial(tmp_file)
+        if isinstance(last_error, RemoteFileChangedError):
+            raise RemoteFileChangedError(f"Error downloading {url}: {last_error}")
+        raise DownloadError(f"Error downloading {url}: {last_error}")
+
+    def download(self, url: str, filepath: str, show_progress: bool = None, expected_sha256: str = "") -> int:
+        """ Download url to filepath and return the size of the file """
+        return self.fetch(
+            url,
+            filepath,
+            show_progress=show_progress,
+            expected_sha256=expected_sha256
+        )["size"]
+
+    def verify_digest(self, url: str, sha256: str, expected_sha256: str) -> None:
+        """ Raise ChecksumError if expected_sha256 is set and differs from sha256 """
+        if expected_sha256 == "":
+            return
+        if sha256.lower() != expected_sha256.strip().lower():
+            raise ChecksumError(
+                f"Checksum mismatch for {url}: expected sha256 {expected_sha256.strip().lower()}, got {sha256}"
+            )
+
+    def get_published_digest(self, checksum_url: str) -> str:
+        """ Download a published checksum file (sha256sum format or a bare digest) and return the digest """
+        import requests
+        try:
+            response = self.get_session().get(checksum_url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as error:
+            raise DownloadError(f"Error downloading the checksum {checksum_url}: {error}") from error
+        for word in response.text.split():
+            if len(word) == 64 and all(char in "0123456789abcdefABCDEF" for char in word):
+                return word.lower()
+        raise DownloadError(f"No sha256 found in {checksum_url}")
+
+    def get_pinned_digest(self, url: str) -> str:
+        """ Return the digest pinned for a url in the file named by $CONTOPSSYNC_PINNED_SHA256 ("" if none) """
+        pin_file = os.environ.get(PINNED_DIGESTS_ENV, "")
+        if pin_file == "":
+            return ""
+        try:
+            with open(pin_file, "r", encoding="utf-8") as file:
+                pins = json.load(file)
+        except (OSError, ValueError):
+            return ""
+        if isinstance(pins, dict) is False:
+            return ""
+        return str(pins.get(url, "")).lower()
+
+    def get_reference_digest(self, url: str, expected_sha256: str = "", checksum_url: str = "") -> str:
+        """ Return the digest url is checked against: expected_sha256, the one published at checksum_url or the pinned one ("" if none) """
+        if expected_sha256 == "" and checksum_url != "":
+            expected_sha256 = self.get_published_digest(checksum_url)
+        if expected_sha256 == "":
+            expected_sha256 = self.get_pinned_digest(url)
+        return expected_sha256.strip().lower()
+
+    def fetch_artifact(self, url: str, filepath: str, expected_sha256: str = "", checksum_url: str = "", report: callable = None, cache: any = None) -> dict:
+        """ Put the artifact of url in filepath through the artifact cache (an empty filepath only fills the cache)
+        The content is checked against expected_sha256, the digest published at
+        checksum_url or the digest pinned for the url (in this order). The
+        artifact server of another node (see peer_server) is asked before the
+        internet: the digest it announces only protects the transfer, an artifact
+        without a reference digest is reported unverified whatever its source.
+        report(text) receives the progress messages, cache defaults to the
+        artifact cache of the user. Returns the cache entry with its "source"
+        ("peer" when the artifact server provided it) and "verified" (True when
+        the digest was checked against a reference).
+        Raises DownloadError (ChecksumError when the content does not match).
+        """
+        from .artifact_cache import get_artifact_cache
+        from .peer_server import get_peer_source
+        if cache is None:
+            cache = get_artifact_cache()
+        if report is None:
+            def report(_: str) -> None:
+                """ Drop the progress messages """
+        expected_sha256 = self.get_reference_digest(url, expected_sha256, checksum_url)
+        peer = get_peer_source()
+        if peer is not None and peer.has(url) is True:
+            report(f"Fetching {url} from the artifact server {peer.base_url}\n")
+            try:
+                entry = cache.fetch(
+                    url,
+                    filepath,
+                    self,
+                    expected_sha256 or peer.get_sha256(url),
+                    source_url=peer.get_artifact_url(url)
+                )
+                return dict(entry, source="peer", verified=expected_sha256 != "")
+            except (DownloadError, OSError) as err:
+                report(f"The artifact server could not provide it ({err}), using the internet\n")
+        report(f"Downloading file from url: {url}\n")
+        entry = cache.fetch(url, filepath, self, expected_sha256)
+        return dict(entry, verified=expected_sha256 != "")
+
+    def download_on_tty(self, tty: any, url: str, filepath: str, expected_sha256: str = "", checksum_url: str = "") -> int:
+        """ Download a file (see fetch_artifact) and report it on the tty, returns the tty status
+        The active bundle answers alone, and a file prefetched in the background
+        is only waited for. The status is only mirrored on the tty once known:
+        the steps of an installer download at the same time.
+        """
+        status = self._download_on_tty(tty, url, filepath, expected_sha256, checksum_url)
+        tty.current_tty_status = status
+        return status
+
+    def _download_on_tty(self, tty: any, url: str, filepath: str, expected_sha256: str, checksum_url: str) -> int:
+        """ Download a file and report it on the tty, returns the status without setting it on the tty """
+        from .offline_bundle import get_active_bundle
+        try:
+            bundle = get_active_bundle()
+            if bundle is not None:
+                return self._extract_on_tty(tty, bundle, url, filepath, expected_sha256)
+        except DownloadError as err:
+            tty.print_on_tty(
+                tty.error_colour,
+                f"Error reading the bundle: {err}\n"
+            )
+            return tty.error
+        if self._restore_prefetched_on_tty(tty, url, filepath, expected_sha256, checksum_url) is True:
+            return tty.success
+        try:
+            entry = self.fetch_artifact(
+                url,
+                filepath,
+                expected_sha256,
+                checksum_url,
+                lambda text: tty.print_on_tty(tty.info_colour, text)
+            )
+        except ChecksumError as err:
+            tty.print_on_tty(
+                tty.error_colour,
+                f"{err}\nThe file was discarded, aborting the installation\n"
+            )
+            return tty.error
+        except (DownloadError, OSError) as err:
+            tty.print_on_tty(
+                tty.error_colour,
+                f"Error downloading file: {err}\n"
+            )
+            return tty.error
+        if entry["verified"] is True:
+            tty.print_on_tty(
+                tty.success_colour,
+                f"Checksum verified (sha256 {entry['sha256']})\n"
+            )
+        tty.print_on_tty(
+            tty.success_colour,
+            f"File downloaded to: {filepath}\n"
+        )
+        return tty.success
+
+    def _restore_prefetched_on_tty(self, tty: any, url: str, filepath: str, expected_sha256: str, checksum_url: str = "") -> bool:
+        """ Wait for url if it is being prefetched and copy it to filepath, returns False to download it
+        The prefetched copy is checked against the reference digest of the
+        download (see get_reference_digest), the normal download runs when it
+        does not match or when the reference can not be read.
+        """
+        from .prefetcher import get_active_prefetcher
+        prefetcher = get_active_prefetcher()
+        if prefetcher is None or prefetcher.has(url) is False:
+            return False
+        entry = prefetcher.wait(url)
+        if entry is None:
+            return False
+        try:
+            expected_sha256 = self.get_reference_digest(url, expected_sha256, checksum_url)
+        except DownloadError:
+            return False
+        if expected_sha256 not in ("", entry["sha256"]):
+            return False
+        try:
+            restored = prefetcher.cache.restore(url, filepath)
+        except OSError:
+            return False
+        if restored is None or restored["sha256"] != entry["sha256"]:
+            return False
+        if expected_sha256 != "":
+            tty.print_on_tty(
+                tty.success_colour,
+                f"Checksum verified (sha256 {entry['sha256']})\n"
+            )
+        tty.print_on_tty(
+            tty.success_colour,
+            f"{url} was prefetched (sha256 {entry['sha256']})\nFile downloaded to: {filepath}\n"
+        )
+        return True
+
+    def _extract_on_tty(self, tty: any, bundle: any, url: str, filepath: str, expected_sha256: str) -> int:
+        """ Answer a download from the active bundle (no network access), returns the status """
+        tty.print_on_tty(
+            tty.info_colour,
+            f"Reading {url} from the bundle {bundle.path}\n"
+        )
+        if expected_sha256 == "":
+            expected_sha256 = self.get_pinned_digest(url)
+        try:
+            entry = bundle.extract(url, filepath, expected_sha256)
+        except ChecksumError as err:
+            tty.print_on_tty(
+                tty.error_colour,
+                f"{err}\nThe file was discarded, aborting the installation\n"
+            )
+            return tty.error
+        except (DownloadError, OSError) as err:
+            tty.print_on_tty(
+                tty.error_colour,
+                f"Error reading the bundle: {err}\n"
+            )
+            return tty.error
+        tty.print_on_tty(
+            tty.success_colour,
+            f"Checksum verified (sha256 {entry['sha256']})\nFile extracted to: {filepath}\n"
+        )
+        return tty.success
+
+    def close(self) -> None:
+        """ Close the pooled connections """
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+
+# The download manager shared by the installers
+_DOWNLOAD_MANAGER = None
+
+
+def get_download_manager() -> DownloadManager:
+    """ Return the download manager shared by the installers """
+    global _DOWNLOAD_MANAGER
+    if _DOWNLOAD_MANAGER is None:
+        _DOWNLOAD_MANAGER = DownloadManager()
+    return _DOWNLOAD_MANAGER
@@ -0,0 +1,184 @@
+"""
+File in charge of detecting the host the program runs on
+The facts (system, architecture, raspberry pi model and distribution) are read
+from os.uname(), /proc/device-tree/model and /etc/os-release without starting
+any process. They are cached in memory and on disk (with a time to live) so
+that they are only detected once.
+"""
+
+import os
+import json
+import time
+import platform
+from .cache_folder import get_cache_folder
+
+HOST_FACTS_FILE = "host_facts.json"
+HOST_FACTS_TTL = 24 * 60 * 60
+DEVICE_TREE_MODEL_FILE = "/proc/device-tree/model"
+OS_RELEASE_FILES = ("/etc/os-release", "/usr/lib/os-release")
+BOOT_ID_FILE = "/proc/sys/kernel/random/boot_id"
+
+
+def _read_file(file_path: str) -> str:
+    """ Return the content of a file ("" if it can not be read) """
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+            return file.read()
+    except OSError:
+        return ""
+
+
+def _parse_os_release(content: str) -> dict:
+    """ Convert the content of an os-release file into a dictionary """
+    result = {}
+    for line in content.splitlines():
+        line = line.strip()
+        if line == "" or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        result[key.strip()] = value.strip().strip("\"'")
+    return result
+
+
+class HostFacts:
+    """ The facts describing the host system """
+
+    def __init__(self, system: str = "", machine: str = "", node_name: str = "", kernel_release: str = "", device_model: str = "", os_release: dict = None, boot_id: str = "", detected_at: float = 0.0) -> None:
+        self.system = system
+        self.machine = machine
+        self.node_name = node_name
+        self.kernel_release = kernel_release
+        self.device_model = device_model
+        self.os_release = os_release if os_release is not None else {}
+        self.boot_id = boot_id
+        self.detected_at = detected_at
+
+    @classmethod
+    def detect(cls) -> "HostFacts":
+        """ Read the facts from the host """
+        if hasattr(os, "uname") is True:
+            uname = os.uname()
+            system = uname.sysname
+            machine = uname.machine
+            node_name = uname.nodename
+            kernel_release = uname.release
+        else:
+            system = platform.system()
+            machine = platform.machine()
+            node_name = platform.node()
+            kernel_release = platform.release()
+        os_release = {}
+        for file_path in OS_RELEASE_FILES:
+            os_release = _parse_os_release(_read_file(file_path))
+            if len(os_release) > 0:
+                break
+        return cls(
+            system=system,
+            machine=machine,
+            node_name=node_name,
+            kernel_release=kernel_release,
+            device_model=_read_file(DEVICE_TREE_MODEL_FILE).strip("\x00\n "),
+            os_release=os_release,
+            boot_id=_read_file(BOOT_ID_FILE).strip(),
+            detected_at=time.time()
+        )
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "HostFacts":
+        """ Create the facts from a dictionary saved by to_dict """
+        return cls(
+            system=content.get("system", ""),
+            machine=content.get("machine", ""),
+            node_name=content.get("node_name", ""),
+            kernel_release=content.get("kernel_release", ""),
+            device_model=content.get("device_model", ""),
+            os_release=content.get("os_release", {}),
+            boot_id=content.get("boot_id", ""),
+            detected_at=content.get("detected_at", 0.0)
+        )
+
+    def to_dict(self) -> dict:
+        """ Convert the facts into a dictionary that can be saved as json """
+        return {
+            "system": self.system,
+            "machine": self.machine,
+            "node_name": self.node_name,
+            "kernel_release": self.kernel_release,
+            "device_model": self.device_model,
+            "os_release": self.os_release,
+            "boot_id": self.boot_id,
+            "detected_at": self.detected_at
+        }
+
+    @property
+    def is_raspberrypi(self) -> bool:
+        """ True if the host is a raspberry pi (board model, or the default hostname) """
+        if "raspberry pi" in self.device_model.lower():
+            return True
+        return "raspberrypi" in self.node_name
+
+    @property
+    def distro_id(self) -> str:
+        """ The id of the linux distribution (ex: debian, ubuntu, raspbian) """
+        return self.os_release.get("ID", "").lower()
+
+    @property
+    def distro_like(self) -> list[str]:
+        """ The ids of the distributions this one is based on """
+        return self.os_release.get("ID_LIKE", "").lower().split()
+
+    @property
+    def distro_version(self) -> str:
+        """ The version of the linux distribution """
+        return self.os_release.get("VERSION_ID", "")
+
+    @property
+    def pi_base_flavor(self) -> str:
+        """ The distribution the raspberry pi os is based on: ubuntu, debian or "" """
+        families = [self.distro_id] + self.distro_like
+        for flavor in ("ubuntu", "debian"):
+            if flavor in families:
+                return flavor
+        return ""
+
+    def is_valid(self, ttl: float = HOST_FACTS_TTL) -> bool:
+        """ Check that the cached facts are recent and come from the current boot """
+        if self.system != platform.system():
+            return False
+        if time.time() - self.detected_at > ttl:
+            return False
+        return self.boot_id == _read_file(BOOT_ID_FILE).strip()
+
+
+# The in memory copy of the host facts
+_HOST_FACTS = None
+
+
+def get_host_facts(refresh: bool = False, ttl: float = HOST_FACTS_TTL) -> HostFacts:
+    """ Return the host facts, detected once then cached in memory and on disk """
+    global _HOST_FACTS
+    if refresh is False and _HOST_FACTS is not None:
+        return _HOST_FACTS
+    cache_file = os.path.join(get_cache_folder(create=False), HOST_FACTS_FILE)
+    facts = None
+    if refresh is False:
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                facts = HostFacts.from_dict(json.load(file))
+        except (OSError, ValueError, AttributeError):
+            facts = None
+        if facts is not None and facts.is_valid(ttl) is False:
+            facts = None
+    if facts is None:
+        facts = HostFacts.detect()
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(facts.to_dict(), file)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+    _HOST_FACTS = facts
+    return facts
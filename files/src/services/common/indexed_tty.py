@@ -0,0 +1,279 @@
+"""
+File in charge of providing the tty used by the program
+It is the tty of tty_ov with the commands dispatched through a CommandIndex
+instead of a scan of the option list.
+"""
+
+import sys
+import subprocess
+from typing import List, Dict
+from tty_ov import TTY, ColouriseOutput, AskQuestion
+from prompt_toolkit.completion import Completer, Completion
+from .command_index import CommandIndex
+
+
+class CommandCompleter(Completer):
+    """ Complete the command names (and their aliases) typed in the prompt """
+
+    def __init__(self, command_index: CommandIndex) -> None:
+        self.command_index = command_index
+
+    def get_completions(self, document, complete_event):
+        """ Yield the commands starting with the word being typed """
+        text = document.text_before_cursor.lstrip()
+        if " " in text:
+            return
+        for name in self.command_index.complete(text):
+            yield Completion(name, start_position=-len(text))
+
+
+class IndexedTTY(TTY):
+    """ The tty of the program, dispatching its commands through an index """
+
+    def __init__(self, err: int, error: int, success: int, colour_lib: ColouriseOutput, ask_question: AskQuestion, colours: Dict, colourise_output: bool = True) -> None:
+        super().__init__(
+            err,
+            error,
+            success,
+            colour_lib,
+            ask_question,
+            colours,
+            colourise_output
+        )
+        # ---- The command index ----
+        self.command_index = CommandIndex(self.command_description_token_inner)
+        # ---- Token used to list the commands starting with a prefix ----
+        self.help_prefix_token = "*"
+        # ---- Display the name of the functions added to the shell ----
+        self.announce_imports = True
+        # ---- When set, the help texts are saved here instead of displayed ----
+        self.help_recorder = None
+
+    def index_options(self) -> None:
+        """ Rebuild the command index from the option list """
+        self.command_index.clear()
+        for option in self.options:
+            self.command_index.add(option)
+
+    def load_basics(self) -> None:
+        """ set the values for the variables that can be configured by the user """
+        super().load_basics()
+        self.index_options()
+        self.user_session.completer = CommandCompleter(self.command_index)
+
+    def unload_basics(self) -> int:
+        """ Free the ressources that were previously allocated """
+        self.command_index.clear()
+        return super().unload_basics()
+
+    def import_functions_into_shell(self, functions: List[Dict[str, any]]) -> int:
+        """ Import functions into the shell (a known name replaces the previous command) """
+        for function in functions:
+            if function is None or isinstance(function, Dict) is not True:
+                continue
+            if self.command_description_token_inner not in function:
+                function[self.command_description_token_inner] = "No description provided\n"
+            item = self.command_index.get_option_name(function)
+            previous = self.command_index.commands.get(item.lower())
+            if previous is not None:
+                self.options = [i for i in self.options if i is not previous]
+            else:
+                self.auto_complete_list.append(item)
+            self.options.append(function)
+            self.command_index.add(function)
+            if self.announce_imports is False:
+                continue
+            self.print_on_tty(
+                self.success_colour,
+                f"Added function {item}\n"
+            )
+        self.current_tty_status = self.success
+        return self.success
+
+    def function_help(self, function_name: str, description: str) -> None:
+        """ The function in charge of displaying the help for a specific function """
+        if self.help_recorder is not None:
+            self.help_recorder[function_name.lower()] = description
+            return
+        super().function_help(function_name, description)
+
+    def run_external_command(self, command: str) -> int:
+        """ The function in charge of executing command on the host system in a contained manner """
+        if self.help_recorder is not None:
+            return self.error
+        if sys.stdout is sys.__stdout__:
+            return super().run_external_command(command)
+        # ---- The output is redirected (ex: daemon), forward the one of the command ----
+        try:
+            with subprocess.Popen(
+                command,
+                shell=True,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace"
+            ) as process:
+                for line in process.stdout:
+                    sys.stdout.write(line)
+                return process.wait()
+        except OSError:
+            return self.error
+
+    def add_command_alias(self, alias: str, command: str) -> int:
+        """ Make alias call the same function as command without duplicating it """
+        if self.command_index.add_alias(alias, command) is False:
+            self.current_tty_status = self.error
+            return self.error
+        self.auto_complete_list.append(alias)
+        self.current_tty_status = self.success
+        return self.success
+
+    def remove_function_from_options(self, function: str) -> int:
+        """ Remove a function (or an alias) from the options """
+        name = self.command_index.resolve_name(function)
+        if name == "":
+            self.print_on_tty(
+                self.error_colour,
+                f"Failed to remove function {function}\n"
+            )
+            self.current_tty_status = self.error
+            return self.current_tty_status
+        removed = [function.lower()]
+        if function.lower() == name:
+            option = self.command_index.commands[name]
+            self.options = [i for i in self.options if i is not option]
+            removed.extend(self.command_index.get_aliases(name))
+        self.command_index.remove(function)
+        self.auto_complete_list = [
+            i for i in self.auto_complete_list if i.lower() not in removed
+        ]
+        self.print_on_tty(
+            self.success_colour,
+            f"Removed function {function}\n"
+        )
+        self.current_tty_status = self.success
+        return self.current_tty_status
+
+    def process_input(self) -> None:
+        """ The function in charge of processing the user input """
+        if self.user_input == "":
+            self.current_tty_status = self.success
+            return
+        self.history.append(self.user_input)
+        cleaned_command = self.user_input.split(self.comment_token)[0]
+        command = cleaned_command.split(self.input_split_char)
+        args = command[1:]
+        command = command[0].lower()
+        function = self.command_index.get_function(command)
+        if function is None:
+            self.print_on_tty(
+                self.error_colour,
+                f"Invalid option: {str(command)}\n"
+            )
+            self.current_tty_status = self.err
+            return
+        function(args)
+
+    def run_indexed_command(self, command: str, args: List = None) -> int:
+        """ Run a command of the shell from the program, returns its status """
+        function = self.command_index.get_function(command.lower())
+        if function is None:
+            self.print_on_tty(
+                self.error_colour,
+                f"Invalid option: {command}\n"
+            )
+            self.current_tty_status = self.err
+            return self.err
+        status = function(list(args or []))
+        if isinstance(status, int) is True:
+            self.current_tty_status = status
+        return self.current_tty_status
+
+    def help_starting_with(self, prefix: str) -> int:
+        """ Display the commands starting with a prefix """
+        names = self.command_index.complete(prefix)
+        if len(names) == 0:
+            self.print_on_tty(
+                self.error_colour,
+                f"No command starts with: {prefix}\n"
+            )
+            self.current_tty_status = self.error
+            return self.current_tty_status
+        self.print_on_tty(
+            self.reset_colour,
+            f"Commands starting with '{prefix}':\n"
+        )
+        for name in names:
+            self.print_on_tty(self.env_term_colour, name)
+            self.print_on_tty(self.env_shell_colour, ": ")
+            self.print_on_tty(
+                self.env_definition_colour,
+                self.command_index.get_description(name)
+            )
+            self.print_on_tty(self.env_definition_colour, "\n")
+        self.current_tty_status = self.success
+        return self.current_tty_status
+
+    def process_help_call(self, args: List) -> int:
+        """ Process the inputs for the help calls """
+        usr_input = args[0].lower()
+        if usr_input in self.help_help_options:
+            self.help_help()
+            self.current_tty_status = self.success
+            return self.success
+        if usr_input == "prompt":
+            self.help_prompt()
+            self.current_tty_status = self.success
+            return self.current_tty_status
+        if usr_input.endswith(self.help_prefix_token):
+            return self.help_starting_with(usr_input[:-1])
+        name = self.command_index.resolve_name(usr_input)
+        if name != "":
+            self.help_function_child_name = name
+            self.command_index.get_function(name)(args[1:])
+            self.current_tty_status = self.success
+            return self.current_tty_status
+        self.print_on_tty(
+            self.error_colour,
+            f"Invalid option: {str(args[0])}\n"
+        )
+        self.current_tty_status = self.error
+        return self.current_tty_status
+
+    def help(self, args: List) -> int:
+        """ The help function in charge of displaying the available options to the user """
+        argsc = len(args)
+        if argsc > 0 and args[0] != '':
+            if argsc > 1 and self.enable_multi_command_help is True:
+                global_status = self.success
+                for i in enumerate(args):
+                    status = self.process_help_call(args[i[0]:])
+                    if status != self.success:
+                        global_status = self.error
+            else:
+                global_status = self.process_help_call(args)
+            self.current_tty_status = global_status
+            return global_status
+        self.print_on_tty(self.reset_colour, "Available commands:\n")
+        for name in self.command_index.names():
+            self.print_on_tty(self.env_term_colour, name)
+            aliases = self.command_index.get_aliases(name)
+            if len(aliases) > 0:
+                self.print_on_tty(
+                    self.env_shell_colour,
+                    f" ({', '.join(aliases)})"
+                )
+            self.print_on_tty(self.env_shell_colour, ": ")
+            self.print_on_tty(
+                self.env_definition_colour,
+                self.command_index.get_description(name)
+            )
+            self.print_on_tty(self.env_definition_colour, "\n")
+        self.print_on_tty(
+            self.env_definition_colour,
+            f"Use 'help <prefix>{self.help_prefix_token}' to list the commands starting with a prefix\n"
+        )
+        self.print_on_tty(self.default_colour, "\n")
+        self.current_tty_status = self.success
+        return self.current_tty_status
@@ -0,0 +1,68 @@
+"""
+File in charge of building the child classes only when they are first used
+"""
+
+import sys
+import importlib
+
+
+class LazyChild:
+    """ Import and instantiate a child class the first time it is accessed
+
+    Declared at the class level:
+        linux = LazyChild(".install_kubernetes_linux", "InstallKubernetesLinux")
+    The module path is resolved relative to the package of the owning class.
+    The owning instance must expose the tty, success, err and error attributes
+    which are passed to the child's constructor.
+    Once built, the child is stored in the instance dictionary so further
+    accesses cost as much as a regular attribute lookup.
+    """
+
+    def __init__(self, module: str, class_name: str) -> None:
+        self.module = module
+        self.class_name = class_name
+        self.name = class_name
+        self.package = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.package = sys.modules[owner.__module__].__package__
+
+    def load_class(self) -> type:
+        """ Import the module containing the child class and return the class """
+        module = importlib.import_module(self.module, self.package)
+        return getattr(module, self.class_name)
+
+    def __get__(self, instance: object, owner: type = None) -> object:
+        if instance is None:
+            return self
+        child_class = self.load_class()
+        child = child_class(
+            instance.tty,
+            instance.success,
+            instance.err,
+            instance.error
+        )
+        instance.__dict__[self.name] = child
+        return child
+
+
+def is_child_loaded(instance: object, name: str) -> bool:
+    """ Returns true if the lazy child called name was already built """
+    return name in instance.__dict__
+
+
+def preload_children(instance: object, recursive: bool = True) -> int:
+    """ Build every lazy child of the instance (and of its children if recursive) """
+    built = 0
+    for owner in type(instance).__mro__:
+        for name, attribute in list(vars(owner).items()):
+            if not isinstance(attribute, LazyChild):
+                continue
+            was_loaded = is_child_loaded(instance, name)
+            child = getattr(instance, name)
+            if was_loaded is False:
+                built += 1
+            if recursive is True:
+                built += preload_children(child, recursive)
+    return built
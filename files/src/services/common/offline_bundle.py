@@ -0,0 +1,341 @@
+"""
+File in charge of the offline bundles used for the air-gapped installs
+A bundle is a zip archive holding every artifact an install plan downloads
+(installer scripts, release files, binaries for one architecture, the k3s
+airgap images) and a manifest mapping their urls to their sha256. The zip
+central directory is the index, so an installer reads one artifact without
+unpacking the others. The artifacts already compressed are stored as they are.
+While a bundle is active, the downloads are answered from the bundle only.
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import tempfile
+import threading
+from .download_manager import DownloadManager, DownloadError, ChecksumError, get_download_manager
+
+BUNDLE_FORMAT = 1
+BUNDLE_MANIFEST = "manifest.json"
+BUNDLE_ENV = "CONTOPSSYNC_BUNDLE"
+BUNDLE_ARCHITECTURES = ("amd64", "arm64", "armhf")
+# ---- The members already compressed are not deflated again ----
+BUNDLE_STORED_SUFFIXES = (".gz", ".tgz", ".zst", ".xz", ".zip", ".exe")
+BUNDLE_COPY_SIZE = 1024 * 1024
+# ---- The release locations ----
+KUBERNETES_STABLE = "https://cdn.dl.k8s.io/release/stable.txt"
+KUBERNETES_RELEASES = "https://dl.k8s.io/release"
+K3S_SCRIPT = "https://get.k3s.io"
+K3S_STABLE_CHANNEL = "https://update.k3s.io/v1-release/channels/stable"
+K3S_RELEASES = "https://github.com/k3s-io/k3s/releases/download"
+# ---- The name of every architecture in the release files ----
+K3S_BINARY_NAMES = {"amd64": "k3s", "arm64": "k3s-arm64", "armhf": "k3s-armhf"}
+K3S_IMAGE_ARCHITECTURES = {"amd64": "amd64", "arm64": "arm64", "armhf": "arm"}
+KUBECTL_ARCHITECTURES = {"amd64": "amd64", "arm64": "arm64", "armhf": "arm"}
+
+
+class BundleError(DownloadError):
+    """ Raised when a bundle can not be built or does not hold an artifact """
+
+
+def get_bundle_architecture(machine: str) -> str:
+    """ Return the bundle architecture of a machine name (platform.machine()), "" if unsupported """
+    machine = machine.lower()
+    if machine in ("x86_64", "amd64", "x64"):
+        return "amd64"
+    if machine in ("aarch64", "arm64", "armv8l"):
+        return "arm64"
+    if machine.startswith("armv7") or machine.startswith("armv6") or machine == "armhf":
+        return "armhf"
+    return ""
+
+
+class OfflineBundle:
+    """ Read the artifacts of a bundle """
+
+    def __init__(self, path: str) -> None:
+        self.path = os.path.abspath(os.path.expanduser(path))
+        try:
+            with zipfile.ZipFile(self.path, "r") as archive:
+                manifest = json.loads(archive.read(BUNDLE_MANIFEST).decode("utf-8"))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            raise BundleError(f"{path} is not a valid bundle: {error}") from error
+        if isinstance(manifest, dict) is False or manifest.get("format") != BUNDLE_FORMAT:
+            raise BundleError(f"{path}: unsupported bundle format")
+        self.manifest = manifest
+        self.artifacts = manifest.get("artifacts", {})
+
+    @property
+    def architecture(self) -> str:
+        """ The architecture of the binaries in the bundle """
+        return self.manifest.get("architecture", "")
+
+    def _find(self, url: str) -> dict:
+        """ Return the manifest entry of url (a trailing / is ignored), None if absent """
+        entry = self.artifacts.get(url)
+        if entry is None:
+            entry = self.artifacts.get(url.rstrip("/"))
+        return entry
+
+    def has(self, url: str) -> bool:
+        """ Return True if the bundle holds the artifact of url """
+        return self._find(url) is not None
+
+    def get_entries(self, role: str = "") -> list[dict]:
+        """ Return the artifacts of the bundle (only the ones of a role if given) """
+        return [
+            dict(entry, url=url) for url, entry in self.artifacts.items()
+            if role == "" or entry.get("role", "") == role
+        ]
+
+    def extract(self, url: str, filepath: str, expected_sha256: str = "") -> dict:
+        """ Copy the artifact of url to filepath, checking its sha256 while it is written
+        BundleError is raised if the bundle does not hold it, ChecksumError if the
+        content differs from the manifest or from expected_sha256.
+        """
+        entry = self._find(url)
+        if entry is None:
+            raise BundleError(f"{url} is not in the bundle {self.path}")
+        folder = os.path.dirname(os.path.abspath(filepath))
+        os.makedirs(folder, exist_ok=True)
+        tmp_file = f"{filepath}.{os.getpid()}.{threading.get_ident()}.part"
+        digest = hashlib.sha256()
+        try:
+            with zipfile.ZipFile(self.path, "r") as archive:
+                with archive.open(entry["member"], "r") as source, open(tmp_file, "wb") as target:
+                    for block in iter(lambda: source.read(BUNDLE_COPY_SIZE), b""):
+                        digest.update(block)
+                        target.write(block)
+            sha256 = digest.hexdigest()
+            for expected in (entry["sha256"], expected_sha256.strip().lower()):
+                if expected != "" and sha256 != expected:
+                    raise ChecksumError(
+                        f"Checksum mismatch for {url} in {self.path}: expected sha256 {expected}, got {sha256}"
+                    )
+            os.replace(tmp_file, filepath)
+        except (KeyError, zipfile.BadZipFile) as error:
+            raise BundleError(f"{url}: the bundle {self.path} is damaged: {error}") from error
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        return dict(entry, url=url)
+
+    def extract_role(self, role: str, folder: str) -> list[str]:
+        """ Extract the artifacts of a role in folder, returns their paths """
+        paths = []
+        for entry in self.get_entries(role):
+            path = os.path.join(folder, entry["name"])
+            self.extract(entry["url"], path)
+            paths.append(path)
+        return paths
+
+
+class BundleBuilder:
+    """ Resolve the artifacts of install plans and pack them in a bundle """
+
+    def __init__(self, manager: DownloadManager = None, cache: any = None) -> None:
+        self.manager = manager
+        if self.manager is None:
+            self.manager = get_download_manager()
+        self.cache = cache
+        self.plans = {
+            "k3s": self._resolve_k3s,
+            "kubectl": self._resolve_kubectl
+        }
+
+    def _get_text(self, url: str) -> str:
+        """ Return the body of a small text file """
+        import requests
+        try:
+            response = self.manager.get_session().get(
+                url,
+                allow_redirects=True,
+                timeout=self.manager.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as error:
+            raise BundleError(f"Error downloading {url}: {error}") from error
+        return response.text
+
+    def _get_release(self, tool: str, architecture: str) -> str:
+        """ Return the stable version of a tool (see release_resolver) """
+        from .release_resolver import get_release_resolver
+        try:
+            return get_release_resolver().resolve(tool, architecture)["version"]
+        except DownloadError as error:
+            raise BundleError(str(error)) from error
+
+    def _parse_checksums(self, content: str) -> dict:
+        """ Parse a sha256sum file into {file name: sha256} """
+        checksums = {}
+        for line in content.splitlines():
+            words = line.split()
+            if len(words) == 2 and len(words[0]) == 64:
+                checksums[words[1].lstrip("*")] = words[0].lower()
+        return checksums
+
+    def _resolve_kubectl(self, architecture: str, versions: dict) -> list[dict]:
+        """ stable.txt and the kubectl binary checked against its published digest """
+        artifacts = [{"url": KUBERNETES_STABLE, "name": "stable.txt", "role": "release"}]
+        version = versions.get("kubectl", "")
+        if version == "":
+            version = self._get_release("kubectl", architecture)
+        # ---- stable.txt must name the bundled version ----
+        artifacts[0]["content"] = version
+        versions["kubectl"] = version
+        url = f"{KUBERNETES_RELEASES}/{version}/bin/linux/{KUBECTL_ARCHITECTURES[architecture]}/kubectl"
+        artifacts.append({
+            "url": url,
+            "name": "kubectl",
+            "role": "kubectl-binary",
+            "sha256": self.manager.get_published_digest(f"{url}.sha256")
+        })
+        return artifacts
+
+    def _resolve_k3s(self, architecture: str, versions: dict) -> list[dict]:
+        """ The install script, the k3s binary and the airgap images of a k3s release """
+        version = versions.get("k3s", "")
+        if version == "":
+            version = self._get_release("k3s", architecture)
+        versions["k3s"] = version
+        release = f"{K3S_RELEASES}/{version.replace('+', '%2B')}"
+        image_architecture = K3S_IMAGE_ARCHITECTURES[architecture]
+        checksums = self._parse_checksums(
+            self._get_text(f"{release}/sha256sum-{image_architecture}.txt")
+        )
+        binary = K3S_BINARY_NAMES[architecture]
+        images = f"k3s-airgap-images-{image_architecture}.tar.zst"
+        for name in (binary, images):
+            if name not in checksums:
+                raise BundleError(f"k3s {version} publishes no {name} for {architecture}")
+        return [
+            {"url": K3S_SCRIPT, "name": "k3s_install.sh", "role": "k3s-script"},
+            {
+                "url": f"{release}/{binary}",
+                "name": "k3s",
+                "role": "k3s-binary",
+                "sha256": checksums[binary]
+            },
+            {
+                "url": f"{release}/{images}",
+                "name": images,
+                "role": "k3s-images",
+                "sha256": checksums[images]
+            }
+        ]
+
+    def resolve(self, plans: list[str], architecture: str, versions: dict = None) -> list[dict]:
+        """ Return the artifacts needed by the plans: [{url, name, role, sha256?, content?}]
+        versions ({"k3s": ..., "kubectl": ...}) pins the releases, the stable ones
+        are used otherwise and the resolved versions are written back in it.
+        """
+        if architecture not in BUNDLE_ARCHITECTURES:
+            raise BundleError(
+                f"Unsupported architecture {architecture}, expected one of: {', '.join(BUNDLE_ARCHITECTURES)}"
+            )
+        if versions is None:
+            versions = {}
+        artifacts = {}
+        for plan in plans:
+            if plan not in self.plans:
+                raise BundleError(
+                    f"Unknown plan {plan}, expected one of: {', '.join(sorted(self.plans))}"
+                )
+            for artifact in self.plans[plan](architecture, versions):
+                artifacts.setdefault(artifact["url"], artifact)
+        return list(artifacts.values())
+
+    def _add_file(self, archive: zipfile.ZipFile, path: str, member: str) -> None:
+        """ Add a file to the archive, deflated unless it is already compressed """
+        compression = zipfile.ZIP_DEFLATED
+        if member.endswith(BUNDLE_STORED_SUFFIXES) is True:
+            compression = zipfile.ZIP_STORED
+        archive.write(path, member, compress_type=compression)
+
+    def build(self, plans: list[str], architecture: str, output: str, versions: dict = None, on_artifact: callable = None) -> dict:
+        """ Download the artifacts of the plans and write the bundle to output
+        The downloads go through the artifact cache, so a rebuild only fetches
+        what changed. on_artifact(artifact, entry) is called after each one.
+        Returns the manifest of the bundle.
+        """
+        if self.cache is None:
+            from .artifact_cache import get_artifact_cache
+            self.cache = get_artifact_cache()
+        if versions is None:
+            versions = {}
+        artifacts = self.resolve(plans, architecture, versions)
+        output = os.path.abspath(os.path.expanduser(output))
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "created_at": time.time(),
+            "plans": plans,
+            "architecture": architecture,
+            "versions": versions,
+            "artifacts": {}
+        }
+        tmp_output = f"{output}.{os.getpid()}.part"
+        folder = tempfile.mkdtemp(prefix="contopssync-bundle-")
+        try:
+            with zipfile.ZipFile(tmp_output, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for artifact in artifacts:
+                    path = os.path.join(folder, artifact["name"])
+                    if "content" in artifact:
+                        with open(path, "w", encoding="utf-8", newline="\n") as file:
+                            file.write(artifact["content"])
+                        with open(path, "rb") as file:
+                            entry = {
+                                "sha256": hashlib.sha256(file.read()).hexdigest(),
+                                "size": os.path.getsize(path)
+                            }
+                    else:
+                        entry = self.cache.fetch(
+                            artifact["url"],
+                            path,
+                            self.manager,
+                            artifact.get("sha256", "")
+                        )
+                    member = f"artifacts/{entry['sha256'][:16]}/{artifact['name']}"
+                    self._add_file(archive, path, member)
+                    os.remove(path)
+                    manifest["artifacts"][artifact["url"]] = {
+                        "name": artifact["name"],
+                        "role": artifact["role"],
+                        "member": member,
+                        "sha256": entry["sha256"],
+                        "size": entry["size"]
+                    }
+                    if on_artifact is not None:
+                        on_artifact(artifact, entry)
+                archive.writestr(BUNDLE_MANIFEST, json.dumps(manifest, indent=4))
+            os.replace(tmp_output, output)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+        return manifest
+
+
+# The bundle the downloads are answered from (None: the network is used)
+_ACTIVE_BUNDLE = None
+
+
+def set_active_bundle(path: str) -> OfflineBundle:
+    """ Answer the downloads from the bundle at path ("" goes back to the network) """
+    global _ACTIVE_BUNDLE
+    if path == "":
+        _ACTIVE_BUNDLE = None
+        return None
+    _ACTIVE_BUNDLE = OfflineBundle(path)
+    return _ACTIVE_BUNDLE
+
+
+def get_active_bundle() -> OfflineBundle:
+    """ Return the active bundle, the one named by $CONTOPSSYNC_BUNDLE if none was set """
+    global _ACTIVE_BUNDLE
+    if _ACTIVE_BUNDLE is None and os.environ.get(BUNDLE_ENV, "") != "":
+        _ACTIVE_BUNDLE = OfflineBundle(os.environ[BUNDLE_ENV])
+    return _ACTIVE_BUNDLE
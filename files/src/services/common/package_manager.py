@@ -0,0 +1,305 @@
+"""
+File in charge of the package managers of the host (apt, dnf, pacman, yay, snap, brew and pip)
+Each package manager is detected once, through the tool cache. The installers
+request the packages they need and the requests are applied together: one
+transaction per package manager (and per set of options) instead of one per
+package. The package index is refreshed at most once, not at all when apt
+refreshed it recently, the packages already installed are left out, and apt
+waits for the lock of another upgrade instead of failing on it.
+"""
+
+import os
+import time
+import threading
+from .process_runner import ProcessRunner, ProcessResult
+from .tool_cache import get_tool_cache
+
+APT_LISTS_FOLDER = "/var/lib/apt/lists"
+# ---- An index refreshed less than this many seconds ago is used as is ----
+APT_REFRESH_AGE = 6 * 3600
+# ---- Seconds apt waits for the lock held by another upgrade ----
+APT_LOCK_TIMEOUT = 300
+# ---- The system packages providing pip3, by package manager ----
+PIP_PACKAGES = {
+    "apt": ["python3-pip"],
+    "dnf": ["python3-pip"],
+    "pacman": ["python-pip"]
+}
+
+
+class PackageManagerError(Exception):
+    """ Raised when packages are requested from a package manager that can not be used """
+
+
+class PackageManager:
+    """ The commands of a package manager """
+
+    def __init__(self, name: str, tool: str, install: list, query: list = None, installed_marker: str = "", refresh: list = None, as_admin: bool = True, batch_options: bool = True) -> None:
+        self.name = name
+        self.tool = tool
+        self.install = list(install)
+        self.query = list(query or [])
+        # ---- A query line names an installed package only when it contains the marker ----
+        self.installed_marker = installed_marker
+        self.refresh = list(refresh or [])
+        self.as_admin = as_admin
+        # ---- False when the options only apply to one package per command (snap --classic) ----
+        self.batch_options = batch_options
+
+
+PACKAGE_MANAGERS = (
+    PackageManager(
+        "apt",
+        "apt-get",
+        [
+            "env", "DEBIAN_FRONTEND=noninteractive",
+            "apt-get", "-o", f"DPkg::Lock::Timeout={APT_LOCK_TIMEOUT}", "install", "-y"
+        ],
+        query=["dpkg-query", "-W", "-f=${Package} ${Status}\n"],
+        installed_marker=" ok installed",
+        refresh=["apt-get", "-o", f"DPkg::Lock::Timeout={APT_LOCK_TIMEOUT}", "update"]
+    ),
+    PackageManager("dnf", "dnf", ["dnf", "install", "-y"], query=["rpm", "-q", "--qf", "%{NAME}\n"]),
+    # ---- pacman and yay are never refreshed alone: a partial upgrade breaks Arch ----
+    PackageManager("pacman", "pacman", ["pacman", "-S", "--needed", "--noconfirm"], query=["pacman", "-Q"]),
+    PackageManager(
+        "yay",
+        "yay",
+        ["yay", "-S", "--needed", "--noconfirm"],
+        query=["yay", "-Q"],
+        as_admin=False
+    ),
+    PackageManager("snap", "snap", ["snap", "install"], query=["snap", "list"], batch_options=False),
+    PackageManager(
+        "brew",
+        "brew",
+        ["brew", "install"],
+        query=["brew", "list", "--versions"],
+        as_admin=False
+    ),
+    PackageManager("pip", "pip3", ["pip3", "install"], query=["pip3", "list", "--format=freeze"])
+)
+
+
+class PackageTransaction:
+    """ The packages installed by one command of a package manager """
+
+    def __init__(self, manager: str, packages: list, options: list = None, reasons: list = None) -> None:
+        self.manager = manager
+        self.packages = list(packages)
+        self.options = list(options or [])
+        self.reasons = list(reasons or [])
+        self.already_installed = []
+        self.refreshed = False
+        self.result = None
+        self.error = ""
+
+    @property
+    def ok(self) -> bool:
+        """ True when the packages are installed """
+        return self.error == "" and (self.result is None or self.result.ok is True)
+
+
+class PackageBackend:
+    """ Detect the package managers once and install the requested packages in batches """
+
+    def __init__(self, runner: ProcessRunner = None, tool_cache: any = None, managers: tuple = PACKAGE_MANAGERS, apt_lists_folder: str = APT_LISTS_FOLDER) -> None:
+        self.runner = runner if runner is not None else ProcessRunner()
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_cache()
+        self.managers = {manager.name: manager for manager in managers}
+        self.apt_lists_folder = apt_lists_folder
+        self.available = {}
+        self.refreshed = []
+        # ---- Pending requests: (manager, options) -> {"packages": [...], "reasons": [...]} ----
+        self.pending = {}
+        self.lock = threading.RLock()
+
+    # ---- Detection ----
+
+    def is_available(self, manager: str) -> bool:
+        """ Return True when the package manager can be used (probed once) """
+        with self.lock:
+            if manager not in self.available:
+                self.available[manager] = (
+                    manager in self.managers
+                    and self.tool_cache.is_installed(self.managers[manager].tool) is True
+                )
+            return self.available[manager]
+
+    def get_available(self) -> list[str]:
+        """ Return the package managers that can be used, the preferred first """
+        return [name for name in self.managers if self.is_available(name) is True]
+
+    def get_preferred(self, candidates: dict) -> str:
+        """ Return the first available manager of candidates ({manager: packages}), "" when none is """
+        for manager in candidates:
+            if self.is_available(manager) is True:
+                return manager
+        return ""
+
+    def forget(self) -> None:
+        """ Detect the package managers again (one was installed by other means) """
+        with self.lock:
+            self.available = {}
+
+    # ---- Requests ----
+
+    def request(self, manager: str, packages: list, options: list = None, reason: str = "") -> None:
+        """ Add packages to the next transaction of manager """
+        if self.is_available(manager) is False:
+            raise PackageManagerError(f"{manager} is not available on this machine")
+        key = (manager, tuple(options or []))
+        with self.lock:
+            entry = self.pending.setdefault(key, {"packages": [], "reasons": []})
+            entry["packages"] += [name for name in packages if name not in entry["packages"]]
+            if reason != "" and reason not in entry["reasons"]:
+                entry["reasons"].append(reason)
+
+    def get_pending(self) -> list[PackageTransaction]:
+        """ Return the transactions the pending requests make, in the order of the managers """
+        transactions = []
+        with self.lock:
+            for name, manager in self.managers.items():
+                for (requested, options), entry in self.pending.items():
+                    if requested != name:
+                        continue
+                    if manager.batch_options is True or len(options) == 0:
+                        transactions.append(
+                            PackageTransaction(name, entry["packages"], options, entry["reasons"])
+                        )
+                        continue
+                    transactions += [
+                        PackageTransaction(name, [package], options, entry["reasons"])
+                        for package in entry["packages"]
+                    ]
+        return transactions
+
+    # ---- Transactions ----
+
+    def get_missing(self, manager: str, packages: list) -> list[str]:
+        """ Return the packages that are not installed yet (all of them when it can not be known) """
+        query = self.managers[manager].query
+        if len(query) == 0:
+            return list(packages)
+        result = self.runner.run(query + list(packages))
+        installed = []
+        marker = self.managers[manager].installed_marker
+        for line in result.stdout.splitlines():
+            if line.strip() == "" or marker not in line:
+                continue
+            installed.append(line.split()[0].split("==")[0].lower())
+        return [name for name in packages if name.lower() not in installed]
+
+    def _is_index_fresh(self, manager: str) -> bool:
+        """ Return True when the package index of manager does not need a refresh """
+        if manager in self.refreshed:
+            return True
+        if manager != "apt":
+            return False
+        try:
+            age = time.time() - os.stat(self.apt_lists_folder).st_mtime
+        except OSError:
+            return False
+        return age < APT_REFRESH_AGE
+
+    def _refresh(self, manager: str, stream: bool) -> ProcessResult:
+        """ Refresh the package index of manager """
+        result = self.runner.run(self.managers[manager].refresh, as_admin=True, stream=stream)
+        if result.ok is True:
+            self.refreshed.append(manager)
+        return result
+
+    def _apply_transaction(self, transaction: PackageTransaction, stream: bool) -> None:
+        """ Install the missing packages of a transaction """
+        manager = self.managers[transaction.manager]
+        missing = self.get_missing(manager.name, transaction.packages)
+        transaction.already_installed = [name for name in transaction.packages if name not in missing]
+        if len(missing) == 0:
+            return
+        fresh = True
+        if len(manager.refresh) > 0 and self._is_index_fresh(manager.name) is False:
+            fresh = False
+            result = self._refresh(manager.name, stream)
+            if result.ok is False:
+                transaction.result = result
+                transaction.error = f"Error refreshing the {manager.name} index: {result.stderr.strip()}"
+                return
+            transaction.refreshed = True
+        argv = manager.install + transaction.options + missing
+        transaction.result = self.runner.run(argv, as_admin=manager.as_admin, stream=stream)
+        if transaction.result.ok is False and fresh is True and len(manager.refresh) > 0 and manager.name not in self.refreshed:
+            # ---- The index was recent but may still miss a package: refresh once and try again ----
+            if self._refresh(manager.name, stream).ok is True:
+                transaction.refreshed = True
+                transaction.result = self.runner.run(argv, as_admin=manager.as_admin, stream=stream)
+        if transaction.result.ok is False:
+            transaction.error = f"Error installing {' '.join(missing)} with {manager.name}"
+
+    def apply(self, stream: bool = True) -> list[PackageTransaction]:
+        """ Run the pending requests, one transaction per package manager, returns the transactions """
+        with self.lock:
+            transactions = self.get_pending()
+            self.pending = {}
+            for transaction in transactions:
+                self._apply_transaction(transaction, stream)
+        if any(len(transaction.packages) > len(transaction.already_installed) for transaction in transactions):
+            # ---- The tools of the new packages are looked for right after (pip3 from python3-pip) ----
+            self.tool_cache.invalidate()
+            with self.lock:
+                self.available = {name: True for name, found in self.available.items() if found is True}
+        return transactions
+
+    def install(self, manager: str, packages: list, options: list = None, reason: str = "", stream: bool = True) -> list[PackageTransaction]:
+        """ Request packages and apply them with the other pending requests """
+        self.request(manager, packages, options, reason)
+        return self.apply(stream)
+
+    # ---- Tty ----
+
+    def is_available_on_tty(self, tty: any, manager: str) -> bool:
+        """ Check a package manager and report it on the tty """
+        tty.print_on_tty(tty.info_colour, f"Checking if the user has {manager} installed:")
+        if self.is_available(manager) is False:
+            tty.print_on_tty(tty.error_colour, "[KO]\n")
+            tty.current_tty_status = tty.error
+            return False
+        tty.print_on_tty(tty.success_colour, "[OK]\n")
+        tty.current_tty_status = tty.success
+        return True
+
+    def apply_on_tty(self, tty: any) -> int:
+        """ Apply the pending requests and report every transaction on the tty, returns the tty status """
+        status = tty.success
+        for transaction in self.apply(stream=True):
+            label = " ".join(transaction.options + transaction.packages)
+            tty.print_on_tty(tty.info_colour, f"Installation status ({transaction.manager} {label}):")
+            if transaction.ok is False:
+                tty.print_on_tty(tty.error_colour, "[KO]\n")
+                tty.print_on_tty(tty.error_colour, f"{transaction.error}\n")
+                status = tty.error
+                continue
+            tty.print_on_tty(tty.success_colour, "[OK]\n")
+        tty.current_tty_status = status
+        return status
+
+    def install_on_tty(self, tty: any, manager: str, packages: list, options: list = None, reason: str = "") -> int:
+        """ Install packages with the pending requests and report them on the tty, returns the tty status """
+        try:
+            self.request(manager, packages, options, reason)
+        except PackageManagerError as err:
+            tty.print_on_tty(tty.error_colour, f"{err}\n")
+            tty.current_tty_status = tty.error
+            return tty.current_tty_status
+        return self.apply_on_tty(tty)
+
+
+# The package managers of the host
+_PACKAGE_BACKEND = None
+
+
+def get_package_backend() -> PackageBackend:
+    """ Return the package managers of the host """
+    global _PACKAGE_BACKEND
+    if _PACKAGE_BACKEND is None:
+        _PACKAGE_BACKEND = PackageBackend()
+    return _PACKAGE_BACKEND
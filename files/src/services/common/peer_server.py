@@ -0,0 +1,352 @@
+"""
+File in charge of sharing the downloaded artifacts between the nodes of a cluster
+The master runs a small http server backed by its artifact cache, the agents
+ask it for the installer files first and only go to the internet when the
+master does not have them. N internet downloads become one download and N
+transfers on the local network.
+Endpoints:
+    GET /index                  {url: {sha256, size, role, architecture}}
+    GET /artifact?url=<url>     the cached content of url (Range, ETag and If-None-Match supported)
+"""
+
+import os
+import json
+import threading
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from .download_manager import DownloadManager, DownloadError, get_download_manager
+
+PEER_PORT = 8751
+PEER_ENV = "CONTOPSSYNC_PEER"
+PEER_PROBE_TIMEOUT = 2
+PEER_COPY_SIZE = 1024 * 1024
+
+
+class _PeerRequestHandler(BaseHTTPRequestHandler):
+    """ Answer the requests of the agents """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "contopssync-peer"
+
+    def log_message(self, *args) -> None:
+        """ Do not log the requests on the tty """
+
+    def _send_json(self, content: any, status: int = 200) -> None:
+        """ Answer with a json body """
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _get_span(self, size: int, etag: str) -> tuple:
+        """ Return the (start, end) asked by a Range header, None for the whole file, () if unsatisfiable """
+        requested = self.headers.get("Range", "")
+        if requested.startswith("bytes=") is False or "," in requested:
+            return None
+        if self.headers.get("If-Range", etag) != etag:
+            return None
+        first, _, last = requested[6:].partition("-")
+        try:
+            if first == "":
+                start, end = max(0, size - int(last)), size - 1
+            else:
+                start, end = int(first), min(int(last or size - 1), size - 1)
+        except ValueError:
+            return None
+        if start > end or start >= size:
+            return ()
+        return start, end
+
+    def _send_artifact(self, url: str) -> None:
+        """ Answer with the cached content of url """
+        entry = self.server.peer.lookup(url)
+        path = ""
+        if entry is not None:
+            path = self.server.peer.cache.get_object_path(entry["sha256"])
+        if entry is None or os.path.isfile(path) is False:
+            self._send_json({"error": f"{url} is not cached"}, 404)
+            return
+        size = os.path.getsize(path)
+        etag = f'"{entry["sha256"]}"'
+        if self.headers.get("If-None-Match", "") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        span = self._get_span(size, etag)
+        if span == ():
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = span if span is not None else (0, size - 1)
+        self.send_response(206 if span is not None else 200)
+        if span is not None:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("ETag", etag)
+        self.send_header("X-Content-Sha256", entry["sha256"])
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        left = end - start + 1
+        with open(path, "rb") as file:
+            file.seek(start)
+            while left > 0:
+                block = file.read(min(PEER_COPY_SIZE, left))
+                if block == b"":
+                    break
+                self.wfile.write(block)
+                left -= len(block)
+
+    def do_GET(self) -> None:
+        """ Route a request """
+        parsed = urlsplit(self.path)
+        if parsed.path == "/index":
+            self._send_json(self.server.peer.get_index())
+            return
+        if parsed.path == "/artifact":
+            urls = parse_qs(parsed.query).get("url", [])
+            if len(urls) == 1:
+                self._send_artifact(urls[0])
+                return
+        self._send_json({"error": "not found"}, 404)
+
+    def do_HEAD(self) -> None:
+        """ Route a request without sending the body """
+        self.do_GET()
+
+
+class ArtifactPeerServer:
+    """ Serve the artifact cache of this node to the other nodes of the cluster """
+
+    def __init__(self, cache: any = None) -> None:
+        self.cache = cache
+        if self.cache is None:
+            from .artifact_cache import get_artifact_cache
+            self.cache = get_artifact_cache()
+        # ---- url -> {role, architecture} of the artifacts prefetched for the agents ----
+        self.roles = {}
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """ True while the server answers requests """
+        return self.server is not None
+
+    @property
+    def port(self) -> int:
+        """ The port the server listens on (0 when stopped) """
+        if self.server is None:
+            return 0
+        return self.server.server_address[1]
+
+    def lookup(self, url: str) -> dict:
+        """ Return the cache entry of url (a trailing / is ignored), None if it is not cached """
+        index = self.cache.load_index()
+        entry = index.get(url)
+        if entry is None:
+            entry = index.get(url.rstrip("/"))
+        return entry
+
+    def get_index(self) -> dict:
+        """ Return the artifacts served: {url: {sha256, size, role, architecture}} """
+        index = {}
+        for url, entry in self.cache.load_index().items():
+            if os.path.isfile(self.cache.get_object_path(entry["sha256"])) is False:
+                continue
+            role = self.roles.get(url, {})
+            index[url] = {
+                "sha256": entry["sha256"],
+                "size": entry.get("size", 0),
+                "role": role.get("role", ""),
+                "architecture": role.get("architecture", "")
+            }
+        return index
+
+    def prefetch(self, plans: list[str], architectures: list[str], builder: any = None, on_artifact: callable = None) -> list[dict]:
+        """ Download the artifacts of install plans for the agents (the ones the installers do not fetch themselves)
+        The plans are resolved by a BundleBuilder. Returns the artifacts,
+        on_artifact(artifact, entry) is called after each one.
+        """
+        if builder is None:
+            from .offline_bundle import BundleBuilder
+            builder = BundleBuilder(get_download_manager(), self.cache)
+        fetched = []
+        for architecture in architectures:
+            for artifact in builder.resolve(plans, architecture):
+                if "content" in artifact:
+                    continue
+                entry = self.cache.fetch(
+                    artifact["url"],
+                    "",
+                    builder.manager,
+                    artifact.get("sha256", "")
+                )
+                with self.lock:
+                    self.roles[artifact["url"]] = {
+                        "role": artifact["role"],
+                        "architecture": architecture
+                    }
+                fetched.append(artifact)
+                if on_artifact is not None:
+                    on_artifact(artifact, entry)
+        return fetched
+
+    def start(self, port: int = PEER_PORT, host: str = "0.0.0.0") -> int:
+        """ Serve the cache in a background thread, returns the port (0 to let the system choose one) """
+        with self.lock:
+            if self.server is not None:
+                return self.port
+            server = ThreadingHTTPServer((host, port), _PeerRequestHandler)
+            server.daemon_threads = True
+            server.peer = self
+            self.server = server
+            self.thread = threading.Thread(
+                target=server.serve_forever,
+                name="artifact-peer-server",
+                daemon=True
+            )
+            self.thread.start()
+            return self.port
+
+    def stop(self) -> None:
+        """ Stop serving """
+        with self.lock:
+            if self.server is None:
+                return
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = None
+            self.thread = None
+
+
+class PeerSource:
+    """ The artifact server of another node, asked before the internet """
+
+    def __init__(self, base_url: str, architecture: str = "", manager: DownloadManager = None) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.architecture = architecture
+        self.manager = manager
+        if self.manager is None:
+            self.manager = get_download_manager()
+        self.index = {}
+
+    def probe(self) -> dict:
+        """ Load the index of the peer, raises DownloadError if it can not be reached """
+        import requests
+        try:
+            response = self.manager.get_session().get(
+                f"{self.base_url}/index",
+                timeout=PEER_PROBE_TIMEOUT
+            )
+            response.raise_for_status()
+            index = response.json()
+        except (requests.RequestException, ValueError) as error:
+            raise DownloadError(f"The artifact server {self.base_url} is not reachable: {error}") from error
+        if isinstance(index, dict) is False:
+            raise DownloadError(f"{self.base_url} is not an artifact server")
+        self.index = index
+        return index
+
+    def _find(self, url: str) -> dict:
+        """ Return the index entry of url (a trailing / is ignored), None if the peer does not have it """
+        entry = self.index.get(url)
+        if entry is None:
+            entry = self.index.get(url.rstrip("/"))
+        return entry
+
+    def has(self, url: str) -> bool:
+        """ Return True if the peer serves url """
+        return self._find(url) is not None
+
+    def get_sha256(self, url: str) -> str:
+        """ Return the sha256 of url on the peer ("" if it does not have it) """
+        entry = self._find(url)
+        return entry["sha256"] if entry is not None else ""
+
+    def get_artifact_url(self, url: str) -> str:
+        """ Return the address of url on the peer """
+        if url not in self.index and url.rstrip("/") in self.index:
+            url = url.rstrip("/")
+        return f"{self.base_url}/artifact?url={quote(url, safe='')}"
+
+    def get_entries(self, role: str = "") -> list[dict]:
+        """ Return the artifacts the peer prefetched for this architecture (only the ones of a role if given) """
+        return [
+            dict(entry, url=url) for url, entry in self.index.items()
+            if entry.get("role", "") != ""
+            and (role == "" or entry["role"] == role)
+            and (self.architecture == "" or entry.get("architecture", "") == self.architecture)
+        ]
+
+    def extract_role(self, role: str, folder: str) -> list[str]:
+        """ Download the artifacts of a role from the peer in folder, returns their paths """
+        paths = []
+        for entry in self.get_entries(role):
+            path = os.path.join(folder, entry["url"].rstrip("/").rsplit("/", 1)[-1])
+            self.manager.fetch(
+                self.get_artifact_url(entry["url"]),
+                path,
+                expected_sha256=entry["sha256"]
+            )
+            paths.append(path)
+        return paths
+
+
+# The artifact server of this node
+_PEER_SERVER = None
+# The artifact server asked before the internet (None: the internet is used directly)
+_PEER_SOURCE = None
+# ---- $CONTOPSSYNC_PEER is only probed once ----
+_PEER_ENV_CHECKED = False
+
+
+def get_peer_server() -> ArtifactPeerServer:
+    """ Return the artifact server of this node """
+    global _PEER_SERVER
+    if _PEER_SERVER is None:
+        _PEER_SERVER = ArtifactPeerServer()
+    return _PEER_SERVER
+
+
+def set_peer_source(base_url: str, architecture: str = "") -> PeerSource:
+    """ Ask the artifact server at base_url before the internet ("" stops asking it)
+    The artifacts prefetched for another architecture than this machine's one
+    are ignored. DownloadError is raised (and no peer is used) if it can not be
+    reached.
+    """
+    global _PEER_SOURCE
+    global _PEER_ENV_CHECKED
+    _PEER_SOURCE = None
+    _PEER_ENV_CHECKED = True
+    if base_url == "":
+        return None
+    if architecture == "":
+        from .host_facts import get_host_facts
+        from .offline_bundle import get_bundle_architecture
+        architecture = get_bundle_architecture(get_host_facts().machine)
+    source = PeerSource(base_url, architecture)
+    source.probe()
+    _PEER_SOURCE = source
+    return _PEER_SOURCE
+
+
+def get_peer_source() -> PeerSource:
+    """ Return the artifact server asked before the internet, the one named by $CONTOPSSYNC_PEER if none was set """
+    if _PEER_ENV_CHECKED is False and os.environ.get(PEER_ENV, "") != "":
+        try:
+            set_peer_source(os.environ[PEER_ENV])
+        except DownloadError:
+            pass
+    return _PEER_SOURCE
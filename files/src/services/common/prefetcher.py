@@ -0,0 +1,204 @@
+"""
+File in charge of downloading the artifacts of an installer while it prepares the machine
+The installer declares the files it will need before its preparation steps
+(board setup, dependencies), they are downloaded in the background into the
+artifact cache and the step needing one only waits if it is not there yet.
+The wall time of the downloads (from the first start to the last end) and the
+time the steps waited tell how much wall time the overlap saved.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .download_manager import DownloadManager, DownloadError
+
+PREFETCH_WORKERS = 2
+
+
+class ArtifactPrefetcher:
+    """ Download the declared artifacts in the background """
+
+    def __init__(self, manager: DownloadManager = None, cache: any = None, architecture: str = "", max_workers: int = PREFETCH_WORKERS) -> None:
+        self.manager = manager
+        if self.manager is None:
+            # ---- No progress bars in the middle of the preparation steps ----
+            self.manager = DownloadManager(show_progress=False)
+        self.cache = cache
+        if self.cache is None:
+            from .artifact_cache import get_artifact_cache
+            self.cache = get_artifact_cache()
+        self.architecture = architecture
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers),
+            thread_name_prefix="prefetch"
+        )
+        # ---- url -> {future, role, started, finished, waited} ----
+        self.jobs = {}
+        self.plan_futures = []
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def declare(self, url: str, expected_sha256: str = "", checksum_url: str = "", role: str = "") -> None:
+        """ Start downloading url in the background (once) """
+        with self.lock:
+            if url in self.jobs:
+                return
+            job = {"role": role, "started": None, "finished": None, "waited": 0.0}
+            self.jobs[url] = job
+            job["future"] = self.pool.submit(
+                self._download, url, job, expected_sha256, checksum_url
+            )
+
+    def declare_plan(self, plans: list[str], architecture: str, builder: any = None) -> None:
+        """ Resolve install plans (see BundleBuilder) in the background and declare their artifacts """
+        with self.lock:
+            self.plan_futures.append(
+                self.pool.submit(self._resolve, plans, architecture, builder)
+            )
+
+    def _resolve(self, plans: list[str], architecture: str, builder: any) -> None:
+        """ Declare the artifacts of install plans """
+        if builder is None:
+            from .offline_bundle import BundleBuilder
+            builder = BundleBuilder(self.manager, self.cache)
+        for artifact in builder.resolve(plans, architecture):
+            if "content" not in artifact:
+                self.declare(
+                    artifact["url"],
+                    artifact.get("sha256", ""),
+                    role=artifact["role"]
+                )
+
+    def _download(self, url: str, job: dict, expected_sha256: str, checksum_url: str) -> dict:
+        """ Fetch an artifact into the cache and time it """
+        job["started"] = time.perf_counter()
+        try:
+            return self.manager.fetch_artifact(
+                url,
+                "",
+                expected_sha256,
+                checksum_url,
+                cache=self.cache
+            )
+        finally:
+            job["finished"] = time.perf_counter()
+
+    def _find(self, url: str) -> dict:
+        """ Return the job of url (a trailing / is ignored), None if it was not declared """
+        with self.lock:
+            job = self.jobs.get(url)
+            if job is None:
+                job = self.jobs.get(url.rstrip("/"))
+            return job
+
+    def has(self, url: str) -> bool:
+        """ Return True if url was declared """
+        return self._find(url) is not None
+
+    def _add_waited(self, job: dict, waited: float) -> None:
+        """ Count the time an install step waited """
+        with self.lock:
+            self.waited += waited
+            if job is not None:
+                job["waited"] += waited
+
+    def wait_for_plans(self) -> None:
+        """ Wait until the declared plans are resolved """
+        start = time.perf_counter()
+        with self.lock:
+            futures = list(self.plan_futures)
+        for future in futures:
+            try:
+                future.result()
+            except (DownloadError, OSError):
+                pass
+        self._add_waited(None, time.perf_counter() - start)
+
+    def wait(self, url: str) -> dict:
+        """ Wait for the download of url, returns its cache entry (None if it failed or was not declared) """
+        job = self._find(url)
+        if job is None:
+            return None
+        start = time.perf_counter()
+        try:
+            entry = job["future"].result()
+        except (DownloadError, OSError):
+            entry = None
+        self._add_waited(job, time.perf_counter() - start)
+        return entry
+
+    def get_entries(self, role: str = "") -> list[dict]:
+        """ Return the declared artifacts (only the ones of a role if given) """
+        self.wait_for_plans()
+        with self.lock:
+            return [
+                {"url": url, "role": job["role"]} for url, job in self.jobs.items()
+                if role == "" or job["role"] == role
+            ]
+
+    def extract_role(self, role: str, folder: str) -> list[str]:
+        """ Wait for the artifacts of a role and copy them in folder, returns their paths """
+        paths = []
+        for entry in self.get_entries(role):
+            if self.wait(entry["url"]) is None:
+                raise DownloadError(f"{entry['url']} could not be prefetched")
+            path = os.path.join(folder, entry["url"].rstrip("/").rsplit("/", 1)[-1])
+            if self.cache.restore(entry["url"], path) is None:
+                raise DownloadError(f"{entry['url']} is no longer in the cache")
+            paths.append(path)
+        return paths
+
+    def get_report(self) -> dict:
+        """ Return {artifacts, failed, download_time, waited_time, saved_time} (in seconds)
+        download_time is the wall time of the prefetch window: the downloads run
+        in parallel, their durations are not added up.
+        """
+        with self.lock:
+            jobs = list(self.jobs.values())
+            waited = self.waited
+        started = [job["started"] for job in jobs if job["started"] is not None]
+        finished = [job["finished"] for job in jobs if job["finished"] is not None]
+        download_time = 0.0
+        if len(started) > 0 and len(finished) > 0:
+            download_time = max(finished) - min(started)
+        failed = [
+            job for job in jobs
+            if job["future"].done() is True and job["future"].exception() is not None
+        ]
+        return {
+            "artifacts": len(jobs),
+            "failed": len(failed),
+            "download_time": download_time,
+            "waited_time": waited,
+            "saved_time": max(0.0, download_time - waited)
+        }
+
+    def format_report(self) -> str:
+        """ Describe the time the overlap saved """
+        report = self.get_report()
+        return (
+            f"Prefetch: {report['artifacts']} artifact(s) downloaded in {report['download_time']:.1f} s "
+            f"during the preparation, the install waited {report['waited_time']:.1f} s for them "
+            f"({report['saved_time']:.1f} s saved)\n"
+        )
+
+    def close(self) -> None:
+        """ Drop the downloads that did not start, the running ones end in the background """
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+# The prefetcher the downloads wait for (None: nothing is prefetched)
+_ACTIVE_PREFETCHER = None
+
+
+def set_active_prefetcher(prefetcher: ArtifactPrefetcher) -> ArtifactPrefetcher:
+    """ Make the downloads of the declared urls wait for the prefetcher (None stops it) """
+    global _ACTIVE_PREFETCHER
+    _ACTIVE_PREFETCHER = prefetcher
+    return _ACTIVE_PREFETCHER
+
+
+def get_active_prefetcher() -> ArtifactPrefetcher:
+    """ Return the prefetcher the downloads wait for """
+    return _ACTIVE_PREFETCHER
@@ -0,0 +1,165 @@
+"""
+File in charge of running the external programs
+The commands are given as an argv list and started without a shell, their
+output is captured in memory (and can be streamed line by line while the
+program runs) and a structured result is returned instead of a shell status.
+"""
+
+import os
+import sys
+import time
+import threading
+import subprocess
+
+PROCESS_NOT_FOUND = 127
+PROCESS_TIMED_OUT = 124
+
+
+class ProcessResult:
+    """ The outcome of a program run by the ProcessRunner """
+
+    def __init__(self, argv: list, returncode: int, stdout: str = "", stderr: str = "", duration: float = 0.0, timed_out: bool = False) -> None:
+        self.argv = argv
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.duration = duration
+        self.timed_out = timed_out
+
+    @property
+    def ok(self) -> bool:
+        """ True if the program exited with 0 """
+        return self.returncode == 0
+
+    @property
+    def lines(self) -> list[str]:
+        """ The non empty lines printed on the standard output """
+        return [line for line in self.stdout.splitlines() if line.strip() != ""]
+
+    def to_dict(self) -> dict:
+        """ Convert the result into a dictionary that can be saved as json """
+        return {
+            "argv": self.argv,
+            "returncode": self.returncode,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "duration": self.duration,
+            "timed_out": self.timed_out
+        }
+
+
+class ProcessRunner:
+    """ Run argv lists without a shell and capture their output """
+
+    def __init__(self, default_timeout: float = None) -> None:
+        self.default_timeout = default_timeout
+        self.is_windows = os.name == "nt"
+
+    def get_admin_prefix(self) -> list[str]:
+        """ Return the argv prefix needed to run a program as administrator """
+        if self.is_windows is True:
+            return []
+        if hasattr(os, "geteuid") is True and os.geteuid() == 0:
+            return []
+        return ["sudo"]
+
+    def _pump(self, pipe, buffer: list, output, on_line) -> None:
+        """ Read a pipe line by line, store the lines and forward them """
+        for line in iter(pipe.readline, ""):
+            buffer.append(line)
+            if output is not None:
+                output.write(line)
+                output.flush()
+            if on_line is not None:
+                on_line(line)
+        pipe.close()
+
+    def _wait(self, process: subprocess.Popen, readers: list, timeout: float) -> tuple:
+        """ Wait for a program and its output, returns (its exit code, True if it was killed after timeout) """
+        timed_out = False
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            process.kill()
+            process.wait()
+            returncode = PROCESS_TIMED_OUT
+        for reader in readers:
+            # ---- A killed program can leave children holding the pipes ----
+            reader.join(1 if timed_out is True else None)
+        return returncode, timed_out
+
+    def run(self, argv: list, as_admin: bool = False, stream: bool = False, timeout: float = None, input_text: str = None, cwd: str = None, env: dict = None, on_line=None) -> ProcessResult:
+        """ Run a program and return its result
+        stream prints the output while the program runs (it is captured either way),
+        on_line is called with every line of the standard output.
+        """
+        argv = [str(item) for item in argv]
+        if as_admin is True:
+            argv = self.get_admin_prefix() + argv
+        if timeout is None:
+            timeout = self.default_timeout
+        start = time.perf_counter()
+        try:
+            process = subprocess.Popen(
+                argv,
+                stdin=subprocess.PIPE if input_text is not None else subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=cwd,
+                env=env,
+                text=True,
+                errors="replace"
+            )
+        except OSError as error:
+            return ProcessResult(
+                argv,
+                PROCESS_NOT_FOUND,
+                stderr=f"{error}\n",
+                duration=time.perf_counter() - start
+            )
+        stdout = []
+        stderr = []
+        readers = [
+            threading.Thread(
+                target=self._pump,
+                args=(
+                    process.stdout,
+                    stdout,
+                    sys.stdout if stream is True else None,
+                    on_line
+                ),
+                daemon=True
+            ),
+            threading.Thread(
+                target=self._pump,
+                args=(
+                    process.stderr,
+                    stderr,
+                    sys.stderr if stream is True else None,
+                    None
+                ),
+                daemon=True
+            )
+        ]
+        for reader in readers:
+            reader.start()
+        if input_text is not None:
+            try:
+                process.stdin.write(input_text)
+                process.stdin.close()
+            except OSError:
+                pass
+        returncode, timed_out = self._wait(process, readers, timeout)
+        return ProcessResult(
+            argv,
+            returncode,
+            stdout="".join(stdout),
+            stderr="".join(stderr),
+            duration=time.perf_counter() - start,
+            timed_out=timed_out
+        )
+
+    def run_as_admin(self, argv: list, **kwargs) -> ProcessResult:
+        """ Run a program as administrator (sudo when not already root) """
+        return self.run(argv, as_admin=True, **kwargs)
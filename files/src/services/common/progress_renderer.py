@@ -0,0 +1,117 @@
+"""
+File in charge of displaying the progress of the downloads
+The byte counters are updated for every chunk, but the line is only drawn a
+few times per second, so a slow terminal (a Raspberry Pi console, an ssh
+session) does not spend its time redrawing. When the output is not a terminal
+(a pipe, a log file), a plain line is written every few seconds instead of
+carriage returns.
+"""
+
+import sys
+import time
+import threading
+
+PROGRESS_FPS = 4
+PROGRESS_PIPE_INTERVAL = 10
+PROGRESS_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def format_bytes(size: float) -> str:
+    """ Return a size in a readable unit """
+    for unit in PROGRESS_UNITS:
+        if abs(size) < 1024 or unit == PROGRESS_UNITS[-1]:
+            if unit == "B":
+                return f"{int(size)} B"
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} {PROGRESS_UNITS[-1]}"
+
+
+class ProgressRenderer:
+    """ A progress line redrawn at a fixed frame rate """
+
+    def __init__(self, total: int = 0, initial: int = 0, label: str = "", enabled: bool = True, stream: any = None, fps: float = PROGRESS_FPS, pipe_interval: float = PROGRESS_PIPE_INTERVAL) -> None:
+        self.total = max(0, total)
+        self.initial = initial
+        self.position = initial
+        self.label = label
+        self.enabled = enabled
+        self.stream = stream if stream is not None else sys.stderr
+        try:
+            self.is_terminal = self.stream.isatty()
+        except (AttributeError, ValueError):
+            self.is_terminal = False
+        self.interval = 1 / max(fps, 0.1)
+        if self.is_terminal is False:
+            self.interval = pipe_interval
+        self.started_at = time.monotonic()
+        self.next_frame = self.started_at + self.interval
+        self.frames = 0
+        self.width = 0
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> "ProgressRenderer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def update(self, size: int) -> None:
+        """ Count size more bytes, the line is drawn when the next frame is due """
+        with self.lock:
+            self.position += size
+            if self.enabled is False:
+                return
+            now = time.monotonic()
+            if now < self.next_frame:
+                return
+            self.next_frame = now + self.interval
+            self._draw(now)
+
+    def get_line(self, now: float = None) -> str:
+        """ Return the text of the progress line """
+        if now is None:
+            now = time.monotonic()
+        elapsed = max(now - self.started_at, 1e-6)
+        rate = (self.position - self.initial) / elapsed
+        line = format_bytes(self.position)
+        if self.total > 0:
+            line = f"{line} / {format_bytes(self.total)} ({self.position * 100 // self.total} %)"
+        line = f"{line}, {format_bytes(rate)}/s"
+        if self.total > 0 and rate > 0:
+            line = f"{line}, {max(0, self.total - self.position) / rate:.0f} s left"
+        if self.label != "":
+            line = f"{self.label}: {line}"
+        return line
+
+    def _draw(self, now: float) -> None:
+        """ Write the progress line """
+        line = self.get_line(now)
+        try:
+            if self.is_terminal is True:
+                self.stream.write(f"\r{line.ljust(self.width)}")
+                self.width = len(line)
+            else:
+                self.stream.write(f"{line}\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            self.enabled = False
+            return
+        self.frames += 1
+
+    def close(self) -> None:
+        """ Draw the final state of the line """
+        with self.lock:
+            if self.closed is True:
+                return
+            self.closed = True
+            if self.enabled is False:
+                return
+            self._draw(time.monotonic())
+            if self.is_terminal is True:
+                try:
+                    self.stream.write("\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
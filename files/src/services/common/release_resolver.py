@@ -0,0 +1,273 @@
+"""
+File in charge of answering "which release of a tool should be installed"
+The latest stable version of a tool is asked to its release server once, then
+kept in memory and on disk for a while (6 hours by default,
+$CONTOPSSYNC_RELEASE_TTL in seconds), so the installers and the bundles do
+not download stable.txt again and again. A lockfile pins the versions: a
+reinstall with the same lockfile installs the same releases without asking
+any server. The versions recorded in the active bundle are used as well.
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .cache_folder import get_cache_folder
+from .download_manager import DownloadManager, DownloadError, get_download_manager
+
+RELEASE_CACHE_FILE = "releases.json"
+RELEASE_TTL = 6 * 3600
+RELEASE_TTL_ENV = "CONTOPSSYNC_RELEASE_TTL"
+RELEASE_LOCK_ENV = "CONTOPSSYNC_RELEASE_LOCK"
+RELEASE_LOCK_FORMAT = 1
+RELEASE_WORKERS = 4
+
+
+class ReleaseError(DownloadError):
+    """ Raised when the release of a tool can not be resolved """
+
+
+class ReleaseResolver:
+    """ Resolve the release of the tools through a memory and a disk cache """
+
+    def __init__(self, manager: DownloadManager = None, cache_file: str = "", ttl: float = None) -> None:
+        self.manager = manager
+        if self.manager is None:
+            self.manager = get_download_manager()
+        self.cache_file = cache_file
+        if self.cache_file == "":
+            self.cache_file = os.path.join(
+                get_cache_folder(create=False),
+                RELEASE_CACHE_FILE
+            )
+        self.ttl = ttl
+        if self.ttl is None:
+            try:
+                self.ttl = float(os.environ.get(RELEASE_TTL_ENV, RELEASE_TTL))
+            except ValueError:
+                self.ttl = RELEASE_TTL
+        # ---- tool -> callable(architecture) returning the latest stable version ----
+        self.sources = {
+            "k3s": self._resolve_k3s,
+            "kubectl": self._resolve_kubectl
+        }
+        # ---- "tool/architecture" -> {version, resolved_at} ----
+        self.memory = {}
+        # ---- The versions pinned by the lockfile: tool -> version ----
+        self.pins = {}
+        self.lockfile = ""
+        self.lock = threading.RLock()
+
+    # ---- Sources ----
+
+    def _resolve_kubectl(self, architecture: str) -> str:
+        """ The version named by stable.txt (the same for every architecture) """
+        import requests
+        from .offline_bundle import KUBERNETES_STABLE
+        try:
+            response = self.manager.get_session().get(
+                KUBERNETES_STABLE,
+                timeout=self.manager.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as error:
+            raise ReleaseError(f"Error downloading {KUBERNETES_STABLE}: {error}") from error
+        return response.text.strip()
+
+    def _resolve_k3s(self, architecture: str) -> str:
+        """ The release the stable channel redirects to (the same for every architecture) """
+        import requests
+        from .offline_bundle import K3S_STABLE_CHANNEL
+        try:
+            response = self.manager.get_session().head(
+                K3S_STABLE_CHANNEL,
+                allow_redirects=True,
+                timeout=self.manager.timeout
+            )
+            response.raise_for_status()
+        except requests.RequestException as error:
+            raise ReleaseError(f"Error resolving {K3S_STABLE_CHANNEL}: {error}") from error
+        return response.url.rstrip("/").rsplit("/", 1)[-1]
+
+    # ---- Disk cache ----
+
+    def _load_cache(self) -> dict:
+        """ Load the resolved versions from the disk """
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(content, dict) is False:
+            return {}
+        return content
+
+    def _save_cache(self, key: str, entry: dict) -> None:
+        """ Add a resolved version to the disk cache """
+        tmp_file = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self.lock:
+            content = self._load_cache()
+            content[key] = entry
+            try:
+                os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+                with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                    json.dump(content, file, indent=4)
+                os.replace(tmp_file, self.cache_file)
+            except OSError:
+                if os.path.exists(tmp_file):
+                    os.remove(tmp_file)
+
+    # ---- Resolution ----
+
+    def _get_cached(self, key: str) -> tuple:
+        """ Return (entry, where) of the last resolution of key, (None, "") if unknown """
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                return entry, "memory"
+            entry = self._load_cache().get(key)
+            if isinstance(entry, dict) is False or entry.get("version", "") == "":
+                return None, ""
+            self.memory[key] = entry
+            return entry, "disk"
+
+    def get_pinned(self, tool: str) -> str:
+        """ Return the version of a tool pinned by the lockfile ("" if it is not pinned) """
+        with self.lock:
+            return self.pins.get(tool.lower(), "")
+
+    def resolve(self, tool: str, architecture: str = "", refresh: bool = False) -> dict:
+        """ Return the release of a tool: {tool, architecture, version, resolved_at, source}
+        source tells where the version comes from: "lock", "bundle", "memory",
+        "disk", "network" or "stale" (an expired version used because the server
+        could not be reached). refresh asks the server even if the cached version
+        is still fresh. Raises ReleaseError.
+        """
+        from .offline_bundle import get_active_bundle
+        tool = tool.lower()
+        if tool not in self.sources:
+            raise ReleaseError(
+                f"Unknown tool {tool}, expected one of: {', '.join(sorted(self.sources))}"
+            )
+        release = {"tool": tool, "architecture": architecture}
+        pinned = self.get_pinned(tool)
+        if pinned != "":
+            return dict(release, version=pinned, resolved_at=0.0, source="lock")
+        bundle = get_active_bundle()
+        if bundle is not None and bundle.manifest.get("versions", {}).get(tool, "") != "":
+            return dict(
+                release,
+                version=bundle.manifest["versions"][tool],
+                resolved_at=bundle.manifest.get("created_at", 0.0),
+                source="bundle"
+            )
+        key = f"{tool}/{architecture}"
+        cached, where = self._get_cached(key)
+        if cached is not None and refresh is False and time.time() - cached["resolved_at"] < self.ttl:
+            return dict(release, version=cached["version"], resolved_at=cached["resolved_at"], source=where)
+        try:
+            version = self.sources[tool](architecture)
+        except DownloadError as err:
+            if cached is None:
+                raise ReleaseError(f"The release of {tool} could not be resolved: {err}") from err
+            return dict(release, version=cached["version"], resolved_at=cached["resolved_at"], source="stale")
+        if version == "":
+            raise ReleaseError(f"The release server of {tool} named no version")
+        entry = {"version": version, "resolved_at": time.time()}
+        with self.lock:
+            self.memory[key] = entry
+        self._save_cache(key, entry)
+        return dict(release, version=version, resolved_at=entry["resolved_at"], source="network")
+
+    def resolve_many(self, tools: list[str], architecture: str = "", refresh: bool = False, max_workers: int = RELEASE_WORKERS) -> dict:
+        """ Resolve several tools at the same time, returns {tool: release}
+        The release of a tool that could not be resolved has an empty version
+        and an "error" key.
+        """
+        tools = list(dict.fromkeys(tool.lower() for tool in tools))
+        if len(tools) == 0:
+            return {}
+
+        def _resolve(tool: str) -> dict:
+            try:
+                return self.resolve(tool, architecture, refresh)
+            except DownloadError as err:
+                return {
+                    "tool": tool,
+                    "architecture": architecture,
+                    "version": "",
+                    "resolved_at": 0.0,
+                    "source": "",
+                    "error": str(err)
+                }
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tools)))) as pool:
+            releases = list(pool.map(_resolve, tools))
+        return {release["tool"]: release for release in releases}
+
+    # ---- Lockfile ----
+
+    def write_lockfile(self, path: str, tools: list[str], architecture: str = "", refresh: bool = False) -> dict:
+        """ Resolve tools and pin their versions in a lockfile, returns its content """
+        releases = self.resolve_many(tools, architecture, refresh)
+        errors = [release["error"] for release in releases.values() if "error" in release]
+        if len(errors) > 0:
+            raise ReleaseError("\n".join(errors))
+        content = {
+            "format": RELEASE_LOCK_FORMAT,
+            "created_at": time.time(),
+            "versions": {tool: release["version"] for tool, release in releases.items()}
+        }
+        path = os.path.abspath(os.path.expanduser(path))
+        tmp_file = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(content, file, indent=4)
+            os.replace(tmp_file, path)
+        except OSError as error:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise ReleaseError(f"Error writing the lockfile {path}: {error}") from error
+        return content
+
+    def use_lockfile(self, path: str) -> dict:
+        """ Install the versions pinned by a lockfile ("" stops pinning), returns the pins """
+        if path == "":
+            with self.lock:
+                self.pins = {}
+                self.lockfile = ""
+            return {}
+        path = os.path.abspath(os.path.expanduser(path))
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError) as error:
+            raise ReleaseError(f"{path} is not a valid lockfile: {error}") from error
+        if isinstance(content, dict) is False or content.get("format") != RELEASE_LOCK_FORMAT:
+            raise ReleaseError(f"{path}: unsupported lockfile format")
+        versions = content.get("versions", {})
+        if isinstance(versions, dict) is False:
+            raise ReleaseError(f"{path}: the versions are not a mapping")
+        with self.lock:
+            self.pins = {
+                str(tool).lower(): str(version) for tool, version in versions.items()
+                if str(version) != ""
+            }
+            self.lockfile = path
+            return dict(self.pins)
+
+
+# The resolver shared by the installers
+_RELEASE_RESOLVER = None
+
+
+def get_release_resolver() -> ReleaseResolver:
+    """ Return the release resolver, pinned by the lockfile named by $CONTOPSSYNC_RELEASE_LOCK if set """
+    global _RELEASE_RESOLVER
+    if _RELEASE_RESOLVER is None:
+        resolver = ReleaseResolver()
+        if os.environ.get(RELEASE_LOCK_ENV, "") != "":
+            resolver.use_lockfile(os.environ[RELEASE_LOCK_ENV])
+        _RELEASE_RESOLVER = resolver
+    return _RELEASE_RESOLVER
@@ -0,0 +1,194 @@
+"""
+File in charge of continuing an installation after the reboot it needs
+Some installations edit the boot configuration of the machine (the cgroups
+and the 64 bit mode of a Raspberry Pi): they only take effect after a
+reboot. Before rebooting, the installer saves the command to run again and
+registers a one-shot systemd unit that starts the program with
+--resume-install at the next boot. The program then runs the command again,
+the step journal makes it continue at the step that needed the reboot, and
+the unit is removed. The output of the resumed run is kept in a log file.
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import getpass
+import shutil
+import tempfile
+import threading
+from .cache_folder import get_cache_folder
+from .process_runner import ProcessRunner
+
+RESUME_UNIT = "contopssync-resume.service"
+RESUME_UNIT_FOLDER = "/etc/systemd/system"
+RESUME_STATE_FILE = "resume.json"
+RESUME_LOG_FILE = "resume.log"
+RESUME_FLAG = "--resume-install"
+RESUME_REBOOT_LIMIT = 2
+# ---- The settings a resumed command needs to find again ----
+RESUME_ENVIRONMENT = ("CONTOPSSYNC_BUNDLE", "CONTOPSSYNC_RELEASE_LOCK")
+
+
+class ResumeError(Exception):
+    """ Raised when an installation can not be resumed after a reboot """
+
+
+class ResumeHook:
+    """ Run a command again at the next boot, once """
+
+    def __init__(self, runner: ProcessRunner = None, state_file: str = "", unit_folder: str = RESUME_UNIT_FOLDER, unit_name: str = RESUME_UNIT, reboot_limit: int = RESUME_REBOOT_LIMIT) -> None:
+        self.runner = runner if runner is not None else ProcessRunner()
+        if state_file == "":
+            state_file = os.path.join(get_cache_folder(create=False), RESUME_STATE_FILE)
+        self.state_file = state_file
+        self.log_file = os.path.join(os.path.dirname(state_file), RESUME_LOG_FILE)
+        self.unit_name = unit_name
+        self.unit_path = os.path.join(unit_folder, unit_name)
+        self.reboot_limit = max(1, reboot_limit)
+        self.lock = threading.Lock()
+
+    # ---- State ----
+
+    def get_state(self) -> dict:
+        """ Return {installer, command, environment, reboots, registered_at}, {} when nothing is pending """
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if isinstance(state, dict) is False or isinstance(state.get("command"), list) is False:
+            return {}
+        return state
+
+    def _save_state(self, state: dict) -> None:
+        """ Write the state, readable by its owner only (it may hold a cluster token) """
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+            descriptor = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(descriptor, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(state, file, indent=4)
+            os.replace(tmp_file, self.state_file)
+        except OSError as error:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+            raise ResumeError(f"Error saving the state of the installation: {error}") from error
+
+    def _clear_state(self) -> None:
+        """ Forget the pending command """
+        try:
+            os.remove(self.state_file)
+        except OSError:
+            pass
+
+    # ---- Unit ----
+
+    def get_launch_command(self) -> list[str]:
+        """ Return the argv that starts the program in resume mode """
+        if getattr(sys, "frozen", False) is True:
+            launch = [sys.executable]
+        else:
+            main_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "main.py")
+            launch = [sys.executable, os.path.normpath(main_file)]
+        return launch + ["--no-colour", RESUME_FLAG]
+
+    def get_unit_content(self, installer: str, user: str = "", working_directory: str = "") -> str:
+        """ Return the systemd unit running the resume command once at boot """
+        user = user or getpass.getuser()
+        working_directory = working_directory or os.getcwd()
+        cache_base = os.path.dirname(os.path.dirname(self.state_file))
+        exec_start = " ".join(shlex.quote(item) for item in self.get_launch_command())
+        return "\n".join([
+            "[Unit]",
+            f"Description=Resume the {installer} installation of contopssync after a reboot",
+            "After=network-online.target",
+            "Wants=network-online.target",
+            f"ConditionPathExists={self.state_file}",
+            "",
+            "[Service]",
+            "Type=oneshot",
+            f"User={user}",
+            f"Environment=HOME={os.path.expanduser('~')}",
+            f"Environment=XDG_CACHE_HOME={cache_base}",
+            f"WorkingDirectory={working_directory}",
+            f"ExecStart={exec_start}",
+            f"StandardOutput=append:{self.log_file}",
+            f"StandardError=append:{self.log_file}",
+            "",
+            "[Install]",
+            "WantedBy=multi-user.target",
+            ""
+        ])
+
+    def get_unavailable_reason(self) -> str:
+        """ Return why the hook can not be registered here ("" when it can) """
+        if shutil.which("systemctl") is None:
+            return "systemd is not available on this machine"
+        if self.runner.get_admin_prefix() != []:
+            # ---- The resumed run is not attended, sudo must not ask for a password ----
+            if self.runner.run(["sudo", "-n", "true"]).ok is False:
+                return "sudo asks for a password, the resumed installation could not use it"
+        return ""
+
+    def register(self, installer: str, command: list) -> dict:
+        """ Run command again at the next boot, returns the saved state
+        The reboots counter stops a board from rebooting forever when the
+        reboot does not fix what the installer checks.
+        """
+        with self.lock:
+            previous = self.get_state()
+            reboots = previous.get("reboots", 0) if previous.get("installer") == installer else 0
+            if reboots >= self.reboot_limit:
+                raise ResumeError(
+                    f"The {installer} installation was already resumed after {reboots} reboots, it is not resumed again"
+                )
+            state = {
+                "installer": installer,
+                "command": list(command),
+                "environment": {
+                    name: os.environ[name] for name in RESUME_ENVIRONMENT if os.environ.get(name, "") != ""
+                },
+                "reboots": reboots + 1,
+                "registered_at": time.time()
+            }
+            self._save_state(state)
+            descriptor, tmp_unit = tempfile.mkstemp(suffix=".service")
+            try:
+                with open(descriptor, "w", encoding="utf-8", newline="\n") as file:
+                    file.write(self.get_unit_content(installer))
+                commands = (
+                    ["install", "-m", "0644", tmp_unit, self.unit_path],
+                    ["systemctl", "daemon-reload"],
+                    ["systemctl", "enable", self.unit_name]
+                )
+                for argv in commands:
+                    result = self.runner.run_as_admin(argv)
+                    if result.ok is False:
+                        self._clear_state()
+                        raise ResumeError(
+                            f"Error registering {self.unit_name} ({' '.join(argv)}): {result.stderr.strip()}"
+                        )
+            finally:
+                os.remove(tmp_unit)
+        return state
+
+    def is_pending(self, installer: str = "") -> bool:
+        """ Return True when a command waits for the next boot (of installer when given) """
+        state = self.get_state()
+        if state == {}:
+            return False
+        return installer == "" or state.get("installer") == installer
+
+    def unregister(self) -> None:
+        """ Remove the unit and forget the command """
+        with self.lock:
+            self._clear_state()
+            self.runner.run_as_admin(["systemctl", "disable", self.unit_name])
+            self.runner.run_as_admin(["rm", "-f", self.unit_path])
+            self.runner.run_as_admin(["systemctl", "daemon-reload"])
+
+    def reboot(self) -> bool:
+        """ Reboot the machine, returns False when it was refused """
+        return self.runner.run_as_admin(["systemctl", "reboot"]).ok
@@ -0,0 +1,168 @@
+"""
+File in charge of planning the installation of several tools at once
+The requested targets are expanded with their prerequisites (docker for
+docker compose, kind and a k3s using docker, kubectl for minikube, pip for
+docker compose on Linux), every prerequisite appears once, in an order where
+it is installed before the tools needing it. The tools already installed are
+found with one silent probe each (the tool cache) and left out of the plan.
+The downloads of the remaining tools can be declared to a prefetcher so that
+they run at the same time as the installations before them, and the tools
+shipped by the package manager of the system are installed in one
+transaction per package manager.
+"""
+
+from .tool_cache import get_tool_cache
+from .package_manager import PIP_PACKAGES
+
+STACK_DOCKER_SCRIPT = "https://get.docker.com"
+
+
+class StackError(Exception):
+    """ Raised when a stack can not be planned """
+
+
+class StackTarget:
+    """ A tool the stack can install: with a package manager ({manager: packages}), through a command of the shell (with args) or an admin argv """
+
+    def __init__(self, name: str, tool: str, command: str = "", args: list = None, argv: list = None, requires: list = None, plans: list = None, urls: list = None, systems: tuple = ("Linux", "Darwin", "Windows", "Java"), packages: dict = None) -> None:
+        self.name = name
+        self.tool = tool
+        self.command = command
+        self.args = list(args or [])
+        self.argv = list(argv or [])
+        self.requires = list(requires or [])
+        self.plans = list(plans or [])
+        self.urls = list(urls or [])
+        self.systems = systems
+        self.packages = dict(packages or {})
+
+
+def get_stack_targets(system: str, force_docker: bool = False) -> dict:
+    """ Return {name: StackTarget} for the targets the stack knows on system """
+    compose_requires = ["docker"]
+    if system == "Linux":
+        # ---- The Linux docker compose is installed with pip ----
+        compose_requires.append("pip")
+    targets = [
+        StackTarget("docker", "docker", command="install_docker", urls=[STACK_DOCKER_SCRIPT]),
+        StackTarget(
+            "pip",
+            "pip3",
+            argv=["python3", "-m", "ensurepip", "--upgrade"],
+            systems=("Linux",),
+            packages=PIP_PACKAGES
+        ),
+        StackTarget(
+            "docker_compose",
+            "docker-compose",
+            command="install_docker_compose",
+            requires=compose_requires
+        ),
+        StackTarget("kubectl", "kubectl", command="install_kubectl", plans=["kubectl"]),
+        StackTarget("minikube", "minikube", command="install_minikube", requires=["kubectl"]),
+        StackTarget("kind", "kind", command="install_kind", requires=["docker"]),
+        StackTarget(
+            "k3s",
+            "k3s",
+            command="install_k3s",
+            # ---- A master node ----
+            args=["true", "true" if force_docker is True else "false"],
+            requires=["docker"] if force_docker is True else [],
+            plans=["k3s"]
+        ),
+        StackTarget("k3d", "k3d", command="install_k3d", requires=["docker"]),
+        StackTarget("microk8s", "microk8s", command="install_microk8s")
+    ]
+    return {target.name: target for target in targets if system in target.systems}
+
+
+class StackPlan:
+    """ The ordered and deduplicated installations of a stack """
+
+    def __init__(self, targets: list[str], system: str, force_docker: bool = False, tool_cache: any = None) -> None:
+        self.system = system
+        self.force_docker = force_docker
+        self.tool_cache = tool_cache if tool_cache is not None else get_tool_cache()
+        self.known = get_stack_targets(system, force_docker)
+        self.requested = []
+        for name in targets:
+            name = name.lower().replace("-", "_")
+            if name not in self.known:
+                raise StackError(
+                    f"Unknown target {name} on {system}, expected one of: {', '.join(sorted(self.known))}"
+                )
+            if name not in self.requested:
+                self.requested.append(name)
+        self.entries = self._resolve()
+
+    def _resolve(self) -> list[dict]:
+        """ Return [{name, target, installed, required_by}], the prerequisites first """
+        entries = {}
+        order = []
+
+        def visit(name: str, required_by: str, path: tuple) -> None:
+            if name in path:
+                raise StackError(f"The targets depend on each other: {' -> '.join(path + (name,))}")
+            if name not in self.known:
+                raise StackError(f"{required_by} requires {name}, which is not available on {self.system}")
+            if name in entries:
+                if required_by != "" and required_by not in entries[name]["required_by"]:
+                    entries[name]["required_by"].append(required_by)
+                return
+            target = self.known[name]
+            for prerequisite in target.requires:
+                visit(prerequisite, name, path + (name,))
+            entries[name] = {
+                "name": name,
+                "target": target,
+                # ---- One silent probe per tool, even when several targets need it ----
+                "installed": self.tool_cache.is_installed(target.tool),
+                "required_by": [required_by] if required_by != "" else []
+            }
+            order.append(name)
+
+        for name in self.requested:
+            visit(name, "", ())
+        return [entries[name] for name in order]
+
+    def get_installations(self) -> list[dict]:
+        """ Return the entries that have to be installed, in order """
+        return [entry for entry in self.entries if entry["installed"] is False]
+
+    def get_package_installations(self, backend: any) -> list[dict]:
+        """ Return the entries installed with a package manager of backend, before the other ones """
+        batched = []
+        for entry in self.get_installations():
+            target = entry["target"]
+            if backend.get_preferred(target.packages) == "":
+                continue
+            # ---- A prerequisite installed through a command has to come first ----
+            names = [item["name"] for item in batched]
+            if all(name in names or self._is_planned_installed(name) for name in target.requires):
+                batched.append(entry)
+        return batched
+
+    def _is_planned_installed(self, name: str) -> bool:
+        """ Return True when the plan found name installed """
+        return any(entry["name"] == name and entry["installed"] is True for entry in self.entries)
+
+    def get_prefetch(self) -> tuple:
+        """ Return (plans, urls) downloaded by the installations of the plan """
+        plans = []
+        urls = []
+        for entry in self.get_installations():
+            plans += [plan for plan in entry["target"].plans if plan not in plans]
+            urls += [url for url in entry["target"].urls if url not in urls]
+        return plans, urls
+
+    def format_plan(self) -> str:
+        """ Describe what the plan installs and skips """
+        lines = []
+        for entry in self.entries:
+            state = "installed, skipped" if entry["installed"] is True else "to install"
+            if entry["name"] not in self.requested:
+                state = f"{state} (required by {', '.join(entry['required_by'])})"
+            lines.append(f"{entry['name']:16} {state}")
+        installations = len(self.get_installations())
+        lines.append(f"{installations} of {len(self.entries)} tools to install")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,257 @@
+"""
+File in charge of running the steps of an installer as a dependency graph
+Every step declares the steps it needs, the values it reads from the shared
+context (inputs) and the values it adds to it (outputs). A step starts as
+soon as the steps it depends on are done, so independent steps (a download
+and a board preparation, two downloads) run at the same time. The first
+fatal failure stops the scheduling: the running steps end and the others are
+skipped. The interactive steps (the ones that may ask for the sudo password)
+never run at the same time as each other. Every step is timed.
+With a journal, the completed steps are recorded with a fingerprint and a
+rerun resumes at the first step that did not complete (see step_journal).
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+STEP_WORKERS = 4
+# ---- The states of a step in the report ----
+STEP_DONE = "done"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+STEP_RESUMED = "resumed"
+
+
+class StepGraphError(Exception):
+    """ Raised when the steps do not form a valid graph """
+
+
+class InstallStep:
+    """ A step of an installer: action(context) returns a status code
+    key holds the configuration the step depends on (a url, a version) and
+    files the paths it leaves behind: a journaled step is only resumed when
+    its key is unchanged and its files still exist. The checks that must be
+    done on every run have checkpoint set to False.
+    """
+
+    def __init__(self, name: str, action: callable, requires: list = None, inputs: list = None, outputs: list = None, fatal: bool = True, interactive: bool = False, key: any = None, files: list = None, checkpoint: bool = True) -> None:
+        self.name = name
+        self.action = action
+        self.requires = list(requires or [])
+        self.inputs = list(inputs or [])
+        self.outputs = list(outputs or [])
+        self.fatal = fatal
+        self.interactive = interactive
+        self.key = key
+        self.files = list(files or [])
+        self.checkpoint = checkpoint
+
+
+class StepGraph:
+    """ Run the steps of an installer, the independent ones at the same time """
+
+    def __init__(self, success: int = 0, error: int = 84, max_workers: int = STEP_WORKERS, name: str = "", journal: any = None) -> None:
+        self.success = success
+        self.error = error
+        self.max_workers = max(1, max_workers)
+        # ---- The journal of the installer (none without a name) ----
+        self.name = name
+        self.journal = journal if name != "" else None
+        self.steps = {}
+        # ---- Only one interactive step at a time ----
+        self.terminal_lock = threading.Lock()
+
+    def add(self, name: str, action: callable, requires: list = None, inputs: list = None, outputs: list = None, fatal: bool = True, interactive: bool = False, key: any = None, files: list = None, checkpoint: bool = True) -> InstallStep:
+        """ Add a step, returns it """
+        if name in self.steps:
+            raise StepGraphError(f"The step {name} is declared twice")
+        step = InstallStep(name, action, requires, inputs, outputs, fatal, interactive, key, files, checkpoint)
+        self.steps[name] = step
+        return step
+
+    def get_dependencies(self) -> dict:
+        """ Return {step: the steps it waits for}: its requires and the producers of its inputs """
+        producers = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if output in producers:
+                    raise StepGraphError(
+                        f"{output} is produced by {producers[output]} and {step.name}"
+                    )
+                producers[output] = step.name
+        dependencies = {}
+        for step in self.steps.values():
+            needed = []
+            for name in step.requires:
+                if name not in self.steps:
+                    raise StepGraphError(f"The step {step.name} requires the unknown step {name}")
+                needed.append(name)
+            for value in step.inputs:
+                if value not in producers:
+                    raise StepGraphError(f"No step produces {value}, needed by {step.name}")
+                needed.append(producers[value])
+            dependencies[step.name] = list(dict.fromkeys(needed))
+        return dependencies
+
+    def get_order(self) -> list[list[str]]:
+        """ Return the steps by levels: a level only depends on the levels before it """
+        dependencies = self.get_dependencies()
+        placed = set()
+        levels = []
+        while len(placed) < len(dependencies):
+            level = [
+                name for name, needed in dependencies.items()
+                if name not in placed and all(item in placed for item in needed)
+            ]
+            if len(level) == 0:
+                cycle = [name for name in dependencies if name not in placed]
+                raise StepGraphError(f"The steps depend on each other: {', '.join(cycle)}")
+            levels.append(level)
+            placed.update(level)
+        return levels
+
+    def has_checkpoints(self) -> bool:
+        """ Return True when a previous run of the installer left completed steps in the journal """
+        if self.journal is None:
+            return False
+        return len(self.journal.get_installer(self.name).get("steps", {})) > 0
+
+    def get_fingerprint(self, step: InstallStep, context: dict, fingerprints: dict) -> str:
+        """ Return the fingerprint of what a step is given: its key, its inputs and the steps before it """
+        content = {
+            "step": step.name,
+            "key": step.key,
+            "inputs": {value: context.get(value) for value in step.inputs},
+            "after": {name: fingerprints.get(name, "") for name in self.get_dependencies()[step.name]}
+        }
+        serialised = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(serialised.encode("utf-8")).hexdigest()
+
+    def _resume_step(self, step: InstallStep, context: dict, fingerprint: str) -> dict:
+        """ Restore the outputs of a step completed by a previous run, None when it has to run """
+        if self.journal is None or step.checkpoint is False:
+            return None
+        record = self.journal.get_completed(self.name, step.name, fingerprint)
+        if record is None:
+            return None
+        if any(not os.path.exists(os.path.expanduser(path)) for path in step.files):
+            return None
+        if any(output not in record["outputs"] for output in step.outputs):
+            return None
+        context.update({output: record["outputs"][output] for output in step.outputs})
+        return {"state": STEP_RESUMED, "status": self.success, "duration": 0.0, "error": ""}
+
+    def _journal_step(self, step: InstallStep, context: dict, fingerprint: str, result: dict) -> None:
+        """ Record the outcome of a step in the journal (the step a run stopped at, even an unrecorded check) """
+        if self.journal is None:
+            return
+        if result["state"] == STEP_DONE and step.checkpoint is True:
+            outputs = {output: context[output] for output in step.outputs}
+            self.journal.record(self.name, step.name, fingerprint, outputs, result["duration"])
+        elif result["state"] == STEP_FAILED and step.fatal is True:
+            self.journal.record_failure(self.name, step.name, result["error"])
+
+    def _run_step(self, step: InstallStep, context: dict, fingerprint: str = "") -> dict:
+        """ Run a step (or resume it from the journal) and describe its outcome """
+        resumed = self._resume_step(step, context, fingerprint)
+        if resumed is not None:
+            return resumed
+        start = time.perf_counter()
+        error = ""
+        if step.interactive is True:
+            self.terminal_lock.acquire()
+        try:
+            status = step.action(context)
+        except Exception as err:
+            status = self.error
+            error = f"{type(err).__name__}: {err}"
+        finally:
+            if step.interactive is True:
+                self.terminal_lock.release()
+        missing = [output for output in step.outputs if output not in context]
+        if status == self.success and len(missing) > 0:
+            status = self.error
+            error = f"{step.name} did not produce {', '.join(missing)}"
+        result = {
+            "state": STEP_DONE if status == self.success else STEP_FAILED,
+            "status": status,
+            "duration": time.perf_counter() - start,
+            "error": error
+        }
+        self._journal_step(step, context, fingerprint, result)
+        return result
+
+    def _submit_ready(self, pool: ThreadPoolExecutor, dependencies: dict, context: dict, results: dict, running: dict, fingerprints: dict) -> None:
+        """ Submit the steps whose dependencies are done, skip the ones after a failed or skipped step """
+        for name, needed in dependencies.items():
+            if name in results or name in running.values():
+                continue
+            states = [results[item]["state"] if item in results else "" for item in needed]
+            if any(state in (STEP_FAILED, STEP_SKIPPED) for state in states):
+                results[name] = {"state": STEP_SKIPPED, "status": self.error, "duration": 0.0, "error": ""}
+            elif all(state in (STEP_DONE, STEP_RESUMED) for state in states) and len(running) < self.max_workers:
+                # ---- Only submit to a free worker, so a failure also stops the waiting steps ----
+                fingerprints[name] = self.get_fingerprint(self.steps[name], context, fingerprints)
+                running[pool.submit(self._run_step, self.steps[name], context, fingerprints[name])] = name
+
+    def run(self, context: dict = None) -> dict:
+        """ Run the steps, returns {status, failed, duration, steps: {name: {state, status, duration, error}}}
+        failed is the name of the fatal step that stopped the graph ("" if none).
+        A failed non fatal step only skips the steps depending on it.
+        The journal of the installer is forgotten when all the steps succeed.
+        """
+        if context is None:
+            context = {}
+        dependencies = self.get_dependencies()
+        self.get_order()
+        results = {}
+        fingerprints = {}
+        running = {}
+        failed = ""
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="step") as pool:
+            while True:
+                if failed == "":
+                    self._submit_ready(pool, dependencies, context, results, running, fingerprints)
+                if len(running) == 0:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if results[name]["state"] == STEP_FAILED and self.steps[name].fatal is True and failed == "":
+                        failed = name
+        for name in self.steps:
+            if name not in results:
+                results[name] = {"state": STEP_SKIPPED, "status": self.error, "duration": 0.0, "error": ""}
+        if failed == "" and self.journal is not None:
+            self.journal.finish(self.name)
+        return {
+            "status": self.error if failed != "" else self.success,
+            "failed": failed,
+            "duration": time.perf_counter() - start,
+            "steps": {name: results[name] for name in self.steps}
+        }
+
+    def format_report(self, report: dict) -> str:
+        """ Describe the duration of every step """
+        lines = []
+        for name, result in report["steps"].items():
+            line = f"{name:32} {result['state']:8} {result['duration']:7.1f} s"
+            if result["error"] != "":
+                line = f"{line}  ({result['error']})"
+            lines.append(line)
+        busy = sum(result["duration"] for result in report["steps"].values())
+        total = (
+            f"{len(report['steps'])} steps in {report['duration']:.1f} s "
+            f"({busy:.1f} s of work, {max(0.0, busy - report['duration']):.1f} s run in parallel)"
+        )
+        resumed = len([result for result in report["steps"].values() if result["state"] == STEP_RESUMED])
+        if resumed > 0:
+            total = f"{total}, {resumed} completed by a previous run"
+        lines.append(total)
+        return "\n".join(lines) + "\n"
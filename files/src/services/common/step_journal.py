@@ -0,0 +1,149 @@
+"""
+File in charge of remembering the installer steps that already succeeded
+The step graph of an installer records every completed step with the
+fingerprint of what it was given (its configuration, its inputs and the
+fingerprints of the steps before it) and the values it produced. When a
+failed or interrupted installation is run again, the steps whose fingerprint
+still matches are not run a second time: their values are restored and the
+installation continues at the first step that did not complete. The journal
+of an installer is forgotten once it succeeds.
+"""
+
+import os
+import json
+import time
+import threading
+from .cache_folder import get_cache_folder
+
+JOURNAL_FILE = "install_journal.json"
+JOURNAL_FORMAT = 1
+
+
+class StepJournal:
+    """ The completed steps of the installations that did not finish """
+
+    def __init__(self, journal_file: str = "") -> None:
+        if journal_file == "":
+            journal_file = os.path.join(get_cache_folder(create=False), JOURNAL_FILE)
+        self.journal_file = journal_file
+        self.lock = threading.Lock()
+
+    # ---- Disk ----
+
+    def _load(self) -> dict:
+        """ Load the journal from the disk """
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            content = {}
+        if isinstance(content, dict) is False or content.get("format") != JOURNAL_FORMAT:
+            content = {}
+        if isinstance(content.get("installers"), dict) is False:
+            content = {"format": JOURNAL_FORMAT, "installers": {}}
+        return content
+
+    def _save(self, content: dict) -> None:
+        """ Write the journal, an installer keeps going when the disk refuses it """
+        tmp_file = f"{self.journal_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.journal_file) or ".", exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(content, file, indent=4)
+            os.replace(tmp_file, self.journal_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _get_entry(self, content: dict, installer: str) -> dict:
+        """ Return the journal of an installer in content, created if missing """
+        entry = content["installers"].setdefault(installer, {})
+        now = time.time()
+        entry.setdefault("started_at", now)
+        entry.setdefault("failed", "")
+        entry.setdefault("error", "")
+        entry.setdefault("steps", {})
+        entry["updated_at"] = now
+        return entry
+
+    # ---- Steps ----
+
+    def get_installers(self) -> dict:
+        """ Return {installer: {started_at, updated_at, failed, error, steps}} """
+        with self.lock:
+            return self._load()["installers"]
+
+    def get_installer(self, installer: str) -> dict:
+        """ Return the journal of an installer, {} if it has none """
+        return self.get_installers().get(installer, {})
+
+    def get_completed(self, installer: str, step: str, fingerprint: str) -> dict:
+        """ Return the record of a step completed with this fingerprint, None otherwise """
+        record = self.get_installer(installer).get("steps", {}).get(step)
+        if isinstance(record, dict) is False or record.get("fingerprint") != fingerprint:
+            return None
+        if isinstance(record.get("outputs"), dict) is False:
+            return None
+        return record
+
+    def record(self, installer: str, step: str, fingerprint: str, outputs: dict, duration: float) -> bool:
+        """ Remember a completed step, returns False when its outputs can not be saved (it will run again) """
+        try:
+            json.dumps(outputs)
+        except (TypeError, ValueError):
+            return False
+        with self.lock:
+            content = self._load()
+            entry = self._get_entry(content, installer)
+            entry["steps"][step] = {
+                "fingerprint": fingerprint,
+                "outputs": outputs,
+                "duration": duration,
+                "completed_at": time.time()
+            }
+            if entry["failed"] == step:
+                entry["failed"] = ""
+                entry["error"] = ""
+            self._save(content)
+        return True
+
+    def record_failure(self, installer: str, step: str, error: str = "") -> None:
+        """ Remember the step an installation stopped at """
+        with self.lock:
+            content = self._load()
+            entry = self._get_entry(content, installer)
+            entry["failed"] = step
+            entry["error"] = error
+            entry["steps"].pop(step, None)
+            self._save(content)
+
+    def finish(self, installer: str) -> None:
+        """ Forget the journal of an installation that succeeded """
+        self.reset(installer)
+
+    def reset(self, installer: str = "") -> list[str]:
+        """ Forget the journal of an installer (all of them with ""), returns the installers forgotten """
+        with self.lock:
+            content = self._load()
+            if installer == "":
+                removed = sorted(content["installers"])
+                content["installers"] = {}
+            elif installer in content["installers"]:
+                removed = [installer]
+                content["installers"].pop(installer)
+            else:
+                return []
+            self._save(content)
+        return removed
+
+
+# The journal of the installations
+_STEP_JOURNAL = None
+
+
+def get_step_journal() -> StepJournal:
+    """ Return the journal of the installations """
+    global _STEP_JOURNAL
+    if _STEP_JOURNAL is None:
+        _STEP_JOURNAL = StepJournal()
+    return _STEP_JOURNAL
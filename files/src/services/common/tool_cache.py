@@ -0,0 +1,237 @@
+"""
+File in charge of locating the tools installed on the host
+The folders of the PATH are listed once and indexed by file name, so checking
+if a tool is installed does not start a process. The index is rebuilt when the
+PATH or the modification time of one of its folders changes. The version of a
+tool is only captured when it is asked for, and it is cached on disk until the
+binary changes.
+"""
+
+import os
+import json
+import threading
+import subprocess
+from .cache_folder import get_cache_folder
+
+TOOL_CACHE_FILE = "tools.json"
+TOOL_VERSION_TIMEOUT = 15
+# ---- Folders used by sudo (secure_path) that can be missing from the PATH ----
+EXTRA_POSIX_FOLDERS = (
+    "/usr/local/sbin",
+    "/usr/local/bin",
+    "/usr/sbin",
+    "/usr/bin",
+    "/sbin",
+    "/bin",
+    "/snap/bin"
+)
+
+
+class ToolCache:
+    """ Resolve the tools with an index of the PATH folders and cache their versions """
+
+    def __init__(self, cache_file: str = "") -> None:
+        self.cache_file = cache_file
+        if self.cache_file == "":
+            self.cache_file = os.path.join(
+                get_cache_folder(create=False),
+                TOOL_CACHE_FILE
+            )
+        self.is_windows = os.name == "nt"
+        self.extensions = [""]
+        if self.is_windows is True:
+            self.extensions = os.environ.get(
+                "PATHEXT", ".COM;.EXE;.BAT;.CMD"
+            ).lower().split(";")
+        # ---- The PATH index: name -> candidate paths (in the PATH order) ----
+        self.path_value = None
+        self.folders = []
+        self.index = {}
+        # ---- The versions: path -> {mtime_ns, size, args, version} ----
+        self.versions = None
+        # ---- The probes can be run from several threads ----
+        self.lock = threading.RLock()
+
+    def _get_search_folders(self) -> list[str]:
+        """ Return the folders of the PATH (and the sudo folders) without duplicates """
+        folders = os.environ.get("PATH", "").split(os.pathsep)
+        if self.is_windows is False:
+            folders.extend(EXTRA_POSIX_FOLDERS)
+        result = []
+        for folder in folders:
+            if folder != "" and folder not in result:
+                result.append(folder)
+        return result
+
+    def _get_folder_mtime(self, folder: str) -> int:
+        """ Return the modification time of a folder (-1 if it does not exist) """
+        try:
+            return os.stat(folder).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _is_index_valid(self) -> bool:
+        """ Check that neither the PATH nor its folders changed since the indexing """
+        if self.path_value != os.environ.get("PATH", ""):
+            return False
+        for folder, mtime in self.folders:
+            if self._get_folder_mtime(folder) != mtime:
+                return False
+        return True
+
+    def _get_index_names(self, file_name: str) -> list[str]:
+        """ Return the names under which a file is indexed """
+        if self.is_windows is False:
+            return [file_name]
+        file_name = file_name.lower()
+        names = [file_name]
+        root, extension = os.path.splitext(file_name)
+        if extension != "" and extension in self.extensions:
+            names.append(root)
+        return names
+
+    def _build_index(self) -> None:
+        """ List the folders of the PATH and index their files by name """
+        self.path_value = os.environ.get("PATH", "")
+        self.folders = []
+        self.index = {}
+        for folder in self._get_search_folders():
+            self.folders.append((folder, self._get_folder_mtime(folder)))
+            try:
+                entries = os.scandir(folder)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    for name in self._get_index_names(entry.name):
+                        self.index.setdefault(name, []).append(entry.path)
+
+    def _is_executable(self, path: str) -> bool:
+        """ Check that a path is an executable file """
+        if os.path.isfile(path) is False:
+            return False
+        if self.is_windows is True:
+            return True
+        return os.access(path, os.X_OK)
+
+    def which(self, name: str) -> str:
+        """ Return the path of a tool ("" if it is not installed) """
+        with self.lock:
+            if self._is_index_valid() is False:
+                self._build_index()
+            candidates = self.index.get(
+                name.lower() if self.is_windows is True else name,
+                []
+            )
+        for path in candidates:
+            if self._is_executable(path) is True:
+                return path
+        return ""
+
+    def is_installed(self, name: str) -> bool:
+        """ Check if a tool is installed without running it """
+        return self.which(name) != ""
+
+    def _load_versions(self) -> None:
+        """ Load the cached versions from the disk """
+        self.versions = {}
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(content, dict) is True:
+            self.versions = content
+
+    def _save_versions(self) -> None:
+        """ Write the cached versions to the disk """
+        tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            with open(tmp_file, "w", encoding="utf-8", newline="\n") as file:
+                json.dump(self.versions, file)
+            os.replace(tmp_file, self.cache_file)
+        except OSError:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+
+    def _run_version_command(self, path: str, args: tuple) -> str:
+        """ Run the version command of a tool, returns the first line it printed ("" on failure) """
+        try:
+            result = subprocess.run(
+                [path, *args],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=TOOL_VERSION_TIMEOUT,
+                check=False,
+                text=True,
+                errors="replace"
+            )
+        except (OSError, subprocess.SubprocessError):
+            return ""
+        for line in result.stdout.splitlines():
+            if line.strip() != "":
+                return line.strip()
+        return ""
+
+    def get_version(self, name: str, args: tuple = ("--version",), refresh: bool = False) -> str:
+        """ Return the first line printed by the version command of a tool ("" if unknown)
+        refresh runs the version command even if its output is cached.
+        """
+        path = self.which(name)
+        if path == "":
+            return ""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ""
+        with self.lock:
+            if self.versions is None:
+                self._load_versions()
+            entry = self.versions.get(path)
+        if refresh is False and entry is not None and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size and entry.get("args") == list(args):
+            return entry.get("version", "")
+        version = self._run_version_command(path, args)
+        with self.lock:
+            if self.versions is None:
+                self._load_versions()
+            self.versions[path] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "args": list(args),
+                "version": version
+            }
+            self._save_versions()
+        return version
+
+    def is_installed_on_tty(self, tty: any, name: str, label: str = "") -> bool:
+        """ Check a tool and report it on the tty (label names it in the message) """
+        tty.print_on_tty(tty.info_colour, f"Checking if {label or name} is installed:")
+        if self.is_installed(name) is False:
+            tty.print_on_tty(tty.error_colour, "[KO]\n")
+            tty.current_tty_status = tty.error
+            return False
+        tty.print_on_tty(tty.success_colour, "[OK]\n")
+        tty.current_tty_status = tty.success
+        return True
+
+    def invalidate(self) -> None:
+        """ Forget the index and the versions loaded in memory """
+        with self.lock:
+            self.path_value = None
+            self.folders = []
+            self.index = {}
+            self.versions = None
+
+
+# The tool cache shared by the installers
+_TOOL_CACHE = None
+
+
+def get_tool_cache() -> ToolCache:
+    """ Return the tool cache shared by the installers """
+    global _TOOL_CACHE
+    if _TOOL_CACHE is None:
+        _TOOL_CACHE = ToolCache()
+    return _TOOL_CACHE
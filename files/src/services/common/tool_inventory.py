@@ -0,0 +1,87 @@
+"""
+File in charge of probing the tools supported by the program
+Each probe resolves the tool through the ToolCache and reads its version, the
+probes are run on a bounded thread pool.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .tool_cache import ToolCache, get_tool_cache
+
+# The tools of the inventory: name -> arguments printing the version
+INVENTORY_TOOLS = {
+    "docker": ("--version",),
+    "docker-compose": ("--version",),
+    "kubectl": ("version", "--client"),
+    "k3s": ("--version",),
+    "k3d": ("--version",),
+    "kind": ("version",),
+    "minikube": ("version",),
+    "microk8s": ("version",),
+    "kubeadm": ("version", "-o", "short")
+}
+INVENTORY_MAX_WORKERS = 8
+
+
+class ToolInventory:
+    """ Probe the supported tools in parallel """
+
+    def __init__(self, tools: dict = None, tool_cache: ToolCache = None, max_workers: int = INVENTORY_MAX_WORKERS) -> None:
+        self.tools = tools if tools is not None else INVENTORY_TOOLS
+        self.tool_cache = tool_cache
+        self.max_workers = max(1, max_workers)
+
+    def probe(self, name: str, refresh: bool = False) -> dict:
+        """ Return the install state, version, path and probe latency of a tool """
+        tool_cache = self.tool_cache if self.tool_cache is not None else get_tool_cache()
+        start = time.perf_counter()
+        path = tool_cache.which(name)
+        version = ""
+        if path != "":
+            version = tool_cache.get_version(name, self.tools[name], refresh)
+        return {
+            "tool": name,
+            "installed": path != "",
+            "version": version,
+            "path": path,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3)
+        }
+
+    def probe_all(self, refresh: bool = False, max_workers: int = 0) -> list[dict]:
+        """ Probe every tool, the results keep the order of the tools """
+        if max_workers <= 0:
+            max_workers = self.max_workers
+        workers = min(max_workers, len(self.tools))
+        if workers <= 1:
+            return [self.probe(name, refresh) for name in self.tools]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(lambda name: self.probe(name, refresh), self.tools)
+            )
+
+    def format_table(self, results: list[dict]) -> str:
+        """ Convert the results into a text table """
+        header = ["Tool", "Status", "Version", "Path", "Probe (ms)"]
+        rows = [
+            [
+                item["tool"],
+                "[OK]" if item["installed"] is True else "[KO]",
+                item["version"],
+                item["path"],
+                f"{item['latency_ms']:.1f}"
+            ]
+            for item in results
+        ]
+        widths = [
+            max(len(row[index]) for row in [header] + rows)
+            for index in range(len(header))
+        ]
+        lines = []
+        for row in [header] + rows:
+            lines.append(
+                " | ".join(
+                    cell.ljust(widths[index]) for index, cell in enumerate(row)
+                ).rstrip()
+            )
+        lines.insert(1, "-+-".join("-" * width for width in widths))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,78 @@
+"""
+File in charge of keeping the statistics of the downloads of the session
+Every completed download records the bytes received, its duration, its
+throughput and whether the connections of the pool were reused, so that a
+slow install can be explained (see the downloads command).
+"""
+
+import time
+import threading
+from collections import deque
+
+TRANSFER_LOG_SIZE = 500
+
+
+class TransferLog:
+    """ The transfers completed during the session (the most recent ones) """
+
+    def __init__(self, max_entries: int = TRANSFER_LOG_SIZE) -> None:
+        self.entries = deque(maxlen=max(1, max_entries))
+        self.lock = threading.Lock()
+
+    def record(self, url: str, status: int, size: int, transferred: int, duration: float, new_connections: int, requests: int, resumed_from: int = 0, segments: int = 1) -> dict:
+        """ Add a completed transfer, returns its entry
+        transferred is the number of bytes received (size without the resumed
+        part, 0 for a 304), new_connections the connections opened for it.
+        """
+        entry = {
+            "url": url,
+            "status": status,
+            "size": size,
+            "transferred": transferred,
+            "duration": duration,
+            "throughput": transferred / duration if duration > 0 else 0.0,
+            "new_connections": new_connections,
+            "requests": requests,
+            "connection_reused": new_connections == 0,
+            "resumed_from": resumed_from,
+            "segments": segments,
+            "finished_at": time.time()
+        }
+        with self.lock:
+            self.entries.append(entry)
+        return entry
+
+    def get_entries(self) -> list[dict]:
+        """ Return the transfers, the oldest first """
+        with self.lock:
+            return list(self.entries)
+
+    def get_summary(self) -> dict:
+        """ Return {transfers, transferred, duration, throughput, reused} over the session """
+        entries = self.get_entries()
+        transferred = sum(entry["transferred"] for entry in entries)
+        duration = sum(entry["duration"] for entry in entries)
+        return {
+            "transfers": len(entries),
+            "transferred": transferred,
+            "duration": duration,
+            "throughput": transferred / duration if duration > 0 else 0.0,
+            "reused": len([entry for entry in entries if entry["connection_reused"] is True])
+        }
+
+    def clear(self) -> None:
+        """ Forget the transfers """
+        with self.lock:
+            self.entries.clear()
+
+
+# The transfers of the session
+_TRANSFER_LOG = None
+
+
+def get_transfer_log() -> TransferLog:
+    """ Return the transfer log of the session """
+    global _TRANSFER_LOG
+    if _TRANSFER_LOG is None:
+        _TRANSFER_LOG = TransferLog()
+    return _TRANSFER_LOG
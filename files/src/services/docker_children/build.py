@@ -3,9 +3,9 @@ File in charge of containing the code to build a docker image
 """
 
 import os
-from platform import system
 from tty_ov import TTY
 import display_tty
+from ..common import get_host_facts, ProcessRunner
 
 
 class BuildImage:
@@ -16,47 +16,28 @@ class BuildImage:
         self.err = err
         self.error = error
         self.options = []
-        self.system_name = system()
+        self.system_name = get_host_facts().system
         # ---- The TTY options ----
         self.tty = tty
         self.print_on_tty = self.tty.print_on_tty
         self.super_run = self.tty.run_as_admin
         self.run = self.tty.run_command
+        self.process = ProcessRunner()
         # ---- The Disp option ----
         self.disp = display_tty.IDISP
         self.disp.toml_content["PRETTIFY_OUTPUT"] = False
         self.disp.toml_content["PRETTY_OUTPUT_IN_BLOCS"] = False
 
     def _run_docker_command(self, command: list, hide_output: bool = False) -> int:
-        """ Run a docker command """
-        compiled_command = []
-        if self.system_name == "Windows":
-            compiled_command.append("docker")
-            compiled_command.extend(command)
-            if hide_output is True:
-                compiled_command.extend(
-                    [
-                        ">nul",
-                        "2>nul"
-                    ]
-                )
-        else:
-            compiled_command.extend(
-                [
-                    "sudo",
-                    "docker"
-                ]
-            )
-            compiled_command.extend(command)
-            if hide_output is True:
-                compiled_command.extend(
-                    [
-                        ">/dev/null",
-                        "2>/dev/null"
-                    ]
-                )
-        status = self.run(compiled_command)
-        return status
+        """ Run a docker command (as administrator outside of Windows) """
+        result = self.process.run(
+            ["docker", *command],
+            as_admin=self.system_name != "Windows",
+            stream=hide_output is False
+        )
+        if result.ok is False:
+            return self.err
+        return self.success
 
     def build_image(self, args: list) -> int:
         """ Build a docker image """
@@ -3,35 +3,33 @@ File in charge of linking the docker installation scripts
 """
 
 from tty_ov import TTY
-from .install_docker_linux import InstallDockerLinux
-from .install_docker_mac import InstallDockerMac
-from .install_docker_raspberry_pi import InstallDockerRaspberryPi
-from .install_docker_windows import InstallDockerWindows
+from ...common import LazyChild
 
 
 class InstallDockerInit:
     """ Install docker on your system """
 
+    install_docker_windows = LazyChild(
+        ".install_docker_windows",
+        "InstallDockerWindows"
+    )
+    install_docker_mac = LazyChild(".install_docker_mac", "InstallDockerMac")
+    install_docker_linux = LazyChild(
+        ".install_docker_linux",
+        "InstallDockerLinux"
+    )
+    install_docker_raspberrypi = LazyChild(
+        ".install_docker_raspberry_pi",
+        "InstallDockerRaspberryPi"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_docker_windows = InstallDockerWindows(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_docker_mac = InstallDockerMac(tty, success, err, error)
-        self.install_docker_linux = InstallDockerLinux(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_docker_raspberrypi = InstallDockerRaspberryPi(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_class_install_docker(self) -> None:
         """ Test the class InstallDocker """
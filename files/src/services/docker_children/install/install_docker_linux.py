@@ -4,9 +4,8 @@ File in charge of containing the docker installation for mac systems
 
 
 import display_tty
-import requests
-from tqdm import tqdm
 from tty_ov import TTY
+from ...common import get_tool_cache, get_download_manager, StepGraph, get_step_journal
 
 
 class InstallDockerLinux:
@@ -33,83 +32,11 @@ class InstallDockerLinux:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_docker_installed(self) -> bool:
         """ Returns true if Docker is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "docker",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker", "Docker")
 
     def _installation_error_message(self) -> None:
         """ Print the error message """
@@ -118,7 +45,14 @@ class InstallDockerLinux:
             "Error installing docker\n"
         )
 
-    def _download_script(self) -> int:
+    def _resuming_message(self) -> None:
+        """ Tell the user the steps completed by the previous run are not run again """
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Resuming the previous installation, its completed steps are skipped (install_journal_reset docker_linux to start over)\n"
+        )
+
+    def _download_script(self, context: dict) -> int:
         """ Dowload the installer script """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Downloading docker install script")
@@ -134,9 +68,10 @@ class InstallDockerLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        context["install_script"] = self.destination_file
+        return self.success
 
-    def _install_docker_via_script(self) -> int:
+    def _install_docker_via_script(self, context: dict) -> int:
         """ Install docker via the script """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Installing docker via the script")
@@ -148,9 +83,9 @@ class InstallDockerLinux:
             [
                 "chmod",
                 "+x",
-                self.destination_file,
+                context["install_script"],
                 "&&",
-                self.destination_file
+                context["install_script"]
             ]
         )
         self.print_on_tty(
@@ -161,11 +96,15 @@ class InstallDockerLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        return self.success
+
+    def _add_user_to_docker_group(self, context: dict) -> int:
+        """ Let the user run docker without sudo """
         self.print_on_tty(
             self.tty.info_colour,
             "Adding you to the docker groupe\n"
         )
-        self.run(
+        status = self.run(
             [
                 "sudo",
                 "usermod",
@@ -174,16 +113,16 @@ class InstallDockerLinux:
                 "$USER"
             ]
         )
-        if self.tty.current_tty_status != self.success:
+        if status != self.success:
             self.print_on_tty(
                 self.tty.error_colour,
                 "Error adding you to the docker groupe\n"
             )
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _test_docker_installation(self) -> int:
+    def _test_docker_installation(self, context: dict) -> int:
         """ Test the docker installation """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Testing docker installation")
@@ -207,9 +146,9 @@ class InstallDockerLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _test_docker_functionalities(self) -> int:
+    def _test_docker_functionalities(self, context: dict) -> int:
         """ Testing Docker's capability to pull a hello-world image """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Testing docker functionalities")
@@ -241,26 +180,55 @@ class InstallDockerLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
+
+    def get_steps(self) -> StepGraph:
+        """ Return the installation steps """
+        steps = StepGraph(self.success, self.err, name="docker_linux", journal=get_step_journal())
+        steps.add(
+            "download_script",
+            self._download_script,
+            outputs=["install_script"],
+            key=self.installer_path,
+            files=[self.destination_file]
+        )
+        steps.add(
+            "install_docker",
+            self._install_docker_via_script,
+            inputs=["install_script"],
+            interactive=True
+        )
+        steps.add(
+            "add_user_to_docker_group",
+            self._add_user_to_docker_group,
+            requires=["install_docker"],
+            interactive=True
+        )
+        # ---- After the sudo usermod, so that its password prompt is not mixed with the test output ----
+        steps.add(
+            "test_installation",
+            self._test_docker_installation,
+            requires=["add_user_to_docker_group"],
+            checkpoint=False
+        )
+        steps.add(
+            "test_functionalities",
+            self._test_docker_functionalities,
+            requires=["test_installation"],
+            checkpoint=False
+        )
+        return steps
 
     def main(self) -> int:
         """ Install docker on the current system """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_title("Installing docker")
-        status = self._download_script()
-        if status != self.success:
-            self._installation_error_message()
-            return self.err
-        status = self._install_docker_via_script()
-        if status != self.success:
-            self._installation_error_message()
-            return self.err
-        status = self._test_docker_installation()
-        if status != self.success:
-            self._installation_error_message()
-            return self.err
-        status = self._test_docker_functionalities()
-        if status != self.success:
+        steps = self.get_steps()
+        if steps.has_checkpoints() is True:
+            self._resuming_message()
+        report = steps.run()
+        self.print_on_tty(self.tty.info_colour, steps.format_report(report))
+        if report["status"] != self.success:
             self._installation_error_message()
             return self.err
         self.print_on_tty(
@@ -2,10 +2,10 @@
 File in charge of installing Docker on all 3 systems
 """
 
-import platform
 from tty_ov import TTY
 from display_tty import IDISP
 from .install import InstallDockerInit
+from ..common import get_host_facts
 
 
 class InstallDocker():
@@ -17,7 +17,8 @@ class InstallDocker():
         self.err = err
         self.error = error
         # ---- System info ----
-        self.current_system = platform.system()
+        self.host_facts = get_host_facts()
+        self.current_system = self.host_facts.system
         # ---- Parent classes ----
         self.tty = tty
         self.disp = IDISP
@@ -28,14 +29,29 @@ class InstallDocker():
         self.disp.toml_content["PRETTY_OUTPUT_IN_BLOCS"] = False
         # ---- Child classes ----
         self.install = InstallDockerInit(tty, success, err, error)
-        # ---- System install ----
-        self.windows = self.install.install_docker_windows
-        self.linux = self.install.install_docker_linux
-        self.raspberrypi = self.install.install_docker_raspberrypi
-        self.mac = self.install.install_docker_mac
         # ---- command management ----
         self.options = []
 
+    @property
+    def windows(self) -> object:
+        """ The windows installer, only built when first used """
+        return self.install.install_docker_windows
+
+    @property
+    def linux(self) -> object:
+        """ The linux installer, only built when first used """
+        return self.install.install_docker_linux
+
+    @property
+    def raspberrypi(self) -> object:
+        """ The raspberry pi installer, only built when first used """
+        return self.install.install_docker_raspberrypi
+
+    @property
+    def mac(self) -> object:
+        """ The mac installer, only built when first used """
+        return self.install.install_docker_mac
+
     def install_docker(self, args: list) -> int:
         """ Install docker on the host system """
         function_name = "install_docker"
@@ -54,7 +70,7 @@ Output:
         if self.current_system == "Windows":
             return self.windows.main()
         if self.current_system == "Linux":
-            if self.raspberrypi.is_raspberrypi() is True:
+            if self.host_facts.is_raspberrypi is True:
                 return self.raspberrypi.main()
             return self.linux.main()
         if self.current_system == "Darwin" or self.current_system == "Java":
@@ -83,7 +99,7 @@ Output:
         if self.current_system == "Windows":
             status = self.windows.is_docker_installed()
         if self.current_system == "Linux":
-            if self.raspberrypi.is_raspberrypi() is True:
+            if self.host_facts.is_raspberrypi is True:
                 status = self.raspberrypi.is_docker_installed()
             else:
                 status = self.linux.is_docker_installed()
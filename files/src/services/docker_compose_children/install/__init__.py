@@ -3,40 +3,36 @@ File in charge of linking the docker installation scripts
 """
 
 from tty_ov import TTY
-from .install_docker_compose_linux import InstallDockerComposeLinux
-from .install_docker_compose_mac import InstallDockerComposeMac
-from .install_docker_compose_raspberry_pi import InstallDockerComposeRaspberryPi
-from .install_docker_compose_windows import InstallDockerComposeWindows
+from ...common import LazyChild
 
 
 class InstallDockerComposeInit:
     """ Install docker on your system """
 
+    install_docker_windows = LazyChild(
+        ".install_docker_compose_windows",
+        "InstallDockerComposeWindows"
+    )
+    install_docker_mac = LazyChild(
+        ".install_docker_compose_mac",
+        "InstallDockerComposeMac"
+    )
+    install_docker_linux = LazyChild(
+        ".install_docker_compose_linux",
+        "InstallDockerComposeLinux"
+    )
+    install_docker_raspberrypi = LazyChild(
+        ".install_docker_compose_raspberry_pi",
+        "InstallDockerComposeRaspberryPi"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_docker_windows = InstallDockerComposeWindows(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_docker_mac = InstallDockerComposeMac(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_docker_linux = InstallDockerComposeLinux(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_docker_raspberrypi = InstallDockerComposeRaspberryPi(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_class_install_docker_compose(self, args: list) -> None:
         """ Test the class InstallDocker """
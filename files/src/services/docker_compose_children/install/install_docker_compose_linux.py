@@ -5,9 +5,9 @@ File in charge of containing the docker installation for mac systems
 
 from time import sleep
 from tty_ov import TTY
-from tqdm import tqdm
 import display_tty
 import requests
+from ...common import get_tool_cache, get_download_manager, StepGraph, get_step_journal, get_package_backend, PIP_PACKAGES
 
 
 class InstallDockerComposeLinux:
@@ -42,111 +42,15 @@ class InstallDockerComposeLinux:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_docker_compose_installed(self) -> bool:
         """ Returns true if Docker-compose is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker-compose is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "sudo",
-                "docker-compose",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker-compose status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker-compose", "Docker-compose")
 
     def is_docker_installed(self) -> bool:
         """ Returns true if Docker is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "sudo",
-                "docker",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker", "Docker")
 
     def _installation_error_message(self) -> None:
         """ Print the error message """
@@ -155,7 +59,7 @@ class InstallDockerComposeLinux:
             "Error installing docker\n"
         )
 
-    def _download_script(self) -> int:
+    def _download_script(self, context: dict) -> int:
         """ Dowload the installer script """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Downloading docker install script")
@@ -171,9 +75,10 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        context["install_script"] = self.destination_file
+        return self.success
 
-    def _install_docker_via_script(self) -> int:
+    def _install_docker_via_script(self, context: dict) -> int:
         """ Install docker via the script """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Installing docker via the script")
@@ -185,9 +90,9 @@ class InstallDockerComposeLinux:
             [
                 "chmod",
                 "+x",
-                self.destination_file,
+                context["install_script"],
                 "&&",
-                self.destination_file
+                context["install_script"]
             ]
         )
         self.print_on_tty(
@@ -202,7 +107,7 @@ class InstallDockerComposeLinux:
             self.tty.info_colour,
             "Adding you to the docker groupe\n"
         )
-        self.run(
+        status = self.run(
             [
                 "sudo",
                 "usermod",
@@ -211,16 +116,16 @@ class InstallDockerComposeLinux:
                 "$USER"
             ]
         )
-        if self.tty.current_tty_status != self.success:
+        if status != self.success:
             self.print_on_tty(
                 self.tty.error_colour,
                 "Error adding you to the docker groupe\n"
             )
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _test_docker_installation(self) -> int:
+    def _test_docker_installation(self, context: dict) -> int:
         """ Test the docker installation """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Testing docker installation")
@@ -244,9 +149,9 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _test_docker_functionalities(self) -> int:
+    def _test_docker_functionalities(self, context: dict) -> int:
         """ Testing Docker's capability to pull a hello-world image """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Testing docker functionalities")
@@ -278,9 +183,9 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _add_docker_to_the_user(self) -> int:
+    def _add_docker_to_the_user(self, context: dict) -> int:
         """ Add the docker binary to the user groupe (grants it the same rights as the user) """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Adding docker to the user")
@@ -301,51 +206,36 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
     def _has_pip(self) -> bool:
         """ Check if pip is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if pip is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "pip3",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Pip status: "
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "pip")
 
-    def _ensure_pip(self) -> int:
+    def _ensure_pip(self, context: dict) -> int:
         """ Ensure pip is installed """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Ensuring pip is installed")
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Installing pip:"
-        )
-        status = self.run(
-            [
-
-                "sudo",
-                "python3",
-                "-m",
-                "ensurepip",
-                "--upgrade"
-            ]
-        )
+        backend = get_package_backend()
+        manager = backend.get_preferred(PIP_PACKAGES)
+        if manager != "":
+            # ---- The distributions ship pip as a package (Debian disables ensurepip) ----
+            status = backend.install_on_tty(self.tty, manager, PIP_PACKAGES[manager], reason="docker-compose")
+        else:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "Installing pip:"
+            )
+            status = self.run(
+                [
+                    "sudo",
+                    "python3",
+                    "-m",
+                    "ensurepip",
+                    "--upgrade"
+                ]
+            )
+            backend.forget()
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (pip):"
@@ -354,9 +244,9 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
-    def _install_docker_compose_binary(self) -> int:
+    def _install_docker_compose_binary(self, context: dict) -> int:
         """ Install docker-compose binary """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Installing docker-compose binary")
@@ -364,14 +254,7 @@ class InstallDockerComposeLinux:
             self.tty.info_colour,
             "Installing docker-compose:"
         )
-        status = self.run(
-            [
-                "sudo",
-                "pip3",
-                "install",
-                "docker-compose"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "pip", ["docker-compose"])
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (docker-compose):"
@@ -380,7 +263,7 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
     def _save_to_file(self, content: str = "", file_name: str = "a.txt") -> int:
         """ Save the content to a file """
@@ -398,14 +281,14 @@ class InstallDockerComposeLinux:
                 f"File saved to: {file_name}\n"
             )
             self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+            return self.tty.success
         except Exception as err:
             self.print_on_tty(
                 self.tty.error_colour,
                 f"Error saving file: {err}\n"
             )
             self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+            return self.tty.error
 
     def _deploy_docker_compose(self, file_path: str) -> int:
         """ Deploy a docker-compose.yaml file """
@@ -435,7 +318,7 @@ class InstallDockerComposeLinux:
             self.tty.success_colour,
             f"{file_path} file deployed successfully\n"
         )
-        return self.tty.current_tty_status
+        return self.success
 
     def _request_url_until_delay(self, url: str, delay: int) -> int:
         """ Request an URL until it's available or the delay is reached """
@@ -463,24 +346,23 @@ class InstallDockerComposeLinux:
             )
             if request.status_code == 200:
                 self.tty.current_tty_status = self.tty.success
-                return self.tty.current_tty_status
+                return self.tty.success
             self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+            return self.tty.error
         except requests.RequestException as err:
             self.print_on_tty(
                 self.tty.error_colour,
                 f"Error requesting url: {err}\n"
             )
             self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+            return self.tty.error
         except Exception:
-            self.run(
+            return self.run(
                 [
                     "wget",
                     url
                 ]
             )
-            return self.tty.current_tty_status
 
     def _testing_image_deployment(self, url: str) -> int:
         """ Querying the url to check if the image is up to date """
@@ -496,7 +378,7 @@ class InstallDockerComposeLinux:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.current_tty_status
+        return self.success
 
     def _test_docker_compose_installation(self) -> int:
         """ Try deploying a docker-compose.yaml file in order to test to see if the installation was successefull """
@@ -524,26 +406,8 @@ services:
         status = self._testing_image_deployment(self.ping_url)
         return self.tty.success
 
-    def _install_docker_compose(self) -> int:
-        """ Install docker-compose """
-        self.print_on_tty(self.tty.info_colour, "")
-        self.disp.sub_title("Installing docker-compose")
-        status = self._add_docker_to_the_user()
-        if status != self.success:
-            return self.error
-        if self._has_pip() is False:
-            status = self._ensure_pip()
-            if status != self.success:
-                return self.error
-        status = self._install_docker_compose_binary()
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker-compose installation status:"
-        )
-        if status != self.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return self.error
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+    def _test_docker_compose(self, context: dict) -> int:
+        """ Deploy a test docker-compose.yaml file """
         status = self._test_docker_compose_installation()
         self.print_on_tty(
             self.tty.info_colour,
@@ -553,7 +417,63 @@ services:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.error
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        return self.tty.success
+        return self.success
+
+    def get_steps(self, install_docker: bool = True, install_pip: bool = True) -> StepGraph:
+        """ Return the installation steps (docker first when it is missing) """
+        steps = StepGraph(self.success, self.error, name="docker_compose_linux", journal=get_step_journal())
+        docker_ready = []
+        if install_docker is True:
+            steps.add(
+                "download_script",
+                self._download_script,
+                outputs=["install_script"],
+                key=self.installer_path,
+                files=[self.destination_file]
+            )
+            steps.add(
+                "install_docker",
+                self._install_docker_via_script,
+                inputs=["install_script"],
+                interactive=True
+            )
+            steps.add(
+                "test_docker_installation",
+                self._test_docker_installation,
+                requires=["install_docker"],
+                checkpoint=False
+            )
+            steps.add(
+                "test_docker_functionalities",
+                self._test_docker_functionalities,
+                requires=["test_docker_installation"],
+                checkpoint=False
+            )
+            docker_ready = ["test_docker_functionalities"]
+        steps.add(
+            "add_docker_to_the_user",
+            self._add_docker_to_the_user,
+            requires=docker_ready,
+            interactive=True
+        )
+        compose_requires = ["add_docker_to_the_user"]
+        if install_pip is True:
+            # ---- pip does not need docker, it is installed while docker is ----
+            steps.add("ensure_pip", self._ensure_pip, interactive=True)
+            compose_requires.append("ensure_pip")
+        steps.add(
+            "install_docker_compose",
+            self._install_docker_compose_binary,
+            requires=compose_requires,
+            interactive=True
+        )
+        steps.add(
+            "test_docker_compose",
+            self._test_docker_compose,
+            requires=["install_docker_compose"],
+            checkpoint=False
+        )
+        return steps
 
     def main(self) -> int:
         """ Install docker on the current system """
@@ -563,28 +483,31 @@ services:
         self.disp.inform_message(
             "In order to install docker-compose, docker needs to be installed beforehand."
         )
-        if self.is_docker_installed() is False:
-            status = self._download_script()
-            if status != self.success:
-                self._installation_error_message()
-                return self.err
-            status = self._install_docker_via_script()
-            if status != self.success:
-                self._installation_error_message()
-                return self.err
-            status = self._test_docker_installation()
-            if status != self.success:
-                self._installation_error_message()
-                return self.err
-            status = self._test_docker_functionalities()
-            if status != self.success:
+        steps = self.get_steps(
+            self.is_docker_installed() is False,
+            self._has_pip() is False
+        )
+        if steps.has_checkpoints() is True:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "Resuming the previous installation, its completed steps are skipped (install_journal_reset docker_compose_linux to start over)\n"
+            )
+        report = steps.run()
+        self.print_on_tty(self.tty.info_colour, steps.format_report(report))
+        if report["status"] != self.success:
+            if report["failed"] in ("download_script", "install_docker", "test_docker_installation", "test_docker_functionalities"):
                 self._installation_error_message()
-                return self.err
             self.print_on_tty(
-                self.tty.success_colour,
-                "Docker installed successfully\n"
+                self.tty.info_colour,
+                "Docker-compose installation status:"
             )
-        return self._install_docker_compose()
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            return self.error
+        self.print_on_tty(
+            self.tty.success_colour,
+            "Docker-compose installed successfully\n"
+        )
+        return self.tty.success
 
     def test_class_install_docker_compose_linux(self) -> None:
         """ Test the class install docker-compose Linux """
@@ -4,9 +4,8 @@ File in charge of containing the docker installation for linux systems
 
 
 import display_tty
-import requests
-from tqdm import tqdm
 from tty_ov import TTY
+from ...common import get_tool_cache, get_download_manager
 
 
 class InstallDockerComposeMac:
@@ -33,110 +32,15 @@ class InstallDockerComposeMac:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_docker_compose_installed(self) -> bool:
         """ Returns true if Docker-compose is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker-compose is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "sudo",
-                "docker-compose",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker-compose status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker-compose", "Docker-compose")
 
     def is_docker_installed(self) -> bool:
-        """ Returns true if k3d is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3d is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "docker",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "K3d status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        """ Returns true if Docker is installed """
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker", "Docker")
 
     def _installation_error_message(self) -> None:
         """ Print the error message """
@@ -4,9 +4,9 @@ File in charge of installing docker on a raspberry pi
 
 from time import sleep
 from tty_ov import TTY
-from tqdm import tqdm
 import display_tty
 import requests
+from ...common import get_host_facts, get_tool_cache, get_download_manager, get_package_backend, PIP_PACKAGES
 
 
 class InstallDockerComposeRaspberryPi:
@@ -41,110 +41,15 @@ class InstallDockerComposeRaspberryPi:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_docker_compose_installed(self) -> bool:
         """ Returns true if Docker-compose is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker-compose is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "sudo",
-                "docker-compose",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker-compose status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker-compose", "Docker-compose")
 
     def is_docker_installed(self) -> bool:
         """ Returns true if Docker is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if Docker is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "docker",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Docker status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "docker", "Docker")
 
     def is_raspberrypi(self) -> bool:
         """ Check the system to see if we are on a raspberrypi """
@@ -152,21 +57,11 @@ class InstallDockerComposeRaspberryPi:
             self.tty.info_colour,
             "Checking if the system is a raspberry pi:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "uname",
-                "-n",
-                "|",
-                "grep",
-                "-q",
-                "raspberrypi"
-            ]
-        )
         self.print_on_tty(
             self.tty.info_colour,
             "Is Rasberry Pi status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if get_host_facts().is_raspberrypi is False:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return False
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
@@ -310,47 +205,32 @@ class InstallDockerComposeRaspberryPi:
 
     def _has_pip(self) -> bool:
         """ Check if pip is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if pip is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "pip3",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Pip status: "
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "pip")
 
     def _ensure_pip(self) -> int:
         """ Ensure pip is installed """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title("Ensuring pip is installed")
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Installing pip:"
-        )
-        status = self.run(
-            [
-
-                "sudo",
-                "python3",
-                "-m",
-                "ensurepip",
-                "--upgrade"
-            ]
-        )
+        backend = get_package_backend()
+        manager = backend.get_preferred(PIP_PACKAGES)
+        if manager != "":
+            # ---- The distributions ship pip as a package (Debian disables ensurepip) ----
+            status = backend.install_on_tty(self.tty, manager, PIP_PACKAGES[manager], reason="docker-compose")
+        else:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "Installing pip:"
+            )
+            status = self.run(
+                [
+                    "sudo",
+                    "python3",
+                    "-m",
+                    "ensurepip",
+                    "--upgrade"
+                ]
+            )
+            backend.forget()
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (pip):"
@@ -369,14 +249,7 @@ class InstallDockerComposeRaspberryPi:
             self.tty.info_colour,
             "Installing docker-compose:"
         )
-        status = self.run(
-            [
-                "sudo",
-                "pip3",
-                "install",
-                "docker-compose"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "pip", ["docker-compose"])
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (docker-compose):"
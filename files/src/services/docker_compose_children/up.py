@@ -3,9 +3,9 @@ File in charge of helping the user to bring a docker-compose image up
 """
 
 import os
-from platform import system
 from tty_ov import TTY
 import display_tty
+from ..common import get_host_facts
 
 
 class DockerComposeUp:
@@ -16,7 +16,7 @@ class DockerComposeUp:
         self.err = err
         self.error = error
         self.options = []
-        self.system_name = system()
+        self.system_name = get_host_facts().system
         # ---- The TTY options ----
         self.tty = tty
         self.print_on_tty = self.tty.print_on_tty
@@ -33,7 +33,7 @@ class ApiVersionsAppInfoKubernetes:
 
     def api_versions(self, args: list) -> int:
         """ Display the api-versions of kubectl """
-        func_name = "kube_api_versions"
+        func_name = "api-versions"
         if self.tty.help_function_child_name == func_name:
             help_description = f"""
 Display the api-versions of kubectl
@@ -1,22 +1,51 @@
 """
 File in charge of linking the system installer classes tot the main installer class for kubernetes
+The system installers are only imported when they are requested so that
+loading the shell does not pull the installers of every system.
 """
 
-from .install_kubernetes_windows import InstallKubernetesWindows
-from .install_kubernetes_linux import InstallKubernetesLinux
-from .install_kubernetes_mac import InstallKubernetesMac
+import importlib
 
 __all__ = ["InstallKubernetesWindows",
            "InstallKubernetesLinux", "InstallKubernetesMac"]
 
+_INSTALLER_MODULES = {
+    "InstallKubernetesWindows": ".install_kubernetes_windows",
+    "InstallKubernetesLinux": ".install_kubernetes_linux",
+    "InstallKubernetesMac": ".install_kubernetes_mac"
+}
+
+
+def _import_installer(class_name: str) -> type:
+    """ Import the module containing the installer class and return the class """
+    module = importlib.import_module(_INSTALLER_MODULES[class_name], __name__)
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str) -> type:
+    """ Resolve the system installer classes on their first access """
+    if name in _INSTALLER_MODULES:
+        return _import_installer(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Install:
     """ The class in charge of grouping the os specific kubernetes installers """
 
-    def __init__(self) -> None:
-        self.install_kubernetes_linux = InstallKubernetesLinux
-        self.install_kubernetes_windows = InstallKubernetesWindows
-        self.install_kubernetes_mac = InstallKubernetesMac
+    @property
+    def install_kubernetes_linux(self) -> type:
+        """ The installer class for linux """
+        return _import_installer("InstallKubernetesLinux")
+
+    @property
+    def install_kubernetes_windows(self) -> type:
+        """ The installer class for windows """
+        return _import_installer("InstallKubernetesWindows")
+
+    @property
+    def install_kubernetes_mac(self) -> type:
+        """ The installer class for mac """
+        return _import_installer("InstallKubernetesMac")
 
     def test_class_install(self) -> int:
         """ Test the Install class of kubernetes """
@@ -4,19 +4,21 @@ File in charge of containing the code that will install kubernetes on a mac.
 
 from tty_ov import TTY
 import display_tty
-from .k3d import InstallK3d
-from .k3s import InstallK3s
-from .k8s import InstallK8s
-from .kind import InstallKind
-from .kubectl import InstallKubectl
-from .microk8s import InstallMicroK8s
-from .minikube import InstallMinikube
-from .kubeadm import InstallKubeadm
+from ...common import LazyChild
 
 
 class InstallKubernetesMac:
     """ Install the kubernetes on Mac """
 
+    k3d = LazyChild(".k3d", "InstallK3d")
+    k3s = LazyChild(".k3s", "InstallK3s")
+    k8s = LazyChild(".k8s", "InstallK8s")
+    kind = LazyChild(".kind", "InstallKind")
+    kubectl = LazyChild(".kubectl", "InstallKubectl")
+    microk8s = LazyChild(".microk8s", "InstallMicroK8s")
+    minikube = LazyChild(".minikube", "InstallMinikube")
+    kubeadm = LazyChild(".kubeadm", "InstallKubeadm")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
@@ -24,14 +26,6 @@ class InstallKubernetesMac:
         self.error = error
         # ---- Parent classes ----
         self.tty = tty
-        self.k3d = InstallK3d(tty, success, err, error)
-        self.k3s = InstallK3s(tty, success, err, error)
-        self.k8s = InstallK8s(tty, success, err, error)
-        self.kind = InstallKind(tty, success, err, error)
-        self.kubectl = InstallKubectl(tty, success, err, error)
-        self.microk8s = InstallMicroK8s(tty, success, err, error)
-        self.minikube = InstallMinikube(tty, success, err, error)
-        self.kubeadm = InstallKubeadm(tty, success, err, error)
         # ---- TTY rebinds ----
         self.print_on_tty = self.tty.print_on_tty
         # ---- Download options ----
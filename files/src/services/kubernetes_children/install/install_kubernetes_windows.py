@@ -2,23 +2,23 @@
 File in charge of downloading kubernetes for windows
 """
 
-import requests
 import display_tty
-from tqdm import tqdm
 from tty_ov import TTY
-from .k3d import InstallK3d
-from .k3s import InstallK3s
-from .k8s import InstallK8s
-from .kind import InstallKind
-from .kubectl import InstallKubectl
-from .microk8s import InstallMicroK8s
-from .minikube import InstallMinikube
-from .kubeadm import InstallKubeadm
+from ...common import LazyChild, get_download_manager
 
 
 class InstallKubernetesWindows:
     """ The script in charge of installing the kubernetes interpreter for windows """
 
+    k3d = LazyChild(".k3d", "InstallK3d")
+    k3s = LazyChild(".k3s", "InstallK3s")
+    k8s = LazyChild(".k8s", "InstallK8s")
+    kind = LazyChild(".kind", "InstallKind")
+    kubectl = LazyChild(".kubectl", "InstallKubectl")
+    microk8s = LazyChild(".microk8s", "InstallMicroK8s")
+    minikube = LazyChild(".minikube", "InstallMinikube")
+    kubeadm = LazyChild(".kubeadm", "InstallKubeadm")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
@@ -26,14 +26,6 @@ class InstallKubernetesWindows:
         self.error = error
         # ---- Parent classes ----
         self.tty = tty
-        self.k3d = InstallK3d(tty, success, err, error)
-        self.k3s = InstallK3s(tty, success, err, error)
-        self.k8s = InstallK8s(tty, success, err, error)
-        self.kind = InstallKind(tty, success, err, error)
-        self.kubectl = InstallKubectl(tty, success, err, error)
-        self.microk8s = InstallMicroK8s(tty, success, err, error)
-        self.minikube = InstallMinikube(tty, success, err, error)
-        self.kubeadm = InstallKubeadm(tty, success, err, error)
         # ---- TTY rebinds ----
         self.print_on_tty = self.tty.print_on_tty
         # ---- Download options ----
@@ -61,41 +53,7 @@ class InstallKubernetesWindows:
 
     def download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def install_kubectl(self) -> int:
         """ The main function in charge of installing kubernetes on windows """
@@ -3,30 +3,27 @@ File in charge of loading the k3d installer classes
 """
 
 from tty_ov import TTY
-from .install_k3d_linux import InstallK3dLinux
-from .install_k3d_raspberry_pi import InstallK3dRaspberryPi
-from .install_k3d_mac import InstallK3dMac
-from .install_k3d_windows import InstallK3dWindows
+from ....common import LazyChild
 
 
 class InstallK3d:
     """ Install K3d on the correct device """
 
+    install_mac = LazyChild(".install_k3d_mac", "InstallK3dMac")
+    install_linux = LazyChild(".install_k3d_linux", "InstallK3dLinux")
+    install_raspberrypi = LazyChild(
+        ".install_k3d_raspberry_pi",
+        "InstallK3dRaspberryPi"
+    )
+    install_windows = LazyChild(".install_k3d_windows", "InstallK3dWindows")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallK3dMac(tty, success, err, error)
-        self.install_linux = InstallK3dLinux(tty, success, err, error)
-        self.install_raspberrypi = InstallK3dRaspberryPi(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_windows = InstallK3dWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_k3d_installation_class(self) -> None:
         """ Test the k3d installation class """
@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallK3dMac:
@@ -25,29 +26,7 @@ class InstallK3dMac:
 
     def is_k3d_installed(self) -> bool:
         """ Returns true if k3d is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3d is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3d",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "K3d status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3d")
 
     def test_class_install_k3d_mac(self) -> None:
         """ Test the class install k3d MacOS """
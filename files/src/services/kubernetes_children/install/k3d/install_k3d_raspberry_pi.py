@@ -5,10 +5,9 @@ File in charge of installing k3d on a rasberry pi
 import os
 import uuid
 import display_tty
-import requests
 from datetime import datetime
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_host_facts, get_tool_cache, ProcessRunner, get_download_manager, get_package_backend
 
 
 class InstallK3dRaspberryPi:
@@ -24,6 +23,7 @@ class InstallK3dRaspberryPi:
         self.print_on_tty = self.tty.print_on_tty
         self.super_run = self.tty.run_as_admin
         self.run = self.tty.run_command
+        self.process = ProcessRunner()
         # ---- The Disp option ----
         self.disp = display_tty.IDISP
         self.disp.toml_content["PRETTIFY_OUTPUT"] = False
@@ -41,16 +41,23 @@ class InstallK3dRaspberryPi:
         self.edit_mode = "w"
         self.encoding = "utf-8"
         self.newline = "\n"
+        # ---- The apt packages of each base distribution for vxlan support ----
+        self.extra_dependencies = {
+            "ubuntu": ["linux-modules-extra-raspi"],
+            "debian": [
+                "libavcodec-extra",
+                "ttf-mscorefonts-installer",
+                "unrar",
+                "chromium-codecs-ffmpeg-extra",
+                "gstreamer1.0-libav",
+                "gstreamer1.0-plugins-ugly",
+                "gstreamer1.0-vaapi"
+            ]
+        }
         # ---- Token file ----
         self.token_save_file = "~/your_master_token.txt"
         # ---- K3d Host name file ----
         self.k3d_hostname_file = "/etc/your_k3d_hostname.txt"
-        # ---- Dns file ----
-        self.dns_save_file = "/tmp/your_current_dns_address.txt"
-        # ---- IP file ----
-        self.ip_save_file = "/tmp/your_current_ip.txt"
-        # ---- Router file ----
-        self.router_save_file = "/tmp/your_router_name.txt"
 
     def _get_file_content(self, file_path: str, encoding: str = "utf-8") -> str:
         """ Get the content of a file """
@@ -95,83 +102,11 @@ class InstallK3dRaspberryPi:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_k3d_installed(self) -> bool:
         """ Returns true if k3d is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3d is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3d",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "K3d status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3d")
 
     def is_raspberrypi(self) -> bool:
         """ Check the system to see if we are on a raspberrypi """
@@ -179,21 +114,11 @@ class InstallK3dRaspberryPi:
             self.tty.info_colour,
             "Checking if the system is a raspberry pi:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "uname",
-                "-n",
-                "|",
-                "grep",
-                "-q",
-                "raspberrypi"
-            ]
-        )
         self.print_on_tty(
             self.tty.info_colour,
             "Is Rasberry Pi status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if get_host_facts().is_raspberrypi is False:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return False
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
@@ -206,14 +131,10 @@ class InstallK3dRaspberryPi:
             self.tty.info_colour,
             "Getting the IP of the machine:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "hostname",
-                "-I",
-                f">{self.ip_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        result = self.process.run(["hostname", "-I"])
+        self.tty.current_tty_status = self.tty.success
+        if result.ok is False:
+            self.tty.current_tty_status = self.tty.error
         self.print_on_tty(
             self.tty.info_colour,
             "Machine IP status: "
@@ -224,10 +145,10 @@ class InstallK3dRaspberryPi:
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.tty.current_tty_status = self.tty.success
-        usr_ip = self._get_file_content(self.ip_save_file, "utf-8")
-        usr_ip = usr_ip.replace("\n", " ")
-        usr_ip = usr_ip.split(" ")[0]
-        return usr_ip
+        usr_ip = result.stdout.split()
+        if len(usr_ip) == 0:
+            return ""
+        return usr_ip[0]
 
     def _get_dns_ip(self) -> str:
         """ Get the ip of the dns for the static ip """
@@ -235,17 +156,19 @@ class InstallK3dRaspberryPi:
             self.tty.info_colour,
             "Getting the dns of the machine:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.dns_file,
-                "|",
-                "grep",
-                "nameserver",
-                f">{self.dns_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        dns_ip = ""
+        try:
+            file_content = self._get_file_content(self.dns_file, "utf-8")
+        except OSError:
+            file_content = ""
+        for line in file_content.splitlines():
+            fields = line.split()
+            if len(fields) > 1 and fields[0] == "nameserver":
+                dns_ip = fields[1]
+                break
+        self.tty.current_tty_status = self.tty.success
+        if dns_ip == "":
+            self.tty.current_tty_status = self.tty.error
         self.print_on_tty(
             self.tty.info_colour,
             "DNS status: "
@@ -255,9 +178,6 @@ class InstallK3dRaspberryPi:
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.tty.current_tty_status = self.tty.success
-        dns_ip = self._get_file_content(self.dns_save_file, "utf-8")
-        dns_ip = dns_ip.replace("\n", " ")
-        dns_ip = dns_ip.split(" ")[1]
         return dns_ip
 
     def _get_user_name(self) -> str:
@@ -267,7 +187,7 @@ class InstallK3dRaspberryPi:
 
     def _get_computer_name(self) -> str:
         """ Get the computer name of the machine """
-        computer_name = os.uname()[1]
+        computer_name = get_host_facts().node_name
         return computer_name
 
     def _get_date(self) -> str:
@@ -339,40 +259,22 @@ class InstallK3dRaspberryPi:
         )
         router_name = ""
         ip = self._get_usr_ip()
-        router_name_status = self.run(
-            [
-                "ifconfig",
-                "|",
-                "grep",
-                "-B1",
-                f"'{ip}'",
-                "|",
-                "cut",
-                "-d",
-                "\":\"",
-                "-f",
-                "1",
-                "|",
-                "cut",
-                "-d",
-                "\" \"",
-                "-f",
-                "1",
-                f">{self.router_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        result = self.process.run(["ifconfig"])
         self.print_on_tty(
             self.tty.info_colour,
             "Router name status: "
         )
-        if router_name_status == self.tty.error:
+        if result.ok is False:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        router_name = self._get_file_content(self.router_save_file, "utf-8")
-        router_name = router_name.replace("\n", " ")
-        router_name = router_name.split(" ")[0]
+        # ---- The interface is named on the line above its address ----
+        previous_line = ""
+        for line in result.stdout.splitlines():
+            if ip != "" and ip in line.split():
+                router_name = previous_line.split(":")[0].split(" ")[0]
+                break
+            previous_line = line
         return router_name
 
     def _compile_static_ip(self) -> str:
@@ -523,108 +425,38 @@ class InstallK3dRaspberryPi:
             self.tty.info_colour,
             "Checking if the raspberry pi is based on Ubuntu or Debian:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.release_file,
-                "|",
-                "grep",
-                "-q",
-                "ubuntu"
-            ]
-        )
-        if self.tty.current_tty_status == self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Raspberry pi base flavor status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[OK]\n")
-            return "ubuntu"
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.release_file,
-                "|",
-                "grep",
-                "-q",
-                "debian"
-            ]
-        )
+        pi_system = get_host_facts().pi_base_flavor
         self.print_on_tty(
             self.tty.info_colour,
             "Raspberry pi base flavor status: "
         )
-        if self.tty.current_tty_status == self.tty.success:
-            self.print_on_tty(self.tty.success_colour, "[OK]\n")
-            return "debian"
-        self.print_on_tty(self.tty.error_colour, "[KO]\n")
-        return ""
+        if pi_system == "":
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            return pi_system
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        return pi_system
 
-    def _install_extra_ubuntu_dependencies(self) -> int:
-        """ Install extra ubuntu dependencies for vxlan support """
+    def _install_extra_dependencies(self, pi_system: str) -> int:
+        """ Install the extra dependencies of the distribution for vxlan support, in one apt transaction """
         self.print_on_tty(
             self.tty.info_colour,
-            "Installing extra ubuntu dependencies:\n"
+            f"Installing extra {pi_system} dependencies:\n"
         )
-        status = self.run(
-            [
-                "sudo",
-                "su",
-                "-c",
-                "\"apt",
-                "install",
-                "-y",
-                "linux-modules-extra-raspi\""
-            ]
-        )
-        if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Extra ubuntu dependencies status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[KO]\n")
-            return self.err
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Extra ubuntu dependencies status: "
+        status = get_package_backend().install_on_tty(
+            self.tty,
+            "apt",
+            self.extra_dependencies[pi_system],
+            reason=f"{pi_system} vxlan support"
         )
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-
-    def _install_extra_debian_dependencies(self) -> int:
-        """ Install extra debian dependencies for vxlan support """
         self.print_on_tty(
             self.tty.info_colour,
-            "Installing extra debian dependencies:\n"
-        )
-        status = self.run(
-            [
-                "sudo",
-                "su",
-                "-c",
-                "\"apt",
-                "install",
-                "-y",
-                "libavcodec-extra",
-                "ttf-mscorefonts-installer",
-                "unrar",
-                "chromium-codecs-ffmpeg-extra",
-                "gstreamer1.0-libav",
-                "gstreamer1.0-plugins-ugly",
-                "gstreamer1.0-vaapi\""
-            ]
+            f"Extra {pi_system} dependencies status: "
         )
         if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Extra debian dependencies status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[KO]\n")
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Extra debian dependencies status: "
-        )
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        return self.success
 
     def _prepping_failed_message(self) -> None:
         """ The message to display when the prepping fails """
@@ -652,16 +484,11 @@ class InstallK3dRaspberryPi:
             self._installation_failed_message()
             return status
         pi_system = self._check_pi_base_flavor()
-        if pi_system == "ubuntu":
-            status = self._install_extra_ubuntu_dependencies()
+        if pi_system in self.extra_dependencies:
+            status = self._install_extra_dependencies(pi_system)
             if status == self.err:
                 self._installation_failed_message()
                 return status
-        if pi_system == "debian":
-            status = self._install_extra_debian_dependencies()
-            if status == self.err:
-                self._installation_failed_message()
-                return self.err
         self.print_on_tty(
             self.tty.info_colour,
             "Prepping status: "
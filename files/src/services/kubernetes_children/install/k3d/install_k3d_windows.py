@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallK3dWindows:
@@ -107,29 +108,7 @@ class InstallK3dWindows:
 
     def is_k3d_installed(self) -> bool:
         """ Returns true if k3d is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3d is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3d",
-                "--version",
-                ">nul",
-                "2>nul"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "K3d status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3d")
 
     def main(self) -> int:
         """ The main function of the class """
@@ -3,30 +3,27 @@ File in charge of loading the k3s installer classes
 """
 
 from tty_ov import TTY
-from .install_k3s_linux import InstallK3sLinux
-from .install_k3s_mac import InstallK3sMac
-from .install_k3s_windows import InstallK3sWindows
-from .install_k3s_raspberry_pi import InstallK3sRaspberryPi
+from ....common import LazyChild
 
 
 class InstallK3s:
     """ Install K3s on the correct device """
 
+    install_mac = LazyChild(".install_k3s_mac", "InstallK3sMac")
+    install_linux = LazyChild(".install_k3s_linux", "InstallK3sLinux")
+    install_raspberrypi = LazyChild(
+        ".install_k3s_raspberry_pi",
+        "InstallK3sRaspberryPi"
+    )
+    install_windows = LazyChild(".install_k3s_windows", "InstallK3sWindows")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallK3sMac(tty, success, err, error)
-        self.install_linux = InstallK3sLinux(tty, success, err, error)
-        self.install_raspberrypi = InstallK3sRaspberryPi(
-            tty,
-            success,
-            err,
-            error
-        )
-        self.install_windows = InstallK3sWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_k3s_installation_class(self) -> None:
         """ Test the k3s installation class """
@@ -6,10 +6,24 @@ import os
 import uuid
 from datetime import datetime
 
-import requests
 import display_tty
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import (
+    get_host_facts,
+    get_tool_cache,
+    get_download_manager,
+    get_active_bundle,
+    get_bundle_architecture,
+    DownloadError,
+    get_peer_server,
+    set_peer_source,
+    get_peer_source,
+    PEER_PORT,
+    get_release_resolver,
+    StepGraph,
+    get_step_journal,
+    get_package_backend
+)
 
 
 class InstallK3sLinux:
@@ -44,60 +58,15 @@ class InstallK3sLinux:
         self.token_save_file = "~/your_master_token.txt"
         # ---- K3s Host name file ----
         self.k3s_hostname_file = "/etc/your_k3s_hostname.txt"
+        # ---- Install from an offline bundle or from the artifact server of the master ----
+        self.airgap_folder = "/tmp/k3s_airgap"
+        self.k3s_binary_path = "/usr/local/bin/k3s"
+        self.k3s_images_folder = "/var/lib/rancher/k3s/agent/images/"
+        self.k3s_skip_download = False
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def _get_file_content(self, file_path: str, encoding: str = "utf-8") -> str:
         """ Get the content of a file """
@@ -106,45 +75,11 @@ class InstallK3sLinux:
 
     def _has_yay(self) -> bool:
         """ Returns true if the user has yay [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has yay installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "yay",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "yay")
 
     def _has_brew(self) -> bool:
         """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has brew installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "brew",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "brew")
 
     def _installation_failed_message(self) -> None:
         """ the message to display when the installation fails """
@@ -161,7 +96,7 @@ class InstallK3sLinux:
 
     def _get_computer_name(self) -> str:
         """ Get the computer name of the machine """
-        computer_name = os.uname()[1]
+        computer_name = get_host_facts().node_name
         return computer_name
 
     def _get_date(self) -> str:
@@ -225,6 +160,135 @@ class InstallK3sLinux:
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         return hostname
 
+    def _fetch_local_artifacts(self, context: dict) -> int:
+        """ Copy the k3s binary and airgap images of the bundle (or of the master's artifact server) to the airgap folder """
+        context["staged_binaries"] = []
+        context["staged_images"] = []
+        source = get_active_bundle()
+        required = source is not None
+        if source is None:
+            source = get_peer_source()
+        if source is None:
+            return self.success
+        origin = "bundle" if required is True else "artifact server"
+        self.print_on_tty(
+            self.tty.info_colour,
+            f"Staging the k3s binary and images of the {origin}:\n"
+        )
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        if required is True and source.architecture != architecture:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"The bundle holds {source.architecture} binaries, this machine needs {architecture or 'an unsupported architecture'}\n"
+            )
+            return self.error
+        try:
+            binaries = source.extract_role("k3s-binary", self.airgap_folder)
+            images = source.extract_role("k3s-images", self.airgap_folder)
+        except (DownloadError, OSError) as err:
+            if required is False:
+                self.print_on_tty(
+                    self.tty.info_colour,
+                    f"The artifact server could not provide them ({err}), the install script downloads them\n"
+                )
+                return self.success
+            self.print_on_tty(self.tty.error_colour, f"{err}\n")
+            return self.error
+        if len(binaries) == 0:
+            if required is False:
+                self.print_on_tty(
+                    self.tty.info_colour,
+                    f"The artifact server has no k3s binary for {architecture}, the install script downloads it\n"
+                )
+                return self.success
+            self.print_on_tty(
+                self.tty.error_colour,
+                "The bundle has no k3s binary, build it with the k3s plan\n"
+            )
+            return self.error
+        context["staged_binaries"] = binaries
+        context["staged_images"] = images
+        return self.success
+
+    def _install_local_artifacts(self, context: dict) -> int:
+        """ Put the fetched k3s binary and airgap images where the install script expects them """
+        binaries = context["staged_binaries"]
+        images = context["staged_images"]
+        context["k3s_skip_download"] = False
+        if len(binaries) == 0:
+            return self.success
+        status = self.run(["sudo", "install", "-m", "0755", binaries[0], self.k3s_binary_path])
+        if status == self.success and len(images) > 0:
+            status = self.run(["sudo", "mkdir", "-p", self.k3s_images_folder])
+            if status == self.success:
+                status = self.run(["sudo", "cp", images[0], self.k3s_images_folder])
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Staging status: "
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        context["k3s_skip_download"] = True
+        return self.success
+
+    def _get_pinned_k3s_version(self) -> str:
+        """ Return the k3s release pinned by the release lockfile ("" lets the install script choose) """
+        try:
+            return get_release_resolver().get_pinned("k3s")
+        except DownloadError as err:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"The release lockfile is ignored: {err}\n"
+            )
+            return ""
+
+    def _use_master_artifact_server(self, master_ip: str) -> None:
+        """ Fetch the installer files from the artifact server of the master when it runs one """
+        base_url = f"http://{master_ip}:{PEER_PORT}"
+        try:
+            set_peer_source(base_url)
+        except DownloadError:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "The master serves no artifacts, the files are downloaded from the internet\n"
+            )
+            return
+        self.print_on_tty(
+            self.tty.success_colour,
+            f"The files are fetched from the master first ({base_url})\n"
+        )
+
+    def _serve_artifacts(self) -> int:
+        """ Share the k3s artifacts with the agents through the artifact server """
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Preparing the artifacts for the agents:\n"
+        )
+        server = get_peer_server()
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        try:
+            server.prefetch(["k3s"], [architecture])
+        except (DownloadError, OSError) as err:
+            self.print_on_tty(
+                self.tty.info_colour,
+                f"The k3s release could not be prefetched ({err}), the agents will download it\n"
+            )
+        try:
+            port = server.start(PEER_PORT)
+        except OSError as err:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"Error starting the artifact server: {err}\n"
+            )
+            return self.error
+        self.print_on_tty(
+            self.tty.success_colour,
+            f"Serving the artifacts to the agents on port {port} while this program runs\n"
+        )
+        return self.success
+
     def _install_master_k3s(self, force_docker: bool = False) -> int:
         """ Install the k3s version for the master node (the one managing the others) """
         self.tty.setenv(["K3S_KUBECONFIG_MODE", '"644"'])
@@ -239,13 +303,29 @@ class InstallK3sLinux:
             "sudo",
             self.k3s_file_name
         ]
+        if self.k3s_skip_download is True:
+            # ---- The binary and images come from the bundle ----
+            install_line.insert(-1, "INSTALL_K3S_SKIP_DOWNLOAD=true")
+        version = self._get_pinned_k3s_version()
+        if version != "":
+            install_line.insert(-1, f"INSTALL_K3S_VERSION={version}")
         if force_docker is True:
             self.tty.setenv(["K3S_FORCE_INSTALL_DOCKER", "1"])
             install_line.append("--docker")
 
-        self.run(install_line)
+        status = self.run(install_line)
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Installation status (k3s master):"
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            self.tty.current_tty_status = self.tty.error
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.get_k3s_token()
-        return self.tty.success
+        self.tty.current_tty_status = self.tty.success
+        return self.success
 
     def _install_slave_k3s(self, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
         """ Install the k3s version for the slave, the one being managed by the masters """
@@ -280,16 +360,30 @@ class InstallK3sLinux:
             "sudo",
             self.k3s_file_name
         ]
+        if self.k3s_skip_download is True:
+            # ---- The binary and images come from the bundle ----
+            install_line.insert(-1, "INSTALL_K3S_SKIP_DOWNLOAD=true")
+        version = self._get_pinned_k3s_version()
+        if version != "":
+            install_line.insert(-1, f"INSTALL_K3S_VERSION={version}")
         if force_docker is True:
             self.tty.setenv(["K3S_FORCE_INSTALL_DOCKER", "1"])
             install_line.append("--docker")
-        self.run(install_line)
-        return self.tty.success
+        status = self.run(install_line)
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Installation status (k3s slave):"
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            self.tty.current_tty_status = self.tty.error
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        self.tty.current_tty_status = self.tty.success
+        return self.success
 
-    def _manual_installation(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
-        """ Install k3s manually """
-        self.print_on_tty(self.tty.info_colour, "")
-        self.disp.sub_sub_title("Installing k3s")
+    def _download_script(self, context: dict) -> int:
+        """ Download the k3s install script """
         status = self._download_file(self.k3s_link, self.k3s_file_name)
         if status != self.success:
             self.print_on_tty(
@@ -297,7 +391,12 @@ class InstallK3sLinux:
                 "Error downloading the k3s install script\n"
             )
             return self.err
-        status = self.run(["sudo", "chmod", "+x", self.k3s_file_name])
+        context["install_script"] = self.k3s_file_name
+        return self.success
+
+    def _make_script_executable(self, context: dict) -> int:
+        """ Grant the execution permissions to the k3s install script """
+        status = self.run(["sudo", "chmod", "+x", context["install_script"]])
         self.print_on_tty(
             self.tty.info_colour,
             "Download status (k3s):"
@@ -310,20 +409,69 @@ class InstallK3sLinux:
             )
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        if install_as_slave is True:
-            status = self._install_slave_k3s(
-                force_docker,
-                master_token,
-                master_ip
+        return self.success
+
+    def get_steps(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> StepGraph:
+        """ Return the steps of the manual installation (the script and the local artifacts are fetched at the same time) """
+        steps = StepGraph(self.success, self.err, name="k3s_linux", journal=get_step_journal())
+        steps.add(
+            "download_script",
+            self._download_script,
+            outputs=["install_script"],
+            key=self.k3s_link,
+            files=[self.k3s_file_name]
+        )
+        steps.add(
+            "make_script_executable",
+            self._make_script_executable,
+            inputs=["install_script"],
+            interactive=True
+        )
+        steps.add(
+            "fetch_local_artifacts",
+            self._fetch_local_artifacts,
+            outputs=["staged_binaries", "staged_images"],
+            checkpoint=False
+        )
+        steps.add(
+            "install_local_artifacts",
+            self._install_local_artifacts,
+            inputs=["staged_binaries", "staged_images"],
+            outputs=["k3s_skip_download"],
+            interactive=True,
+            files=[self.k3s_binary_path]
+        )
+
+        def install(context: dict) -> int:
+            self.k3s_skip_download = context["k3s_skip_download"]
+            if install_as_slave is True:
+                return self._install_slave_k3s(force_docker, master_token, master_ip)
+            return self._install_master_k3s(force_docker)
+        steps.add(
+            "install_k3s",
+            install,
+            requires=["make_script_executable"],
+            inputs=["k3s_skip_download"],
+            interactive=True,
+            key=[install_as_slave, force_docker, master_token, master_ip, self._get_pinned_k3s_version()]
+        )
+        return steps
+
+    def _manual_installation(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
+        """ Install k3s manually """
+        self.print_on_tty(self.tty.info_colour, "")
+        self.disp.sub_sub_title("Installing k3s")
+        steps = self.get_steps(install_as_slave, force_docker, master_token, master_ip)
+        if steps.has_checkpoints() is True:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "Resuming the previous installation, its completed steps are skipped (install_journal_reset k3s_linux to start over)\n"
             )
-            if status != self.success:
-                self._installation_failed_message()
-                return self.error
-        else:
-            status = self._install_master_k3s(force_docker)
-            if status != self.success:
-                self._installation_failed_message()
-                return self.error
+        report = steps.run()
+        self.print_on_tty(self.tty.info_colour, steps.format_report(report))
+        if report["status"] != self.success:
+            self._installation_failed_message()
+            return self.error
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status: "
@@ -336,13 +484,7 @@ class InstallK3sLinux:
         self.disp.sub_sub_title(
             "Installing k3s for Aur (Arch Linux User Repository) systems"
         )
-        status = self.run(
-            [
-                "yay",
-                "-S",
-                "rancher-k3s-bin"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "yay", ["rancher-k3s-bin"])
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (k3s):"
@@ -368,13 +510,7 @@ class InstallK3sLinux:
     def _install_for_brew(self) -> int:
         """ Install Kubectl using brew """
         self.disp.sub_sub_title("Installing Kubectl via Brew")
-        status = self.run(
-            [
-                "brew",
-                "install",
-                "k3s"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "brew", ["k3s"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -409,24 +545,7 @@ class InstallK3sLinux:
 
     def is_k3s_installed(self) -> bool:
         """ Returns true if k3s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3s",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3s")
 
     def get_k3s_token(self) -> int:
         """ Get the master token for k3s """
@@ -434,18 +553,19 @@ class InstallK3sLinux:
             self.tty.info_colour,
             "Getting the k3s master token:\n"
         )
-        self.tty.current_tty_status = self.run(
+        status = self.run(
             [
                 "sudo",
                 "cat",
                 self.k3s_token_file
             ]
         )
+        self.tty.current_tty_status = status
         self.print_on_tty(
             self.tty.info_colour,
             "K3s master token status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.error
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
@@ -474,8 +594,10 @@ class InstallK3sLinux:
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         return self.success
 
-    def main(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
+    def main(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "", serve_artifacts: bool = False) -> int:
         """ The main function of the class """
+        if install_as_slave is True and master_ip != "":
+            self._use_master_artifact_server(master_ip)
         if self._manual_installation(install_as_slave, force_docker, master_token, master_ip) != self.success:
             if self._has_yay() is True:
                 status = self._install_for_aur()
@@ -485,6 +607,8 @@ class InstallK3sLinux:
                 status = self._install_for_brew()
                 if status == self.success:
                     return status
+        elif install_as_slave is False and serve_artifacts is True:
+            return self._serve_artifacts()
         return self.success
 
     def test_class_install_k3s_linux(self) -> None:
@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallK3sMac:
@@ -34,24 +35,7 @@ class InstallK3sMac:
 
     def is_k3s_installed(self) -> bool:
         """ Returns true if k3s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3s",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3s")
 
     def get_k3s_token(self) -> int:
         """ Get the master token for k3s """
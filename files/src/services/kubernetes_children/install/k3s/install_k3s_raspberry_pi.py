@@ -6,10 +6,30 @@ import os
 import uuid
 from datetime import datetime
 
-import requests
 import display_tty
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import (
+    get_host_facts,
+    get_tool_cache,
+    ProcessRunner,
+    get_download_manager,
+    get_active_bundle,
+    get_bundle_architecture,
+    DownloadError,
+    get_peer_server,
+    set_peer_source,
+    get_peer_source,
+    PEER_PORT,
+    ArtifactPrefetcher,
+    set_active_prefetcher,
+    get_active_prefetcher,
+    get_release_resolver,
+    StepGraph,
+    get_step_journal,
+    ResumeHook,
+    ResumeError,
+    get_package_backend
+)
 
 
 class InstallK3sRaspberryPi:
@@ -25,6 +45,7 @@ class InstallK3sRaspberryPi:
         self.print_on_tty = self.tty.print_on_tty
         self.super_run = self.tty.run_as_admin
         self.run = self.tty.run_command
+        self.process = ProcessRunner()
         # ---- The Disp option ----
         self.disp = display_tty.IDISP
         self.disp.toml_content["PRETTIFY_OUTPUT"] = False
@@ -37,23 +58,40 @@ class InstallK3sRaspberryPi:
         self.release_file = "/etc/os-release"
         self.k3s_token_file = "/var/lib/rancher/k3s/server/node-token"
         self.dns_file = "/etc/resolv.conf"
+        self.cgroups_file = "/proc/cgroups"
         self.installer_file = "./k3s_installer.sh"
+        # ---- The name of the installation in the step journal and the resume hook ----
+        self.journal_name = "k3s_raspberry_pi"
         # ---- File rights ----
         self.edit_mode = "w"
         self.encoding = "utf-8"
         self.newline = "\n"
+        # ---- The apt packages of each base distribution for vxlan support ----
+        self.extra_dependencies = {
+            "ubuntu": ["linux-modules-extra-raspi"],
+            "debian": [
+                "libavcodec-extra",
+                "ttf-mscorefonts-installer",
+                "unrar",
+                "chromium-codecs-ffmpeg-extra",
+                "gstreamer1.0-libav",
+                "gstreamer1.0-plugins-ugly",
+                "gstreamer1.0-vaapi"
+            ]
+        }
         # ---- Token file ----
         self.token_save_file = "~/your_master_token.txt"
         # ---- K3s Host name file ----
         self.k3s_hostname_file = "/etc/your_k3s_hostname.txt"
-        # ---- Dns file ----
-        self.dns_save_file = "/tmp/your_current_dns_address.txt"
-        # ---- IP file ----
-        self.ip_save_file = "/tmp/your_current_ip.txt"
-        # ---- Router file ----
-        self.router_save_file = "/tmp/your_router_name.txt"
         # ---- k3s folder ----
         self.k3s_folder = "/etc/rancher/k3s/"
+        # ---- Install from an offline bundle or from the artifact server of the master ----
+        self.airgap_folder = "/tmp/k3s_airgap"
+        self.k3s_binary_path = "/usr/local/bin/k3s"
+        self.k3s_images_folder = "/var/lib/rancher/k3s/agent/images/"
+        self.k3s_skip_download = False
+        # ---- The downloads running while the board is prepared ----
+        self.prefetcher = None
 
     def _get_file_content(self, file_path: str, encoding: str = "utf-8") -> str:
         """ Get the content of a file """
@@ -63,7 +101,7 @@ class InstallK3sRaspberryPi:
     def _set_file_content(self, file_path: str, content: str, newline: str = "\n") -> int:
         """ Set the content of a file """
         content = content.replace("\r\n", newline)
-        self.tty.run_as_admin(
+        status = self.tty.run_as_admin(
             [
                 "echo",
                 "-n",
@@ -71,7 +109,8 @@ class InstallK3sRaspberryPi:
                 f">{file_path}",
             ]
         )
-        return self.tty.current_tty_status
+        self.tty.current_tty_status = status
+        return status
 
     def _update_variable_in_string(self, variable: str, value: str, string: str) -> str:
         """ Update a variable in a string """
@@ -98,83 +137,11 @@ class InstallK3sRaspberryPi:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
-        except Exception:
-            self.run(
-                [
-                    "wget",
-                    "--progress=bar:force",
-                    "-O",
-                    filepath,
-                    url
-                ]
-            )
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def is_k3s_installed(self) -> bool:
         """ Returns true if k3s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3s is installed:\n"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3s",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        self.print_on_tty(
-            self.tty.info_colour,
-            "K3s status: "
-        )
-
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3s")
 
     def is_raspberrypi(self) -> bool:
         """ Check the system to see if we are on a raspberrypi """
@@ -182,21 +149,11 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Checking if the system is a raspberry pi:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "uname",
-                "-n",
-                "|",
-                "grep",
-                "-q",
-                "raspberrypi"
-            ]
-        )
         self.print_on_tty(
             self.tty.info_colour,
             "Is Rasberry Pi status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if get_host_facts().is_raspberrypi is False:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return False
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
@@ -209,28 +166,25 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Getting the IP of the machine:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "hostname",
-                "-I",
-                f">{self.ip_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        result = self.process.run(["hostname", "-I"])
+        status = self.tty.success
+        if result.ok is False:
+            status = self.tty.error
+        self.tty.current_tty_status = status
         self.print_on_tty(
             self.tty.info_colour,
             "Machine IP status: "
         )
 
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.tty.current_tty_status = self.tty.success
-        usr_ip = self._get_file_content(self.ip_save_file, "utf-8")
-        usr_ip = usr_ip.replace("\n", " ")
-        usr_ip = usr_ip.split(" ")[0]
-        return usr_ip
+        usr_ip = result.stdout.split()
+        if len(usr_ip) == 0:
+            return ""
+        return usr_ip[0]
 
     def _get_dns_ip(self) -> str:
         """ Get the ip of the dns for the static ip """
@@ -238,29 +192,29 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Getting the dns of the machine:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.dns_file,
-                "|",
-                "grep",
-                "nameserver",
-                f">{self.dns_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        dns_ip = ""
+        try:
+            file_content = self._get_file_content(self.dns_file, "utf-8")
+        except OSError:
+            file_content = ""
+        for line in file_content.splitlines():
+            fields = line.split()
+            if len(fields) > 1 and fields[0] == "nameserver":
+                dns_ip = fields[1]
+                break
+        status = self.tty.success
+        if dns_ip == "":
+            status = self.tty.error
+        self.tty.current_tty_status = status
         self.print_on_tty(
             self.tty.info_colour,
             "DNS status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.tty.current_tty_status = self.tty.success
-        dns_ip = self._get_file_content(self.dns_save_file, "utf-8")
-        dns_ip = dns_ip.replace("\n", " ")
-        dns_ip = dns_ip.split(" ")[1]
         return dns_ip
 
     def _get_user_name(self) -> str:
@@ -270,7 +224,7 @@ class InstallK3sRaspberryPi:
 
     def _get_computer_name(self) -> str:
         """ Get the computer name of the machine """
-        computer_name = os.uname()[1]
+        computer_name = get_host_facts().node_name
         return computer_name
 
     def _get_date(self) -> str:
@@ -359,40 +313,22 @@ class InstallK3sRaspberryPi:
         )
         router_name = ""
         ip = self._get_usr_ip()
-        router_name_status = self.run(
-            [
-                "ifconfig",
-                "|",
-                "grep",
-                "-B1",
-                f"'{ip}'",
-                "|",
-                "cut",
-                "-d",
-                "\":\"",
-                "-f",
-                "1",
-                "|",
-                "cut",
-                "-d",
-                "\" \"",
-                "-f",
-                "1",
-                f">{self.router_save_file}",
-                "2>/dev/null"
-            ]
-        )
+        result = self.process.run(["ifconfig"])
         self.print_on_tty(
             self.tty.info_colour,
             "Router name status: "
         )
-        if router_name_status == self.tty.error:
+        if result.ok is False:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return ""
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        router_name = self._get_file_content(self.router_save_file, "utf-8")
-        router_name = router_name.replace("\n", " ")
-        router_name = router_name.split(" ")[0]
+        # ---- The interface is named on the line above its address ----
+        previous_line = ""
+        for line in result.stdout.splitlines():
+            if ip != "" and ip in line.split():
+                router_name = previous_line.split(":")[0].split(" ")[0]
+                break
+            previous_line = line
         return router_name
 
     def _compile_static_ip(self) -> str:
@@ -424,36 +360,22 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Checking if the cgroup is running:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "status=\"$(grep",
-                "memory",
-                "/proc/cgroups",
-                "|",
-                "while",
-                "read",
-                "-r",
-                "n",
-                "n",
-                "n",
-                "enabled;",
-                "do",
-                "echo",
-                "$enabled;",
-                "done)\";",
-                "if [ $status -eq 0 ];",
-                "then",
-                "exit 1;",
-                "else",
-                "exit 0;",
-                "fi;"
-            ]
-        )
+        status = self.tty.success
+        try:
+            file_content = self._get_file_content(self.cgroups_file, "utf-8")
+        except OSError:
+            file_content = ""
+        # ---- Columns: subsys_name hierarchy num_cgroups enabled ----
+        for line in file_content.splitlines():
+            fields = line.split()
+            if len(fields) == 4 and fields[0] == "memory" and fields[3] == "0":
+                status = self.tty.error
+        self.tty.current_tty_status = status
         self.print_on_tty(
             self.tty.info_colour,
             "CGroup status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
@@ -584,108 +506,38 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Checking if the raspberry pi is based on Ubuntu or Debian:\n"
         )
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.release_file,
-                "|",
-                "grep",
-                "-q",
-                "ubuntu"
-            ]
-        )
-        if self.tty.current_tty_status == self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Raspberry pi base flavor status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[OK]\n")
-            return "ubuntu"
-        self.tty.current_tty_status = self.run(
-            [
-                "cat",
-                self.release_file,
-                "|",
-                "grep",
-                "-q",
-                "debian"
-            ]
-        )
+        pi_system = get_host_facts().pi_base_flavor
         self.print_on_tty(
             self.tty.info_colour,
             "Raspberry pi base flavor status: "
         )
-        if self.tty.current_tty_status == self.tty.success:
-            self.print_on_tty(self.tty.success_colour, "[OK]\n")
-            return "debian"
-        self.print_on_tty(self.tty.error_colour, "[KO]\n")
-        return ""
+        if pi_system == "":
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            return pi_system
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        return pi_system
 
-    def _install_extra_ubuntu_dependencies(self) -> int:
-        """ Install extra ubuntu dependencies for vxlan support """
+    def _install_extra_dependencies(self, pi_system: str) -> int:
+        """ Install the extra dependencies of the distribution for vxlan support, in one apt transaction """
         self.print_on_tty(
             self.tty.info_colour,
-            "Installing extra ubuntu dependencies:\n"
+            f"Installing extra {pi_system} dependencies:\n"
         )
-        status = self.run(
-            [
-                "sudo",
-                "su",
-                "-c",
-                "\"apt",
-                "install",
-                "-y",
-                "linux-modules-extra-raspi\""
-            ]
-        )
-        if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Extra ubuntu dependencies status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[KO]\n")
-            return self.err
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Extra ubuntu dependencies status: "
+        status = get_package_backend().install_on_tty(
+            self.tty,
+            "apt",
+            self.extra_dependencies[pi_system],
+            reason=f"{pi_system} vxlan support"
         )
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-
-    def _install_extra_debian_dependencies(self) -> int:
-        """ Install extra debian dependencies for vxlan support """
         self.print_on_tty(
             self.tty.info_colour,
-            "Installing extra debian dependencies:\n"
-        )
-        status = self.run(
-            [
-                "sudo",
-                "su",
-                "-c",
-                "\"apt",
-                "install",
-                "-y",
-                "libavcodec-extra",
-                "ttf-mscorefonts-installer",
-                "unrar",
-                "chromium-codecs-ffmpeg-extra",
-                "gstreamer1.0-libav",
-                "gstreamer1.0-plugins-ugly",
-                "gstreamer1.0-vaapi\""
-            ]
+            f"Extra {pi_system} dependencies status: "
         )
         if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.info_colour,
-                "Extra debian dependencies status: "
-            )
-            self.print_on_tty(self.tty.success_colour, "[KO]\n")
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.err
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Extra debian dependencies status: "
-        )
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        return self.success
 
     def _prepping_failed_message(self) -> None:
         """ The message to display when the prepping fails """
@@ -695,31 +547,39 @@ class InstallK3sRaspberryPi:
         )
         self.print_on_tty(self.tty.error_colour, "[KO]\n")
 
-    def _prepare_board(self) -> int:
-        """ Prepare the files and all the required elements for a successefull k3s installation """
+    def _prepare_cmdline(self, context: dict) -> int:
+        """ Enable the cgroups and the static ip in the boot command line """
         self.print_on_tty(self.tty.info_colour, "")
         self.disp.sub_sub_title(
             "Preparing the board for the installation of k3s"
         )
-        status = self._enable_cgroups_if_not()
-        if status == self.err:
-            self._installation_failed_message()
-            return status
+        return self._enable_cgroups_if_not()
+
+    def _prepare_boot_mode(self, context: dict) -> int:
+        """ Make the board boot in 64 bit mode """
+        before = self._get_boot_file(self.config_file_path)
         status = self._force_64bit_boot()
-        if status == self.err:
-            self._installation_failed_message()
-            return status
+        # ---- The boot the change was made on: it is active once the boot id changes ----
+        context["boot_mode_changed_on"] = ""
+        if self._get_boot_file(self.config_file_path) != before:
+            context["boot_mode_changed_on"] = get_host_facts().boot_id
+        return status
+
+    def _get_boot_file(self, file_path: str) -> str:
+        """ Return the content of a boot file ("" when it can not be read) """
+        try:
+            return self._get_file_content(file_path, self.encoding)
+        except OSError:
+            return ""
+
+    def _prepare_dependencies(self, context: dict) -> int:
+        """ Install the extra dependencies of the distribution of the board """
         pi_system = self._check_pi_base_flavor()
-        if pi_system == "ubuntu":
-            status = self._install_extra_ubuntu_dependencies()
-            if status == self.err:
-                self._installation_failed_message()
-                return status
-        if pi_system == "debian":
-            status = self._install_extra_debian_dependencies()
-            if status == self.err:
-                self._installation_failed_message()
-                return self.err
+        status = self.success
+        if pi_system in self.extra_dependencies:
+            status = self._install_extra_dependencies(pi_system)
+        if status == self.err:
+            return self.err
         self.print_on_tty(
             self.tty.info_colour,
             "Prepping status: "
@@ -727,7 +587,96 @@ class InstallK3sRaspberryPi:
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         return self.success
 
-    def get_k3s_installer(self) -> int:
+    def _check_boot_state(self, context: dict) -> int:
+        """ Make sure the boot changes of the preparation are active, asks for a reboot otherwise """
+        self.print_on_tty(self.tty.info_colour, "")
+        self.disp.sub_sub_title("Checking cgroup status")
+        context["reboot_required"] = False
+        response = self._check_if_cgroup_is_running()
+        self.print_on_tty(self.tty.info_colour, "cgroup status:")
+        if response != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            self.print_on_tty(self.tty.error_colour, "")
+            self.disp.error_message("The cgroup is not running")
+            context["reboot_required"] = True
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        changed_on = context["boot_mode_changed_on"]
+        if changed_on != "" and get_host_facts().machine not in ("aarch64", "arm64"):
+            if changed_on == get_host_facts().boot_id:
+                self.print_on_tty(
+                    self.tty.info_colour,
+                    "The board boots in 64 bit mode after a reboot\n"
+                )
+                context["reboot_required"] = True
+                return self.error
+            # ---- Rebooted since: the board has no 64 bit mode ----
+            self.print_on_tty(
+                self.tty.info_colour,
+                "The board still runs a 32 bit kernel, k3s is installed for it\n"
+            )
+        return self.success
+
+    def _get_resume_command(self, install_as_slave: bool, force_docker: bool, master_token: str, master_ip: str, serve_artifacts: bool, reboot: bool) -> list[str]:
+        """ Return the shell command that runs this installation again """
+        command = [
+            "install_k3s",
+            "false" if install_as_slave is True else "true",
+            "true" if force_docker is True else "false"
+        ]
+        if install_as_slave is True:
+            command += [master_token, master_ip]
+        if serve_artifacts is True:
+            command.append("serve")
+        if reboot is True:
+            command.append("reboot")
+        return command
+
+    def _resume_after_reboot(self, command: list, reboot: bool) -> int:
+        """ Register the installation to resume at the next boot, and reboot when allowed """
+        hook = ResumeHook(self.process)
+        reason = hook.get_unavailable_reason()
+        if reason == "":
+            try:
+                hook.register(self.journal_name, command)
+            except ResumeError as err:
+                reason = str(err)
+        self.print_on_tty(self.tty.info_colour, "")
+        if reason != "":
+            self.disp.inform_message(
+                [
+                    "The boot configuration has been changed but is not active yet.",
+                    f"The installation can not resume by itself: {reason}.",
+                    "Please reboot your system and try again the same way run this program.",
+                    "The steps already completed will not be run again."
+                ]
+            )
+            return self.error
+        if reboot is False:
+            self.disp.inform_message(
+                [
+                    "The boot configuration has been changed but is not active yet.",
+                    "Please reboot your system: the installation resumes by itself at the next boot.",
+                    f"Its output is written to {hook.log_file}"
+                ]
+            )
+            return self.error
+        self.disp.inform_message(
+            [
+                "The boot configuration has been changed, the board reboots now.",
+                "The installation resumes by itself at the next boot.",
+                f"Its output is written to {hook.log_file}"
+            ]
+        )
+        if hook.reboot() is False:
+            self.print_on_tty(
+                self.tty.error_colour,
+                "Error rebooting the board, please reboot it: the installation resumes at the next boot\n"
+            )
+            return self.error
+        return self.success
+
+    def get_k3s_installer(self, context: dict = None) -> int:
         """ Download the k3s installer """
         self.print_on_tty(
             self.tty.info_colour,
@@ -742,6 +691,8 @@ class InstallK3sRaspberryPi:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.error
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        if context is not None:
+            context["installer_script"] = self.installer_file
         return self.success
 
     def get_k3s_token(self) -> int:
@@ -750,18 +701,19 @@ class InstallK3sRaspberryPi:
             self.tty.info_colour,
             "Getting the k3s master token:\n"
         )
-        self.tty.current_tty_status = self.run(
+        status = self.run(
             [
                 "sudo",
                 "cat",
                 self.k3s_token_file
             ]
         )
+        self.tty.current_tty_status = status
         self.print_on_tty(
             self.tty.info_colour,
             "K3s master token status: "
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(self.tty.error_colour, "[KO]\n")
             return self.error
         self.print_on_tty(
@@ -817,6 +769,170 @@ class InstallK3sRaspberryPi:
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
         return self.success
 
+    def _fetch_local_artifacts(self, context: dict) -> int:
+        """ Copy the k3s binary and airgap images of the bundle (or the prefetched ones, or the master's) to the airgap folder """
+        context["staged_binaries"] = []
+        context["staged_images"] = []
+        source = get_active_bundle()
+        required = source is not None
+        origin = "bundle"
+        if source is None:
+            source = get_active_prefetcher()
+            origin = "prefetched release"
+        if source is None:
+            source = get_peer_source()
+            origin = "artifact server"
+        if source is None:
+            return self.success
+        self.print_on_tty(
+            self.tty.info_colour,
+            f"Staging the k3s binary and images of the {origin}:\n"
+        )
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        if required is True and source.architecture != architecture:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"The bundle holds {source.architecture} binaries, this machine needs {architecture or 'an unsupported architecture'}\n"
+            )
+            return self.error
+        try:
+            binaries = source.extract_role("k3s-binary", self.airgap_folder)
+            images = source.extract_role("k3s-images", self.airgap_folder)
+        except (DownloadError, OSError) as err:
+            if required is False:
+                self.print_on_tty(
+                    self.tty.info_colour,
+                    f"The {origin} could not provide them ({err}), the install script downloads them\n"
+                )
+                return self.success
+            self.print_on_tty(self.tty.error_colour, f"{err}\n")
+            return self.error
+        if len(binaries) == 0:
+            if required is False:
+                self.print_on_tty(
+                    self.tty.info_colour,
+                    f"The {origin} has no k3s binary for {architecture}, the install script downloads it\n"
+                )
+                return self.success
+            self.print_on_tty(
+                self.tty.error_colour,
+                "The bundle has no k3s binary, build it with the k3s plan\n"
+            )
+            return self.error
+        context["staged_binaries"] = binaries
+        context["staged_images"] = images
+        return self.success
+
+    def _install_local_artifacts(self, context: dict) -> int:
+        """ Put the fetched k3s binary and airgap images where the install script expects them """
+        binaries = context["staged_binaries"]
+        images = context["staged_images"]
+        context["k3s_skip_download"] = False
+        if len(binaries) == 0:
+            return self.success
+        status = self.run(["sudo", "install", "-m", "0755", binaries[0], self.k3s_binary_path])
+        if status == self.success and len(images) > 0:
+            status = self.run(["sudo", "mkdir", "-p", self.k3s_images_folder])
+            if status == self.success:
+                status = self.run(["sudo", "cp", images[0], self.k3s_images_folder])
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Staging status: "
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        context["k3s_skip_download"] = True
+        return self.success
+
+    def _get_pinned_k3s_version(self) -> str:
+        """ Return the k3s release pinned by the release lockfile ("" lets the install script choose) """
+        try:
+            return get_release_resolver().get_pinned("k3s")
+        except DownloadError as err:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"The release lockfile is ignored: {err}\n"
+            )
+            return ""
+
+    def _use_master_artifact_server(self, master_ip: str) -> None:
+        """ Fetch the installer files from the artifact server of the master when it runs one """
+        base_url = f"http://{master_ip}:{PEER_PORT}"
+        try:
+            set_peer_source(base_url)
+        except DownloadError:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "The master serves no artifacts, the files are downloaded from the internet\n"
+            )
+            return
+        self.print_on_tty(
+            self.tty.success_colour,
+            f"The files are fetched from the master first ({base_url})\n"
+        )
+
+    def _start_prefetch(self) -> None:
+        """ Download the installer and the k3s release in the background while the board is prepared """
+        if get_active_bundle() is not None:
+            return
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        active = get_active_prefetcher()
+        if active is not None:
+            # ---- Started by install_stack, its owner stops it ----
+            active.declare(self.installer_path)
+            if architecture != "":
+                active.declare_plan(["k3s"], architecture)
+            return
+        self.prefetcher = ArtifactPrefetcher(architecture=architecture)
+        self.prefetcher.declare(self.installer_path)
+        if architecture != "":
+            self.prefetcher.declare_plan(["k3s"], architecture)
+        set_active_prefetcher(self.prefetcher)
+        self.print_on_tty(
+            self.tty.info_colour,
+            "The installer files are downloaded in the background while the board is prepared\n"
+        )
+
+    def _stop_prefetch(self) -> None:
+        """ Stop the background downloads and report the time they saved """
+        if self.prefetcher is None:
+            return
+        set_active_prefetcher(None)
+        self.prefetcher.close()
+        self.print_on_tty(self.tty.info_colour, self.prefetcher.format_report())
+        self.prefetcher = None
+
+    def _serve_artifacts(self) -> int:
+        """ Share the k3s artifacts with the agents through the artifact server """
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Preparing the artifacts for the agents:\n"
+        )
+        server = get_peer_server()
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        try:
+            server.prefetch(["k3s"], [architecture])
+        except (DownloadError, OSError) as err:
+            self.print_on_tty(
+                self.tty.info_colour,
+                f"The k3s release could not be prefetched ({err}), the agents will download it\n"
+            )
+        try:
+            port = server.start(PEER_PORT)
+        except OSError as err:
+            self.print_on_tty(
+                self.tty.error_colour,
+                f"Error starting the artifact server: {err}\n"
+            )
+            return self.error
+        self.print_on_tty(
+            self.tty.success_colour,
+            f"Serving the artifacts to the agents on port {port} while this program runs\n"
+        )
+        return self.success
+
     def _install_master_k3s(self, force_docker: bool = False) -> int:
         """ Install the k3s version for the master node (the one managing the others) """
         self.tty.setenv(["K3S_KUBECONFIG_MODE", '"644"'])
@@ -839,14 +955,30 @@ class InstallK3sRaspberryPi:
             "sudo",
             self.installer_file
         ]
+        if self.k3s_skip_download is True:
+            # ---- The binary and images come from the bundle ----
+            install_line.insert(-1, "INSTALL_K3S_SKIP_DOWNLOAD=true")
+        version = self._get_pinned_k3s_version()
+        if version != "":
+            install_line.insert(-1, f"INSTALL_K3S_VERSION={version}")
         if force_docker is True:
             self.tty.setenv(["K3S_FORCE_INSTALL_DOCKER", "1"])
             install_line.append("--docker")
 
-        self.run(install_line)
+        status = self.run(install_line)
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Installation status (k3s master):"
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            self.tty.current_tty_status = self.tty.error
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self.get_k3s_token()
         self._fix_broken_permissions()
-        return self.tty.success
+        self.tty.current_tty_status = self.tty.success
+        return self.success
 
     def _install_slave_k3s(self, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
         """ Install the k3s version for the slave, the one being managed by the masters """
@@ -882,14 +1014,30 @@ class InstallK3sRaspberryPi:
             self.installer_file,
 
         ]
+        if self.k3s_skip_download is True:
+            # ---- The binary and images come from the bundle ----
+            install_line.insert(-1, "INSTALL_K3S_SKIP_DOWNLOAD=true")
+        version = self._get_pinned_k3s_version()
+        if version != "":
+            install_line.insert(-1, f"INSTALL_K3S_VERSION={version}")
         if force_docker is True:
             self.tty.setenv(["K3S_FORCE_INSTALL_DOCKER", "1"])
             install_line.append("--docker")
-        self.run(install_line)
+        status = self.run(install_line)
+        self.print_on_tty(
+            self.tty.info_colour,
+            "Installation status (k3s slave):"
+        )
+        if status != self.success:
+            self.print_on_tty(self.tty.error_colour, "[KO]\n")
+            self.tty.current_tty_status = self.tty.error
+            return self.error
+        self.print_on_tty(self.tty.success_colour, "[OK]\n")
         self._fix_broken_permissions()
-        return self.tty.success
+        self.tty.current_tty_status = self.tty.success
+        return self.success
 
-    def main(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> int:
+    def main(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "", serve_artifacts: bool = False, reboot: bool = False) -> int:
         """ Install k3s on RaspberryPi """
         self.print_on_tty(
             self.tty.info_colour,
@@ -909,51 +1057,121 @@ class InstallK3sRaspberryPi:
             )
             self._installation_failed_message()
             return self.err
-        status = self._prepare_board()
-        if status != self.success:
-            self._installation_failed_message()
-            return self.error
-        self.print_on_tty(self.tty.info_colour, "")
-        self.disp.sub_sub_title("Checking cgroup status")
-        response = self._check_if_cgroup_is_running()
-        self.print_on_tty(self.tty.info_colour, "cgroup status:")
-        if response != self.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            self._installation_failed_message()
-            self.print_on_tty(self.tty.error_colour, "")
-            self.disp.error_message("The cgroup is not running")
-            self.print_on_tty(self.tty.info_colour, "")
-            self.disp.inform_message(
-                [
-                    "The cgroup has been enabled but is not running.",
-                    "Please reboot your system and try again the same way run this program."
-                ]
+        if install_as_slave is True and master_ip != "":
+            self._use_master_artifact_server(master_ip)
+        self._start_prefetch()
+        try:
+            return self._install(
+                install_as_slave,
+                force_docker,
+                master_token,
+                master_ip,
+                serve_artifacts,
+                reboot
             )
-            return self.error
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        status = self.get_k3s_installer()
-        if status != self.success:
-            self._installation_failed_message()
-            return self.error
-        if install_as_slave is True:
-            status = self._install_slave_k3s(
+        finally:
+            self._stop_prefetch()
+
+    def get_steps(self, install_as_slave: bool = False, force_docker: bool = False, master_token: str = "", master_ip: str = "") -> StepGraph:
+        """ Return the installation steps (the installer files are fetched while the board is prepared) """
+        steps = StepGraph(self.success, self.error, name=self.journal_name, journal=get_step_journal())
+        # ---- The boot files are written with sudo: the board preparation is interactive ----
+        steps.add("prepare_cmdline", self._prepare_cmdline, interactive=True, key=self.cmdline_file)
+        steps.add(
+            "prepare_boot_mode",
+            self._prepare_boot_mode,
+            requires=["prepare_cmdline"],
+            outputs=["boot_mode_changed_on"],
+            interactive=True,
+            key=self.config_file_path
+        )
+        steps.add(
+            "prepare_dependencies",
+            self._prepare_dependencies,
+            requires=["prepare_boot_mode"],
+            interactive=True,
+            key=get_host_facts().pi_base_flavor
+        )
+        steps.add(
+            "check_boot_state",
+            self._check_boot_state,
+            requires=["prepare_dependencies"],
+            inputs=["boot_mode_changed_on"],
+            outputs=["reboot_required"],
+            checkpoint=False
+        )
+        steps.add(
+            "download_installer",
+            self.get_k3s_installer,
+            outputs=["installer_script"],
+            key=self.installer_path,
+            files=[self.installer_file]
+        )
+        steps.add(
+            "fetch_local_artifacts",
+            self._fetch_local_artifacts,
+            outputs=["staged_binaries", "staged_images"],
+            checkpoint=False
+        )
+        steps.add(
+            "install_local_artifacts",
+            self._install_local_artifacts,
+            requires=["check_boot_state"],
+            inputs=["staged_binaries", "staged_images"],
+            outputs=["k3s_skip_download"],
+            interactive=True,
+            files=[self.k3s_binary_path]
+        )
+
+        def install(context: dict) -> int:
+            self.k3s_skip_download = context["k3s_skip_download"]
+            if install_as_slave is True:
+                return self._install_slave_k3s(force_docker, master_token, master_ip)
+            return self._install_master_k3s(force_docker)
+        steps.add(
+            "install_k3s",
+            install,
+            requires=["check_boot_state"],
+            inputs=["installer_script", "k3s_skip_download"],
+            interactive=True,
+            key=[install_as_slave, force_docker, master_token, master_ip, self._get_pinned_k3s_version()]
+        )
+        return steps
+
+    def _install(self, install_as_slave: bool, force_docker: bool, master_token: str, master_ip: str, serve_artifacts: bool, reboot: bool = False) -> int:
+        """ Prepare the board and install k3s (the installer files are prefetched meanwhile) """
+        steps = self.get_steps(install_as_slave, force_docker, master_token, master_ip)
+        if steps.has_checkpoints() is True:
+            self.print_on_tty(
+                self.tty.info_colour,
+                "Resuming the previous installation, its completed steps are skipped (install_journal_reset k3s_raspberry_pi to start over)\n"
+            )
+        context = {}
+        report = steps.run(context)
+        self.print_on_tty(self.tty.info_colour, steps.format_report(report))
+        if report["failed"] == "check_boot_state" and context.get("reboot_required") is True:
+            command = self._get_resume_command(
+                install_as_slave,
                 force_docker,
                 master_token,
-                master_ip
+                master_ip,
+                serve_artifacts,
+                reboot
             )
-            if status != self.success:
-                self._installation_failed_message()
-                return self.error
-        else:
-            status = self._install_master_k3s(force_docker)
-            if status != self.success:
-                self._installation_failed_message()
-                return self.error
+            return self._resume_after_reboot(command, reboot)
+        if report["status"] != self.success:
+            self._installation_failed_message()
+            return self.error
+        hook = ResumeHook(self.process)
+        if hook.is_pending(self.journal_name) is True:
+            hook.unregister()
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status status: "
         )
         self.print_on_tty(self.tty.success_colour, "[OK]\n")
+        if install_as_slave is False and serve_artifacts is True:
+            return self._serve_artifacts()
         return self.success
 
     def test_class_install_k3s_raspberry_pi(self) -> None:
@@ -3,23 +3,23 @@ File in charge of loading the k8s installer classes
 """
 
 from tty_ov import TTY
-from .install_k8s_linux import InstallK8sLinux
-from .install_k8s_mac import InstallK8sMac
-from .install_k8s_windows import InstallK8sWindows
+from ....common import LazyChild
 
 
 class InstallK8s:
     """ Install K8s on the correct device """
 
+    install_mac = LazyChild(".install_k8s_mac", "InstallK8sMac")
+    install_linux = LazyChild(".install_k8s_linux", "InstallK8sLinux")
+    install_windows = LazyChild(".install_k8s_windows", "InstallK8sWindows")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallK8sMac(tty, success, err, error)
-        self.install_linux = InstallK8sLinux(tty, success, err, error)
-        self.install_windows = InstallK8sWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_k8s_installation_class(self) -> None:
         """ Test the k8s installation class """
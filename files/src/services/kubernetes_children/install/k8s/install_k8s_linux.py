@@ -3,9 +3,8 @@ File in charge of containing the class that will install k8s for linux distribut
 """
 
 import display_tty
-import requests
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache, get_download_manager, get_package_backend
 
 
 class InstallK8sLinux:
@@ -32,83 +31,15 @@ class InstallK8sLinux:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def _has_yay(self) -> bool:
         """ Returns true if the user has yay [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has yay installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "yay",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "yay")
 
     def _has_brew(self) -> bool:
         """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has brew installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "brew",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "brew")
 
     def _manual_installation(self) -> int:
         """ Install k8s manually """
@@ -140,13 +71,7 @@ class InstallK8sLinux:
         self.disp.sub_sub_title(
             "Installing k8s for Aur (Arch Linux User Repository) systems"
         )
-        status = self.run(
-            [
-                "yay",
-                "-S",
-                "rancher-k8s-bin"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "yay", ["rancher-k8s-bin"])
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (k8s):"
@@ -172,13 +97,7 @@ class InstallK8sLinux:
     def _install_for_brew(self) -> int:
         """ Install Kubectl using brew """
         self.disp.sub_sub_title("Installing Kubectl via Brew")
-        status = self.run(
-            [
-                "brew",
-                "install",
-                "k8s"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "brew", ["k8s"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -213,25 +132,7 @@ class InstallK8sLinux:
 
     def is_k8s_installed(self) -> bool:
         """ Returns true if k8s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k8s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kubectl",
-                "version",
-                "--output=yaml",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kubectl", "k8s")
 
     def main(self) -> int:
         """ The main function of the class """
@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallK8sMac:
@@ -30,25 +31,7 @@ class InstallK8sMac:
 
     def is_k8s_installed(self) -> bool:
         """ Returns true if k8s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k8s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kubectl",
-                "version",
-                "--output=yaml",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kubectl", "k8s")
 
     def test_class_install_k8s_mac(self) -> None:
         """ Test the class install k8s MacOS """
@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallK8sWindows:
@@ -27,25 +28,7 @@ class InstallK8sWindows:
 
     def is_k8s_installed(self) -> bool:
         """ Returns true if k8s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k8s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kubectl",
-                "version",
-                "--output=yaml",
-                ">nul",
-                "2>nul"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kubectl", "k8s")
 
     def main(self) -> int:
         """ The main function of the class """
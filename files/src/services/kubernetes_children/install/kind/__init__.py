@@ -3,23 +3,23 @@ File in charge of loading the kind installer classes
 """
 
 from tty_ov import TTY
-from .install_kind_linux import InstallKindLinux
-from .install_kind_mac import InstallKindMac
-from .install_kind_windows import InstallKindWindows
+from ....common import LazyChild
 
 
 class InstallKind:
     """ Install Kind on the correct device """
 
+    install_mac = LazyChild(".install_kind_mac", "InstallKindMac")
+    install_linux = LazyChild(".install_kind_linux", "InstallKindLinux")
+    install_windows = LazyChild(".install_kind_windows", "InstallKindWindows")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallKindMac(tty, success, err, error)
-        self.install_linux = InstallKindLinux(tty, success, err, error)
-        self.install_windows = InstallKindWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_kind_installation_class(self) -> None:
         """ Test the kind installation class """
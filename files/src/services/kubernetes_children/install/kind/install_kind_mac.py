@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallKindMac:
@@ -22,24 +23,7 @@ class InstallKindMac:
 
     def is_kind_installed(self) -> bool:
         """ Returns true if kind is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if kind is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kind",
-                "version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kind")
 
     def main(self) -> int:
         """ The main function of the class """
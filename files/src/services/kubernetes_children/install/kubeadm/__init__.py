@@ -3,23 +3,26 @@ File in charge of loading the kubeadm installer classes
 """
 
 from tty_ov import TTY
-from .install_kubeadm_linux import InstallKubeadmLinux
-from .install_kubeadm_mac import InstallKubeadmMac
-from .install_kubeadm_windows import InstallKubeadmWindows
+from ....common import LazyChild
 
 
 class InstallKubeadm:
     """ Install kubeadm on the correct device """
 
+    install_mac = LazyChild(".install_kubeadm_mac", "InstallKubeadmMac")
+    install_linux = LazyChild(".install_kubeadm_linux", "InstallKubeadmLinux")
+    install_windows = LazyChild(
+        ".install_kubeadm_windows",
+        "InstallKubeadmWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallKubeadmMac(tty, success, err, error)
-        self.install_linux = InstallKubeadmLinux(tty, success, err, error)
-        self.install_windows = InstallKubeadmWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_kubeadm_installation_class(self) -> None:
         """ Test the kubeadm installation class """
@@ -3,23 +3,29 @@ File in charge of loading the kubectl installer classes
 """
 
 from tty_ov import TTY
-from .install_kubernetes_linux import InstallKubectlLinux
-from .install_kubernetes_mac import InstallKubectlMac
-from .install_kubernetes_windows import InstallKubectlWindows
+from ....common import LazyChild
 
 
 class InstallKubectl:
     """ Install Kubectl on the correct device """
 
+    install_mac = LazyChild(".install_kubernetes_mac", "InstallKubectlMac")
+    install_linux = LazyChild(
+        ".install_kubernetes_linux",
+        "InstallKubectlLinux"
+    )
+    install_windows = LazyChild(
+        ".install_kubernetes_windows",
+        "InstallKubectlWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallKubectlMac(tty, success, err, error)
-        self.install_linux = InstallKubectlLinux(tty, success, err, error)
-        self.install_windows = InstallKubectlWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_kubectl_installation_class(self) -> None:
         """ Test the kubectl installation class """
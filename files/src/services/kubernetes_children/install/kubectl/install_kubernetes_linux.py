@@ -3,11 +3,17 @@ File in charge of containing the class that will install kubectl for linux distr
 """
 
 import os
-from platform import machine, platform
+from platform import platform
 import display_tty
-import requests
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import (
+    get_host_facts,
+    get_tool_cache,
+    get_download_manager,
+    get_release_resolver,
+    DownloadError,
+    get_package_backend
+)
 
 
 class InstallKubectlLinux:
@@ -47,43 +53,14 @@ class InstallKubectlLinux:
         self.kube_folder = ".kube"
         self.config_file = "config"
 
-    def download_file(self, url: str, filepath: str) -> int:
-        """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
+    def download_file(self, url: str, filepath: str, checksum_url: str = "") -> int:
+        """ Download a file from a url (checked against the sha256 published at checksum_url if given) """
+        return get_download_manager().download_on_tty(
+            self.tty,
+            url,
+            filepath,
+            checksum_url=checksum_url
         )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
 
     def get_file_content(self, file_path: str) -> str or int:
         """ Get the content of a file """
@@ -114,37 +91,33 @@ class InstallKubectlLinux:
             self.tty.info_colour,
             "Getting the latest version of Kubernetes for Linux\n"
         )
-        version_name = "version.useless"
-        status = self.download_file(
-            self.release_file,
-            version_name
-        )
-        if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.error_colour,
-                "Error getting the latest release of Kubernetes for Linux\n"
-            )
-            self.tty.current_tty_status = status
-            return self.tty.current_tty_status
-        file_content = self.get_file_content(version_name)
-        if file_content == self.tty.error:
+        try:
+            release = get_release_resolver().resolve("kubectl", self.hardware_platform)
+        except DownloadError as err:
             self.print_on_tty(
                 self.tty.error_colour,
-                "Error getting the latest release of Kubernetes for Linux\n"
+                f"Error getting the latest release of Kubernetes for Linux: {err}\n"
             )
             self.tty.current_tty_status = self.tty.error
             return self.tty.current_tty_status
-        download_link = f"{self.install_file_link_chunk1}{file_content}{self.install_file_link_chunk2}{self.hardware_platform}{self.install_file_link_chunk3}"
+        version = release["version"]
+        self.print_on_tty(
+            self.tty.info_colour,
+            f"Kubernetes release: {version} ({release['source']})\n"
+        )
+        download_link = f"{self.install_file_link_chunk1}{version}{self.install_file_link_chunk2}{self.hardware_platform}{self.install_file_link_chunk3}"
         self.installer_name = f"/tmp/{self.installer_name}"
         status = self.download_file(
             download_link,
-            self.installer_name
+            self.installer_name,
+            checksum_url=f"{download_link}.sha256"
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
                 "Error downloading the latest release of Kubernetes for Linux\n"
             )
+            self.tty.current_tty_status = self.tty.error
             return self.tty.current_tty_status
         self.print_on_tty(
             self.tty.success_colour,
@@ -183,10 +156,10 @@ class InstallKubectlLinux:
 
     def get_hardware_platform(self) -> str:
         """ Get the hardware platform of the current system """
-        system_architecture = machine()
+        system_architecture = get_host_facts().machine
         if system_architecture in ("AMD64", "x86_64"):
             return "amd64"
-        if system_architecture in ("ARM64", "ARM"):
+        if system_architecture in ("ARM64", "ARM", "aarch64", "arm64"):
             return "arm64"
         if system_architecture in "i386":
             if "x64" in platform():
@@ -217,57 +190,16 @@ class InstallKubectlLinux:
 
     def has_snap(self) -> bool:
         """ Returns true if the user has snap [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has snap installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "snap",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "snap")
 
     def has_brew(self) -> bool:
         """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has brew installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "brew",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "brew")
 
     def install_for_snap(self) -> int:
         """ Install Kubectl using snap """
         self.disp.sub_sub_title("Installing Kubectl via Snap")
-        status = self.run(
-            [
-                "snap",
-                "install",
-                "kubectl",
-                "--classic"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "snap", ["kubectl"], ["--classic"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -300,13 +232,7 @@ class InstallKubectlLinux:
     def install_for_brew(self) -> int:
         """ Install Kubectl using brew """
         self.disp.sub_sub_title("Installing Kubectl via Brew")
-        status = self.run(
-            [
-                "brew",
-                "install",
-                "kubectl"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "brew", ["kubectl"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -393,25 +319,7 @@ class InstallKubectlLinux:
 
     def is_kubectl_installed(self) -> bool:
         """ Returns true if kubectl is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if kubectl is installed (Linux):"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kubectl",
-                "version",
-                "--output=yaml",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kubectl")
 
     def main(self) -> int:
         """ Install kubernetes on Linux """
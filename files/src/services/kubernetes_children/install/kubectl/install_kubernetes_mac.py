@@ -4,6 +4,7 @@ File in charge of containing the code that will install kubernetes on a mac.
 
 from tty_ov import TTY
 import display_tty
+from ....common import get_tool_cache
 
 
 class InstallKubectlMac:
@@ -48,25 +49,7 @@ class InstallKubectlMac:
 
     def is_kubectl_installed(self) -> bool:
         """ Returns true if kubectl is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if kubectl is installed (Linux):"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "kubectl",
-                "version",
-                "--output=yaml",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "kubectl")
 
     def main(self) -> int:
         """ Install kubernetes on Mac """
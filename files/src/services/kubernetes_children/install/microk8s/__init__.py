@@ -3,18 +3,29 @@ File in charge of loading the MicroK8s installer classes
 """
 
 from tty_ov import TTY
-from .install_microk8s_linux import InstallMicroK8sLinux
-from .install_microk8s_mac import InstallMicroK8sMac
-from .install_microk8s_windows import InstallMicroK8sWindows
+from ....common import LazyChild
 
 
 class InstallMicroK8s:
     """ Install MicroK8s on the correct device """
 
+    install_mac = LazyChild(".install_microk8s_mac", "InstallMicroK8sMac")
+    install_linux = LazyChild(
+        ".install_microk8s_linux",
+        "InstallMicroK8sLinux"
+    )
+    install_windows = LazyChild(
+        ".install_microk8s_windows",
+        "InstallMicroK8sWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallMicroK8sMac(tty, success, err, error)
-        self.install_linux = InstallMicroK8sLinux(tty, success, err, error)
-        self.install_windows = InstallMicroK8sWindows(tty, success, err, error)
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_microk8s_installation_class(self) -> None:
         """ Test the MicroK8s installation class """
@@ -3,9 +3,8 @@ File in charge of containing the class that will install microk8s for linux dist
 """
 
 import display_tty
-import requests
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache, get_download_manager, get_package_backend
 
 
 class InstallMicroK8sLinux:
@@ -32,104 +31,19 @@ class InstallMicroK8sLinux:
 
     def _download_file(self, url: str, filepath: str) -> int:
         """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
-        )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
+        return get_download_manager().download_on_tty(self.tty, url, filepath)
 
     def _has_yay(self) -> bool:
         """ Returns true if the user has yay [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has yay installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "yay",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "yay")
 
     def _has_snap(self) -> bool:
-        """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has snap installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "snap",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        """ Returns true if the user has snap [package manager] installed """
+        return get_package_backend().is_available_on_tty(self.tty, "snap")
 
     def _has_brew(self) -> bool:
         """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has brew installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "brew",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "brew")
 
     def _manual_installation(self) -> int:
         """ Install k3d manually """
@@ -161,13 +75,7 @@ class InstallMicroK8sLinux:
         self.disp.sub_sub_title(
             "Installing k3d for Aur (Arch Linux User Repository) systems"
         )
-        status = self.run(
-            [
-                "yay",
-                "-S",
-                "rancher-k3d-bin"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "yay", ["rancher-k3d-bin"])
         self.print_on_tty(
             self.tty.info_colour,
             "Installation status (k3d):"
@@ -193,13 +101,7 @@ class InstallMicroK8sLinux:
     def _install_for_brew(self) -> int:
         """ Install Kubectl using brew """
         self.disp.sub_sub_title("Installing Kubectl via Brew")
-        status = self.run(
-            [
-                "brew",
-                "install",
-                "k3d"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "brew", ["k3d"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -235,14 +137,7 @@ class InstallMicroK8sLinux:
     def _install_for_snap(self) -> int:
         """ Install micro Microk8s"""
         self.disp.sub_sub_title("Installing Microk8s via Snap")
-        status = self.run(
-            [
-                "snap",
-                "install",
-                "--classic",
-                "microk8s"
-            ]
-        )
+        status = get_package_backend().install_on_tty(self.tty, "snap", ["microk8s"], ["--classic"])
         if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
@@ -277,25 +172,7 @@ class InstallMicroK8sLinux:
 
     def is_microk8s_installed(self) -> bool:
         """ Returns true if k8s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if microk8s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "microk8s",
-                "version",
-                "--output=yaml",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "microk8s")
 
     def main(self) -> int:
         """ The main function of the class """
@@ -7,6 +7,7 @@ import display_tty
 import requests
 from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class InstallMicroK8sWindows:
@@ -107,24 +108,7 @@ class InstallMicroK8sWindows:
 
     def is_microk8s_installed(self) -> bool:
         """ Returns true if microk8s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if microk8s is installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "microk8s",
-                "version",
-                ">nul",
-                "2>nul"
-            ]
-        )
-        if self.tty.current_tty_status != self.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "microk8s")
 
     def main(self) -> int:
         """ The main function of the class """
@@ -3,23 +3,29 @@ File in charge of loading the minikube installer classes
 """
 
 from tty_ov import TTY
-from .install_minikube_linux import InstallMinikubeLinux
-from .install_minikube_mac import InstallMinikubeMac
-from .install_minikube_windows import InstallMinikubeWindows
+from ....common import LazyChild
 
 
 class InstallMinikube:
     """ Install minikube on the correct device """
 
+    install_mac = LazyChild(".install_minikube_mac", "InstallMinikubeMac")
+    install_linux = LazyChild(
+        ".install_minikube_linux",
+        "InstallMinikubeLinux"
+    )
+    install_windows = LazyChild(
+        ".install_minikube_windows",
+        "InstallMinikubeWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.install_mac = InstallMinikubeMac(tty, success, err, error)
-        self.install_linux = InstallMinikubeLinux(tty, success, err, error)
-        self.install_windows = InstallMinikubeWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_minikube_installation_class(self) -> None:
         """ Test the minikube installation class """
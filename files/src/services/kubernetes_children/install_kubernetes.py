@@ -2,22 +2,37 @@
 File in charge of installing kubernetes on all 3 systems
 """
 
-import platform
 from tty_ov import TTY
 from display_tty import IDISP
+from ..common import LazyChild, get_host_facts, get_tool_cache
 from .install import Install
 
 
 class InstallKubernetes():
     """ Install the kubernetes library on the host system """
 
+    # ---- System install (only built when first used) ----
+    windows = LazyChild(
+        ".install.install_kubernetes_windows",
+        "InstallKubernetesWindows"
+    )
+    linux = LazyChild(
+        ".install.install_kubernetes_linux",
+        "InstallKubernetesLinux"
+    )
+    mac = LazyChild(
+        ".install.install_kubernetes_mac",
+        "InstallKubernetesMac"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
         self.err = err
         self.error = error
         # ---- System info ----
-        self.current_system = platform.system()
+        self.host_facts = get_host_facts()
+        self.current_system = self.host_facts.system
         # ---- Parent classes ----
         self.tty = tty
         self.disp = IDISP
@@ -28,25 +43,6 @@ class InstallKubernetes():
         self.disp.toml_content["PRETTY_OUTPUT_IN_BLOCS"] = False
         # ---- Child classes ----
         self.install = Install()
-        # ---- System install ----
-        self.windows = self.install.install_kubernetes_windows(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
-        self.linux = self.install.install_kubernetes_linux(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
-        self.mac = self.install.install_kubernetes_mac(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
         # ---- command management ----
         self.options = []
 
@@ -92,20 +88,21 @@ Output:
             self.tty.function_help(function_name, help_description)
             self.tty.current_tty_status = self.tty.success
             return self.success
-        self.print_on_tty(
-            self.tty.info_colour,
-            ""
-        )
-        self.disp.inform_message(
-            "Installing kubectl (required for using minikube)"
-        )
-        status = self.install_kubectl([])
-        if status != self.success:
+        if get_tool_cache().is_installed("kubectl") is False:
             self.print_on_tty(
-                self.tty.error_colour,
-                "Error installing kubectl\n"
+                self.tty.info_colour,
+                ""
             )
-            return self.tty.error
+            self.disp.inform_message(
+                "Installing kubectl (required for using minikube)"
+            )
+            status = self.install_kubectl([])
+            if status != self.success:
+                self.print_on_tty(
+                    self.tty.error_colour,
+                    "Error installing kubectl\n"
+                )
+                return self.tty.error
         if self.current_system == "Windows":
             return self.windows.install_minikube()
         if self.current_system == "Linux":
@@ -147,11 +144,9 @@ Output:
 
     def _install_docker_if_not_present(self) -> int:
         """ Install docker on the host system if required and if it was not installed """
-        self.tty.run_command("is_docker_installed")
-        if self.tty.current_tty_status != self.tty.success:
-            self.tty.run_command("install_docker")
-            return self.tty.current_tty_status
-        return self.tty.current_tty_status
+        if get_tool_cache().is_installed("docker") is True:
+            return self.tty.success
+        return self.tty.run_indexed_command("install_docker", [])
 
     def install_k3s(self, args: list) -> int:
         """ Install kubectl on the host system """
@@ -172,10 +167,25 @@ Example 3 (Installing as master node with docker set as default):
     {function_name} true true
 Example 2 (Installing as slave node with docker set as default):
     {function_name} false true <your_master_token> <your_master_ip>
+Sharing the downloads with the agents (Linux):
+    Add the word serve to a master install to keep an artifact server running
+    on port 8751 while the program runs, the agents installed with the ip of
+    the master fetch the install script, the k3s binary and images from it
+    before trying the internet.
+    {function_name} true serve
+Rebooting a Raspberry Pi during the installation:
+    The cgroups and the 64 bit mode enabled by the installation need a
+    reboot. The installation then resumes by itself at the next boot (sudo
+    must not ask for a password). Add the word reboot to let the installer
+    reboot the board itself, for an unattended installation.
+    {function_name} false <your_master_token> <your_master_ip> reboot
 """
             self.tty.function_help(function_name, help_description)
             self.tty.current_tty_status = self.tty.success
             return self.success
+        serve_artifacts = "serve" in [item.lower() for item in args]
+        reboot = "reboot" in [item.lower() for item in args]
+        args = [item for item in args if item.lower() not in ("serve", "reboot")]
         arg_length = len(args)
         as_slave = False
         force_docker = False
@@ -221,7 +231,7 @@ Example 2 (Installing as slave node with docker set as default):
         if self.current_system == "Windows":
             return self.windows.install_k3s()
         if self.current_system == "Linux":
-            return self.linux.install_k3s(as_slave, force_docker, master_token, master_ip)
+            return self.linux.install_k3s(as_slave, force_docker, master_token, master_ip, serve_artifacts, reboot)
         if self.current_system == "Darwin" or self.current_system == "Java":
             return self.mac.install_k3s()
         self.print_on_tty(
@@ -330,6 +340,19 @@ Output:
 
     def install_kubernetes(self, args: list) -> int:
         """ Install k8s because this is the other name of kubernetes """
+        function_name = "install_kubernetes"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Install kubernetes on the host system (kubernetes is also known as k8s)
+Usage Example:
+Input:
+    {function_name}
+Output:
+    Install process of k8s for the current system
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
         self.print_on_tty(self.tty.info_colour, "")
         info_message = "Info: Kubernetes is also known as k8s, thus, this function will run the k8s installation."
         self.disp.inform_message(info_message)
@@ -772,7 +795,7 @@ Output:
             self.tty.current_tty_status = self.tty.success
             return self.success
         ip_data_file_name = "your_ip.txt"
-        current_os = platform.system()
+        current_os = self.current_system
         if current_os == "Windows":
             self.tty.run_command(
                 [
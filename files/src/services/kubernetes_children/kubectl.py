@@ -3,9 +3,9 @@ File in charge of rebinding kubectl as kube
 """
 
 import os
-import platform
 from tty_ov import TTY
 from display_tty import IDISP
+from ..common import get_host_facts, AsyncCommandRunner, CommandTask
 
 
 class Kubectl():
@@ -21,6 +21,8 @@ class Kubectl():
         self.disp = IDISP
         # ---- TTY rebinds ----
         self.print_on_tty = self.tty.print_on_tty
+        # ---- Concurrent kubectl calls ----
+        self.parallel = AsyncCommandRunner(self.success, self.error)
         # ---- Disp re-configuration ----
         self.disp.toml_content["PRETTIFY_OUTPUT"] = False
         self.disp.toml_content["PRETTY_OUTPUT_IN_BLOCS"] = False
@@ -40,7 +42,7 @@ Output:
             self.tty.function_help(function_name, help_description)
             self.tty.current_tty_status = self.tty.success
             return self.success
-        if platform.system() != "Windows":
+        if get_host_facts().system != "Windows":
             args.insert(0, "sudo kubectl")
         else:
             args.insert(0, "kubectl")
@@ -48,7 +50,7 @@ Output:
 
     def kube(self, args: list) -> int:
         """ Rebind kubectl as kube and run commands via the rebind """
-        function_name = "kubectl"
+        function_name = "kube"
         if self.tty.help_function_child_name == function_name:
             help_description = f"""
 Run the kubectl commands using kube
@@ -62,13 +64,67 @@ Output:
             self.tty.current_tty_status = self.tty.success
             return self.success
         if 'kube' not in os.environ:
-            if platform.system() != "Windows":
+            if get_host_facts().system != "Windows":
                 os.environ["kube"] = "sudo kubectl"
             else:
                 os.environ["kube"] = "kubectl"
         args.insert(0, "kube")
         return self.tty.run_command(args)
 
+    def kube_parallel(self, args: list) -> int:
+        """ Run several kubectl commands at the same time """
+        function_name = "kube_parallel"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Run several kubectl commands at the same time, the commands are separated by a ','
+Every line of output starts with the command that printed it.
+The status is an error if one of the commands failed.
+The sudo password is asked once, before the commands start.
+Options:
+    jobs <n>    The maximum number of commands running at the same time (default: 4)
+                (it must be the first word)
+Usage Example:
+Input:
+    {function_name} get pods -n default , get pods -n kube-system , get services
+Output:
+    [get pods -n default] NAME   READY   STATUS    RESTARTS   AGE
+    [get services] NAME         TYPE        CLUSTER-IP   EXTERNAL-IP   PORT(S)   AGE
+    ...
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        max_jobs = 0
+        if len(args) > 0 and args[0].lower() == "jobs":
+            if len(args) < 2 or args[1].isdigit() is False:
+                self.print_on_tty(
+                    self.tty.error_colour,
+                    "jobs expects a number\n"
+                )
+                self.tty.current_tty_status = self.error
+                return self.error
+            max_jobs = int(args[1])
+            args = args[2:]
+        groups = [[]]
+        for item in args:
+            if item == ",":
+                groups.append([])
+            else:
+                groups[-1].append(item)
+        as_admin = get_host_facts().system != "Windows"
+        tasks = [
+            CommandTask(" ".join(group), ["kubectl", *group], as_admin=as_admin)
+            for group in groups if len(group) > 0
+        ]
+        if len(tasks) == 0:
+            self.print_on_tty(
+                self.tty.error_colour,
+                "No kubectl command provided\n"
+            )
+            self.tty.current_tty_status = self.error
+            return self.error
+        return self.parallel.run_on_tty(self.tty, tasks, max_jobs)
+
     def rebind_kubectl_as_kube(self, args: list) -> int:
         """ Rebind kubectl as kube """
         function_name = "rebind_kubectl_as_kube"
@@ -85,7 +141,7 @@ Output:
             self.tty.current_tty_status = self.tty.success
             return self.success
         if 'kube' not in os.environ:
-            if platform.system() != "Windows":
+            if get_host_facts().system != "Windows":
                 os.environ["kube"] = "sudo kubectl"
             else:
                 os.environ["kube"] = "kubectl"
@@ -95,17 +151,6 @@ Output:
             )
         return self.success
 
-    def _create_rebind_command(self, command: dict[str], rebind_item: str, new_name: str) -> dict:
-        """ Create the rebind command """
-        data = dict()
-        for i in command:
-            if rebind_item in i:
-                tmp = i.replace(f"{rebind_item}", f"{new_name}")
-                data[f"{tmp}"] = command[i]
-                data["desc"] = command["desc"]
-                break
-        return data
-
     def rebind_kube_commands_as_kubectl(self, args: list) -> int:
         """ Rebind kube commands as kubectl """
         function_name = "rebind_kube_commands_as_kubectl"
@@ -122,7 +167,7 @@ Output:
             self.tty.current_tty_status = self.tty.success
             return self.success
         if 'kubectl' not in os.environ:
-            if platform.system() != "Windows":
+            if get_host_facts().system != "Windows":
                 os.environ["kubectl"] = "sudo kubectl"
             else:
                 os.environ["kubectl"] = "kubectl"
@@ -130,25 +175,16 @@ Output:
                 self.tty.success_colour,
                 "kube commands rebound as kubectl (the kube commands will still remain available)\n"
             )
-        option_length = len(self.tty.options)
-        option_tracker = 0
-        for i in self.tty.options:
-            for b in i:
-                if b in "desc":
-                    continue
-                if "kube" in b:
-                    self.tty.options.append(
-                        self._create_rebind_command(i, b, "kubectl")
-                    )
-                    self.print_on_tty(
-                        self.tty.success_colour,
-                        f"Command '{b}' rebound to {b.replace('kube', 'kubectl')}, the originale command is still available.\n"
-                    )
-                break
-            option_tracker += 1
-            if option_tracker >= option_length:
-                break
-        print(self.tty.options)
+        rebind_prefix = "kube_"
+        for name in self.tty.command_index.complete(rebind_prefix):
+            alias = name.replace("kube", "kubectl", 1)
+            if alias in self.tty.command_index:
+                continue
+            self.tty.add_command_alias(alias, name)
+            self.print_on_tty(
+                self.tty.success_colour,
+                f"Command '{name}' rebound to {alias}, the originale command is still available.\n"
+            )
         return self.success
 
     def test_class_kubectl(self, args: list) -> int:
@@ -183,6 +219,10 @@ Output:
                 "kube": self.kube,
                 "desc": "Call the kubectl binary (if installed) that is located on your system."
             },
+            {
+                "kube_parallel": self.kube_parallel,
+                "desc": "Run several kubectl commands (separated by a ',') at the same time."
+            },
             {
                 "rebind_kubectl_as_kube": self.rebind_kubectl_as_kube,
                 "desc": "Rebind kubectl as kube."
@@ -1,10 +1,10 @@
 """
 File in charge of linking the system uninstaller classes tot the main uninstaller class for kubernetes
+The system uninstallers are only imported when they are requested so that
+loading the shell does not pull the uninstallers of every system.
 """
 
-from .uninstall_kubernetes_windows import UninstallKubernetesWindows
-from .uninstall_kubernetes_linux import UninstallKubernetesLinux
-from .uninstall_kubernetes_mac import UninstallKubernetesMac
+import importlib
 
 __all__ = [
     "UninstallKubernetesWindows",
@@ -12,14 +12,46 @@ __all__ = [
     "UninstallKubernetesMac"
 ]
 
+_UNINSTALLER_MODULES = {
+    "UninstallKubernetesWindows": ".uninstall_kubernetes_windows",
+    "UninstallKubernetesLinux": ".uninstall_kubernetes_linux",
+    "UninstallKubernetesMac": ".uninstall_kubernetes_mac"
+}
+
+
+def _import_uninstaller(class_name: str) -> type:
+    """ Import the module containing the uninstaller class and return the class """
+    module = importlib.import_module(
+        _UNINSTALLER_MODULES[class_name],
+        __name__
+    )
+    return getattr(module, class_name)
+
+
+def __getattr__(name: str) -> type:
+    """ Resolve the system uninstaller classes on their first access """
+    if name in _UNINSTALLER_MODULES:
+        return _import_uninstaller(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class Uninstall:
     """ The class in charge of grouping the os specific kubernetes uninstallers """
 
-    def __init__(self) -> None:
-        self.uninstall_kubernetes_linux = UninstallKubernetesLinux
-        self.uninstall_kubernetes_windows = UninstallKubernetesWindows
-        self.uninstall_kubernetes_mac = UninstallKubernetesMac
+    @property
+    def uninstall_kubernetes_linux(self) -> type:
+        """ The uninstaller class for linux """
+        return _import_uninstaller("UninstallKubernetesLinux")
+
+    @property
+    def uninstall_kubernetes_windows(self) -> type:
+        """ The uninstaller class for windows """
+        return _import_uninstaller("UninstallKubernetesWindows")
+
+    @property
+    def uninstall_kubernetes_mac(self) -> type:
+        """ The uninstaller class for mac """
+        return _import_uninstaller("UninstallKubernetesMac")
 
     def test_class_uninstall(self) -> int:
         """ Test the Uninstall class of kubernetes """
@@ -5,6 +5,7 @@ File in charge of containing the class that will install k3d for linux distribut
 from os.path import exists, isfile
 import display_tty
 from tty_ov import TTY
+from ....common import get_package_backend
 
 
 class UninstallK3dLinux:
@@ -37,45 +38,11 @@ class UninstallK3dLinux:
 
     def _has_yay(self) -> bool:
         """ Returns true if the user has yay [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has yay installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "yay",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "yay")
 
     def _has_brew(self) -> bool:
         """ Returns true if the user has brew [package manager] installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if the user has brew installed:"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "brew",
-                "--version",
-                ">/dev/null",
-                "2>/dev/null"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_package_backend().is_available_on_tty(self.tty, "brew")
 
     def _file_exists(self, file: str) -> bool:
         """ Returns true if the file exists """
@@ -3,23 +3,26 @@ File in charge of loading the k3s installer classes
 """
 
 from tty_ov import TTY
-from .uninstall_k3s_linux import UninstallK3sLinux
-from .uninstall_k3s_mac import UninstallK3sMac
-from .uninstall_k3s_windows import UninstallK3sWindows
+from ....common import LazyChild
 
 
 class UninstallK3s:
     """ Install K3s on the correct device """
 
+    uninstall_mac = LazyChild(".uninstall_k3s_mac", "UninstallK3sMac")
+    uninstall_linux = LazyChild(".uninstall_k3s_linux", "UninstallK3sLinux")
+    uninstall_windows = LazyChild(
+        ".uninstall_k3s_windows",
+        "UninstallK3sWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallK3sMac(tty, success, err, error)
-        self.uninstall_linux = UninstallK3sLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallK3sWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_k3s_installation_class(self) -> None:
         """ Test the k3s installation class """
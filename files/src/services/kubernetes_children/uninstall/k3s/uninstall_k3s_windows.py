@@ -4,6 +4,7 @@ File in charge of containing the class that will install k3s for Windows distrib
 
 import display_tty
 from tty_ov import TTY
+from ....common import get_tool_cache
 
 
 class UninstallK3sWindows:
@@ -24,24 +25,7 @@ class UninstallK3sWindows:
 
     def is_k3s_installed(self) -> bool:
         """ Returns true if k3s is installed """
-        self.print_on_tty(
-            self.tty.info_colour,
-            "Checking if k3s is installed (Windows):"
-        )
-        self.tty.current_tty_status = self.run(
-            [
-                "k3s",
-                "--version",
-                ">/dev/nul",
-                "2>/dev/nul"
-            ]
-        )
-        if self.tty.current_tty_status != self.tty.success:
-            self.print_on_tty(self.tty.error_colour, "[KO]\n")
-            return False
-        self.print_on_tty(self.tty.success_colour, "[OK]\n")
-        self.tty.current_tty_status = self.tty.success
-        return True
+        return get_tool_cache().is_installed_on_tty(self.tty, "k3s")
 
     def main(self) -> int:
         """ The main function of the class """
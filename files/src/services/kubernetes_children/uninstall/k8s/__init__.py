@@ -3,23 +3,26 @@ File in charge of loading the k8s installer classes
 """
 
 from tty_ov import TTY
-from .uninstall_k8s_linux import UninstallK8sLinux
-from .uninstall_k8s_mac import UninstallK8sMac
-from .uninstall_k8s_windows import UninstallK8sWindows
+from ....common import LazyChild
 
 
 class UninstallK8s:
     """ Uninstall K8s on the correct device """
 
+    uninstall_mac = LazyChild(".uninstall_k8s_mac", "UninstallK8sMac")
+    uninstall_linux = LazyChild(".uninstall_k8s_linux", "UninstallK8sLinux")
+    uninstall_windows = LazyChild(
+        ".uninstall_k8s_windows",
+        "UninstallK8sWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallK8sMac(tty, success, err, error)
-        self.uninstall_linux = UninstallK8sLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallK8sWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_k8s_installation_class(self) -> None:
         """ Test the k8s installation class """
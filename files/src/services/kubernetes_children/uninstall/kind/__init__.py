@@ -3,23 +3,26 @@ File in charge of loading the kind installer classes
 """
 
 from tty_ov import TTY
-from .uninstall_kind_linux import UninstallKindLinux
-from .uninstall_kind_mac import UninstallKindMac
-from .uninstall_kind_windows import UninstallKindWindows
+from ....common import LazyChild
 
 
 class UninstallKind:
     """ Uninstall Kind on the correct device """
 
+    uninstall_mac = LazyChild(".uninstall_kind_mac", "UninstallKindMac")
+    uninstall_linux = LazyChild(".uninstall_kind_linux", "UninstallKindLinux")
+    uninstall_windows = LazyChild(
+        ".uninstall_kind_windows",
+        "UninstallKindWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallKindMac(tty, success, err, error)
-        self.uninstall_linux = UninstallKindLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallKindWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_kind_uninstallation_class(self) -> None:
         """ Test the kind installation class """
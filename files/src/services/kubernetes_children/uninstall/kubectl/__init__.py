@@ -3,23 +3,32 @@ File in charge of loading the kubectl uninstaller classes
 """
 
 from tty_ov import TTY
-from .uninstall_kubernetes_linux import UninstallKubectlLinux
-from .uninstall_kubernetes_mac import UninstallKubectlMac
-from .uninstall_kubernetes_windows import UninstallKubectlWindows
+from ....common import LazyChild
 
 
 class UninstallKubectl:
     """ Uninstall Kubectl on the correct device """
 
+    uninstall_mac = LazyChild(
+        ".uninstall_kubernetes_mac",
+        "UninstallKubectlMac"
+    )
+    uninstall_linux = LazyChild(
+        ".uninstall_kubernetes_linux",
+        "UninstallKubectlLinux"
+    )
+    uninstall_windows = LazyChild(
+        ".uninstall_kubernetes_windows",
+        "UninstallKubectlWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallKubectlMac(tty, success, err, error)
-        self.uninstall_linux = UninstallKubectlLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallKubectlWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_kubectl_uninstallation_class(self) -> None:
         """ Test the kubectl uninstallation class """
@@ -3,10 +3,9 @@ File in charge of removing kubernetes for windows
 """
 
 import os
-import requests
 import display_tty
-from tqdm import tqdm
 from tty_ov import TTY
+from ....common import get_download_manager, get_release_resolver, DownloadError
 
 
 class UninstallKubectlWindows:
@@ -43,43 +42,14 @@ class UninstallKubectlWindows:
         self.kube_folder = ".kube"
         self.config_file = "config"
 
-    def download_file(self, url: str, filepath: str) -> int:
-        """ Download a file from a url """
-        self.print_on_tty(
-            self.tty.info_colour,
-            f"Downloading file from url: {url}\n"
+    def download_file(self, url: str, filepath: str, checksum_url: str = "") -> int:
+        """ Download a file from a url (checked against the sha256 published at checksum_url if given) """
+        return get_download_manager().download_on_tty(
+            self.tty,
+            url,
+            filepath,
+            checksum_url=checksum_url
         )
-        try:
-            request = requests.get(
-                url,
-                allow_redirects=True,
-                timeout=10,
-                stream=True
-            )
-            with open(filepath, "wb") as file:
-                total_length = int(request.headers.get('content-length'))
-                chunk_size = 1024
-                for chunk in tqdm(
-                    request.iter_content(chunk_size=chunk_size),
-                    total=(total_length // chunk_size)+1,
-                    unit='KB'
-                ):
-                    if chunk:
-                        file.write(chunk)
-                        file.flush()
-            self.print_on_tty(
-                self.tty.success_colour,
-                f"File downloaded to: {filepath}\n"
-            )
-            self.tty.current_tty_status = self.tty.success
-            return self.tty.current_tty_status
-        except requests.RequestException as err:
-            self.print_on_tty(
-                self.tty.error_colour,
-                f"Error downloading file: {err}\n"
-            )
-            self.tty.current_tty_status = self.tty.error
-            return self.tty.current_tty_status
 
     def save_environement_variable(self, variable_name: str, variable_value: str) -> int:
         """ Permanently add or update an environment variable """
@@ -311,36 +281,32 @@ Please make sure the package was correctly installed:
             self.tty.info_colour,
             "Getting the latest version of Kubernetes for Windows\n"
         )
-        version_name = "version.useless"
-        status = self.download_file(
-            self.release_file,
-            version_name
-        )
-        if status != self.tty.success:
-            self.print_on_tty(
-                self.tty.error_colour,
-                "Error getting the latest release of Kubernetes for Windows\n"
-            )
-            self.tty.current_tty_status = status
-            return self.tty.current_tty_status
-        file_content = self.get_file_content(version_name)
-        if file_content == self.tty.error:
+        try:
+            release = get_release_resolver().resolve("kubectl", "amd64")
+        except DownloadError as err:
             self.print_on_tty(
                 self.tty.error_colour,
-                "Error getting the latest release of Kubernetes for Windows\n"
+                f"Error getting the latest release of Kubernetes for Windows: {err}\n"
             )
             self.tty.current_tty_status = self.tty.error
             return self.tty.current_tty_status
-        download_link = f"{self.install_file_link_chunk1}{file_content}{self.install_file_link_chunk2}"
+        version = release["version"]
+        self.print_on_tty(
+            self.tty.info_colour,
+            f"Kubernetes release: {version} ({release['source']})\n"
+        )
+        download_link = f"{self.install_file_link_chunk1}{version}{self.install_file_link_chunk2}"
         status = self.download_file(
             download_link,
-            f"{self.full_path}\\{self.installer_name}"
+            f"{self.full_path}\\{self.installer_name}",
+            checksum_url=f"{download_link}.sha256"
         )
-        if self.tty.current_tty_status != self.tty.success:
+        if status != self.tty.success:
             self.print_on_tty(
                 self.tty.error_colour,
                 "Error downloading the latest release of Kubernetes for Windows\n"
             )
+            self.tty.current_tty_status = self.tty.error
             return self.tty.current_tty_status
         self.print_on_tty(
             self.tty.success_colour,
@@ -3,23 +3,32 @@ File in charge of loading the MicroK8s uninstaller classes
 """
 
 from tty_ov import TTY
-from .uninstall_microk8s_linux import UninstallMicroK8sLinux
-from .uninstall_microk8s_mac import UninstallMicroK8sMac
-from .uninstall_microk8s_windows import UninstallMicroK8sWindows
+from ....common import LazyChild
 
 
 class UninstallMicroK8s:
     """ Uninstall MicroK8s on the correct device """
 
+    uninstall_mac = LazyChild(
+        ".uninstall_microk8s_mac",
+        "UninstallMicroK8sMac"
+    )
+    uninstall_linux = LazyChild(
+        ".uninstall_microk8s_linux",
+        "UninstallMicroK8sLinux"
+    )
+    uninstall_windows = LazyChild(
+        ".uninstall_microk8s_windows",
+        "UninstallMicroK8sWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallMicroK8sMac(tty, success, err, error)
-        self.uninstall_linux = UninstallMicroK8sLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallMicroK8sWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_microk8s_installation_class(self) -> None:
         """ Test the MicroK8s installation class """
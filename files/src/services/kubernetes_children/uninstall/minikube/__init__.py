@@ -3,23 +3,32 @@ File in charge of loading the minikube installer classes
 """
 
 from tty_ov import TTY
-from .uninstall_minikube_linux import UninstallMinikubeLinux
-from .uninstall_minikube_mac import UninstallMinikubeMac
-from .uninstall_minikube_windows import UninstallMinikubeWindows
+from ....common import LazyChild
 
 
 class UninstallMinikube:
     """ Uninstall minikube on the correct device """
 
+    uninstall_mac = LazyChild(
+        ".uninstall_minikube_mac",
+        "UninstallMinikubeMac"
+    )
+    uninstall_linux = LazyChild(
+        ".uninstall_minikube_linux",
+        "UninstallMinikubeLinux"
+    )
+    uninstall_windows = LazyChild(
+        ".uninstall_minikube_windows",
+        "UninstallMinikubeWindows"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
-        self.uninstall_mac = UninstallMinikubeMac(tty, success, err, error)
-        self.uninstall_linux = UninstallMinikubeLinux(tty, success, err, error)
-        self.uninstall_windows = UninstallMinikubeWindows(
-            tty,
-            success,
-            err,
-            error
-        )
+        # ---- Status codes ----
+        self.success = success
+        self.err = err
+        self.error = error
+        # ---- Parent classes ----
+        self.tty = tty
 
     def test_minikube_uninstallation_class(self) -> None:
         """ Test the minikube uninstallation class """
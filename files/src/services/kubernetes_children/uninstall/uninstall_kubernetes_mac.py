@@ -4,17 +4,19 @@ File in charge of containing the code that will install kubernetes on a mac.
 
 from tty_ov import TTY
 import display_tty
-from .k3d import UninstallK3d
-from .k3s import UninstallK3s
-from .kind import UninstallKind
-from .kubectl import UninstallKubectl
-from .microk8s import UninstallMicroK8s
-from .minikube import UninstallMinikube
+from ...common import LazyChild
 
 
 class UninstallKubernetesMac:
     """ Uninstall the kubernetes on Mac """
 
+    k3d = LazyChild(".k3d", "UninstallK3d")
+    k3s = LazyChild(".k3s", "UninstallK3s")
+    microk8s = LazyChild(".microk8s", "UninstallMicroK8s")
+    kind = LazyChild(".kind", "UninstallKind")
+    kubectl = LazyChild(".kubectl", "UninstallKubectl")
+    minikube = LazyChild(".minikube", "UninstallMinikube")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
@@ -22,12 +24,6 @@ class UninstallKubernetesMac:
         self.error = error
         # ---- Parent classes ----
         self.tty = tty
-        self.k3d = UninstallK3d(tty, success, err, error)
-        self.k3s = UninstallK3s(tty, success, err, error)
-        self.microk8s = UninstallMicroK8s(tty, success, err, error)
-        self.kind = UninstallKind(tty, success, err, error)
-        self.kubectl = UninstallKubectl(tty, success, err, error)
-        self.minikube = UninstallMinikube(tty, success, err, error)
         # ---- TTY rebinds ----
         self.print_on_tty = self.tty.print_on_tty
         # ---- Download options ----
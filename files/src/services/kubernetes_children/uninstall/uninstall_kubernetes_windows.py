@@ -6,18 +6,20 @@ import requests
 import display_tty
 from tqdm import tqdm
 from tty_ov import TTY
-from .k3d import UninstallK3d
-from .k3s import UninstallK3s
-from .k8s import UninstallK8s
-from .kind import UninstallKind
-from .kubectl import UninstallKubectl
-from .microk8s import UninstallMicroK8s
-from .minikube import UninstallMinikube
+from ...common import LazyChild
 
 
 class UninstallKubernetesWindows:
     """ The script in charge of uninstalling the kubernetes interpreter for windows """
 
+    k3d = LazyChild(".k3d", "UninstallK3d")
+    k3s = LazyChild(".k3s", "UninstallK3s")
+    k8s = LazyChild(".k8s", "UninstallK8s")
+    microk8s = LazyChild(".microk8s", "UninstallMicroK8s")
+    kind = LazyChild(".kind", "UninstallKind")
+    kubectl = LazyChild(".kubectl", "UninstallKubectl")
+    minikube = LazyChild(".minikube", "UninstallMinikube")
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
@@ -25,13 +27,6 @@ class UninstallKubernetesWindows:
         self.error = error
         # ---- Parent classes ----
         self.tty = tty
-        self.k3d = UninstallK3d(tty, success, err, error)
-        self.k3s = UninstallK3s(tty, success, err, error)
-        self.k8s = UninstallK8s(tty, success, err, error)
-        self.microk8s = UninstallMicroK8s(tty, success, err, error)
-        self.kind = UninstallKind(tty, success, err, error)
-        self.kubectl = UninstallKubectl(tty, success, err, error)
-        self.minikube = UninstallMinikube(tty, success, err, error)
         # ---- TTY rebinds ----
         self.print_on_tty = self.tty.print_on_tty
         # ---- Download options ----
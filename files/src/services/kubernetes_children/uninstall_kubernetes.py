@@ -2,22 +2,37 @@
 File in charge of uninstalling kubernetes on all 3 systems
 """
 
-import platform
 from tty_ov import TTY
 from display_tty import IDISP
+from ..common import LazyChild, get_host_facts
 from .uninstall import Uninstall
 
 
 class UninstallKubernetes():
     """ Uninstall the kubernetes library on the host system """
 
+    # ---- System uninstall (only built when first used) ----
+    windows = LazyChild(
+        ".uninstall.uninstall_kubernetes_windows",
+        "UninstallKubernetesWindows"
+    )
+    linux = LazyChild(
+        ".uninstall.uninstall_kubernetes_linux",
+        "UninstallKubernetesLinux"
+    )
+    mac = LazyChild(
+        ".uninstall.uninstall_kubernetes_mac",
+        "UninstallKubernetesMac"
+    )
+
     def __init__(self, tty: TTY, success: int = 0, err: int = 84, error: int = 84) -> None:
         # ---- System Codes ----
         self.success = success
         self.err = err
         self.error = error
         # ---- System info ----
-        self.current_system = platform.system()
+        self.host_facts = get_host_facts()
+        self.current_system = self.host_facts.system
         # ---- Parent classes ----
         self.tty = tty
         self.disp = IDISP
@@ -28,25 +43,6 @@ class UninstallKubernetes():
         self.disp.toml_content["PRETTY_OUTPUT_IN_BLOCS"] = False
         # ---- Child classes ----
         self.uninstall = Uninstall()
-        # ---- System uninstall ----
-        self.windows = self.uninstall.uninstall_kubernetes_windows(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
-        self.linux = self.uninstall.uninstall_kubernetes_linux(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
-        self.mac = self.uninstall.uninstall_kubernetes_mac(
-            self.tty,
-            self.success,
-            self.err,
-            self.error
-        )
         # ---- command management ----
         self.options = []
 
@@ -255,6 +251,19 @@ Output:
 
     def uninstall_kubernetes(self, args: list) -> int:
         """ Uninstall k8s because this is the other name of kubernetes """
+        function_name = "uninstall_kubernetes"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Uninstall kubernetes on the host system (kubernetes is also known as k8s)
+Usage Example:
+Input:
+    {function_name}
+Output:
+    Uninstall process of k8s for the current system
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
         self.print_on_tty(self.tty.info_colour, "")
         info_message = "Info: Kubernetes is also known as k8s, thus, this function will run the k8s uninstallation."
         self.disp.inform_message(info_message)
@@ -0,0 +1,940 @@
+"""
+File containing the Tools class in charge of reporting the tools installed on the host
+"""
+
+import os
+import sys
+import json
+import time
+from tty_ov import TTY
+from .common import (
+    ToolInventory,
+    get_artifact_cache,
+    get_host_facts,
+    BundleBuilder,
+    BundleError,
+    OfflineBundle,
+    get_bundle_architecture,
+    set_active_bundle,
+    get_active_bundle,
+    get_peer_server,
+    PEER_PORT,
+    get_release_resolver,
+    ReleaseError,
+    DownloadError,
+    format_bytes,
+    get_transfer_log,
+    get_step_journal,
+    StackPlan,
+    StackError,
+    ArtifactPrefetcher,
+    set_active_prefetcher,
+    get_active_prefetcher,
+    get_tool_cache,
+    ProcessRunner,
+    get_package_backend
+)
+
+
+class Tools:
+    """ The class in charge of reporting the tools installed on the host """
+
+    def __init__(self, success, err, error, tty: TTY) -> None:
+        self.success = success
+        self.err = err
+        self.error = error
+        self.tty = tty
+        # ---- The probes of the supported tools ----
+        self.inventory_probe = ToolInventory()
+        # ---- TTY Tools options ----
+        self.options = []
+
+    def inventory(self, args: list) -> int:
+        """ Report the state of every supported tool in one table """
+        function_name = "inventory"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Report the install state, version, path and probe latency of docker,
+docker-compose, kubectl, k3s, k3d, kind, minikube, microk8s and kubeadm.
+The tools are probed in parallel.
+Options:
+    json        Display the report as json
+    refresh     Run the version commands even if their output is cached
+    jobs <n>    The maximum number of probes running at the same time
+Usage Example:
+Input:
+    {function_name} json
+Output:
+    [{{"tool": "docker", "installed": true, "version": "Docker version ...", "path": "/usr/bin/docker", "latency_ms": 0.2}}, ...]
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        args = [item.lower() for item in args]
+        as_json = "json" in args
+        refresh = "refresh" in args
+        max_workers = 0
+        if "jobs" in args:
+            index = args.index("jobs") + 1
+            if index >= len(args) or args[index].isdigit() is False:
+                self.tty.print_on_tty(
+                    self.tty.error_colour,
+                    "jobs expects a number\n"
+                )
+                self.tty.current_tty_status = self.error
+                return self.error
+            max_workers = int(args[index])
+        results = self.inventory_probe.probe_all(refresh, max_workers)
+        if as_json is True:
+            sys.stdout.write(json.dumps(results, indent=4) + "\n")
+        else:
+            self.tty.print_on_tty(
+                self.tty.default_colour,
+                self.inventory_probe.format_table(results)
+            )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def _format_size(self, size: int) -> str:
+        """ Convert a number of bytes into a readable size """
+        return format_bytes(size)
+
+    def artifact_cache_list(self, args: list) -> int:
+        """ List the artifacts kept in the download cache """
+        function_name = "artifact_cache_list"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+List the downloaded artifacts (installer scripts, release files, binaries) kept
+in the cache, the most recently used first.
+Options:
+    json        Display the list as json
+Usage Example:
+Input:
+    {function_name}
+Output:
+    3 artifacts, 52.4 MB (limit: 2.0 GB)
+    9f86d081884c  51.3 MB  2025-01-02 10:11  https://dl.k8s.io/release/v1.32.0/bin/linux/arm64/kubectl
+    ...
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        cache = get_artifact_cache()
+        entries = cache.list_entries()
+        if "json" in [item.lower() for item in args]:
+            sys.stdout.write(json.dumps(entries, indent=4) + "\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        self.tty.print_on_tty(
+            self.tty.info_colour,
+            f"{len(entries)} artifacts, {self._format_size(cache.get_total_size())} "
+            f"(limit: {self._format_size(cache.max_size)})\n"
+        )
+        for entry in entries:
+            last_used = time.strftime(
+                "%Y-%m-%d %H:%M", time.localtime(entry.get("last_used", 0))
+            )
+            self.tty.print_on_tty(
+                self.tty.default_colour,
+                f"{entry['sha256'][:12]}  {self._format_size(entry.get('size', 0)):>9}  "
+                f"{last_used}  {entry['url']}\n"
+            )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def artifact_cache_purge(self, args: list) -> int:
+        """ Remove artifacts from the download cache """
+        function_name = "artifact_cache_purge"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Remove artifacts from the download cache.
+Without argument every artifact is removed, otherwise the artifacts whose url
+or sha256 starts with one of the arguments are removed.
+Usage Example:
+Input:
+    {function_name} https://get.k3s.io
+Output:
+    Removed: https://get.k3s.io
+    1 artifact(s) removed
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        cache = get_artifact_cache()
+        selectors = args if len(args) > 0 else [""]
+        removed = []
+        for selector in selectors:
+            removed.extend(cache.purge(selector))
+        for url in removed:
+            self.tty.print_on_tty(self.tty.info_colour, f"Removed: {url}\n")
+        self.tty.print_on_tty(
+            self.tty.success_colour,
+            f"{len(removed)} artifact(s) removed\n"
+        )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def _get_option_value(self, args: list, option: str) -> str:
+        """ Return the word following an option in args ("" if absent), None if the value is missing """
+        lowered = [item.lower() for item in args]
+        if option not in lowered:
+            return ""
+        index = lowered.index(option) + 1
+        if index >= len(args):
+            return None
+        return args[index]
+
+    def _parse_bundle_args(self, args: list) -> tuple:
+        """ Return (plans, architecture, output, versions) from the arguments of bundle_build, None (reported) if they are invalid """
+        options = {"arch": "", "k3s_version": "", "kubectl_version": "", "output": ""}
+        for option in options:
+            value = self._get_option_value(args, option)
+            if value is None:
+                self.tty.print_on_tty(
+                    self.tty.error_colour,
+                    f"{option} expects a value\n"
+                )
+                return None
+            options[option] = value
+        values = [value for value in options.values() if value != ""]
+        plans = [
+            item.lower() for item in args
+            if item.lower() not in options and item not in values
+        ]
+        if len(plans) == 0:
+            self.tty.print_on_tty(
+                self.tty.error_colour,
+                "You need to specify at least one plan (k3s, kubectl)\n"
+            )
+            return None
+        architecture = options["arch"].lower()
+        if architecture == "":
+            architecture = get_bundle_architecture(get_host_facts().machine)
+        output = options["output"]
+        if output == "":
+            output = f"contopssync-{'-'.join(plans)}-{architecture}.zip"
+        versions = {}
+        for tool in ("k3s", "kubectl"):
+            if options[f"{tool}_version"] != "":
+                versions[tool] = options[f"{tool}_version"]
+        return plans, architecture, output, versions
+
+    def bundle_build(self, args: list) -> int:
+        """ Pack the artifacts of install plans in an offline bundle """
+        function_name = "bundle_build"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Download every artifact the install plans need and pack them in one bundle
+(a zip archive indexed by url) to install machines without internet access.
+Plans:
+    k3s         The install script, the k3s binary and the k3s airgap images
+    kubectl     stable.txt and the kubectl binary
+Options:
+    arch <amd64|arm64|armhf>    The architecture of the binaries (default: this machine)
+    k3s_version <version>       The k3s release (default: the stable channel)
+    kubectl_version <version>   The kubectl release (default: stable.txt)
+    output <path>               The bundle file (default: contopssync-<plans>-<arch>.zip)
+Usage Example:
+Input:
+    {function_name} k3s kubectl arch arm64 output pi-rack.zip
+Output:
+    Added https://get.k3s.io (27.3 KB, network)
+    ...
+    Bundle written to: /home/user/pi-rack.zip (5 artifacts, 241.5 MB)
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        parsed = self._parse_bundle_args(args)
+        if parsed is None:
+            self.tty.current_tty_status = self.error
+            return self.error
+        plans, architecture, output, versions = parsed
+
+        def _on_artifact(artifact: dict, entry: dict) -> None:
+            self.tty.print_on_tty(
+                self.tty.info_colour,
+                f"Added {artifact['url']} ({self._format_size(entry['size'])}, {entry.get('source', 'generated')})\n"
+            )
+        try:
+            manifest = BundleBuilder().build(
+                plans,
+                architecture,
+                output,
+                versions,
+                _on_artifact
+            )
+        except (BundleError, OSError) as err:
+            self.tty.print_on_tty(
+                self.tty.error_colour,
+                f"Error building the bundle: {err}\n"
+            )
+            self.tty.current_tty_status = self.error
+            return self.error
+        artifacts = manifest["artifacts"].values()
+        self.tty.print_on_tty(
+            self.tty.success_colour,
+            f"Bundle written to: {os.path.abspath(output)} ({len(artifacts)} artifacts, "
+            f"{self._format_size(sum(item['size'] for item in artifacts))})\n"
+        )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def bundle_list(self, args: list) -> int:
+        """ List the artifacts of an offline bundle """
+        function_name = "bundle_list"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+List the artifacts of a bundle (the active one if no path is given).
+Options:
+    json        Display the manifest as json
+Usage Example:
+Input:
+    {function_name} pi-rack.zip
+Output:
+    Bundle /home/user/pi-rack.zip: k3s, kubectl for arm64 (k3s v1.31.1+k3s1, kubectl v1.31.1)
+    k3s-script      27.3 KB  https://get.k3s.io
+    ...
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        paths = [item for item in args if item.lower() != "json"]
+        try:
+            bundle = OfflineBundle(paths[0]) if len(paths) > 0 else get_active_bundle()
+        except BundleError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        if bundle is None:
+            self.tty.print_on_tty(
+                self.tty.error_colour,
+                "No bundle is active, give the path of a bundle\n"
+            )
+            self.tty.current_tty_status = self.error
+            return self.error
+        if "json" in [item.lower() for item in args]:
+            sys.stdout.write(json.dumps(bundle.manifest, indent=4) + "\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        versions = ", ".join(
+            f"{name} {version}" for name, version in bundle.manifest.get("versions", {}).items()
+        )
+        self.tty.print_on_tty(
+            self.tty.info_colour,
+            f"Bundle {bundle.path}: {', '.join(bundle.manifest.get('plans', []))} "
+            f"for {bundle.architecture} ({versions})\n"
+        )
+        for entry in bundle.get_entries():
+            self.tty.print_on_tty(
+                self.tty.default_colour,
+                f"{entry['role']:14}  {self._format_size(entry['size']):>9}  {entry['url']}\n"
+            )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def use_bundle(self, args: list) -> int:
+        """ Answer the downloads from an offline bundle """
+        function_name = "use_bundle"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Install from a bundle built by bundle_build: the installers read their files
+from the bundle only and never reach the network. The program can also be
+started with --from-bundle=<path> (or with $CONTOPSSYNC_BUNDLE set).
+Options:
+    <path>      The bundle to use
+    off         Go back to downloading the files
+Usage Example:
+Input:
+    {function_name} pi-rack.zip
+Output:
+    The downloads are now read from: /home/user/pi-rack.zip (arm64)
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        if len(args) == 0:
+            bundle = get_active_bundle()
+            message = "No bundle is active, the files are downloaded\n"
+            if bundle is not None:
+                message = f"The downloads are read from: {bundle.path} ({bundle.architecture})\n"
+            self.tty.print_on_tty(self.tty.info_colour, message)
+            self.tty.current_tty_status = self.success
+            return self.success
+        if args[0].lower() == "off":
+            os.environ.pop("CONTOPSSYNC_BUNDLE", None)
+            set_active_bundle("")
+            self.tty.print_on_tty(
+                self.tty.success_colour,
+                "The files are downloaded again\n"
+            )
+            self.tty.current_tty_status = self.success
+            return self.success
+        try:
+            bundle = set_active_bundle(args[0])
+        except BundleError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        self.tty.print_on_tty(
+            self.tty.success_colour,
+            f"The downloads are now read from: {bundle.path} ({bundle.architecture})\n"
+        )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def artifact_server(self, args: list) -> int:
+        """ Share the artifact cache with the other nodes of the cluster """
+        function_name = "artifact_server"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Serve the artifact cache of this machine on the local network, the nodes
+installed with the ip of this machine fetch their files from it before
+trying the internet (install_k3s true serve starts it after a master install).
+Options:
+    start [port <n>]    Start the server (port {PEER_PORT} by default)
+    stop                Stop the server
+    (nothing)           Display the state of the server
+Usage Example:
+Input:
+    {function_name} start
+Output:
+    Serving 4 artifacts on port {PEER_PORT}
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        server = get_peer_server()
+        action = args[0].lower() if len(args) > 0 else ""
+        if action == "stop":
+            server.stop()
+            self.tty.print_on_tty(self.tty.success_colour, "The artifact server is stopped\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        if action == "start":
+            port = self._get_option_value(args, "port")
+            if port is None or (port != "" and port.isdigit() is False):
+                self.tty.print_on_tty(self.tty.error_colour, "port expects a number\n")
+                self.tty.current_tty_status = self.error
+                return self.error
+            try:
+                server.start(int(port) if port != "" else PEER_PORT)
+            except OSError as err:
+                self.tty.print_on_tty(
+                    self.tty.error_colour,
+                    f"Error starting the artifact server: {err}\n"
+                )
+                self.tty.current_tty_status = self.error
+                return self.error
+        elif action != "":
+            self.tty.print_on_tty(
+                self.tty.error_colour,
+                f"Unknown action {args[0]}, expected start or stop\n"
+            )
+            self.tty.current_tty_status = self.error
+            return self.error
+        if server.is_running is False:
+            self.tty.print_on_tty(self.tty.info_colour, "The artifact server is not running\n")
+        else:
+            self.tty.print_on_tty(
+                self.tty.success_colour,
+                f"Serving {len(server.get_index())} artifacts on port {server.port}\n"
+            )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def downloads(self, args: list) -> int:
+        """ Display the downloads of the session """
+        function_name = "downloads"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Display the files downloaded since the program started: the bytes received,
+the duration, the throughput and the connections opened (reused means the
+connection of a previous download to the same server was used again).
+Options:
+    json        Display the transfers as json
+    clear       Forget the transfers
+Usage Example:
+Input:
+    {function_name}
+Output:
+    200   62.3 MB    5.2 s   12.0 MB/s  reused   https://dl.k8s.io/release/v1.31.1/bin/linux/arm64/kubectl
+    2 downloads, 62.3 MB in 5.4 s (11.5 MB/s), 1 on a reused connection
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        transfer_log = get_transfer_log()
+        lowered = [item.lower() for item in args]
+        if "clear" in lowered:
+            transfer_log.clear()
+            self.tty.print_on_tty(self.tty.success_colour, "The transfer log is cleared\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        entries = transfer_log.get_entries()
+        if "json" in lowered:
+            sys.stdout.write(
+                json.dumps({"transfers": entries, "summary": transfer_log.get_summary()}, indent=4) + "\n"
+            )
+            self.tty.current_tty_status = self.success
+            return self.success
+        if len(entries) == 0:
+            self.tty.print_on_tty(self.tty.info_colour, "Nothing was downloaded yet\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        for entry in entries:
+            connection = "reused" if entry["connection_reused"] is True else f"{entry['new_connections']} new"
+            self.tty.print_on_tty(
+                self.tty.default_colour,
+                f"{entry['status']:<4} {self._format_size(entry['transferred']):>9} {entry['duration']:7.1f} s "
+                f"{self._format_size(entry['throughput']):>9}/s  {connection:7}  {entry['url']}\n"
+            )
+        summary = transfer_log.get_summary()
+        self.tty.print_on_tty(
+            self.tty.info_colour,
+            f"{summary['transfers']} downloads, {self._format_size(summary['transferred'])} in "
+            f"{summary['duration']:.1f} s ({self._format_size(summary['throughput'])}/s), "
+            f"{summary['reused']} on a reused connection\n"
+        )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def _split_release_args(self, args: list) -> tuple:
+        """ Return (tools, architecture, refresh) from the arguments of the release commands, None if arch has no value """
+        architecture = self._get_option_value(args, "arch")
+        if architecture is None:
+            return None
+        lowered = [item.lower() for item in args]
+        words = [
+            item for item in lowered
+            if item not in ("arch", "refresh", "json") and item != architecture.lower()
+        ]
+        return words, architecture.lower(), "refresh" in lowered
+
+    def release_versions(self, args: list) -> int:
+        """ Display the release of the tools the installers would install """
+        function_name = "release_versions"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Display the release of the tools the installers would install (all the known
+tools if none is given). The stable versions are asked to the release servers
+at the same time and cached for 6 hours ($CONTOPSSYNC_RELEASE_TTL seconds),
+the versions pinned by the release lockfile (see release_lock) win.
+Options:
+    arch <amd64|arm64|armhf>    The architecture (default: this machine)
+    refresh                     Ask the release servers even if the versions are cached
+    json                        Display the releases as json
+Usage Example:
+Input:
+    {function_name} k3s kubectl
+Output:
+    k3s      v1.31.1+k3s1  network
+    kubectl  v1.31.1       disk (12 min old)
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        parsed = self._split_release_args(args)
+        if parsed is None:
+            self.tty.print_on_tty(self.tty.error_colour, "arch expects a value\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        tools, architecture, refresh = parsed
+        if architecture == "":
+            architecture = get_bundle_architecture(get_host_facts().machine)
+        try:
+            resolver = get_release_resolver()
+        except DownloadError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        if len(tools) == 0:
+            tools = sorted(resolver.sources)
+        releases = resolver.resolve_many(tools, architecture, refresh)
+        status = self.success
+        if any("error" in release for release in releases.values()):
+            status = self.error
+        if "json" in [item.lower() for item in args]:
+            sys.stdout.write(json.dumps(releases, indent=4) + "\n")
+            self.tty.current_tty_status = status
+            return status
+        self._print_releases(releases)
+        self.tty.current_tty_status = status
+        return status
+
+    def _print_releases(self, releases: dict) -> None:
+        """ Display the resolved releases, with the age of the cached ones """
+        for tool, release in releases.items():
+            if "error" in release:
+                self.tty.print_on_tty(self.tty.error_colour, f"{tool:8} {release['error']}\n")
+                continue
+            source = release["source"]
+            if source in ("memory", "disk", "stale"):
+                source = f"{source} ({int((time.time() - release['resolved_at']) // 60)} min old)"
+            self.tty.print_on_tty(
+                self.tty.default_colour,
+                f"{tool:8} {release['version']:14} {source}\n"
+            )
+
+    def _apply_release_lock(self, resolver: any, action: str, args: list) -> dict:
+        """ Run an action of release_lock, returns the pinned versions (raises ReleaseError) """
+        if action == "write":
+            parsed = self._split_release_args(args[2:])
+            if parsed is None:
+                raise ReleaseError("arch expects a value")
+            tools, architecture, refresh = parsed
+            if len(tools) == 0:
+                tools = sorted(resolver.sources)
+            resolver.write_lockfile(args[1], tools, architecture, refresh)
+            return resolver.use_lockfile(args[1])
+        if action == "use":
+            return resolver.use_lockfile(args[1])
+        if action == "off":
+            os.environ.pop("CONTOPSSYNC_RELEASE_LOCK", None)
+            resolver.use_lockfile("")
+            return {}
+        if action == "":
+            return dict(resolver.pins)
+        raise ReleaseError(f"Unknown action {args[0]}, expected write, use or off")
+
+    def release_lock(self, args: list) -> int:
+        """ Pin the releases the installers install with a lockfile """
+        function_name = "release_lock"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Pin the releases installed by the installers so that a reinstall installs the
+same versions without asking the release servers. The lockfile can also be
+given with $CONTOPSSYNC_RELEASE_LOCK.
+Options:
+    write <path> [tools] [arch <a>] [refresh]   Resolve the tools (all by default) and write their versions
+    use <path>                                  Install the versions pinned by a lockfile
+    off                                         Install the stable versions again
+    (nothing)                                   Display the pinned versions
+Usage Example:
+Input:
+    {function_name} write cluster.lock.json
+Output:
+    Pinned in /home/user/cluster.lock.json: k3s v1.31.1+k3s1, kubectl v1.31.1
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        try:
+            resolver = get_release_resolver()
+        except DownloadError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        action = args[0].lower() if len(args) > 0 else ""
+        if action in ("write", "use") and len(args) < 2:
+            self.tty.print_on_tty(self.tty.error_colour, f"{action} expects the path of a lockfile\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        try:
+            pins = self._apply_release_lock(resolver, action, args)
+        except ReleaseError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        if action == "off":
+            self.tty.print_on_tty(
+                self.tty.success_colour,
+                "The stable releases are installed again\n"
+            )
+        elif resolver.lockfile == "":
+            self.tty.print_on_tty(self.tty.info_colour, "No release is pinned\n")
+        else:
+            versions = ", ".join(f"{tool} {version}" for tool, version in sorted(pins.items()))
+            self.tty.print_on_tty(
+                self.tty.success_colour,
+                f"Pinned in {resolver.lockfile}: {versions}\n"
+            )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def install_journal(self, args: list) -> int:
+        """ Display the steps completed by the installations that did not finish """
+        function_name = "install_journal"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Display the installations that failed or were interrupted: the steps they
+completed (a rerun skips them as long as their configuration did not change)
+and the step they stopped at. An installer forgets its journal once it
+succeeds, install_journal_reset forgets it right away.
+Options:
+    json        Display the journal as json
+Usage Example:
+Input:
+    {function_name}
+Output:
+    k3s_raspberry_pi: 3 steps completed, stopped at check_cgroups (2024-05-04 10:12)
+        prepare_cmdline                     0.2 s
+        prepare_boot_mode                   0.1 s
+        prepare_dependencies               94.3 s
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        installers = get_step_journal().get_installers()
+        if "json" in [item.lower() for item in args]:
+            sys.stdout.write(json.dumps(installers, indent=4) + "\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        if len(installers) == 0:
+            self.tty.print_on_tty(self.tty.info_colour, "No installation is waiting to be resumed\n")
+            self.tty.current_tty_status = self.success
+            return self.success
+        for installer, entry in sorted(installers.items()):
+            updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.get("updated_at", 0)))
+            line = f"{installer}: {len(entry.get('steps', {}))} steps completed"
+            if entry.get("failed", "") != "":
+                line = f"{line}, stopped at {entry['failed']}"
+            self.tty.print_on_tty(self.tty.info_colour, f"{line} ({updated})\n")
+            if entry.get("error", "") != "":
+                self.tty.print_on_tty(self.tty.error_colour, f"    {entry['error']}\n")
+            for step, record in entry.get("steps", {}).items():
+                self.tty.print_on_tty(
+                    self.tty.default_colour,
+                    f"    {step:32} {record.get('duration', 0.0):7.1f} s\n"
+                )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def install_journal_reset(self, args: list) -> int:
+        """ Forget the completed steps so that the next installation starts over """
+        function_name = "install_journal_reset"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Forget the steps completed by the installations that did not finish, so that
+the next run of the installer starts from its first step.
+Options:
+    <installer>     The installer to forget (all of them by default)
+Usage Example:
+Input:
+    {function_name} k3s_raspberry_pi
+Output:
+    The journal of k3s_raspberry_pi is forgotten
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        installer = args[0] if len(args) > 0 else ""
+        removed = get_step_journal().reset(installer)
+        if len(removed) == 0:
+            self.tty.print_on_tty(
+                self.tty.info_colour,
+                f"{installer or 'No installation'} has no journal\n"
+            )
+            self.tty.current_tty_status = self.success
+            return self.success
+        self.tty.print_on_tty(
+            self.tty.success_colour,
+            f"The journal of {', '.join(removed)} is forgotten\n"
+        )
+        self.tty.current_tty_status = self.success
+        return self.success
+
+    def _start_stack_prefetch(self, plan: StackPlan) -> ArtifactPrefetcher:
+        """ Download the files of the whole stack while the first tools are installed (None when nothing to do) """
+        if plan.system != "Linux" or get_active_bundle() is not None or get_active_prefetcher() is not None:
+            return None
+        plans, urls = plan.get_prefetch()
+        architecture = get_bundle_architecture(get_host_facts().machine)
+        if architecture == "":
+            plans = []
+        if len(plans) == 0 and len(urls) == 0:
+            return None
+        prefetcher = ArtifactPrefetcher(architecture=architecture)
+        for url in urls:
+            prefetcher.declare(url)
+        if len(plans) > 0:
+            prefetcher.declare_plan(plans, architecture)
+        set_active_prefetcher(prefetcher)
+        return prefetcher
+
+    def _install_stack_packages(self, plan: StackPlan, statuses: dict) -> None:
+        """ Install the tools of the stack shipped by a package manager, one transaction per manager """
+        backend = get_package_backend()
+        batched = plan.get_package_installations(backend)
+        if len(batched) == 0:
+            return
+        self.tty.print_on_tty(
+            self.tty.info_colour,
+            f"Installing {', '.join(entry['name'] for entry in batched)} with the package manager:\n"
+        )
+        for entry in batched:
+            manager = backend.get_preferred(entry["target"].packages)
+            backend.request(manager, entry["target"].packages[manager], reason=entry["name"])
+        backend.apply_on_tty(self.tty)
+        for entry in batched:
+            statuses[entry["name"]] = self.error
+            if get_tool_cache().is_installed(entry["target"].tool) is True:
+                statuses[entry["name"]] = self.success
+
+    def _install_stack_entry(self, entry: dict) -> int:
+        """ Install one tool of a stack, returns its status """
+        target = entry["target"]
+        self.tty.print_on_tty(self.tty.info_colour, f"Installing {target.name}:\n")
+        if target.command != "":
+            status = self.tty.run_indexed_command(target.command, target.args)
+        else:
+            result = ProcessRunner().run_as_admin(target.argv, stream=True)
+            status = self.success if result.ok is True else self.error
+        # ---- The next tools look for the ones just installed (a package manager too) ----
+        get_tool_cache().invalidate()
+        get_package_backend().forget()
+        return status
+
+    def _install_stack_plan(self, plan: StackPlan, installations: list) -> dict:
+        """ Install the tools of a plan in order (the downloads are prefetched), returns {name: status} """
+        statuses = {}
+        prefetcher = self._start_stack_prefetch(plan)
+        try:
+            self._install_stack_packages(plan, statuses)
+            for entry in installations:
+                if entry["name"] in statuses:
+                    continue
+                failed = [
+                    name for name in entry["target"].requires
+                    if statuses.get(name, self.success) != self.success
+                ]
+                if len(failed) > 0:
+                    self.tty.print_on_tty(
+                        self.tty.error_colour,
+                        f"{entry['name']} is not installed: {', '.join(failed)} failed\n"
+                    )
+                    statuses[entry["name"]] = self.error
+                    continue
+                statuses[entry["name"]] = self._install_stack_entry(entry)
+        finally:
+            if prefetcher is not None:
+                set_active_prefetcher(None)
+                prefetcher.close()
+                self.tty.print_on_tty(self.tty.info_colour, prefetcher.format_report())
+        return statuses
+
+    def install_stack(self, args: list) -> int:
+        """ Install several tools with one plan, their shared prerequisites once """
+        function_name = "install_stack"
+        if self.tty.help_function_child_name == function_name:
+            help_description = f"""
+Install several tools at once. The prerequisites of the tools (docker for
+docker_compose, kind, k3d and a k3s using docker, kubectl for minikube, pip
+for docker_compose on Linux) are added to the plan once and installed first,
+the tools already installed are skipped. The tools shipped by the package
+manager of the system (pip) are installed first, in one transaction. On Linux
+the downloads of the whole stack start right away and run while the first
+tools are installed. A tool whose prerequisite failed is not installed. k3s is
+installed as a master node.
+Targets:
+    docker, docker_compose, pip, kubectl, minikube, kind, k3s, k3d, microk8s
+Options:
+    force_docker    Install k3s with docker (adds docker to the plan)
+    dry_run         Display the plan without installing anything
+Usage Example:
+Input:
+    {function_name} docker_compose minikube dry_run
+Output:
+    docker           installed, skipped (required by docker_compose)
+    pip              to install (required by docker_compose)
+    docker_compose   to install
+    kubectl          to install (required by minikube)
+    minikube         to install
+    4 of 5 tools to install
+"""
+            self.tty.function_help(function_name, help_description)
+            self.tty.current_tty_status = self.tty.success
+            return self.success
+        lowered = [item.lower() for item in args]
+        force_docker = "force_docker" in lowered
+        dry_run = "dry_run" in lowered
+        targets = [item for item in lowered if item not in ("force_docker", "dry_run")]
+        if len(targets) == 0:
+            self.tty.print_on_tty(self.tty.error_colour, f"{function_name} expects the tools to install\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        try:
+            plan = StackPlan(targets, get_host_facts().system, force_docker)
+        except StackError as err:
+            self.tty.print_on_tty(self.tty.error_colour, f"{err}\n")
+            self.tty.current_tty_status = self.error
+            return self.error
+        self.tty.print_on_tty(self.tty.info_colour, plan.format_plan())
+        installations = plan.get_installations()
+        if dry_run is True or len(installations) == 0:
+            self.tty.current_tty_status = self.success
+            return self.success
+        statuses = self._install_stack_plan(plan, installations)
+        for name, status in statuses.items():
+            self.tty.print_on_tty(self.tty.info_colour, f"{name:16} ")
+            if status == self.success:
+                self.tty.print_on_tty(self.tty.success_colour, "[OK]\n")
+            else:
+                self.tty.print_on_tty(self.tty.error_colour, "[KO]\n")
+        status = self.success
+        if any(item != self.success for item in statuses.values()):
+            status = self.error
+        self.tty.current_tty_status = status
+        return status
+
+    def save_commands(self) -> None:
+        """ The function in charge of saving the commands to the options list """
+        self.options = [
+            {
+                "inventory": self.inventory,
+                "desc": "Report the state, version and path of the supported tools"
+            },
+            {
+                "artifact_cache_list": self.artifact_cache_list,
+                "desc": "List the downloaded artifacts kept in the cache"
+            },
+            {
+                "artifact_cache_purge": self.artifact_cache_purge,
+                "desc": "Remove artifacts (all of them, or by url / sha256 prefix) from the download cache"
+            },
+            {
+                "bundle_build": self.bundle_build,
+                "desc": "Pack the artifacts of install plans (k3s, kubectl) in an offline bundle"
+            },
+            {
+                "bundle_list": self.bundle_list,
+                "desc": "List the artifacts of an offline bundle"
+            },
+            {
+                "use_bundle": self.use_bundle,
+                "desc": "Install from an offline bundle instead of the network (off to stop)"
+            },
+            {
+                "artifact_server": self.artifact_server,
+                "desc": "Share the artifact cache with the other nodes of the cluster (start / stop)"
+            },
+            {
+                "release_versions": self.release_versions,
+                "desc": "Display the releases of the tools the installers would install"
+            },
+            {
+                "release_lock": self.release_lock,
+                "desc": "Pin the releases installed by the installers with a lockfile (write / use / off)"
+            },
+            {
+                "downloads": self.downloads,
+                "desc": "Display the downloads of the session (size, duration, throughput, connection reuse)"
+            },
+            {
+                "install_stack": self.install_stack,
+                "desc": "Install several tools at once, their shared prerequisites only once (docker, kubectl, pip)"
+            },
+            {
+                "install_journal": self.install_journal,
+                "desc": "Display the steps completed by the installations that failed or were interrupted"
+            },
+            {
+                "install_journal_reset": self.install_journal_reset,
+                "desc": "Forget the completed steps of an installation (all of them by default) to start over"
+            }
+        ]
+
+    def injector(self) -> int:
+        """ The function in charge of injecting the tools class into the main class """
+        self.save_commands()
+        return self.tty.import_functions_into_shell(self.options)
@@ -0,0 +1,262 @@
+"""
+File in charge of measuring where the startup time of the program is spent
+It records the import time of every module and the construction time of the
+classes defined under services/, then prints a sorted report or writes it
+as json.
+This file only uses the standard library so that it can be loaded before the
+services (and their dependencies) are imported.
+Usage:
+    python main.py --profile-startup
+    python main.py --profile-startup=startup_profile.json
+"""
+
+import sys
+import json
+import time
+import functools
+
+
+class _TimedLoader:
+    """ Wrap the loader of a module to time its creation and execution """
+
+    def __init__(self, loader: any, profiler: "StartupProfiler", name: str) -> None:
+        self.loader = loader
+        self.profiler = profiler
+        self.name = name
+
+    def __getattr__(self, name: str) -> any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: any) -> any:
+        """ Start the timer and let the real loader create the module """
+        self.profiler.enter(self.profiler.import_stack, self.name)
+        create_module = getattr(self.loader, "create_module", None)
+        if create_module is None:
+            return None
+        try:
+            return create_module(spec)
+        except BaseException:
+            self.profiler.leave_import(self.name)
+            raise
+
+    def exec_module(self, module: any) -> None:
+        """ Execute the module and stop the timer """
+        try:
+            self.loader.exec_module(module)
+        finally:
+            self.profiler.leave_import(self.name)
+            # ---- Give the real loader back to the module ----
+            module.__loader__ = self.loader
+            if getattr(module, "__spec__", None) is not None:
+                module.__spec__.loader = self.loader
+        self.profiler.time_classes(module)
+
+
+class _ImportTimer:
+    """ A meta path finder handing out timed loaders """
+
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        self.profiler = profiler
+
+    def find_spec(self, fullname: str, path: any, target: any = None) -> any:
+        """ Find the module with the other finders and wrap its loader """
+        for finder in sys.meta_path:
+            if finder is self or hasattr(finder, "find_spec") is False:
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is None or hasattr(spec.loader, "exec_module") is False:
+                return spec
+            spec.loader = _TimedLoader(spec.loader, self.profiler, fullname)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """ Record the import and construction timings of the startup """
+
+    def __init__(self, output_file: str = "", prefixes: tuple = ("services",)) -> None:
+        self.output_file = output_file
+        # ---- The modules whose classes are timed ----
+        self.prefixes = prefixes
+        self.finder = _ImportTimer(self)
+        self.import_stack = []
+        self.construction_stack = []
+        # ---- module -> [inclusive seconds, self seconds] ----
+        self.imports = {}
+        # ---- class -> [count, inclusive seconds, self seconds] ----
+        self.constructions = {}
+        self.patched_classes = []
+        self.start_time = 0.0
+        self.stop_time = 0.0
+
+    @classmethod
+    def from_argv(cls, argv: list[str]) -> "StartupProfiler":
+        """ Create and start a profiler if --profile-startup[=file.json] was passed """
+        for arg in argv:
+            if arg == "--profile-startup":
+                profiler = cls()
+            elif arg.startswith("--profile-startup="):
+                profiler = cls(arg.split("=", 1)[1])
+            else:
+                continue
+            profiler.start()
+            return profiler
+        return None
+
+    def start(self) -> None:
+        """ Start recording the imports """
+        self.start_time = time.perf_counter()
+        sys.meta_path.insert(0, self.finder)
+
+    def stop(self) -> None:
+        """ Stop recording and restore the patched classes """
+        self.stop_time = time.perf_counter()
+        if self.finder in sys.meta_path:
+            sys.meta_path.remove(self.finder)
+        for item, init in self.patched_classes:
+            item.__init__ = init
+        self.patched_classes = []
+
+    def enter(self, stack: list, name: str) -> None:
+        """ Push a timed entry: [name, start, time spent in the children] """
+        stack.append([name, time.perf_counter(), 0.0])
+
+    def leave(self, stack: list) -> tuple:
+        """ Pop a timed entry and return its name, inclusive and self times """
+        name, start, children = stack.pop()
+        elapsed = time.perf_counter() - start
+        if len(stack) > 0:
+            stack[-1][2] += elapsed
+        return name, elapsed, elapsed - children
+
+    def leave_import(self, name: str) -> None:
+        """ Close the timer of an import (the timers left open above it are dropped) """
+        if name not in (item[0] for item in self.import_stack):
+            return
+        while self.import_stack[-1][0] != name:
+            self.import_stack.pop()
+        name, elapsed, own = self.leave(self.import_stack)
+        self.imports[name] = [elapsed, own]
+
+    def _is_tracked(self, module_name: str) -> bool:
+        """ Check if the classes of a module must be timed """
+        for prefix in self.prefixes:
+            if module_name == prefix or module_name.startswith(f"{prefix}."):
+                return True
+        return False
+
+    def time_classes(self, module: any) -> None:
+        """ Wrap the constructor of the classes defined in a tracked module """
+        if self._is_tracked(module.__name__) is False:
+            return
+        for item in list(vars(module).values()):
+            if isinstance(item, type) is False:
+                continue
+            if item.__module__ != module.__name__ or "__init__" not in vars(item):
+                continue
+            init = vars(item)["__init__"]
+            item.__init__ = self._timed_init(
+                init,
+                f"{module.__name__}.{item.__qualname__}"
+            )
+            self.patched_classes.append((item, init))
+
+    def _timed_init(self, init: callable, name: str) -> callable:
+        """ Return a constructor recording its duration """
+        profiler = self
+
+        @functools.wraps(init)
+        def wrapper(*args, **kwargs):
+            profiler.enter(profiler.construction_stack, name)
+            try:
+                return init(*args, **kwargs)
+            finally:
+                _, elapsed, own = profiler.leave(profiler.construction_stack)
+                entry = profiler.constructions.setdefault(name, [0, 0.0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += own
+        return wrapper
+
+    def get_report(self) -> dict:
+        """ Return the recorded timings sorted by inclusive time """
+        imports = sorted(
+            self.imports.items(),
+            key=lambda item: item[1][0],
+            reverse=True
+        )
+        externals = {}
+        for name, (_, own) in self.imports.items():
+            if self._is_tracked(name) is True:
+                continue
+            package = name.split(".")[0]
+            externals[package] = externals.get(package, 0.0) + own
+        constructions = sorted(
+            self.constructions.items(),
+            key=lambda item: item[1][1],
+            reverse=True
+        )
+        return {
+            "total_seconds": self.stop_time - self.start_time,
+            "imports": [
+                {"module": name, "seconds": total, "self_seconds": own}
+                for name, (total, own) in imports
+                if self._is_tracked(name) is True
+            ],
+            "external_packages": [
+                {"package": name, "self_seconds": own}
+                for name, own in sorted(
+                    externals.items(),
+                    key=lambda item: item[1],
+                    reverse=True
+                )
+            ],
+            "constructions": [
+                {
+                    "class": name,
+                    "count": count,
+                    "seconds": total,
+                    "self_seconds": own
+                }
+                for name, (count, total, own) in constructions
+            ]
+        }
+
+    def format_report(self, report: dict, limit: int = 25) -> str:
+        """ Convert a report into a text table (limit <= 0 shows every line) """
+        if limit <= 0:
+            limit = None
+        lines = [
+            f"Startup profile: {report['total_seconds'] * 1000:.1f} ms",
+            "",
+            "Imports under services/ (inclusive ms | self ms):"
+        ]
+        for item in report["imports"][:limit]:
+            lines.append(
+                f"{item['seconds'] * 1000:9.2f} | {item['self_seconds'] * 1000:9.2f}  {item['module']}"
+            )
+        lines.append("")
+        lines.append("External packages (self ms):")
+        for item in report["external_packages"][:limit]:
+            lines.append(
+                f"{item['self_seconds'] * 1000:9.2f}  {item['package']}"
+            )
+        lines.append("")
+        lines.append("Constructions (count | inclusive ms | self ms):")
+        for item in report["constructions"][:limit]:
+            lines.append(
+                f"{item['count']:5d} | {item['seconds'] * 1000:9.2f} | {item['self_seconds'] * 1000:9.2f}  {item['class']}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_report(self) -> None:
+        """ Print the report or write it to the json output file """
+        report = self.get_report()
+        if self.output_file == "":
+            sys.stdout.write(self.format_report(report))
+            return
+        with open(self.output_file, "w", encoding="utf-8", newline="\n") as file:
+            json.dump(report, file, indent=4)
+        sys.stdout.write(f"Startup profile written to {self.output_file}\n")
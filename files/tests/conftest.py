@@ -0,0 +1,68 @@
+"""
+File in charge of the fixtures shared by the tests
+"""
+import os
+import sys
+import types
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+    from main import Main
+    from services.common import DownloadManager
+else:
+    from src import constants as CONST
+    from src.main import Main
+    from src.services.common import DownloadManager
+
+
+@pytest.fixture
+def cache_folder(tmp_path: any, monkeypatch: any) -> str:
+    """ An empty folder, also used as the cache of the program ($XDG_CACHE_HOME) """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return str(tmp_path)
+
+
+@pytest.fixture
+def fake_tty() -> types.SimpleNamespace:
+    """ A tty recording what is printed on it in tty.printed ([(colour, text)]) """
+    tty = types.SimpleNamespace(
+        success=CONST.SUCCESS,
+        err=CONST.ERR,
+        error=CONST.ERROR,
+        current_tty_status=CONST.SUCCESS,
+        info_colour="info",
+        success_colour="success",
+        error_colour="error",
+        printed=[]
+    )
+    tty.print_on_tty = lambda colour, text: tty.printed.append((colour, text))
+    return tty
+
+
+@pytest.fixture
+def make_manager() -> callable:
+    """ Build download managers without retries nor progress bars, they are closed after the test """
+    managers = []
+
+    def factory(**options) -> DownloadManager:
+        options.setdefault("retries", 0)
+        options.setdefault("show_progress", False)
+        manager = DownloadManager(**options)
+        managers.append(manager)
+        return manager
+    yield factory
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def main_instance() -> Main:
+    """ The main class of the program, unloaded after the test """
+    main = Main(True)
+    main.call_injectors()
+    main.add_spacing()
+    yield main
+    assert main.tty.unload_basics() == CONST.SUCCESS
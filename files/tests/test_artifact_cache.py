@@ -0,0 +1,72 @@
+"""
+File in charge of testing the artifact cache
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import ArtifactCache
+else:
+    from src.services.common import ArtifactCache
+
+
+def test_artifact_cache(cache_folder: str, make_manager: callable) -> None:
+    """ Test the artifact cache: revalidation, offline copy, eviction and purge """
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    requests_seen = []
+
+    class RecordingHandler(SimpleHTTPRequestHandler):
+        """ Serve the files and record the status of every answer """
+
+        def log_request(self, code="-", size="-") -> None:
+            """ Record the requests instead of logging them """
+            requests_seen.append((self.command, self.path, int(code)))
+
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    for name, size in (("script.sh", 1000), ("binary", 3000), ("other", 3000)):
+        with open(os.path.join(served, name), "wb") as file:
+            file.write(os.urandom(size))
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(RecordingHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    manager = make_manager()
+    cache = ArtifactCache(os.path.join(cache_folder, "cache"), max_size=5000)
+    target = os.path.join(cache_folder, "script.sh")
+    try:
+        first = cache.fetch(f"{url}/script.sh", target, manager)
+        second = cache.fetch(f"{url}/script.sh", target, manager)
+        cache.fetch(f"{url}/binary", os.path.join(cache_folder, "binary"), manager)
+        cache.fetch(f"{url}/other", os.path.join(cache_folder, "other"), manager)
+    finally:
+        server.shutdown()
+        server.server_close()
+    offline_manager = make_manager()
+    os.remove(target)
+    listed = [entry["url"] for entry in cache.list_entries()]
+    evicted = f"{url}/script.sh" not in listed
+    offline = cache.fetch(f"{url}/other", target, offline_manager)
+    with open(target, "rb") as file:
+        offline_content = file.read()
+    with open(os.path.join(served, "other"), "rb") as file:
+        served_content = file.read()
+    removed = cache.purge(offline["sha256"][:8])
+    remaining = cache.list_entries()
+
+    assert first["source"] == "network" and second["source"] == "cache"
+    assert first["sha256"] == second["sha256"]
+    script_requests = [item for item in requests_seen if item[1] == "/script.sh"]
+    assert script_requests[-1][2] == 304
+    assert script_requests.count(("GET", "/script.sh", 200)) == 1
+    assert evicted is True and len(listed) == 1
+    assert offline["source"] == "offline" and offline_content == served_content
+    assert removed == [f"{url}/other"] and remaining == []
@@ -0,0 +1,74 @@
+"""
+File in charge of testing the commands run in parallel
+"""
+import io
+import os
+import sys
+import time
+import contextlib
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import AsyncCommandRunner, CommandTask
+else:
+    from src.services.common import AsyncCommandRunner, CommandTask
+
+
+def test_async_runner(cache_folder: str) -> None:
+    """ Test the concurrent commands: order, prefixed output and aggregated status """
+    script = "import sys, time; time.sleep(0.5); print('done', sys.argv[1]); sys.exit(int(sys.argv[1]))"
+    tasks = [
+        CommandTask(f"task {index}", [sys.executable, "-c", script, "0"])
+        for index in range(3)
+    ]
+    runner = AsyncCommandRunner(max_jobs=3)
+    output = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(output):
+        results = runner.run_all(tasks)
+    elapsed = time.perf_counter() - start
+    assert [item.stdout for item in results] == ["done 0\n"] * 3
+    assert elapsed < 1.4
+    assert sorted(output.getvalue().splitlines()) == [
+        "[task 0] done 0",
+        "[task 1] done 0",
+        "[task 2] done 0"
+    ]
+    assert runner.get_status(results) == runner.success
+    tasks.append(CommandTask("failing", [sys.executable, "-c", script, "2"]))
+    tasks.append(CommandTask("missing", ["contopssync-missing-program"]))
+    quiet = AsyncCommandRunner(max_jobs=2, stream=False)
+    results = quiet.run_all(tasks)
+    assert [item.returncode for item in results][3] == 2
+    assert results[4].ok is False
+    assert quiet.get_status(results) == quiet.error
+
+    # ---- The sudo password is asked once, the admin tasks never prompt ----
+    log_file = os.path.join(cache_folder, "sudo.log")
+    fake_sudo = os.path.join(cache_folder, "sudo.py")
+    with open(fake_sudo, "w", encoding="utf-8") as file:
+        file.write(
+            "import os, sys, subprocess\n"
+            f"open({log_file!r}, 'a').write(' '.join(sys.argv[1:2]) + '\\n')\n"
+            "if sys.argv[1] == '-v':\n"
+            "    sys.exit(int(os.environ.get('FAKE_SUDO_STATUS', '0')))\n"
+            "sys.exit(subprocess.call(sys.argv[2:]))\n"
+        )
+    admin = AsyncCommandRunner(max_jobs=3, stream=False)
+    admin.admin_prefix = [sys.executable, fake_sudo]
+    admin_tasks = [
+        CommandTask(f"admin {index}", [sys.executable, "-c", script, "0"], as_admin=True)
+        for index in range(3)
+    ]
+    results = admin.run_all(admin_tasks)
+    with open(log_file, "r", encoding="utf-8") as file:
+        calls = file.read().split()
+    assert admin.get_status(results) == admin.success
+    assert calls.count("-v") == 1 and calls.count("-n") == 3 and calls[0] == "-v"
+    os.environ["FAKE_SUDO_STATUS"] = "1"
+    try:
+        refused = admin.run_all(admin_tasks)
+    finally:
+        os.environ.pop("FAKE_SUDO_STATUS")
+    assert admin.get_status(refused) == admin.error and all(item.stdout == "" for item in refused)
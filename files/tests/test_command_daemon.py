@@ -0,0 +1,73 @@
+"""
+File in charge of testing the daemon mode and its client
+"""
+import os
+import sys
+import time
+import subprocess
+from platform import system
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+else:
+    from src import constants as CONST
+
+ERR = CONST.ERR
+SUCCESS = CONST.SUCCESS
+CURRENT_SYSTEM = system()
+
+
+def test_daemon(cache_folder: str) -> None:
+    """ Test the commands forwarded to a resident daemon """
+    if CURRENT_SYSTEM == "Windows":
+        return
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    socket_path = os.path.join(cache_folder, "daemon.sock")
+    env = dict(os.environ)
+    daemon = subprocess.Popen(
+        [
+            sys.executable, os.path.join(src, "main.py"),
+            "-nc", f"--daemon={socket_path}"
+        ],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    client = [
+        sys.executable, os.path.join(src, "command_daemon.py"),
+        f"--socket={socket_path}"
+    ]
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path) or daemon.poll() is not None:
+                break
+            time.sleep(0.1)
+        help_call = subprocess.run(
+            client + ["help", "kube_version"],
+            capture_output=True, check=False, text=True, timeout=30
+        )
+        invalid_call = subprocess.run(
+            client + ["not_a_command"],
+            capture_output=True, check=False, text=True, timeout=30
+        )
+        stop_call = subprocess.run(
+            client + ["--stop-daemon"],
+            capture_output=True, check=False, text=True, timeout=30
+        )
+        daemon_status = daemon.wait(timeout=30)
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+            daemon.wait()
+    socket_removed = os.path.exists(socket_path) is False
+
+    assert help_call.returncode == SUCCESS
+    assert "kube_version" in help_call.stdout
+    assert invalid_call.returncode == ERR
+    assert "Invalid option" in invalid_call.stdout
+    assert stop_call.returncode == SUCCESS
+    assert daemon_status == SUCCESS
+    assert socket_removed is True
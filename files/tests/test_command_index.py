@@ -0,0 +1,37 @@
+"""
+File in charge of testing the index of the shell commands
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+else:
+    from src import constants as CONST
+
+ERR = CONST.ERR
+SUCCESS = CONST.SUCCESS
+
+
+def test_command_index(main_instance: any) -> None:
+    """ Test the command lookup, the kube aliases and the completion """
+    index = main_instance.tty.command_index
+    option_count = len(main_instance.tty.options)
+    main_instance.tty.process_complex_input(["rebind_kube_commands_as_kubectl"])
+    status1 = main_instance.tty.current_tty_status
+    same_function = index.get_function("kubectl_version") == index.get_function("kube_version")
+    completion = index.complete("kubectl_v")
+    option_count_after = len(main_instance.tty.options)
+    main_instance.tty.process_complex_input(["help", "kube_log*"])
+    status2 = main_instance.tty.current_tty_status
+    main_instance.tty.process_complex_input(["not_a_command"])
+    status3 = main_instance.tty.current_tty_status
+
+    assert status1 == SUCCESS
+    assert same_function is True
+    assert "kubectl_version" in completion
+    assert option_count == option_count_after
+    assert status2 == SUCCESS
+    assert status3 == ERR
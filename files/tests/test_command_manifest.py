@@ -0,0 +1,111 @@
+"""
+File in charge of testing the manifest of the shell commands
+"""
+import os
+import sys
+import json
+import types
+import tempfile
+import subprocess
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+else:
+    from src import constants as CONST
+
+SUCCESS = CONST.SUCCESS
+
+
+def test_command_manifest(cache_folder: str) -> None:
+    """ Test that a warm start fills the shell without importing the services """
+    probe = """
+import sys
+import json
+sys.path.insert(0, {src!r})
+from main import Main
+MI = Main(False)
+MI.call_injectors()
+MI.tty.help([])
+MI.tty.process_complex_input(["help", "install_kubectl"])
+help_status = MI.tty.current_tty_status
+heavy = [
+    i for i in sys.modules
+    if i.split(".")[0] in ("requests", "tqdm", "display_tty")
+    or "install" in i
+]
+commands = len(MI.tty.command_index)
+MI.tty.process_complex_input(["kubernetes_class_test"])
+sys.__stdout__.write("\\n" + json.dumps({{
+    "heavy": heavy,
+    "commands": commands,
+    "help_status": help_status,
+    "run_status": MI.tty.current_tty_status
+}}) + "\\n")
+"""
+    src = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    env = dict(os.environ)
+    results = []
+    for _ in range(2):
+        output = subprocess.run(
+            [sys.executable, "-c", probe.format(src=src)],
+            env=env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+            text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    manifest_written = os.path.isfile(
+        os.path.join(cache_folder, "contopssync", "command_manifest.json")
+    )
+    cold, warm = results
+
+    assert manifest_written is True
+    assert len(cold["heavy"]) > 0
+    assert warm["heavy"] == []
+    assert warm["commands"] == cold["commands"]
+    assert warm["help_status"] == SUCCESS
+    assert warm["run_status"] == SUCCESS
+
+    from services.common.command_index import CommandIndex
+    from services.common.command_manifest import CommandManifest
+
+    class FakeService:
+        """ One command with a help branch, one without """
+
+        def __init__(self, tty: any) -> None:
+            self.tty = tty
+            self.runs = []
+
+        def documented(self, args: list) -> int:
+            if self.tty.help_function_child_name == "documented":
+                self.tty.function_help("documented", "The help of documented")
+                return SUCCESS
+            self.runs.append("documented")
+            return SUCCESS
+
+        def undocumented(self, args: list) -> int:
+            self.runs.append("undocumented")
+            return SUCCESS
+
+    tty = types.SimpleNamespace(
+        command_index=CommandIndex(),
+        current_tty_status=SUCCESS,
+        help_function_child_name="help",
+        help_recorder=None
+    )
+    tty.function_help = lambda name, text: tty.help_recorder.__setitem__(name, text)
+    service = FakeService(tty)
+    options = [
+        {"documented": service.documented, "desc": "Has a help branch"},
+        {"undocumented": service.undocumented, "desc": "Runs for real"}
+    ]
+    for option in options:
+        tty.command_index.add(option)
+    with tempfile.TemporaryDirectory() as folder:
+        entries = CommandManifest(folder, os.path.join(folder, "manifest.json")).describe_options(tty, options)
+    assert service.runs == []
+    assert [entry["help"] for entry in entries] == ["The help of documented", None]
@@ -0,0 +1,331 @@
+"""
+File in charge of testing the download manager
+"""
+import os
+import sys
+import json
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import (
+        DownloadError,
+        ChecksumError,
+        RemoteFileChangedError,
+        ArtifactCache
+    )
+else:
+    from src.services.common import (
+        DownloadError,
+        ChecksumError,
+        RemoteFileChangedError,
+        ArtifactCache
+    )
+
+
+def test_download_manager(cache_folder: str, make_manager: callable) -> None:
+    """ Test the shared downloads: content, atomic write and http errors """
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        """ Serve the files without logging the requests """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    with open(os.path.join(served, "artifact.bin"), "wb") as file:
+        file.write(content)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(QuietHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    manager = make_manager()
+    target = os.path.join(cache_folder, "out", "artifact.bin")
+    try:
+        size = manager.download(f"{url}/artifact.bin", target)
+        second_size = manager.download(f"{url}/artifact.bin", target)
+        missing_error = ""
+        try:
+            manager.download(f"{url}/missing.bin", os.path.join(cache_folder, "missing.bin"))
+        except DownloadError as error:
+            missing_error = str(error)
+    finally:
+        server.shutdown()
+        server.server_close()
+    with open(target, "rb") as file:
+        downloaded = file.read()
+    leftovers = os.listdir(os.path.join(cache_folder, "out"))
+    missing_exists = os.path.exists(os.path.join(cache_folder, "missing.bin"))
+
+    assert size == second_size == len(content)
+    assert downloaded == content
+    assert leftovers == ["artifact.bin"]
+    assert "404" in missing_error
+    assert missing_exists is False
+    assert manager.get_chunk_size(0) == 64 * 1024
+    assert manager.get_chunk_size(1024 * 1024 * 1024) == 1024 * 1024
+
+
+def test_resumable_download(cache_folder: str, make_manager: callable) -> None:
+    """ Test that an interrupted download is resumed with a Range request """
+    import hashlib
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    content = os.urandom(2 * 1024 * 1024)
+    ranges_seen = []
+
+    class FlakyHandler(BaseHTTPRequestHandler):
+        """ Cut the first full transfer in the middle, honour the Range requests """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+        def do_GET(self) -> None:
+            """ Serve the content (or a part of it) """
+            requested = self.headers.get("Range", "")
+            ranges_seen.append(requested)
+            start = 0
+            if requested != "" and self.headers.get("If-Range", "") == '"v1"':
+                start = int(requested.split("=")[1].split("-")[0])
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range",
+                    f"bytes {start}-{len(content) - 1}/{len(content)}"
+                )
+            else:
+                self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(content) - start))
+            self.end_headers()
+            if len(ranges_seen) == 1:
+                self.wfile.write(content[:len(content) // 3])
+                self.wfile.flush()
+                self.close_connection = True
+                return
+            self.wfile.write(content[start:])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/artifact"
+    target = os.path.join(cache_folder, "artifact")
+    manager = make_manager()
+    try:
+        first_error = ""
+        try:
+            manager.fetch(url, target)
+        except DownloadError as error:
+            first_error = str(error)
+        partial_size = os.path.getsize(f"{target}.part")
+        result = manager.fetch(url, target)
+    finally:
+        server.shutdown()
+        server.server_close()
+    with open(target, "rb") as file:
+        downloaded = file.read()
+    leftovers = sorted(os.listdir(cache_folder))
+
+    assert first_error != ""
+    assert 0 < partial_size <= len(content) // 3
+    assert ranges_seen == ["", f"bytes={partial_size}-"]
+    assert result["resumed_from"] == partial_size
+    assert downloaded == content
+    assert result["sha256"] == hashlib.sha256(content).hexdigest()
+    assert leftovers == ["artifact"]
+
+
+def test_segmented_download(cache_folder: str, make_manager: callable) -> None:
+    """ Test the downloads split in byte ranges, the resume of a failed segment and a file changing on the server """
+    import hashlib
+    import threading
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    content = os.urandom(4 * 1024 * 1024 + 3)
+    ranges_seen = []
+    failures = {"left": 1}
+    state = {"etag": 1, "changing": False, "full": 0, "head": 0}
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        """ Serve the content with HEAD and Range support """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+        def _send_headers(self) -> tuple:
+            """ Send the headers of the answer and return the span to send """
+            start, end = 0, len(content) - 1
+            requested = self.headers.get("Range", "")
+            etag = f'"v{state["etag"]}"'
+            if requested != "" and self.headers.get("If-Range", "") == etag:
+                first, last = requested.split("=")[1].split("-")
+                start, end = int(first), int(last or end)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+            else:
+                self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            return start, end
+
+        def do_HEAD(self) -> None:
+            """ Describe the content """
+            state["head"] += 1
+            self._send_headers()
+
+        def do_GET(self) -> None:
+            """ Serve a range of the content, the first range after 2 MB is cut once """
+            start, end = self._send_headers()
+            if self.headers.get("Range", "") == "":
+                # ---- The client stops reading once it knows the size ----
+                state["full"] += 1
+                if state["changing"] is True:
+                    state["etag"] += 1
+                try:
+                    self.wfile.write(content)
+                except OSError:
+                    self.close_connection = True
+                return
+            ranges_seen.append(start)
+            if start >= 2 * 1024 * 1024 and failures["left"] > 0:
+                failures["left"] -= 1
+                self.wfile.write(content[start:start + 1000])
+                self.close_connection = True
+                return
+            self.wfile.write(content[start:end + 1])
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/binary"
+    target = os.path.join(cache_folder, "binary")
+    manager = make_manager(
+        segment_threshold=1024 * 1024,
+        segments=4
+    )
+    try:
+        first_error = ""
+        try:
+            manager.fetch(url, target)
+        except DownloadError as error:
+            first_error = str(error)
+        first_ranges = list(ranges_seen)
+        result = manager.fetch(url, target)
+        small_manager = make_manager(
+            segment_threshold=len(content) + 1
+        )
+        small_result = small_manager.fetch(url, os.path.join(cache_folder, "small"))
+        os.remove(os.path.join(cache_folder, "small"))
+        state["changing"] = True
+        changed_error = None
+        try:
+            manager.fetch(url, os.path.join(cache_folder, "changed"))
+        except DownloadError as error:
+            changed_error = error
+    finally:
+        server.shutdown()
+        server.server_close()
+    with open(target, "rb") as file:
+        downloaded = file.read()
+    leftovers = sorted(os.listdir(cache_folder))
+
+    segment = -(-len(content) // 4)
+    assert first_error != ""
+    assert sorted(first_ranges) == [0, segment, 2 * segment, 3 * segment]
+    assert len(ranges_seen) == 5 + 4
+    assert result["segments"] == 4 and result["resumed_from"] >= 2 * segment
+    assert downloaded == content
+    assert result["sha256"] == hashlib.sha256(content).hexdigest()
+    assert "segments" not in small_result and small_result["size"] == len(content)
+    assert state["head"] == 0 and state["full"] == 3
+    assert isinstance(changed_error, RemoteFileChangedError)
+    assert leftovers == ["binary"]
+
+
+def test_checksum_verification(cache_folder: str, make_manager: callable) -> None:
+    """ Test the sha256 checked during the download, published or pinned """
+    import hashlib
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        """ Serve the files without logging """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+    content = os.urandom(3 * 1024 * 1024 + 7)
+    digest = hashlib.sha256(content).hexdigest()
+    wrong = hashlib.sha256(b"tampered").hexdigest()
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    with open(os.path.join(served, "kubectl"), "wb") as file:
+        file.write(content)
+    with open(os.path.join(served, "kubectl.sha256"), "w", encoding="utf-8") as file:
+        file.write(f"{digest}  kubectl\n")
+    pin_file = os.path.join(cache_folder, "pins.json")
+    with open(pin_file, "w", encoding="utf-8") as file:
+        json.dump({"https://get.k3s.io": wrong.upper()}, file)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(QuietHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/kubectl"
+    target = os.path.join(cache_folder, "kubectl")
+    manager = make_manager(retries=2, backoff=0)
+    segmented = make_manager(
+        segment_threshold=1024 * 1024,
+        segments=3
+    )
+    cache = ArtifactCache(os.path.join(cache_folder, "cache"))
+    previous_pins = os.environ.get("CONTOPSSYNC_PINNED_SHA256")
+    os.environ["CONTOPSSYNC_PINNED_SHA256"] = pin_file
+    try:
+        published = manager.get_published_digest(f"{url}.sha256")
+        pinned = manager.get_pinned_digest("https://get.k3s.io")
+        mismatch = ""
+        try:
+            manager.fetch(url, target, expected_sha256=wrong)
+        except ChecksumError as error:
+            mismatch = str(error)
+        mismatch_leftovers = sorted(os.listdir(cache_folder))
+        single = manager.fetch(url, target, expected_sha256=published)
+        os.remove(target)
+        split = segmented.fetch(url, target, expected_sha256=published.upper())
+        cached = cache.fetch(url, target, manager, published)
+        cache_mismatch = False
+        try:
+            cache.fetch(url, target, manager, wrong)
+        except ChecksumError:
+            cache_mismatch = True
+        with open(target, "rb") as file:
+            downloaded = file.read()
+    finally:
+        if previous_pins is None:
+            os.environ.pop("CONTOPSSYNC_PINNED_SHA256", None)
+        else:
+            os.environ["CONTOPSSYNC_PINNED_SHA256"] = previous_pins
+        server.shutdown()
+        server.server_close()
+
+    assert published == digest and pinned == wrong
+    assert "Checksum mismatch" in mismatch and wrong in mismatch and digest in mismatch
+    assert mismatch_leftovers == ["pins.json", "served"]
+    assert single["sha256"] == digest
+    assert split["sha256"] == digest
+    assert cached["sha256"] == digest
+    assert cache_mismatch is True
+    assert downloaded == content
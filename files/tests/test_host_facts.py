@@ -0,0 +1,45 @@
+"""
+File in charge of testing the facts gathered about the host
+"""
+import os
+import sys
+from platform import system
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import HostFacts, get_host_facts
+else:
+    from src.services.common import HostFacts, get_host_facts
+
+CURRENT_SYSTEM = system()
+
+
+def test_host_facts() -> None:
+    """ Test the detection and the cache of the host facts """
+    facts = get_host_facts()
+    cached = get_host_facts()
+    restored = HostFacts.from_dict(facts.to_dict())
+    pi_ubuntu = HostFacts(
+        system="Linux",
+        machine="aarch64",
+        node_name="node1",
+        device_model="Raspberry Pi 4 Model B Rev 1.4",
+        os_release={"ID": "ubuntu", "ID_LIKE": "debian"}
+    )
+    pi_os = HostFacts(
+        system="Linux",
+        node_name="raspberrypi",
+        os_release={"ID": "raspbian", "ID_LIKE": "debian"}
+    )
+    desktop = HostFacts(system="Linux", node_name="desktop")
+
+    assert facts.system == CURRENT_SYSTEM
+    assert cached is facts
+    assert restored.to_dict() == facts.to_dict()
+    assert pi_ubuntu.is_raspberrypi is True
+    assert pi_ubuntu.pi_base_flavor == "ubuntu"
+    assert pi_os.is_raspberrypi is True
+    assert pi_os.pi_base_flavor == "debian"
+    assert desktop.is_raspberrypi is False
+    assert desktop.pi_base_flavor == ""
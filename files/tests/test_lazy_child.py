@@ -0,0 +1,34 @@
+"""
+File in charge of testing the lazy loading of the system installers
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import is_child_loaded
+else:
+    from src.services.common import is_child_loaded
+
+
+def test_lazy_installers(main_instance: any) -> None:
+    """ Test that the system installers are only built when a command needs them """
+    install_kubernetes = main_instance.kubernetes.kube_children.install_kubernetes
+    loaded_at_startup = (
+        is_child_loaded(install_kubernetes, "windows")
+        or is_child_loaded(install_kubernetes, "linux")
+        or is_child_loaded(install_kubernetes, "mac")
+    )
+    main_instance.tty.process_complex_input(["help", "install_kubectl"])
+    loaded_after_help = is_child_loaded(install_kubernetes, "linux")
+    linux = install_kubernetes.linux
+    loaded_on_use = is_child_loaded(install_kubernetes, "linux")
+    same_instance = linux is install_kubernetes.linux
+    kubectl_loaded = is_child_loaded(linux, "kubectl")
+
+    assert loaded_at_startup is False
+    assert loaded_after_help is False
+    assert loaded_on_use is True
+    assert same_instance is True
+    assert kubectl_loaded is False
@@ -0,0 +1,120 @@
+"""
+File in charge of testing the offline bundles
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import (
+        DownloadError,
+        ArtifactCache,
+        BundleBuilder,
+        OfflineBundle,
+        set_active_bundle
+    )
+else:
+    from src.services.common import (
+        DownloadError,
+        ArtifactCache,
+        BundleBuilder,
+        OfflineBundle,
+        set_active_bundle
+    )
+
+
+def test_offline_bundle(cache_folder: str, make_manager: callable, fake_tty: any) -> None:
+    """ Test building a bundle and answering the downloads from it without network """
+    import zipfile
+    import hashlib
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        """ Serve the files without logging """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+    files = {
+        "install.sh": b"#!/bin/sh\necho install\n" * 50,
+        "k3s-arm64": os.urandom(200 * 1024),
+        "k3s-airgap-images-arm64.tar.zst": os.urandom(100 * 1024)
+    }
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    for name, content in files.items():
+        with open(os.path.join(served, name), "wb") as file:
+            file.write(content)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(QuietHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    manager = make_manager()
+    builder = BundleBuilder(manager, ArtifactCache(os.path.join(cache_folder, "cache")))
+    builder.plans["local"] = lambda architecture, versions: [
+        {"url": f"{url}/install.sh", "name": "install.sh", "role": "k3s-script"},
+        {
+            "url": f"{url}/k3s-{architecture}",
+            "name": "k3s",
+            "role": "k3s-binary",
+            "sha256": hashlib.sha256(files["k3s-arm64"]).hexdigest()
+        },
+        {
+            "url": f"{url}/k3s-airgap-images-{architecture}.tar.zst",
+            "name": "k3s-airgap-images.tar.zst",
+            "role": "k3s-images"
+        },
+        {"url": f"{url}/stable.txt", "name": "stable.txt", "role": "release", "content": "v1.31.0"}
+    ]
+    bundle_path = os.path.join(cache_folder, "bundle.zip")
+    unknown_plan = ""
+    try:
+        try:
+            builder.build(["nope"], "arm64", bundle_path)
+        except DownloadError as error:
+            unknown_plan = str(error)
+        manifest = builder.build(["local"], "arm64", bundle_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+    with zipfile.ZipFile(bundle_path) as archive:
+        compression = {
+            info.filename.rsplit("/", 1)[-1]: info.compress_type
+            for info in archive.infolist()
+        }
+    bundle = OfflineBundle(bundle_path)
+    staged = bundle.extract_role("k3s-binary", os.path.join(cache_folder, "airgap"))
+    # ---- The server is down: the downloads must be answered by the bundle ----
+    set_active_bundle(bundle_path)
+    try:
+        target = os.path.join(cache_folder, "k3s_install.sh")
+        from_bundle = manager.download_on_tty(fake_tty, f"{url}/install.sh/", target)
+        with open(target, "rb") as file:
+            script = file.read()
+        missing = manager.download_on_tty(fake_tty, f"{url}/other", os.path.join(cache_folder, "other"))
+        tampered = manager.download_on_tty(
+            fake_tty, f"{url}/stable.txt", os.path.join(cache_folder, "stable.txt"), expected_sha256="0" * 64
+        )
+        missing_exists = os.path.exists(os.path.join(cache_folder, "other"))
+    finally:
+        set_active_bundle("")
+    with open(staged[0], "rb") as file:
+        staged_binary = file.read()
+
+    assert "Unknown plan nope" in unknown_plan
+    assert manifest["architecture"] == "arm64" and len(manifest["artifacts"]) == 4
+    assert bundle.architecture == "arm64" and bundle.has(f"{url}/install.sh/") is True
+    assert compression["k3s-airgap-images.tar.zst"] == zipfile.ZIP_STORED
+    assert compression["install.sh"] == zipfile.ZIP_DEFLATED
+    assert staged_binary == files["k3s-arm64"]
+    assert from_bundle == 0 and script == files["install.sh"]
+    assert missing == 84 and missing_exists is False
+    assert tampered == 84
+    assert any("not in the bundle" in text for _, text in fake_tty.printed)
+    assert any("Checksum mismatch" in text for _, text in fake_tty.printed)
@@ -0,0 +1,96 @@
+"""
+File in charge of testing the package manager backend
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import StackPlan, PackageBackend, PackageManagerError
+else:
+    from src.services.common import StackPlan, PackageBackend, PackageManagerError
+
+
+def test_package_backend(cache_folder: str) -> None:
+    """ Test the packages requested by several steps are installed in one transaction per package manager """
+    from services.common.process_runner import ProcessResult
+
+    class FakeToolCache:
+        """ The tools of the host, pip3 appears once python3-pip is installed """
+
+        def __init__(self, installed: list) -> None:
+            self.installed = installed
+            self.probes = []
+
+        def is_installed(self, tool: str) -> bool:
+            self.probes.append(tool)
+            return tool in self.installed
+
+        def invalidate(self) -> None:
+            if "python3-pip" in runner.packages:
+                self.installed.append("pip3")
+
+    class FakeRunner:
+        """ Record the commands, dpkg knows the installed packages """
+
+        def __init__(self) -> None:
+            self.calls = []
+            self.packages = ["curl"]
+
+        def run(self, argv: list, as_admin: bool = False, **kwargs) -> ProcessResult:
+            self.calls.append((argv, as_admin))
+            if argv[0] == "dpkg-query":
+                lines = [f"{name} install ok installed" for name in argv[3:] if name in self.packages]
+                return ProcessResult(argv, 0, stdout="\n".join(lines) + "\n")
+            if "install" in argv:
+                self.packages += [item for item in argv[argv.index("install") + 1:] if item.startswith("-") is False]
+            return ProcessResult(argv, 0)
+
+    runner = FakeRunner()
+    cache = FakeToolCache(["apt-get", "snap"])
+    # ---- An index refreshed a day ago ----
+    os.utime(cache_folder, (time.time() - 86400, time.time() - 86400))
+    backend = PackageBackend(runner, cache, apt_lists_folder=cache_folder)
+    assert backend.get_available() == ["apt", "snap"]
+    assert backend.is_available("apt") is True and cache.probes.count("apt-get") == 1
+    try:
+        backend.request("brew", ["k3d"])
+        raise AssertionError("brew is not available")
+    except PackageManagerError:
+        pass
+
+    backend.request("apt", ["curl", "python3-pip"], reason="docker_compose")
+    backend.request("snap", ["kubectl", "microk8s"], ["--classic"], reason="kubectl")
+    backend.request("apt", ["python3-pip", "unrar"], reason="vxlan")
+    transactions = backend.get_pending()
+    assert [(item.manager, item.packages) for item in transactions] == [
+        ("apt", ["curl", "python3-pip", "unrar"]),
+        ("snap", ["kubectl"]),
+        ("snap", ["microk8s"])
+    ]
+    transactions = backend.apply(stream=False)
+    assert all(item.ok is True for item in transactions)
+    assert transactions[0].already_installed == ["curl"] and transactions[0].refreshed is True
+    commands = [(argv, as_admin) for argv, as_admin in runner.calls if argv[0] == "apt-get" or "install" in argv]
+    assert [argv[-1] for argv, _ in commands] == ["update", "unrar", "kubectl", "microk8s"]
+    apt_install = commands[1][0]
+    assert apt_install[apt_install.index("-y") + 1:] == ["python3-pip", "unrar"]
+    assert all(as_admin is True for _, as_admin in commands)
+    assert backend.get_pending() == []
+
+    # ---- pip3 came with python3-pip, the index is not refreshed again ----
+    assert backend.is_available("pip") is True
+    runner.calls = []
+    backend.install("apt", ["python3-pip"], stream=False)
+    assert [argv[0] for argv, _ in runner.calls] == ["dpkg-query"]
+    backend.install("apt", ["jq"], stream=False)
+    assert [argv[-1] for argv, _ in runner.calls if argv[0] != "dpkg-query"] == ["jq"]
+
+    cache = FakeToolCache(["apt-get"])
+    plan = StackPlan(["docker_compose"], "Linux", tool_cache=cache)
+    batched = plan.get_package_installations(PackageBackend(FakeRunner(), cache, apt_lists_folder=cache_folder))
+    assert [entry["name"] for entry in batched] == ["pip"]
+    batched = plan.get_package_installations(PackageBackend(FakeRunner(), FakeToolCache([])))
+    assert batched == []
@@ -0,0 +1,151 @@
+"""
+File in charge of testing the artifact server shared between the nodes
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import (
+        DownloadError,
+        ArtifactCache,
+        BundleBuilder,
+        ArtifactPeerServer,
+        PeerSource,
+        set_peer_source
+    )
+else:
+    from src.services.common import (
+        DownloadError,
+        ArtifactCache,
+        BundleBuilder,
+        ArtifactPeerServer,
+        PeerSource,
+        set_peer_source
+    )
+
+
+def test_peer_artifact_server(cache_folder: str, make_manager: callable) -> None:
+    """ Test the agents fetching the artifacts from the master instead of the upstream server """
+    import hashlib
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    upstream_requests = []
+
+    class RecordingHandler(SimpleHTTPRequestHandler):
+        """ Serve the upstream files and record the requests """
+
+        def log_request(self, code="-", size="-") -> None:
+            """ Record the requests instead of logging them """
+            upstream_requests.append((self.command, self.path))
+
+    files = {
+        "install.sh": b"#!/bin/sh\necho install\n" * 50,
+        "k3s-arm64": os.urandom(3 * 1024 * 1024 + 5),
+        "k3s-airgap-images-arm64.tar.zst": os.urandom(100 * 1024)
+    }
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    for name, content in files.items():
+        with open(os.path.join(served, name), "wb") as file:
+            file.write(content)
+    upstream = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(RecordingHandler, directory=served)
+    )
+    thread = threading.Thread(target=upstream.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{upstream.server_address[1]}"
+    master_manager = make_manager()
+    master_cache = ArtifactCache(os.path.join(cache_folder, "master"))
+    builder = BundleBuilder(master_manager, master_cache)
+    builder.plans["k3s"] = lambda architecture, versions: [
+        {"url": f"{url}/k3s-{architecture}", "name": "k3s", "role": "k3s-binary"},
+        {
+            "url": f"{url}/k3s-airgap-images-{architecture}.tar.zst",
+            "name": "k3s-airgap-images.tar.zst",
+            "role": "k3s-images"
+        }
+    ]
+    server = ArtifactPeerServer(master_cache)
+    agents = []
+    try:
+        # ---- The master installs (the script) and prefetches the release for the agents ----
+        master_cache.fetch(f"{url}/install.sh", os.path.join(cache_folder, "master_install.sh"), master_manager)
+        prefetched = server.prefetch(["k3s"], ["arm64"], builder)
+        port = server.start(0, "127.0.0.1")
+        peer_url = f"http://127.0.0.1:{port}"
+        for index in range(2):
+            manager = make_manager(
+                segment_threshold=1024 * 1024,
+                segments=3
+            )
+            peer = PeerSource(peer_url, "arm64", manager)
+            peer.probe()
+            agent_cache = ArtifactCache(os.path.join(cache_folder, f"agent{index}"))
+            script = os.path.join(cache_folder, f"agent{index}", "k3s_install.sh")
+            entry = agent_cache.fetch(
+                f"{url}/install.sh/",
+                script,
+                manager,
+                peer.get_sha256(f"{url}/install.sh/"),
+                source_url=peer.get_artifact_url(f"{url}/install.sh/")
+            )
+            binaries = peer.extract_role("k3s-binary", os.path.join(cache_folder, f"agent{index}", "airgap"))
+            with open(script, "rb") as file:
+                script_content = file.read()
+            with open(binaries[0], "rb") as file:
+                binary_content = file.read()
+            agents.append((entry, script_content, binary_content, agent_cache.list_entries()[0]))
+        other_architecture = PeerSource(peer_url, "amd64", master_manager)
+        other_architecture.probe()
+        missing_error = ""
+        try:
+            master_manager.fetch(
+                peer.get_artifact_url(f"{url}/unknown"),
+                os.path.join(cache_folder, "unknown")
+            )
+        except DownloadError as error:
+            missing_error = str(error)
+        # ---- The digest announced by the peer is no reference ----
+        set_peer_source(peer_url, "arm64")
+        peer_cache = ArtifactCache(os.path.join(cache_folder, "peer_client"))
+        unverified = master_manager.fetch_artifact(f"{url}/k3s-arm64", "", cache=peer_cache)
+        verified = master_manager.fetch_artifact(
+            f"{url}/k3s-arm64",
+            "",
+            hashlib.sha256(files["k3s-arm64"]).hexdigest(),
+            cache=peer_cache
+        )
+    finally:
+        set_peer_source("")
+        server.stop()
+        upstream.shutdown()
+        upstream.server_close()
+    unreachable = False
+    try:
+        PeerSource(peer_url, "arm64", make_manager()).probe()
+    except DownloadError:
+        unreachable = True
+
+    assert len(prefetched) == 2
+    assert peer.index[f"{url}/k3s-arm64"]["role"] == "k3s-binary"
+    assert peer.index[f"{url}/install.sh"]["sha256"] == hashlib.sha256(files["install.sh"]).hexdigest()
+    for entry, script_content, binary_content, cached in agents:
+        assert entry["source"] == "network" and script_content == files["install.sh"]
+        assert binary_content == files["k3s-arm64"]
+        assert cached["url"] == f"{url}/install.sh/" and cached["etag"] == ""
+    # ---- Every file left the upstream server once, for the master ----
+    assert sorted(item for item in upstream_requests if item[0] == "GET") == sorted([
+        ("GET", "/install.sh"),
+        ("GET", "/k3s-arm64"),
+        ("GET", "/k3s-airgap-images-arm64.tar.zst")
+    ])
+    assert other_architecture.get_entries("k3s-binary") == []
+    assert unverified["source"] == "peer" and unverified["verified"] is False
+    assert verified["source"] == "peer" and verified["verified"] is True
+    assert "404" in missing_error
+    assert unreachable is True
@@ -0,0 +1,131 @@
+"""
+File in charge of testing the artifacts prefetched during the installations
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import (
+        ArtifactCache,
+        BundleBuilder,
+        ArtifactPrefetcher,
+        set_active_prefetcher
+    )
+else:
+    from src.services.common import (
+        ArtifactCache,
+        BundleBuilder,
+        ArtifactPrefetcher,
+        set_active_prefetcher
+    )
+
+
+def test_prefetch_pipeline(cache_folder: str, make_manager: callable, fake_tty: any) -> None:
+    """ Test the artifacts downloaded in the background while the install prepares the machine """
+    import hashlib
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class SlowHandler(SimpleHTTPRequestHandler):
+        """ Serve the files slowly, like a distant mirror """
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+        def do_GET(self) -> None:
+            """ Wait before answering """
+            time.sleep(0.4)
+            super().do_GET()
+
+    files = {
+        "install.sh": b"#!/bin/sh\necho install\n" * 50,
+        "k3s-arm64": os.urandom(512 * 1024),
+        "k3s-airgap-images-arm64.tar.zst": os.urandom(100 * 1024),
+        "tool.sh": b"#!/bin/sh\necho tool\n"
+    }
+    # ---- The published checksum of tool.sh is not the one of its content ----
+    files["install.sh.sha256"] = f"{hashlib.sha256(files['install.sh']).hexdigest()}  install.sh\n".encode("utf-8")
+    files["tool.sh.sha256"] = f"{hashlib.sha256(b'other').hexdigest()}  tool.sh\n".encode("utf-8")
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    for name, content in files.items():
+        with open(os.path.join(served, name), "wb") as file:
+            file.write(content)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(SlowHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    manager = make_manager()
+    cache = ArtifactCache(os.path.join(cache_folder, "cache"))
+    builder = BundleBuilder(manager, cache)
+    builder.plans["k3s"] = lambda architecture, versions: [
+        {"url": f"{url}/k3s-{architecture}", "name": "k3s", "role": "k3s-binary"},
+        {
+            "url": f"{url}/k3s-airgap-images-{architecture}.tar.zst",
+            "name": "k3s-airgap-images.tar.zst",
+            "role": "k3s-images"
+        }
+    ]
+    prefetcher = ArtifactPrefetcher(manager, cache, "arm64", max_workers=3)
+    try:
+        start = time.perf_counter()
+        prefetcher.declare(f"{url}/install.sh")
+        prefetcher.declare(f"{url}/tool.sh")
+        prefetcher.declare_plan(["k3s"], "arm64", builder)
+        prefetcher.declare(f"{url}/missing")
+        # ---- The preparation steps run meanwhile ----
+        time.sleep(1.2)
+        set_active_prefetcher(prefetcher)
+        script = os.path.join(cache_folder, "k3s_install.sh")
+        status = manager.download_on_tty(
+            fake_tty,
+            f"{url}/install.sh",
+            script,
+            checksum_url=f"{url}/install.sh.sha256"
+        )
+        binaries = prefetcher.extract_role("k3s-binary", os.path.join(cache_folder, "airgap"))
+        missing = prefetcher.wait(f"{url}/missing")
+        elapsed = time.perf_counter() - start
+        report = prefetcher.get_report()
+        with open(script, "rb") as file:
+            script_content = file.read()
+        with open(binaries[0], "rb") as file:
+            binary_content = file.read()
+        printed_before = len(fake_tty.printed)
+        tool_status = manager.download_on_tty(
+            fake_tty,
+            f"{url}/tool.sh",
+            os.path.join(cache_folder, "tool.sh"),
+            checksum_url=f"{url}/tool.sh.sha256"
+        )
+        tool_printed = fake_tty.printed[printed_before:]
+        tool_exists = os.path.exists(os.path.join(cache_folder, "tool.sh"))
+    finally:
+        set_active_prefetcher(None)
+        prefetcher.close()
+        server.shutdown()
+        server.server_close()
+
+    assert status == 0 and script_content == files["install.sh"]
+    assert binary_content == files["k3s-arm64"]
+    assert any("was prefetched" in text for _, text in fake_tty.printed)
+    assert any(text.startswith("Checksum verified") for _, text in fake_tty.printed)
+    # ---- A prefetched copy that does not match the published checksum is not used ----
+    assert tool_status == 84 and tool_exists is False
+    assert all("was prefetched" not in text for _, text in tool_printed)
+    assert missing is None and report["failed"] == 1
+    assert report["artifacts"] == 5
+    # ---- The downloads overlapped the preparation: the install barely waited ----
+    assert report["waited_time"] < 0.5
+    # ---- The wall time of the window: 5 downloads of 0.4 s each on 3 workers, not their sum ----
+    assert 0.8 <= report["download_time"] < 5 * 0.4
+    assert abs(report["saved_time"] - (report["download_time"] - report["waited_time"])) < 1e-6
+    assert elapsed < 1.2 + report["download_time"]
+    assert "saved" in prefetcher.format_report()
@@ -0,0 +1,45 @@
+"""
+File in charge of testing the runner of the external processes
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import ProcessRunner
+else:
+    from src.services.common import ProcessRunner
+
+
+def test_process_runner() -> None:
+    """ Test the argv runner: captured output, status, timeout and missing programs """
+    runner = ProcessRunner()
+    lines = []
+    result = runner.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; print('out 1'); print('out 2'); sys.stderr.write('err > $HOME\\n'); sys.exit(3)"
+        ],
+        on_line=lines.append
+    )
+    assert result.returncode == 3 and result.ok is False
+    assert result.lines == ["out 1", "out 2"]
+    assert lines == ["out 1\n", "out 2\n"]
+    assert result.stderr == "err > $HOME\n"
+    echoed = runner.run(
+        [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"],
+        input_text="a | b"
+    )
+    assert echoed.ok is True and echoed.stdout == "A | B\n"
+    start = time.perf_counter()
+    slow = runner.run(
+        [sys.executable, "-c", "import time; time.sleep(10)"],
+        timeout=0.5
+    )
+    assert slow.timed_out is True and slow.ok is False
+    assert time.perf_counter() - start < 5
+    missing = runner.run(["contopssync-missing-program"])
+    assert missing.ok is False and missing.stderr != ""
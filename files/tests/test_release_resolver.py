@@ -0,0 +1,89 @@
+"""
+File in charge of testing the resolution of the release versions
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import DownloadError, ReleaseResolver, ReleaseError
+else:
+    from src.services.common import DownloadError, ReleaseResolver, ReleaseError
+
+
+def test_release_resolver(cache_folder: str, make_manager: callable) -> None:
+    """ Test the resolution of the releases through the caches and the lockfile """
+    calls = []
+
+    def _stable(version: str, delay: float = 0.0) -> callable:
+        def _resolve(architecture: str) -> str:
+            calls.append(version)
+            time.sleep(delay)
+            return version
+        return _resolve
+
+    def _unreachable(architecture: str) -> str:
+        raise DownloadError("the release server is down")
+
+    cache_file = os.path.join(cache_folder, "releases.json")
+    manager = make_manager()
+    resolver = ReleaseResolver(manager, cache_file, ttl=60)
+    resolver.sources = {"kubectl": _stable("v1.31.1", 0.3), "k3s": _stable("v1.31.1+k3s1", 0.3)}
+    start = time.perf_counter()
+    first = resolver.resolve_many(["kubectl", "k3s", "kubectl"], "arm64")
+    batch_time = time.perf_counter() - start
+    memory = resolver.resolve("kubectl", "arm64")
+    # ---- A new process finds the versions on the disk ----
+    restarted = ReleaseResolver(manager, cache_file, ttl=60)
+    restarted.sources = dict(resolver.sources)
+    disk = restarted.resolve("k3s", "arm64")
+    calls_before_expiry = len(calls)
+    expired = ReleaseResolver(manager, cache_file, ttl=0)
+    expired.sources = {"kubectl": _stable("v1.31.2"), "k3s": _unreachable}
+    refreshed = expired.resolve("kubectl", "arm64")
+    stale = expired.resolve("k3s", "arm64")
+    unknown_error = ""
+    try:
+        expired.resolve("k3s", "amd64")
+    except ReleaseError as error:
+        unknown_error = str(error)
+    failed = expired.resolve_many(["k3s", "helm"], "amd64")
+    # ---- The lockfile pins the versions without asking any server ----
+    lockfile = os.path.join(cache_folder, "cluster.lock.json")
+    content = resolver.write_lockfile(lockfile, ["kubectl", "k3s"], "arm64")
+    locked = ReleaseResolver(manager, os.path.join(cache_folder, "other.json"), ttl=0)
+    locked.sources = {"kubectl": _unreachable, "k3s": _unreachable}
+    pins = locked.use_lockfile(lockfile)
+    pinned = locked.resolve_many(["kubectl", "k3s"], "amd64")
+    locked.use_lockfile("")
+    unpinned_error = ""
+    try:
+        locked.resolve("kubectl", "amd64")
+    except ReleaseError as error:
+        unpinned_error = str(error)
+    invalid_error = ""
+    with open(os.path.join(cache_folder, "invalid.json"), "w", encoding="utf-8") as file:
+        file.write('{"versions": {}}')
+    try:
+        locked.use_lockfile(os.path.join(cache_folder, "invalid.json"))
+    except ReleaseError as error:
+        invalid_error = str(error)
+
+    assert first["kubectl"]["version"] == "v1.31.1" and first["kubectl"]["source"] == "network"
+    assert first["k3s"]["version"] == "v1.31.1+k3s1"
+    # ---- The two tools were resolved at the same time ----
+    assert batch_time < 0.55
+    assert memory["source"] == "memory" and disk["source"] == "disk"
+    assert calls_before_expiry == 2
+    assert refreshed["version"] == "v1.31.2" and refreshed["source"] == "network"
+    assert stale["version"] == "v1.31.1+k3s1" and stale["source"] == "stale"
+    assert "the release server is down" in unknown_error
+    assert failed["k3s"]["version"] == "" and "error" in failed["helm"]
+    assert content["versions"] == {"kubectl": "v1.31.1", "k3s": "v1.31.1+k3s1"}
+    assert pins == content["versions"]
+    assert all(release["source"] == "lock" for release in pinned.values())
+    assert pinned["k3s"]["version"] == "v1.31.1+k3s1"
+    assert "could not be resolved" in unpinned_error
+    assert "unsupported lockfile format" in invalid_error
@@ -0,0 +1,109 @@
+"""
+File in charge of testing the installations resumed after a reboot
+"""
+import os
+import sys
+import subprocess
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+    from services.common import ResumeHook, ResumeError, RESUME_FLAG
+else:
+    from src import constants as CONST
+    from src.services.common import ResumeHook, ResumeError, RESUME_FLAG
+
+SUCCESS = CONST.SUCCESS
+
+
+def test_resume_hook(cache_folder: str, fake_tty: any) -> None:
+    """ Test an installation is registered to resume after a reboot """
+    import stat
+    import shlex
+    from services.common.process_runner import ProcessResult
+    from services.kubernetes_children.install.k3s.install_k3s_raspberry_pi import InstallK3sRaspberryPi
+
+    class FakeRunner:
+        """ Record the admin commands instead of running them """
+
+        def __init__(self) -> None:
+            self.calls = []
+            self.refuse = ""
+
+        def get_admin_prefix(self) -> list:
+            return []
+
+        def run_as_admin(self, argv: list, **kwargs) -> ProcessResult:
+            self.calls.append(argv)
+            return ProcessResult(argv, 1 if self.refuse in argv else 0, stderr="refused")
+
+    runner = FakeRunner()
+    state_file = os.path.join(cache_folder, "contopssync", "resume.json")
+    hook = ResumeHook(runner, state_file=state_file, unit_folder=cache_folder)
+    assert hook.get_state() == {} and hook.is_pending() is False
+
+    launch = hook.get_launch_command()
+    assert launch[-1] == RESUME_FLAG
+    assert getattr(sys, "frozen", False) is True or os.path.isfile(launch[1])
+    unit = hook.get_unit_content("k3s_raspberry_pi", user="pi", working_directory="/home/pi")
+    assert "Type=oneshot" in unit and "User=pi" in unit and "WorkingDirectory=/home/pi" in unit
+    assert f"ConditionPathExists={state_file}" in unit
+    assert f"Environment=XDG_CACHE_HOME={cache_folder}" in unit
+    assert f"ExecStart={' '.join(shlex.quote(item) for item in launch)}" in unit
+
+    os.environ["CONTOPSSYNC_BUNDLE"] = "/srv/rack.bundle"
+    try:
+        state = hook.register("k3s_raspberry_pi", ["install_k3s", "false", "false", "token", "10.0.0.1", "reboot"])
+    finally:
+        os.environ.pop("CONTOPSSYNC_BUNDLE")
+    assert state["reboots"] == 1 and state["environment"] == {"CONTOPSSYNC_BUNDLE": "/srv/rack.bundle"}
+    assert hook.get_state()["command"][-1] == "reboot"
+    assert stat.S_IMODE(os.stat(state_file).st_mode) == 0o600
+    assert runner.calls[0][:3] == ["install", "-m", "0644"] and runner.calls[0][-1] == hook.unit_path
+    assert ["systemctl", "enable", hook.unit_name] in runner.calls
+    assert hook.is_pending("k3s_raspberry_pi") is True and hook.is_pending("docker_linux") is False
+
+    # ---- A board that needs reboot after reboot stops being resumed ----
+    assert hook.register("k3s_raspberry_pi", ["install_k3s", "true", "false"])["reboots"] == 2
+    try:
+        hook.register("k3s_raspberry_pi", ["install_k3s", "true", "false"])
+    except ResumeError as err:
+        assert "2 reboots" in str(err)
+    else:
+        raise AssertionError("The reboot limit was not enforced")
+
+    runner.calls.clear()
+    hook.unregister()
+    assert hook.get_state() == {}
+    assert ["systemctl", "disable", hook.unit_name] in runner.calls
+
+    runner.refuse = "enable"
+    try:
+        hook.register("k3s_raspberry_pi", ["install_k3s", "true", "false"])
+    except ResumeError as err:
+        assert "refused" in str(err)
+    else:
+        raise AssertionError("A refused registration was accepted")
+    assert hook.get_state() == {}
+
+    # ---- Started at boot with nothing to resume, the program only says so ----
+    env = dict(os.environ)
+    resumed = subprocess.run(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py"), RESUME_FLAG],
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        timeout=60
+    )
+    assert resumed.returncode == SUCCESS
+    assert "No installation is waiting to be resumed" in resumed.stdout
+
+    fake_tty.run_as_admin = None
+    fake_tty.run_command = None
+    installer = InstallK3sRaspberryPi(fake_tty)
+    assert installer._get_resume_command(True, False, "token", "10.0.0.1", False, True) == ["install_k3s", "false", "false", "token", "10.0.0.1", "reboot"]
+    assert installer._get_resume_command(False, True, "", "", True, False) == ["install_k3s", "true", "true", "serve"]
+    assert installer.get_steps().get_order()[-3:] == [["check_boot_state"], ["install_local_artifacts"], ["install_k3s"]]
@@ -0,0 +1,57 @@
+"""
+File in charge of testing the installation plans of several tools
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import StackPlan, StackError
+else:
+    from src.services.common import StackPlan, StackError
+
+
+def test_stack_plan() -> None:
+    """ Test a stack installs the shared prerequisites once, before the tools needing them """
+
+    class FakeToolCache:
+        """ Count the probes of the installed tools """
+
+        def __init__(self, installed: list) -> None:
+            self.installed = installed
+            self.probes = []
+
+        def is_installed(self, tool: str) -> bool:
+            self.probes.append(tool)
+            return tool in self.installed
+
+    cache = FakeToolCache([])
+    plan = StackPlan(["docker-compose", "minikube", "k3s", "minikube"], "Linux", force_docker=True, tool_cache=cache)
+    names = [entry["name"] for entry in plan.get_installations()]
+    assert names == ["docker", "pip", "docker_compose", "kubectl", "minikube", "k3s"]
+    assert sorted(cache.probes) == sorted(set(cache.probes))
+    docker = plan.entries[0]
+    assert docker["required_by"] == ["docker_compose", "k3s"]
+    assert plan.entries[-1]["target"].args == ["true", "true"]
+    plans, urls = plan.get_prefetch()
+    assert plans == ["kubectl", "k3s"] and len(urls) == 1
+    assert "docker           to install (required by docker_compose, k3s)" in plan.format_plan()
+
+    cache = FakeToolCache(["docker", "kubectl"])
+    plan = StackPlan(["kind", "minikube", "k3s"], "Linux", tool_cache=cache)
+    names = [entry["name"] for entry in plan.get_installations()]
+    assert names == ["kind", "minikube", "k3s"]
+    assert plan.get_prefetch() == (["k3s"], [])
+    assert plan.entries[-1]["target"].args == ["true", "false"]
+    assert "docker           installed, skipped (required by kind)" in plan.format_plan()
+    assert plan.format_plan().endswith("3 of 5 tools to install\n")
+
+    plan = StackPlan(["docker_compose"], "Darwin", tool_cache=FakeToolCache([]))
+    assert [entry["name"] for entry in plan.entries] == ["docker", "docker_compose"]
+    for targets, host_system in ((["helm"], "Linux"), (["pip"], "Darwin")):
+        try:
+            StackPlan(targets, host_system, tool_cache=FakeToolCache([]))
+            raise AssertionError(f"{targets} on {host_system} should not be planned")
+        except StackError:
+            pass
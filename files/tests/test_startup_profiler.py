@@ -0,0 +1,39 @@
+"""
+File in charge of testing the startup profiler
+"""
+import os
+import sys
+import json
+import subprocess
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+
+def test_profile_startup(cache_folder: str) -> None:
+    """ Test the json report of the startup profiler """
+    main_file = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "src", "main.py"
+    )
+    report_file = os.path.join(cache_folder, "startup_profile.json")
+    subprocess.run(
+        [
+            sys.executable, main_file,
+            f"--profile-startup={report_file}", "-nm", "-nc"
+        ],
+        input="exit\n",
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+        text=True
+    )
+    with open(report_file, "r", encoding="utf-8") as file:
+        report = json.load(file)
+    modules = [item["module"] for item in report["imports"]]
+    classes = [item["class"] for item in report["constructions"]]
+    inclusive = [item["seconds"] for item in report["imports"]]
+
+    assert report["total_seconds"] > 0
+    assert "services.kubernetes" in modules
+    assert "services.kubernetes_children.install_kubernetes.InstallKubernetes" in classes
+    assert "services.docker_children.DockerChildren" in classes
+    assert inclusive == sorted(inclusive, reverse=True)
@@ -0,0 +1,112 @@
+"""
+File in charge of testing the installation step graphs
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+    from services.common import StepGraph, StepGraphError
+else:
+    from src import constants as CONST
+    from src.services.common import StepGraph, StepGraphError
+
+ERROR = CONST.ERROR
+SUCCESS = CONST.SUCCESS
+
+
+def test_step_graph() -> None:
+    """ Test the installer steps run as a dependency graph """
+    import threading
+
+    def sleeper(name: str, duration: float, produces: str = "") -> callable:
+        def action(context: dict) -> int:
+            time.sleep(duration)
+            if produces != "":
+                context[produces] = name
+            return SUCCESS
+        return action
+
+    parallel = StepGraph(SUCCESS, ERROR)
+    parallel.add("download_a", sleeper("a", 0.3, "file_a"), outputs=["file_a"])
+    parallel.add("download_b", sleeper("b", 0.3, "file_b"), outputs=["file_b"])
+    parallel.add("prepare", sleeper("prepare", 0.3))
+    parallel.add(
+        "install",
+        lambda context: SUCCESS if context["file_a"] == "a" and context["file_b"] == "b" else ERROR,
+        inputs=["file_a", "file_b"],
+        requires=["prepare"]
+    )
+    assert parallel.get_order() == [["download_a", "download_b", "prepare"], ["install"]]
+    report = parallel.run()
+    assert report["status"] == SUCCESS and report["failed"] == ""
+    assert all(step["state"] == "done" for step in report["steps"].values())
+    assert report["duration"] < 0.8
+    assert "4 steps in" in parallel.format_report(report)
+
+    fatal = StepGraph(SUCCESS, ERROR, max_workers=1)
+    fatal.add("first", lambda context: ERROR)
+    fatal.add("second", lambda context: SUCCESS)
+    fatal.add("after", lambda context: SUCCESS, requires=["first"])
+    report = fatal.run()
+    assert report["status"] == ERROR and report["failed"] == "first"
+    assert report["steps"]["first"]["state"] == "failed"
+    assert report["steps"]["second"]["state"] == "skipped"
+    assert report["steps"]["after"]["state"] == "skipped"
+
+    optional = StepGraph(SUCCESS, ERROR)
+    optional.add("cache_warmup", lambda context: ERROR, fatal=False)
+    optional.add("use_cache", lambda context: SUCCESS, requires=["cache_warmup"])
+    optional.add("install", lambda context: SUCCESS)
+    report = optional.run()
+    assert report["status"] == SUCCESS
+    assert report["steps"]["use_cache"]["state"] == "skipped"
+    assert report["steps"]["install"]["state"] == "done"
+
+    forgetful = StepGraph(SUCCESS, ERROR)
+    forgetful.add("download", lambda context: SUCCESS, outputs=["script"])
+    forgetful.add("crash", lambda context: 1 / 0, fatal=False)
+    report = forgetful.run()
+    assert report["steps"]["download"]["state"] == "failed"
+    assert "did not produce script" in report["steps"]["download"]["error"]
+    assert report["steps"]["crash"]["error"].startswith("ZeroDivisionError")
+
+    for broken in ("cycle", "unknown", "input", "twice"):
+        graph = StepGraph(SUCCESS, ERROR)
+        if broken == "cycle":
+            graph.add("a", lambda context: SUCCESS, requires=["b"])
+            graph.add("b", lambda context: SUCCESS, requires=["a"])
+        elif broken == "unknown":
+            graph.add("a", lambda context: SUCCESS, requires=["missing"])
+        elif broken == "input":
+            graph.add("a", lambda context: SUCCESS, inputs=["missing"])
+        else:
+            graph.add("a", lambda context: SUCCESS, outputs=["value"])
+            graph.add("b", lambda context: SUCCESS, outputs=["value"])
+        try:
+            graph.run()
+        except StepGraphError:
+            continue
+        raise AssertionError(f"The {broken} graph was accepted")
+
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def interactive(context: dict) -> int:
+        with lock:
+            active.append(1)
+            overlaps.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        return SUCCESS
+
+    terminal = StepGraph(SUCCESS, ERROR)
+    for index in range(4):
+        terminal.add(f"sudo_{index}", interactive, interactive=True)
+    assert terminal.run()["status"] == SUCCESS
+    assert max(overlaps) == 1
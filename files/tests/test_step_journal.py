@@ -0,0 +1,101 @@
+"""
+File in charge of testing the journal of the installation steps
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    import constants as CONST
+    from services.common import StepGraph, StepJournal
+else:
+    from src import constants as CONST
+    from src.services.common import StepGraph, StepJournal
+
+ERROR = CONST.ERROR
+SUCCESS = CONST.SUCCESS
+
+
+def test_install_journal(cache_folder: str) -> None:
+    """ Test a failed installation resumes at the step it stopped at """
+    calls = []
+
+    def step(name: str, produces: str = "", fails: list = None) -> callable:
+        def action(context: dict) -> int:
+            calls.append(name)
+            if fails is not None and len(fails) > 0:
+                fails.pop()
+                return ERROR
+            if produces != "":
+                context[produces] = f"{name} value"
+            return SUCCESS
+        return action
+
+    journal = StepJournal(os.path.join(cache_folder, "journal.json"))
+    script = os.path.join(cache_folder, "install.sh")
+    reboot = ["the cgroups are not running"]
+
+    def build(version: str) -> StepGraph:
+        graph = StepGraph(SUCCESS, ERROR, name="k3s", journal=journal)
+        graph.add("prepare", step("prepare"), interactive=True)
+        graph.add("download", step("download", "script"), outputs=["script"], key="https://get.k3s.io", files=[script])
+        graph.add("check", step("check", fails=reboot), requires=["prepare"], checkpoint=False)
+        graph.add("install", step("install"), requires=["check"], inputs=["script"], key=version)
+        return graph
+
+    with open(script, "w", encoding="utf-8") as file:
+        file.write("#!/bin/sh\n")
+    first = build("v1.31").run()
+    entry = journal.get_installer("k3s")
+    assert first["status"] == ERROR and first["failed"] == "check"
+    assert sorted(calls) == ["check", "download", "prepare"]
+    assert entry["failed"] == "check" and sorted(entry["steps"]) == ["download", "prepare"]
+
+    calls.clear()
+    graph = build("v1.31")
+    assert graph.has_checkpoints() is True
+    second = graph.run()
+    assert second["status"] == SUCCESS
+    # ---- The completed steps are skipped, the checks always run ----
+    assert calls == ["check", "install"]
+    assert second["steps"]["prepare"]["state"] == "resumed"
+    assert second["steps"]["download"]["state"] == "resumed"
+    assert "2 completed by a previous run" in graph.format_report(second)
+    # ---- A successful installation forgets its journal ----
+    assert journal.get_installers() == {}
+
+    reboot.append("the install script failed")
+    build("v1.31").run()
+    calls.clear()
+    reboot.append("failed again")
+    os.remove(script)
+    third = build("v1.32").run()
+    # ---- The script is gone, it is downloaded again ----
+    assert sorted(calls) == ["check", "download"]
+    assert third["steps"]["prepare"]["state"] == "resumed"
+    with open(script, "w", encoding="utf-8") as file:
+        file.write("#!/bin/sh\n")
+    calls.clear()
+    fourth = build("v1.32").run()
+    assert fourth["status"] == SUCCESS and calls == ["check", "install"]
+
+    changed = StepGraph(SUCCESS, ERROR, name="chain", journal=journal)
+    changed.add("a", step("a"), key="one")
+    changed.add("b", step("b"), requires=["a"])
+    changed.add("c", step("c"), requires=["b"])
+    changed.add("d", step("d", fails=["stop"]), requires=["c"])
+    changed.run()
+    calls.clear()
+    rerun = StepGraph(SUCCESS, ERROR, name="chain", journal=journal)
+    rerun.add("a", step("a"), key="two")
+    rerun.add("b", step("b"), requires=["a"])
+    rerun.add("c", step("c"), requires=["b"])
+    rerun.add("d", step("d", fails=["stop"]), requires=["c"])
+    rerun.run()
+    # ---- A changed key runs the step and the ones after it again ----
+    assert calls == ["a", "b", "c", "d"]
+    assert journal.get_installer("chain")["failed"] == "d"
+    assert journal.reset("unknown") == []
+    assert journal.reset() == ["chain"]
+    assert journal.get_installers() == {}
@@ -0,0 +1,52 @@
+"""
+File in charge of testing the cache of the installed tools
+"""
+import os
+import sys
+from platform import system
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import ToolCache
+else:
+    from src.services.common import ToolCache
+
+CURRENT_SYSTEM = system()
+
+
+def test_tool_cache(cache_folder: str, fake_tty: any) -> None:
+    """ Test the PATH index and the version cache of the tools """
+    if CURRENT_SYSTEM == "Windows":
+        return
+    path = os.environ.get("PATH", "")
+    tool = os.path.join(cache_folder, "fake_tool")
+    tools = ToolCache(os.path.join(cache_folder, "tools.json"))
+    os.environ["PATH"] = cache_folder
+    try:
+        installed_before = tools.is_installed("fake_tool")
+        with open(tool, "w", encoding="utf-8") as file:
+            file.write("#!/bin/sh\necho fake_tool 1.0\n")
+        os.chmod(tool, 0o755)
+        installed_after = tools.is_installed("fake_tool")
+        version = tools.get_version("fake_tool")
+        with open(tool, "w", encoding="utf-8") as file:
+            file.write("#!/bin/sh\necho fake_tool 2.0.0\n")
+        updated_version = tools.get_version("fake_tool")
+        reloaded_version = ToolCache(tools.cache_file).get_version("fake_tool")
+        found = tools.is_installed_on_tty(fake_tty, "fake_tool", "Fake tool")
+        found_status = fake_tty.current_tty_status
+        missing = tools.is_installed_on_tty(fake_tty, "missing_tool")
+    finally:
+        os.environ["PATH"] = path
+
+    assert installed_before is False
+    assert installed_after is True
+    assert version == "fake_tool 1.0"
+    assert updated_version == "fake_tool 2.0.0"
+    assert reloaded_version == "fake_tool 2.0.0"
+    assert found is True and found_status == 0 and missing is False and fake_tty.current_tty_status == 84
+    assert fake_tty.printed == [
+        ("info", "Checking if Fake tool is installed:"), ("success", "[OK]\n"),
+        ("info", "Checking if missing_tool is installed:"), ("error", "[KO]\n")
+    ]
@@ -0,0 +1,56 @@
+"""
+File in charge of testing the inventory of the installed tools
+"""
+import os
+import sys
+import json
+import time
+from platform import system
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import ToolCache, ToolInventory
+else:
+    from src.services.common import ToolCache, ToolInventory
+
+CURRENT_SYSTEM = system()
+
+
+def test_inventory(cache_folder: str) -> None:
+    """ Test the parallel probes of the inventory """
+    if CURRENT_SYSTEM == "Windows":
+        return
+    path = os.environ.get("PATH", "")
+    for name in ("tool_a", "tool_c"):
+        tool = os.path.join(cache_folder, name)
+        with open(tool, "w", encoding="utf-8") as file:
+            file.write(f"#!{sys.executable}\nimport time\ntime.sleep(0.5)\nprint('{name} 1.0')\n")
+        os.chmod(tool, 0o755)
+    inventory = ToolInventory(
+        tools={
+            "tool_a": ("--version",),
+            "tool_b": ("--version",),
+            "tool_c": ("version",)
+        },
+        tool_cache=ToolCache(os.path.join(cache_folder, "tools.json"))
+    )
+    os.environ["PATH"] = cache_folder
+    try:
+        start = time.perf_counter()
+        results = inventory.probe_all()
+        elapsed = time.perf_counter() - start
+        cached_results = inventory.probe_all()
+    finally:
+        os.environ["PATH"] = path
+
+    assert [item["tool"] for item in results] == ["tool_a", "tool_b", "tool_c"]
+    assert [item["installed"] for item in results] == [True, False, True]
+    assert results[0]["version"] == "tool_a 1.0"
+    assert results[1]["version"] == "" and results[1]["path"] == ""
+    assert results[2]["path"] == os.path.join(cache_folder, "tool_c")
+    # ---- One after the other, the two probes would take at least 1 s ----
+    assert elapsed < 0.95
+    assert [item["version"] for item in cached_results] == [item["version"] for item in results]
+    assert "tool_b" in inventory.format_table(results)
+    json.dumps(results)
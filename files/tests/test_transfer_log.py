@@ -0,0 +1,90 @@
+"""
+File in charge of testing the progress bars and the transfer log
+"""
+import io
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.getcwd(), "..", "src"))
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+if "../" == "../":
+    from services.common import ProgressRenderer, TransferLog
+else:
+    from src.services.common import ProgressRenderer, TransferLog
+
+
+def test_progress_and_transfer_log(cache_folder: str, make_manager: callable) -> None:
+    """ Test the throttled progress line and the statistics of the downloads """
+    import functools
+    import threading
+    from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+    class TerminalStream(io.StringIO):
+        """ A stream that says it is a terminal """
+
+        def isatty(self) -> bool:
+            """ Pretend to be a terminal """
+            return True
+
+    class KeepAliveHandler(SimpleHTTPRequestHandler):
+        """ Serve the files over persistent connections """
+
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args) -> None:
+            """ Do not log the requests """
+
+    piped = io.StringIO()
+    with ProgressRenderer(total=1024 * 1024, label="artifact.bin", stream=piped, pipe_interval=0.05) as progress:
+        for _ in range(1024):
+            progress.update(1024)
+            time.sleep(0.0002)
+    terminal = TerminalStream()
+    with ProgressRenderer(total=0, stream=terminal, fps=10) as live:
+        for _ in range(20000):
+            live.update(1024)
+    disabled = io.StringIO()
+    with ProgressRenderer(total=10, stream=disabled, enabled=False) as hidden:
+        hidden.update(10)
+
+    served = os.path.join(cache_folder, "served")
+    os.makedirs(served)
+    content = os.urandom(256 * 1024)
+    with open(os.path.join(served, "artifact.bin"), "wb") as file:
+        file.write(content)
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0),
+        functools.partial(KeepAliveHandler, directory=served)
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/artifact.bin"
+    transfer_log = TransferLog()
+    manager = make_manager(transfer_log=transfer_log)
+    try:
+        manager.download(url, os.path.join(cache_folder, "first.bin"))
+        manager.download(url, os.path.join(cache_folder, "second.bin"))
+    finally:
+        server.shutdown()
+        server.server_close()
+    entries = transfer_log.get_entries()
+    summary = transfer_log.get_summary()
+
+    lines = piped.getvalue().splitlines()
+    # ---- 1024 updates, a few lines: one per interval and the final one ----
+    assert 1 <= progress.frames < 50 and len(lines) == progress.frames
+    assert "\r" not in piped.getvalue()
+    assert lines[-1].startswith("artifact.bin: 1.0 MB / 1.0 MB (100 %)")
+    assert terminal.getvalue().startswith("\r") and terminal.getvalue().endswith("\n")
+    assert live.frames < 100 and "19.5 MB" in terminal.getvalue()
+    assert disabled.getvalue() == "" and hidden.position == 10
+    assert len(entries) == 2
+    assert entries[0]["transferred"] == entries[1]["transferred"] == len(content)
+    assert entries[0]["new_connections"] == 1 and entries[0]["connection_reused"] is False
+    # ---- One request per download (no size probe), on the connection of the first download ----
+    assert entries[0]["requests"] == 1
+    assert entries[1]["connection_reused"] is True and entries[1]["requests"] == 1
+    assert entries[1]["throughput"] > 0
+    assert summary["transfers"] == 2 and summary["reused"] == 1
+    assert summary["transferred"] == 2 * len(content)